@@ -118,15 +118,14 @@ class EnhancedClaimsInferenceEngine:
                 logger.info("Storing claims in Claims service")
                 fhir_claims_data = self.transformer.batch_anomaly_to_fhir(batch_claims)
                 
-                stored_claims = []
+                # One Bundle request per 100 claims instead of one request per claim
                 async with self.claims_client as client:
-                    for fhir_claim_data in fhir_claims_data:
-                        try:
-                            fhir_claim = await client.create_claim(fhir_claim_data)
-                            stored_claims.append(fhir_claim.get('id'))
-                        except Exception as e:
-                            logger.warning(f"Failed to store claim in FHIR: {e}")
-                            stored_claims.append(None)
+                    results = await client.create_claims_bulk(fhir_claims_data)
+                stored_claims = []
+                for result in results:
+                    if not result['success']:
+                        logger.warning(f"Failed to store claim in FHIR: {result['error']}")
+                    stored_claims.append(result['id'] if result['success'] else None)
                 
                 # Step 3: Update batch result with FHIR information
                 batch_result.update({
@@ -10,9 +10,10 @@ import os
 import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
 import uvicorn
 
 # Add current directory to path
@@ -22,7 +23,10 @@ from models import (
     ClaimData, PredictionResponse, BatchPredictionRequest, BatchPredictionResponse,
     HealthResponse, ErrorResponse, DenialInput, ClassificationResponse
 )
-from claims_service_client import ClaimsServiceClient, ClaimsDataTransformer, create_claims_service_client
+from claims_service_client import (
+    ClaimsServiceClient, ClaimsDataTransformer, CircuitBreaker,
+    create_claims_service_client, close_claims_service_clients
+)
 
 # Import existing prediction logic
 try:
@@ -74,6 +78,16 @@ CLAIMS_SERVICE_URL = os.getenv('CLAIMS_SERVICE_URL', 'http://localhost:8001')
 claims_client: Optional[ClaimsServiceClient] = None
 predictor: Optional[Any] = None
 
+# Claims service circuit breaker metrics
+CIRCUIT_TRANSITIONS = Counter(
+    'claims_service_circuit_transitions_total', 'Claims service circuit breaker transitions', ['to_state']
+)
+CIRCUIT_OPEN = Gauge('claims_service_circuit_open', '1 while the Claims service circuit is open')
+
+def record_circuit_transition(name: str, old_state: str, new_state: str):
+    CIRCUIT_TRANSITIONS.labels(to_state=new_state).inc()
+    CIRCUIT_OPEN.set(1 if new_state == CircuitBreaker.OPEN else 0)
+
 def get_claims_client() -> ClaimsServiceClient:
     """Get Claims Service client instance"""
     global claims_client
@@ -145,6 +159,7 @@ async def startup_event():
     # Initialize Claims Service client
     global claims_client
     claims_client = create_claims_service_client(CLAIMS_SERVICE_URL)
+    claims_client.circuit_breaker.add_listener(record_circuit_transition)
     
     # Test Claims Service connection
     try:
@@ -153,6 +168,16 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Claims Service not available: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the Claims Service connection pool"""
+    await close_claims_service_clients()
+
+@app.get("/metrics", tags=["Health"])
+async def get_metrics():
+    """Prometheus metrics endpoint"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Check the health of the API and ML model"""
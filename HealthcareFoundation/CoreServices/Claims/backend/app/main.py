@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 from models.database import engine, Base
-from routers import claims
+from routers import claims, bundle
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,6 +30,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(claims.router, prefix="/api/v1", tags=["claims"])
+app.include_router(bundle.router, prefix="/api/v1", tags=["bundle"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,160 @@
+# routers/bundle.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from typing import Any, Dict, List, Tuple
+from models.database import get_db
+from models.fhir_models import Claim, ClaimResponse, Coverage
+from schemas.fhir_schemas import (
+    ClaimCreate, ClaimUpdate, ClaimResponseCreate, ClaimResponseUpdate,
+    CoverageCreate, CoverageUpdate,
+    Bundle, BundleEntry, BundleTypeEnum, BundleResponse
+)
+from datetime import datetime
+import uuid
+
+router = APIRouter()
+
+# Resource types a Bundle entry may create (POST) or update (PUT)
+RESOURCE_TYPES = {
+    "Claim": (Claim, ClaimCreate, ClaimUpdate),
+    "ClaimResponse": (ClaimResponse, ClaimResponseCreate, ClaimResponseUpdate),
+    "Coverage": (Coverage, CoverageCreate, CoverageUpdate),
+}
+
+STATUS_TEXT = {
+    200: "200 OK",
+    201: "201 Created",
+    400: "400 Bad Request",
+    404: "404 Not Found",
+    422: "422 Unprocessable Entity",
+    500: "500 Internal Server Error",
+}
+
+class EntryError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _outcome(message: str) -> Dict[str, Any]:
+    return {
+        "resourceType": "OperationOutcome",
+        "issue": [{"severity": "error", "code": "processing", "diagnostics": message}]
+    }
+
+def _error_response(status: int, message: str) -> Dict[str, Any]:
+    return {"response": {"status": STATUS_TEXT[status], "outcome": _outcome(message)}}
+
+def _prepare(entry: BundleEntry) -> Tuple[str, str, Any, Dict[str, Any]]:
+    """Validate one entry into (operation, resource_type, resource_id, values)"""
+    method = entry.request.method.upper()
+    resource_type, _, resource_id = entry.request.url.strip("/").partition("/")
+    if resource_type not in RESOURCE_TYPES:
+        raise EntryError(400, f"Unsupported resource type: {resource_type}")
+    _, create_schema, update_schema = RESOURCE_TYPES[resource_type]
+
+    try:
+        if method == "POST" and not resource_id:
+            values = create_schema(**entry.resource).dict()
+            return "create", resource_type, str(uuid.uuid4()), values
+        if method == "PUT" and resource_id:
+            values = update_schema(**entry.resource).dict(exclude_unset=True)
+            return "update", resource_type, resource_id, values
+    except ValidationError as e:
+        raise EntryError(422, str(e))
+    raise EntryError(400, f"Unsupported request: {method} {entry.request.url}")
+
+def _apply(db: Session, operations: List[Tuple[int, str, str, str, Dict[str, Any]]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Write prepared operations: one multi-row INSERT per resource type and one
+    SELECT ... IN per resource type for updates. Returns entry responses by index;
+    raises EntryError for updates of missing resources.
+    """
+    responses: Dict[int, Dict[str, Any]] = {}
+
+    creates: Dict[str, List[Dict[str, Any]]] = {}
+    updates: Dict[str, Dict[str, List[Tuple[int, Dict[str, Any]]]]] = {}
+    for index, operation, resource_type, resource_id, values in operations:
+        if operation == "create":
+            creates.setdefault(resource_type, []).append({**values, "id": resource_id})
+            responses[index] = {"response": {"status": STATUS_TEXT[201], "location": f"{resource_type}/{resource_id}"}}
+        else:
+            updates.setdefault(resource_type, {}).setdefault(resource_id, []).append((index, values))
+
+    for resource_type, rows in creates.items():
+        model = RESOURCE_TYPES[resource_type][0]
+        db.execute(insert(model), rows)
+
+    now = datetime.utcnow()
+    for resource_type, by_id in updates.items():
+        model = RESOURCE_TYPES[resource_type][0]
+        existing = {row.id: row for row in db.query(model).filter(model.id.in_(list(by_id))).all()}
+        for resource_id, changes in by_id.items():
+            target = existing.get(resource_id)
+            if target is None:
+                raise EntryError(404, f"{resource_type}/{resource_id} not found")
+            for index, values in changes:
+                for key, value in values.items():
+                    setattr(target, key, value)
+                target.updated_at = now
+                responses[index] = {"response": {"status": STATUS_TEXT[200], "location": f"{resource_type}/{resource_id}"}}
+
+    db.flush()
+    return responses
+
+@router.post("/", response_model=BundleResponse)
+def process_bundle(bundle: Bundle, db: Session = Depends(get_db)):
+    """
+    FHIR Bundle endpoint. A transaction Bundle is applied in one database
+    transaction and fails as a whole; a batch Bundle reports each entry's
+    outcome, committing the entries that succeed.
+    """
+    prepared = []
+    errors: Dict[int, Dict[str, Any]] = {}
+    for index, entry in enumerate(bundle.entry):
+        try:
+            prepared.append((index, *_prepare(entry)))
+        except EntryError as e:
+            errors[index] = _error_response(e.status, e.message)
+
+    if bundle.type == BundleTypeEnum.transaction:
+        if errors:
+            raise HTTPException(status_code=400, detail={
+                "resourceType": "OperationOutcome",
+                "issue": [
+                    {"severity": "error", "code": "processing", "diagnostics": f"entry[{index}]: {error['response']['outcome']['issue'][0]['diagnostics']}"}
+                    for index, error in sorted(errors.items())
+                ]
+            })
+        try:
+            responses = _apply(db, prepared)
+            db.commit()
+        except EntryError as e:
+            db.rollback()
+            raise HTTPException(status_code=e.status, detail=_outcome(e.message))
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=_outcome(f"Transaction failed: {str(e)}"))
+        return {"type": "transaction-response", "entry": [responses[index] for index in range(len(bundle.entry))]}
+
+    # Batch: try every valid entry together, then isolate failures entry by entry
+    responses: Dict[int, Dict[str, Any]] = {}
+    try:
+        with db.begin_nested():
+            responses = _apply(db, prepared)
+    except Exception:
+        responses = {}
+        for operation in prepared:
+            try:
+                with db.begin_nested():
+                    responses.update(_apply(db, [operation]))
+            except EntryError as e:
+                errors[operation[0]] = _error_response(e.status, e.message)
+            except Exception as e:
+                errors[operation[0]] = _error_response(500, str(e))
+    db.commit()
+
+    responses.update(errors)
+    return {"type": "batch-response", "entry": [responses[index] for index in range(len(bundle.entry))]}
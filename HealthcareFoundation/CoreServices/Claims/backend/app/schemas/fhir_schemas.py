@@ -193,3 +193,37 @@ class CoverageResponse(CoverageBase):
 
     class Config:
         from_attributes = True
+
+# Bundle schemas
+MAX_BUNDLE_ENTRIES = 1000
+
+class BundleTypeEnum(str, Enum):
+    transaction = "transaction"  # all entries succeed or none do
+    batch = "batch"  # entries succeed or fail independently
+
+class BundleEntryRequest(BaseModel):
+    method: str  # POST to create, PUT to update
+    url: str  # "Claim" for POST, "Claim/{id}" for PUT
+
+class BundleEntry(BaseModel):
+    fullUrl: Optional[str] = None
+    resource: Dict[str, Any]
+    request: BundleEntryRequest
+
+class Bundle(BaseModel):
+    resourceType: str = "Bundle"
+    type: BundleTypeEnum
+    entry: List[BundleEntry] = Field(default_factory=list, max_length=MAX_BUNDLE_ENTRIES)
+
+class BundleEntryResponse(BaseModel):
+    status: str  # e.g. "201 Created"
+    location: Optional[str] = None  # e.g. "Claim/{id}"
+    outcome: Optional[Dict[str, Any]] = None  # OperationOutcome on failure
+
+class BundleResponseEntry(BaseModel):
+    response: BundleEntryResponse
+
+class BundleResponse(BaseModel):
+    resourceType: str = "Bundle"
+    type: str  # transaction-response|batch-response
+    entry: List[BundleResponseEntry]
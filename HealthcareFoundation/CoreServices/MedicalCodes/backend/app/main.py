@@ -3,7 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .database import engine
 from .models import Base
-from .routers import search, codes, utils, data_sync, comprehensive_search, export, fhir_api
+from .routers import search, codes, utils, data_sync, comprehensive_search, export, fhir_api, hierarchy
+from .services.export_jobs import pdf_export_jobs
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -32,6 +33,11 @@ app.include_router(data_sync.router)
 app.include_router(comprehensive_search.router)
 app.include_router(export.router)
 app.include_router(fhir_api.router)
+app.include_router(hierarchy.router)
+
+@app.on_event("shutdown")
+async def shutdown_export_workers():
+    pdf_export_jobs.shutdown()
 
 @app.get("/")
 async def root():
@@ -50,12 +56,15 @@ async def root():
             "data_sync": "/api/sync",
             "comprehensive_search": "/api/comprehensive",
             "export": "/api/export",
+            "export_jobs": "/api/export/pdf/jobs",
+            "hierarchy": "/api/hierarchy/{system}/{code}",
             "fhir": {
                 "metadata": "/fhir/metadata",
                 "codesystems": "/fhir/CodeSystem",
                 "valuesets": "/fhir/ValueSet",
                 "conceptmaps": "/fhir/ConceptMap",
                 "lookup": "/fhir/CodeSystem/{id}/$lookup",
+                "subsumes": "/fhir/CodeSystem/{id}/$subsumes",
                 "expand": "/fhir/ValueSet/{id}/$expand"
             },
             "official_sources": {
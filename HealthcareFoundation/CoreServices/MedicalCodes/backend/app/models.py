@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, Index
 from datetime import datetime
 from .database import Base
 
@@ -56,4 +56,28 @@ class ModifierCode(Base):
     category = Column(String(50), index=True)
     applies_to = Column(String(200))  # What types of codes this applies to
     is_active = Column(String(1), default='Y')
-    created_at = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CodeHierarchyNode(Base):
+    __tablename__ = "code_hierarchy"
+    
+    # Nested-set index over the code tables: a node's descendants are exactly
+    # the rows of the same system with lft/rgt inside its interval
+    id = Column(Integer, primary_key=True)
+    system = Column(String(10), nullable=False)  # icd10, cpt
+    code = Column(String(20), nullable=False)
+    node_type = Column(String(20), nullable=False)  # root, chapter, block, category, section, subsection, code
+    display = Column(Text)
+    parent_id = Column(Integer, index=True)
+    depth = Column(Integer, nullable=False)
+    lft = Column(Integer, nullable=False)
+    rgt = Column(Integer, nullable=False)
+    is_billable = Column(Boolean, default=False, nullable=False)
+    code_set_version = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_hierarchy_system_code', 'system', 'code'),
+        Index('idx_hierarchy_interval', 'system', 'lft', 'rgt'),
+        Index('idx_hierarchy_billable', 'system', 'is_billable', 'lft'),
+    )
@@ -4,11 +4,12 @@ Comprehensive Code Search API Router
 Provides endpoints for searching the comprehensive medical code database
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
 import logging
 
 from ..services.comprehensive_code_database import comprehensive_db
+from ..services.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,7 @@ async def search_comprehensive_codes(
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 @router.get("/stats")
-async def get_comprehensive_stats():
+async def get_comprehensive_stats(request: Request):
     """
     Get comprehensive database statistics
     
@@ -77,13 +78,14 @@ async def get_comprehensive_stats():
     total codes, last update time, and cache status.
     """
     try:
-        stats = comprehensive_db.get_database_stats()
+        def build():
+            return {
+                "success": True,
+                "database_stats": comprehensive_db.get_database_stats(),
+                "data_sources": comprehensive_db.data_sources
+            }
         
-        return {
-            "success": True,
-            "database_stats": stats,
-            "data_sources": comprehensive_db.data_sources
-        }
+        return response_cache.respond(request, "comprehensive_stats", build)
         
     except Exception as e:
         logger.error(f"Error getting comprehensive stats: {e}")
@@ -111,30 +113,33 @@ async def load_comprehensive_database():
         logger.error(f"Error loading comprehensive database: {e}")
         raise HTTPException(status_code=500, detail=f"Database loading error: {str(e)}")
 
+def _build_specialties():
+    specialties = {
+        "cpt_specialties": list(comprehensive_db.cpt_specialties.keys()),
+        "mental_health_chapters": list(comprehensive_db.icd10_mental_health.keys()),
+        "sample_specialties": [
+            "Psychiatry", "Primary Care", "Surgery", "Orthopedics", "Cardiology",
+            "Gastroenterology", "Radiology", "Pathology", "Pulmonology", "Dermatology",
+            "Rheumatology", "Urology", "Obstetrics", "Neonatology", "Emergency Medicine",
+            "Infectious Disease", "Oncology", "Hematology", "Endocrinology", "Neurology",
+            "Ophthalmology"
+        ]
+    }
+    
+    return {
+        "success": True,
+        "specialties": specialties
+    }
+
 @router.get("/specialties")
-async def get_available_specialties():
+async def get_available_specialties(request: Request):
     """
     Get available medical specialties
     
     Returns a list of medical specialties available in the comprehensive database.
     """
     try:
-        specialties = {
-            "cpt_specialties": list(comprehensive_db.cpt_specialties.keys()),
-            "mental_health_chapters": list(comprehensive_db.icd10_mental_health.keys()),
-            "sample_specialties": [
-                "Psychiatry", "Primary Care", "Surgery", "Orthopedics", "Cardiology",
-                "Gastroenterology", "Radiology", "Pathology", "Pulmonology", "Dermatology",
-                "Rheumatology", "Urology", "Obstetrics", "Neonatology", "Emergency Medicine",
-                "Infectious Disease", "Oncology", "Hematology", "Endocrinology", "Neurology",
-                "Ophthalmology"
-            ]
-        }
-        
-        return {
-            "success": True,
-            "specialties": specialties
-        }
+        return response_cache.respond(request, "comprehensive_specialties", _build_specialties)
         
     except Exception as e:
         logger.error(f"Error getting specialties: {e}")
@@ -20,10 +20,10 @@ from ..schemas import SyncStatusResponse, SyncResultResponse, ScrapedDataRespons
 router = APIRouter(prefix="/api/sync", tags=["data-sync"])
 
 # Background task to run data synchronization
-async def run_data_sync_task():
+async def run_data_sync_task(force: bool = False):
     """Background task for data synchronization"""
     try:
-        results = await data_sync_service.sync_all_data()
+        results = await data_sync_service.sync_all_data(force=force)
         return results
     except Exception as e:
         return {"error": str(e)}
@@ -43,11 +43,14 @@ async def get_sync_status():
         raise HTTPException(status_code=500, detail=f"Error getting sync status: {str(e)}")
 
 @router.post("/start", response_model=SyncResultResponse)
-async def start_data_sync(background_tasks: BackgroundTasks):
+async def start_data_sync(
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Refetch every page even if the source reports it unchanged")
+):
     """Start data synchronization from official sources"""
     try:
         # Add the sync task to background tasks
-        background_tasks.add_task(run_data_sync_task)
+        background_tasks.add_task(run_data_sync_task, force)
         
         return SyncResultResponse(
             success=True,
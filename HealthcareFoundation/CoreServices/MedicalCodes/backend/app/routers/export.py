@@ -4,9 +4,10 @@ Export API Router
 Provides endpoints for exporting medical codes to PDF and JSON formats
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse, JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Path, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple
+import heapq
 import json
 import os
 import logging
@@ -19,7 +20,12 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
+from sqlalchemy import and_, case
+from sqlalchemy.orm import Session
+
 from ..services.comprehensive_code_database import comprehensive_db
+from ..services.export_jobs import pdf_export_jobs, SpecialtyNotFoundError, JOB_COMPLETED, JOB_FAILED
+from ..services.response_cache import response_cache
 from ..database import SessionLocal
 from ..models import CPTCode, ICD10Code, HCPCSCode, ModifierCode
 
@@ -27,6 +33,54 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/export", tags=["Export"])
 
+def cpt_code_to_dict(code, specialty: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a CPT ORM object or result row to its export dictionary"""
+    return {
+        'code': code.code,
+        'description': code.description,
+        'category': code.category,
+        'section': code.section,
+        'subsection': code.subsection,
+        'is_active': code.is_active,
+        'effective_date': code.effective_date.isoformat() if code.effective_date else None,
+        'specialty': specialty or get_cpt_specialty(code.section, code.subsection),
+        'type': 'CPT'
+    }
+
+def icd10_code_to_dict(code, specialty: Optional[str] = None) -> Dict[str, Any]:
+    """Convert an ICD-10 ORM object or result row to its export dictionary"""
+    return {
+        'code': code.code,
+        'description': code.description,
+        'code_type': code.code_type,
+        'chapter': code.chapter,
+        'is_billable': code.is_billable,
+        'specialty': specialty or get_icd10_specialty(code.chapter),
+        'type': 'ICD-10'
+    }
+
+def hcpcs_code_to_dict(code, specialty: Optional[str] = None) -> Dict[str, Any]:
+    """Convert an HCPCS ORM object or result row to its export dictionary"""
+    return {
+        'code': code.code,
+        'description': code.description,
+        'level': code.level,
+        'category': code.category,
+        'specialty': specialty or get_hcpcs_specialty(code.category),
+        'type': 'HCPCS'
+    }
+
+def modifier_code_to_dict(code, specialty: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a Modifier ORM object or result row to its export dictionary"""
+    return {
+        'modifier': code.modifier,
+        'description': code.description,
+        'category': code.category,
+        'applies_to': code.applies_to,
+        'specialty': specialty or get_modifier_specialty(code.category),
+        'type': 'Modifier'
+    }
+
 def get_all_codes_from_database() -> Dict[str, List[Dict[str, Any]]]:
     """Get all codes from database organized by type and specialty"""
     db = SessionLocal()
@@ -110,55 +164,19 @@ def get_all_codes_from_database() -> Dict[str, List[Dict[str, Any]]]:
         
         # Process CPT codes
         for code in cpt_codes:
-            code_dict = {
-                'code': code.code,
-                'description': code.description,
-                'category': code.category,
-                'section': code.section,
-                'subsection': code.subsection,
-                'is_active': code.is_active,
-                'effective_date': code.effective_date.isoformat() if code.effective_date else None,
-                'specialty': get_cpt_specialty(code.section, code.subsection),
-                'type': 'CPT'
-            }
-            organized_codes['cpt_codes'].append(code_dict)
+            organized_codes['cpt_codes'].append(cpt_code_to_dict(code))
         
         # Process ICD-10 codes
         for code in icd10_codes:
-            code_dict = {
-                'code': code.code,
-                'description': code.description,
-                'code_type': code.code_type,
-                'chapter': code.chapter,
-                'is_billable': code.is_billable,
-                'specialty': get_icd10_specialty(code.chapter),
-                'type': 'ICD-10'
-            }
-            organized_codes['icd10_codes'].append(code_dict)
+            organized_codes['icd10_codes'].append(icd10_code_to_dict(code))
         
         # Process HCPCS codes
         for code in hcpcs_codes:
-            code_dict = {
-                'code': code.code,
-                'description': code.description,
-                'level': code.level,
-                'category': code.category,
-                'specialty': get_hcpcs_specialty(code.category),
-                'type': 'HCPCS'
-            }
-            organized_codes['hcpcs_codes'].append(code_dict)
+            organized_codes['hcpcs_codes'].append(hcpcs_code_to_dict(code))
         
         # Process Modifier codes
         for code in modifier_codes:
-            code_dict = {
-                'modifier': code.modifier,
-                'description': code.description,
-                'category': code.category,
-                'applies_to': code.applies_to,
-                'specialty': get_modifier_specialty(code.category),
-                'type': 'Modifier'
-            }
-            organized_codes['modifier_codes'].append(code_dict)
+            organized_codes['modifier_codes'].append(modifier_code_to_dict(code))
         
         return organized_codes
         
@@ -168,70 +186,71 @@ def get_all_codes_from_database() -> Dict[str, List[Dict[str, Any]]]:
     finally:
         db.close()
 
+# Specialty mappings shared by the in-memory and streaming export paths
+CPT_SPECIALTY_MAPPING = {
+    'Evaluation and Management': 'Primary Care',
+    'Surgery': 'Surgery',
+    'Radiology': 'Radiology',
+    'Pathology and Laboratory': 'Pathology',
+    'Medicine': 'Primary Care'
+}
+
+ICD10_SPECIALTY_MAPPING = {
+    'Mental, Behavioral and Neurodevelopmental disorders': 'Psychiatry',
+    'Diseases of the circulatory system': 'Cardiology',
+    'Diseases of the respiratory system': 'Pulmonology',
+    'Diseases of the digestive system': 'Gastroenterology',
+    'Diseases of the musculoskeletal system': 'Orthopedics',
+    'Diseases of the genitourinary system': 'Urology',
+    'Diseases of the eye and adnexa': 'Ophthalmology',
+    'Diseases of the nervous system': 'Neurology',
+    'Endocrine, nutritional and metabolic diseases': 'Endocrinology',
+    'Diseases of the skin and subcutaneous tissue': 'Dermatology',
+    'Neoplasms': 'Oncology',
+    'Diseases of the blood and blood-forming organs': 'Hematology',
+    'Certain infectious and parasitic diseases': 'Infectious Disease',
+    'Pregnancy, childbirth and the puerperium': 'Obstetrics',
+    'Certain conditions originating in the perinatal period': 'Neonatology',
+    'Congenital malformations, deformations and chromosomal abnormalities': 'Pediatrics',
+    'Injury, poisoning and certain other consequences of external causes': 'Emergency Medicine',
+    'Symptoms, signs and abnormal clinical and laboratory findings': 'Primary Care',
+    'Factors influencing health status and contact with health services': 'Primary Care'
+}
+
+HCPCS_SPECIALTY_MAPPING = {
+    'Mental Health Services': 'Psychiatry',
+    'Durable Medical Equipment': 'Pulmonology',
+    'Prosthetics and Orthotics': 'Orthopedics',
+    'Ambulance Services': 'Emergency Medicine',
+    'Drugs Administered Other Than Oral Method': 'Oncology'
+}
+
+MODIFIER_SPECIALTY_MAPPING = {
+    'Evaluation and Management': 'Primary Care',
+    'Surgery': 'Surgery',
+    'Telemedicine': 'Primary Care',
+    'Medical Necessity': 'General',
+    'Mental Health': 'Psychiatry'
+}
+
 def get_cpt_specialty(section: str, subsection: str) -> str:
     """Map CPT section/subsection to specialty"""
-    specialty_mapping = {
-        'Evaluation and Management': 'Primary Care',
-        'Surgery': 'Surgery',
-        'Radiology': 'Radiology',
-        'Pathology and Laboratory': 'Pathology',
-        'Medicine': 'Primary Care'
-    }
-    
     if section == 'Medicine' and subsection == 'Psychiatry':
         return 'Psychiatry'
     
-    return specialty_mapping.get(section, 'General')
+    return CPT_SPECIALTY_MAPPING.get(section, 'General')
 
 def get_icd10_specialty(chapter: str) -> str:
     """Map ICD-10 chapter to specialty"""
-    specialty_mapping = {
-        'Mental, Behavioral and Neurodevelopmental disorders': 'Psychiatry',
-        'Diseases of the circulatory system': 'Cardiology',
-        'Diseases of the respiratory system': 'Pulmonology',
-        'Diseases of the digestive system': 'Gastroenterology',
-        'Diseases of the musculoskeletal system': 'Orthopedics',
-        'Diseases of the genitourinary system': 'Urology',
-        'Diseases of the eye and adnexa': 'Ophthalmology',
-        'Diseases of the nervous system': 'Neurology',
-        'Endocrine, nutritional and metabolic diseases': 'Endocrinology',
-        'Diseases of the skin and subcutaneous tissue': 'Dermatology',
-        'Neoplasms': 'Oncology',
-        'Diseases of the blood and blood-forming organs': 'Hematology',
-        'Certain infectious and parasitic diseases': 'Infectious Disease',
-        'Pregnancy, childbirth and the puerperium': 'Obstetrics',
-        'Certain conditions originating in the perinatal period': 'Neonatology',
-        'Congenital malformations, deformations and chromosomal abnormalities': 'Pediatrics',
-        'Injury, poisoning and certain other consequences of external causes': 'Emergency Medicine',
-        'Symptoms, signs and abnormal clinical and laboratory findings': 'Primary Care',
-        'Factors influencing health status and contact with health services': 'Primary Care'
-    }
-    
-    return specialty_mapping.get(chapter, 'General')
+    return ICD10_SPECIALTY_MAPPING.get(chapter, 'General')
 
 def get_hcpcs_specialty(category: str) -> str:
     """Map HCPCS category to specialty"""
-    specialty_mapping = {
-        'Mental Health Services': 'Psychiatry',
-        'Durable Medical Equipment': 'Pulmonology',
-        'Prosthetics and Orthotics': 'Orthopedics',
-        'Ambulance Services': 'Emergency Medicine',
-        'Drugs Administered Other Than Oral Method': 'Oncology'
-    }
-    
-    return specialty_mapping.get(category, 'General')
+    return HCPCS_SPECIALTY_MAPPING.get(category, 'General')
 
 def get_modifier_specialty(category: str) -> str:
     """Map Modifier category to specialty"""
-    specialty_mapping = {
-        'Evaluation and Management': 'Primary Care',
-        'Surgery': 'Surgery',
-        'Telemedicine': 'Primary Care',
-        'Medical Necessity': 'General',
-        'Mental Health': 'Psychiatry'
-    }
-    
-    return specialty_mapping.get(category, 'General')
+    return MODIFIER_SPECIALTY_MAPPING.get(category, 'General')
 
 def organize_by_specialty(codes: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
     """Organize codes by specialty"""
@@ -252,6 +271,238 @@ def organize_by_specialty(codes: Dict[str, List[Dict[str, Any]]]) -> Dict[str, D
     
     return specialty_organization
 
+# Streaming export support
+# Specialty is computed in SQL as an integer rank so each code table can be read
+# in specialty order through a server-side cursor and merged without buffering.
+
+STREAM_BATCH_SIZE = 1000
+STREAM_CHUNK_BYTES = 64 * 1024
+
+CODE_TYPE_ORDER = ['cpt_codes', 'icd10_codes', 'hcpcs_codes', 'modifier_codes']
+
+SPECIALTY_ORDER = sorted(
+    set(CPT_SPECIALTY_MAPPING.values())
+    | set(ICD10_SPECIALTY_MAPPING.values())
+    | set(HCPCS_SPECIALTY_MAPPING.values())
+    | set(MODIFIER_SPECIALTY_MAPPING.values())
+    | {'Psychiatry', 'General'}
+)
+SPECIALTY_RANK = {specialty: rank for rank, specialty in enumerate(SPECIALTY_ORDER)}
+
+def _specialty_rank_expression(column, mapping: Dict[str, str], extra_whens: Optional[List] = None):
+    """Build a SQL CASE expression mapping a column to its specialty rank"""
+    whens = list(extra_whens or [])
+    whens.extend((column == key, SPECIALTY_RANK[value]) for key, value in mapping.items())
+    return case(*whens, else_=SPECIALTY_RANK['General'])
+
+def _streaming_sources(db: Session) -> List[Tuple[str, Any, Any, Callable]]:
+    """Return (code_type, rank expression, ordered column query, row converter) per code table"""
+    cpt_rank = _specialty_rank_expression(
+        CPTCode.section,
+        CPT_SPECIALTY_MAPPING,
+        extra_whens=[(and_(CPTCode.section == 'Medicine', CPTCode.subsection == 'Psychiatry'), SPECIALTY_RANK['Psychiatry'])]
+    )
+    icd10_rank = _specialty_rank_expression(ICD10Code.chapter, ICD10_SPECIALTY_MAPPING)
+    hcpcs_rank = _specialty_rank_expression(HCPCSCode.category, HCPCS_SPECIALTY_MAPPING)
+    modifier_rank = _specialty_rank_expression(ModifierCode.category, MODIFIER_SPECIALTY_MAPPING)
+    
+    return [
+        (
+            'cpt_codes', cpt_rank,
+            db.query(
+                CPTCode.code, CPTCode.description, CPTCode.category, CPTCode.section,
+                CPTCode.subsection, CPTCode.is_active, CPTCode.effective_date,
+                cpt_rank.label('specialty_rank')
+            ).order_by(cpt_rank, CPTCode.code),
+            cpt_code_to_dict
+        ),
+        (
+            'icd10_codes', icd10_rank,
+            db.query(
+                ICD10Code.code, ICD10Code.description, ICD10Code.code_type, ICD10Code.chapter,
+                ICD10Code.is_billable, icd10_rank.label('specialty_rank')
+            ).order_by(icd10_rank, ICD10Code.code),
+            icd10_code_to_dict
+        ),
+        (
+            'hcpcs_codes', hcpcs_rank,
+            db.query(
+                HCPCSCode.code, HCPCSCode.description, HCPCSCode.level, HCPCSCode.category,
+                hcpcs_rank.label('specialty_rank')
+            ).order_by(hcpcs_rank, HCPCSCode.code),
+            hcpcs_code_to_dict
+        ),
+        (
+            'modifier_codes', modifier_rank,
+            db.query(
+                ModifierCode.modifier, ModifierCode.description, ModifierCode.category,
+                ModifierCode.applies_to, modifier_rank.label('specialty_rank')
+            ).order_by(modifier_rank, ModifierCode.modifier),
+            modifier_code_to_dict
+        ),
+    ]
+
+def _ranked_rows(rows, type_index: int, code_type: str, to_dict: Callable) -> Iterator[Tuple[int, int, str, Any, Callable]]:
+    """Tag streamed rows with their merge key"""
+    for row in rows:
+        yield row.specialty_rank, type_index, code_type, row, to_dict
+
+def database_has_codes(db: Session) -> bool:
+    """Check whether any code table has at least one row"""
+    return any(
+        db.query(model.id).first() is not None
+        for model in (CPTCode, ICD10Code, HCPCSCode, ModifierCode)
+    )
+
+def iter_codes_by_specialty(
+    db: Session,
+    specialty_filter: Optional[str] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Yield (specialty, code_type, code_dict) ordered by specialty, then code type.
+    
+    Every table is read with yield_per (server-side cursor on PostgreSQL) and the
+    four ordered streams are merged lazily, so memory stays flat regardless of
+    table size.
+    """
+    streams = []
+    for type_index, (code_type, rank_expr, query, to_dict) in enumerate(_streaming_sources(db)):
+        if specialty_filter:
+            query = query.filter(rank_expr == SPECIALTY_RANK[specialty_filter])
+        streams.append(_ranked_rows(query.yield_per(batch_size), type_index, code_type, to_dict))
+    
+    for rank, _, code_type, row, to_dict in heapq.merge(*streams, key=lambda item: (item[0], item[1])):
+        specialty = SPECIALTY_ORDER[rank]
+        yield specialty, code_type, to_dict(row, specialty)
+
+def _iter_cached_codes_by_specialty(specialty_filter: Optional[str] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Fallback ordering for the comprehensive cache used when the database is empty"""
+    specialty_organized = organize_by_specialty(get_all_codes_from_database())
+    for specialty in sorted(specialty_organized):
+        if specialty_filter and specialty != specialty_filter:
+            continue
+        for code_type in CODE_TYPE_ORDER:
+            for code in specialty_organized[specialty].get(code_type, []):
+                yield specialty, code_type, code
+
+def summarize_code(code: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a code dictionary to the 'summary' export format"""
+    key = 'modifier' if 'modifier' in code else 'code'
+    description = code['description'] or ''
+    return {
+        key: code[key],
+        "description": description[:100] + "..." if len(description) > 100 else description
+    }
+
+def _specialty_summary(counts: Dict[str, int]) -> Dict[str, int]:
+    return {
+        "cpt_count": counts.get('cpt_codes', 0),
+        "icd10_count": counts.get('icd10_codes', 0),
+        "hcpcs_count": counts.get('hcpcs_codes', 0),
+        "modifier_count": counts.get('modifier_codes', 0),
+        "total_count": sum(counts.values())
+    }
+
+def _chunked(pieces: Iterator[str], chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """Coalesce small serialized pieces into network-sized chunks"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+def _iter_export_pieces(
+    codes: Iterator[Tuple[str, str, Dict[str, Any]]],
+    output: str,
+    format_type: str,
+    specialty_filter: Optional[str]
+) -> Iterator[str]:
+    """Serialize ordered codes as NDJSON lines or as a grouped JSON document"""
+    export_info = {
+        "timestamp": datetime.now().isoformat(),
+        "format_type": format_type,
+        "specialty_filter": specialty_filter,
+        "streamed": True
+    }
+    specialty_counts: Dict[str, Dict[str, int]] = {}
+    
+    if output == "ndjson":
+        yield json.dumps({"export_info": export_info}) + "\n"
+        for specialty, code_type, code in codes:
+            counts = specialty_counts.setdefault(specialty, {})
+            counts[code_type] = counts.get(code_type, 0) + 1
+            record = code if format_type == "detailed" else dict(summarize_code(code), specialty=specialty, type=code['type'])
+            yield json.dumps(record) + "\n"
+        yield json.dumps({
+            "summary": {specialty: _specialty_summary(counts) for specialty, counts in specialty_counts.items()},
+            "total_specialties": len(specialty_counts),
+            "total_codes": sum(sum(counts.values()) for counts in specialty_counts.values())
+        }) + "\n"
+        return
+    
+    # Chunked JSON grouped by specialty; export_info is written last because
+    # the totals are only known once the stream is exhausted.
+    current_specialty = None
+    current_type_index = 0
+    first_in_array = True
+    
+    def close_specialty() -> str:
+        closing = ''.join(f'], "{code_type}": [' for code_type in CODE_TYPE_ORDER[current_type_index + 1:])
+        summary = json.dumps(_specialty_summary(specialty_counts[current_specialty]))
+        return f'{closing}]}}, "summary": {summary}}}'
+    
+    yield '{"specialties": {'
+    for specialty, code_type, code in codes:
+        type_index = CODE_TYPE_ORDER.index(code_type)
+        if specialty != current_specialty:
+            if current_specialty is not None:
+                yield close_specialty() + ', '
+            current_specialty = specialty
+            current_type_index = 0
+            first_in_array = True
+            specialty_counts[specialty] = {}
+            yield f'{json.dumps(specialty)}: {{"codes": {{"{CODE_TYPE_ORDER[0]}": ['
+        while current_type_index < type_index:
+            current_type_index += 1
+            first_in_array = True
+            yield f'], "{CODE_TYPE_ORDER[current_type_index]}": ['
+        
+        counts = specialty_counts[specialty]
+        counts[code_type] = counts.get(code_type, 0) + 1
+        record = code if format_type == "detailed" else summarize_code(code)
+        yield ('' if first_in_array else ', ') + json.dumps(record)
+        first_in_array = False
+    
+    if current_specialty is not None:
+        yield close_specialty()
+    export_info["total_specialties"] = len(specialty_counts)
+    export_info["total_codes"] = sum(sum(counts.values()) for counts in specialty_counts.values())
+    yield f'}}, "export_info": {json.dumps(export_info)}}}'
+
+def generate_streaming_export(
+    output: str,
+    format_type: str,
+    specialty_filter: Optional[str],
+    use_database: bool = True
+) -> Iterator[bytes]:
+    """Produce the streaming export body, owning its own database session"""
+    db = SessionLocal()
+    try:
+        if use_database:
+            codes = iter_codes_by_specialty(db, specialty_filter)
+        else:
+            codes = _iter_cached_codes_by_specialty(specialty_filter)
+        yield from _chunked(_iter_export_pieces(codes, output, format_type, specialty_filter))
+    finally:
+        db.close()
+
 @router.get("/json")
 async def export_to_json(
     format_type: str = Query("detailed", description="Export format: 'detailed' or 'summary'"),
@@ -353,273 +604,405 @@ async def export_to_json(
         logger.error(f"Error exporting to JSON: {e}")
         raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
 
-@router.get("/pdf")
-async def export_to_pdf(
+@router.get("/json/stream")
+async def export_to_json_stream(
+    format_type: str = Query("detailed", description="Export format: 'detailed' or 'summary'"),
     specialty_filter: Optional[str] = Query(None, description="Filter by specific specialty"),
-    include_summary: bool = Query(True, description="Include summary statistics")
+    output: str = Query("ndjson", description="Stream encoding: 'ndjson' (one code per line) or 'json' (document grouped by specialty)")
 ):
     """
-    Export medical codes to PDF format
+    Stream medical codes as NDJSON or chunked JSON
     
-    - specialty_filter: Optional specialty filter
-    - include_summary: Include summary statistics page
+    Unlike /json, codes are read through server-side cursors and written as they
+    arrive, so memory use stays flat regardless of table size.
+    
+    - format_type: 'detailed' for full information, 'summary' for basic info
+    - specialty_filter: Optional specialty filter (e.g., 'Psychiatry', 'Cardiology')
+    - output: 'ndjson' or 'json'
     """
+    if output not in ("ndjson", "json"):
+        raise HTTPException(status_code=400, detail="output must be 'ndjson' or 'json'")
+    
     try:
-        # Get all codes from database
-        all_codes = get_all_codes_from_database()
-        
-        # Organize by specialty
-        specialty_organized = organize_by_specialty(all_codes)
-        
-        # Apply specialty filter if specified
-        if specialty_filter:
-            if specialty_filter in specialty_organized:
-                specialty_organized = {specialty_filter: specialty_organized[specialty_filter]}
-            else:
-                raise HTTPException(status_code=404, detail=f"Specialty '{specialty_filter}' not found")
+        db = SessionLocal()
+        try:
+            use_database = database_has_codes(db)
+        finally:
+            db.close()
+        
+        if use_database and specialty_filter and specialty_filter not in SPECIALTY_RANK:
+            return JSONResponse(
+                content={"error": f"Specialty '{specialty_filter}' not found"},
+                status_code=404
+            )
         
-        # Create temporary PDF file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         specialty_suffix = f"_{specialty_filter}" if specialty_filter else ""
-        filename = f"medical_codes_export{specialty_suffix}_{timestamp}.pdf"
-        temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_file.close()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(temp_file.name, pagesize=A4)
-        story = []
+        extension = "ndjson" if output == "ndjson" else "json"
+        filename = f"medical_codes_export_{format_type}{specialty_suffix}_{timestamp}.{extension}"
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=20
+        return StreamingResponse(
+            generate_streaming_export(output, format_type, specialty_filter, use_database=use_database),
+            media_type="application/x-ndjson" if output == "ndjson" else "application/json",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
-        normal_style = styles['Normal']
-        
-        # Title page
-        story.append(Paragraph("Medical Codes Database Export", title_style))
-        story.append(Spacer(1, 20))
-        story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", normal_style))
-        story.append(Spacer(1, 10))
-        story.append(Paragraph(f"Specialty Filter: {specialty_filter if specialty_filter else 'All Specialties'}", normal_style))
-        story.append(Spacer(1, 10))
-        story.append(Paragraph(f"Total Specialties: {len(specialty_organized)}", normal_style))
         
-        total_codes = sum(
-            len(codes) for specialty in specialty_organized.values() 
-            for codes in specialty.values()
-        )
-        story.append(Paragraph(f"Total Codes: {total_codes}", normal_style))
-        story.append(PageBreak())
+    except Exception as e:
+        logger.error(f"Error starting streaming JSON export: {e}")
+        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+
+def render_pdf_export(
+    specialty_filter: Optional[str],
+    include_summary: bool,
+    output_path: str,
+    progress_callback: Optional[Callable[[str, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Render the PDF export to output_path
+    
+    Runs synchronously; callers should execute it off the event loop (see
+    services/export_jobs.py). progress_callback receives (stage, percent).
+    """
+    def report(stage: str, percent: int):
+        if progress_callback:
+            progress_callback(stage, percent)
+    
+    report("loading_codes", 5)
+    
+    # Get all codes from database
+    all_codes = get_all_codes_from_database()
+    
+    # Organize by specialty
+    specialty_organized = organize_by_specialty(all_codes)
+    
+    # Apply specialty filter if specified
+    if specialty_filter:
+        if specialty_filter in specialty_organized:
+            specialty_organized = {specialty_filter: specialty_organized[specialty_filter]}
+        else:
+            raise SpecialtyNotFoundError(f"Specialty '{specialty_filter}' not found")
+    
+    report("building_document", 20)
+    
+    # Create PDF document
+    doc = SimpleDocTemplate(output_path, pagesize=A4)
+    story = []
+    
+    # Get styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        spaceBefore=20
+    )
+    normal_style = styles['Normal']
+    
+    # Title page
+    story.append(Paragraph("Medical Codes Database Export", title_style))
+    story.append(Spacer(1, 20))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", normal_style))
+    story.append(Spacer(1, 10))
+    story.append(Paragraph(f"Specialty Filter: {specialty_filter if specialty_filter else 'All Specialties'}", normal_style))
+    story.append(Spacer(1, 10))
+    story.append(Paragraph(f"Total Specialties: {len(specialty_organized)}", normal_style))
+    
+    total_codes = sum(
+        len(codes) for specialty in specialty_organized.values() 
+        for codes in specialty.values()
+    )
+    story.append(Paragraph(f"Total Codes: {total_codes}", normal_style))
+    story.append(PageBreak())
+    
+    # Summary page
+    if include_summary:
+        story.append(Paragraph("Summary Statistics", heading_style))
         
-        # Summary page
-        if include_summary:
-            story.append(Paragraph("Summary Statistics", heading_style))
+        summary_data = [['Specialty', 'CPT', 'ICD-10', 'HCPCS', 'Modifiers', 'Total']]
+        for specialty, codes in specialty_organized.items():
+            cpt_count = len(codes['cpt_codes'])
+            icd10_count = len(codes['icd10_codes'])
+            hcpcs_count = len(codes['hcpcs_codes'])
+            modifier_count = len(codes['modifier_codes'])
+            total = cpt_count + icd10_count + hcpcs_count + modifier_count
             
-            summary_data = [['Specialty', 'CPT', 'ICD-10', 'HCPCS', 'Modifiers', 'Total']]
-            for specialty, codes in specialty_organized.items():
-                cpt_count = len(codes['cpt_codes'])
-                icd10_count = len(codes['icd10_codes'])
-                hcpcs_count = len(codes['hcpcs_codes'])
-                modifier_count = len(codes['modifier_codes'])
-                total = cpt_count + icd10_count + hcpcs_count + modifier_count
-                
-                summary_data.append([
-                    specialty,
-                    str(cpt_count),
-                    str(icd10_count),
-                    str(hcpcs_count),
-                    str(modifier_count),
-                    str(total)
+            summary_data.append([
+                specialty,
+                str(cpt_count),
+                str(icd10_count),
+                str(hcpcs_count),
+                str(modifier_count),
+                str(total)
+            ])
+        
+        summary_table = Table(summary_data, colWidths=[2*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(summary_table)
+        story.append(PageBreak())
+    
+    # Process each specialty
+    for index, (specialty, codes) in enumerate(specialty_organized.items()):
+        report("building_document", 20 + int(60 * index / max(len(specialty_organized), 1)))
+        story.append(Paragraph(f"Specialty: {specialty}", heading_style))
+        
+        # CPT Codes
+        if codes['cpt_codes']:
+            story.append(Paragraph("CPT Codes", styles['Heading3']))
+            cpt_data = [['Code', 'Description', 'Category', 'Section']]
+            for code in codes['cpt_codes']:
+                cpt_data.append([
+                    code['code'],
+                    code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
+                    code.get('category', ''),
+                    code.get('section', '')
                 ])
             
-            summary_table = Table(summary_data, colWidths=[2*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            cpt_table = Table(cpt_data, colWidths=[1*inch, 3*inch, 1.5*inch, 1.5*inch])
+            cpt_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8)
             ]))
-            story.append(summary_table)
-            story.append(PageBreak())
-        
-        # Process each specialty
-        for specialty, codes in specialty_organized.items():
-            story.append(Paragraph(f"Specialty: {specialty}", heading_style))
-            
-            # CPT Codes
-            if codes['cpt_codes']:
-                story.append(Paragraph("CPT Codes", styles['Heading3']))
-                cpt_data = [['Code', 'Description', 'Category', 'Section']]
-                for code in codes['cpt_codes']:
-                    cpt_data.append([
-                        code['code'],
-                        code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
-                        code.get('category', ''),
-                        code.get('section', '')
-                    ])
-                
-                cpt_table = Table(cpt_data, colWidths=[1*inch, 3*inch, 1.5*inch, 1.5*inch])
-                cpt_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8)
-                ]))
-                story.append(cpt_table)
-                story.append(Spacer(1, 12))
-            
-            # ICD-10 Codes
-            if codes['icd10_codes']:
-                story.append(Paragraph("ICD-10 Codes", styles['Heading3']))
-                icd10_data = [['Code', 'Description', 'Chapter', 'Billable']]
-                for code in codes['icd10_codes']:
-                    icd10_data.append([
-                        code['code'],
-                        code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
-                        code.get('chapter', ''),
-                        code.get('is_billable', '')
-                    ])
-                
-                icd10_table = Table(icd10_data, colWidths=[1*inch, 3*inch, 2*inch, 0.5*inch])
-                icd10_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.green),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8)
-                ]))
-                story.append(icd10_table)
-                story.append(Spacer(1, 12))
+            story.append(cpt_table)
+            story.append(Spacer(1, 12))
+        
+        # ICD-10 Codes
+        if codes['icd10_codes']:
+            story.append(Paragraph("ICD-10 Codes", styles['Heading3']))
+            icd10_data = [['Code', 'Description', 'Chapter', 'Billable']]
+            for code in codes['icd10_codes']:
+                icd10_data.append([
+                    code['code'],
+                    code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
+                    code.get('chapter', ''),
+                    code.get('is_billable', '')
+                ])
             
-            # HCPCS Codes
-            if codes['hcpcs_codes']:
-                story.append(Paragraph("HCPCS Codes", styles['Heading3']))
-                hcpcs_data = [['Code', 'Description', 'Category', 'Level']]
-                for code in codes['hcpcs_codes']:
-                    hcpcs_data.append([
-                        code['code'],
-                        code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
-                        code.get('category', ''),
-                        code.get('level', '')
-                    ])
-                
-                hcpcs_table = Table(hcpcs_data, colWidths=[1*inch, 3*inch, 2*inch, 0.5*inch])
-                hcpcs_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.purple),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lavender),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8)
-                ]))
-                story.append(hcpcs_table)
-                story.append(Spacer(1, 12))
+            icd10_table = Table(icd10_data, colWidths=[1*inch, 3*inch, 2*inch, 0.5*inch])
+            icd10_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.green),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8)
+            ]))
+            story.append(icd10_table)
+            story.append(Spacer(1, 12))
+        
+        # HCPCS Codes
+        if codes['hcpcs_codes']:
+            story.append(Paragraph("HCPCS Codes", styles['Heading3']))
+            hcpcs_data = [['Code', 'Description', 'Category', 'Level']]
+            for code in codes['hcpcs_codes']:
+                hcpcs_data.append([
+                    code['code'],
+                    code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
+                    code.get('category', ''),
+                    code.get('level', '')
+                ])
             
-            # Modifier Codes
-            if codes['modifier_codes']:
-                story.append(Paragraph("Modifier Codes", styles['Heading3']))
-                modifier_data = [['Modifier', 'Description', 'Category', 'Applies To']]
-                for code in codes['modifier_codes']:
-                    modifier_data.append([
-                        code['modifier'],
-                        code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
-                        code.get('category', ''),
-                        code.get('applies_to', '')
-                    ])
-                
-                modifier_table = Table(modifier_data, colWidths=[1*inch, 3*inch, 1.5*inch, 1*inch])
-                modifier_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightyellow),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8)
-                ]))
-                story.append(modifier_table)
+            hcpcs_table = Table(hcpcs_data, colWidths=[1*inch, 3*inch, 2*inch, 0.5*inch])
+            hcpcs_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.purple),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.lavender),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8)
+            ]))
+            story.append(hcpcs_table)
+            story.append(Spacer(1, 12))
+        
+        # Modifier Codes
+        if codes['modifier_codes']:
+            story.append(Paragraph("Modifier Codes", styles['Heading3']))
+            modifier_data = [['Modifier', 'Description', 'Category', 'Applies To']]
+            for code in codes['modifier_codes']:
+                modifier_data.append([
+                    code['modifier'],
+                    code['description'][:60] + "..." if len(code['description']) > 60 else code['description'],
+                    code.get('category', ''),
+                    code.get('applies_to', '')
+                ])
             
-            story.append(PageBreak())
+            modifier_table = Table(modifier_data, colWidths=[1*inch, 3*inch, 1.5*inch, 1*inch])
+            modifier_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.lightyellow),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8)
+            ]))
+            story.append(modifier_table)
         
-        # Build PDF
-        doc.build(story)
+        story.append(PageBreak())
+    
+    # Build PDF
+    report("rendering", 85)
+    doc.build(story)
+    
+    return {
+        "total_specialties": len(specialty_organized),
+        "total_codes": total_codes
+    }
+
+@router.get("/pdf")
+async def export_to_pdf(
+    specialty_filter: Optional[str] = Query(None, description="Filter by specific specialty"),
+    include_summary: bool = Query(True, description="Include summary statistics")
+):
+    """
+    Export medical codes to PDF format
+    
+    - specialty_filter: Optional specialty filter
+    - include_summary: Include summary statistics page
+    
+    The document is rendered in the export process pool and reused until the
+    next data sync; use /pdf/jobs to submit without waiting.
+    """
+    try:
+        job = await pdf_export_jobs.render(specialty_filter, include_summary)
         
         return FileResponse(
-            temp_file.name,
+            job["output_path"],
             media_type='application/pdf',
-            filename=filename,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            filename=job["filename"],
+            headers={"Content-Disposition": f"attachment; filename={job['filename']}"}
         )
         
+    except SpecialtyNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error exporting to PDF: {e}")
         raise HTTPException(status_code=500, detail=f"PDF export error: {str(e)}")
 
-@router.get("/stats")
-async def get_export_stats():
-    """Get statistics for export functionality"""
+@router.post("/pdf/jobs", status_code=202)
+async def submit_pdf_export_job(
+    specialty_filter: Optional[str] = Query(None, description="Filter by specific specialty"),
+    include_summary: bool = Query(True, description="Include summary statistics")
+):
+    """
+    Submit a PDF export to the background render pool
+    
+    Returns immediately with a job id. If the same export was already rendered
+    for the current code set version, the cached PDF is ready to download.
+    """
     try:
-        all_codes = get_all_codes_from_database()
-        specialty_organized = organize_by_specialty(all_codes)
-        
-        stats = {
-            "total_specialties": len(specialty_organized),
-            "specialties": {},
-            "total_codes": 0
-        }
-        
-        for specialty, codes in specialty_organized.items():
-            specialty_stats = {
-                "cpt_count": len(codes['cpt_codes']),
-                "icd10_count": len(codes['icd10_codes']),
-                "hcpcs_count": len(codes['hcpcs_codes']),
-                "modifier_count": len(codes['modifier_codes']),
-                "total_count": sum(len(code_list) for code_list in codes.values())
-            }
-            stats["specialties"][specialty] = specialty_stats
-            stats["total_codes"] += specialty_stats["total_count"]
-        
+        job = pdf_export_jobs.submit(specialty_filter, include_summary)
+        job_id = job["job_id"]
         return {
             "success": True,
-            "export_stats": stats,
-            "available_formats": ["json", "pdf"],
-            "available_specialties": list(specialty_organized.keys())
+            "job": pdf_export_jobs.to_public(job),
+            "status_url": f"/api/export/pdf/jobs/{job_id}",
+            "download_url": f"/api/export/pdf/jobs/{job_id}/download"
+        }
+    except Exception as e:
+        logger.error(f"Error submitting PDF export job: {e}")
+        raise HTTPException(status_code=500, detail=f"PDF export error: {str(e)}")
+
+@router.get("/pdf/jobs/{job_id}")
+async def get_pdf_export_job(job_id: str = Path(..., description="PDF export job ID")):
+    """Get status and progress of a PDF export job"""
+    status = pdf_export_jobs.get_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    
+    return {
+        "success": True,
+        "job": pdf_export_jobs.to_public(status),
+        "download_url": f"/api/export/pdf/jobs/{job_id}/download" if status["status"] == JOB_COMPLETED else None
+    }
+
+@router.get("/pdf/jobs/{job_id}/download")
+async def download_pdf_export_job(job_id: str = Path(..., description="PDF export job ID")):
+    """Download the PDF produced by a completed export job"""
+    status = pdf_export_jobs.get_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if status["status"] == JOB_FAILED:
+        raise HTTPException(status_code=409, detail=f"Export job failed: {status.get('error')}")
+    if status["status"] != JOB_COMPLETED or not os.path.exists(status["output_path"]):
+        raise HTTPException(status_code=409, detail=f"Export job is {status['status']} ({status.get('progress', 0)}%)")
+    
+    return FileResponse(
+        status["output_path"],
+        media_type='application/pdf',
+        filename=status["filename"],
+        headers={"Content-Disposition": f"attachment; filename={status['filename']}"}
+    )
+
+def _build_export_stats():
+    all_codes = get_all_codes_from_database()
+    specialty_organized = organize_by_specialty(all_codes)
+    
+    stats = {
+        "total_specialties": len(specialty_organized),
+        "specialties": {},
+        "total_codes": 0
+    }
+    
+    for specialty, codes in specialty_organized.items():
+        specialty_stats = {
+            "cpt_count": len(codes['cpt_codes']),
+            "icd10_count": len(codes['icd10_codes']),
+            "hcpcs_count": len(codes['hcpcs_codes']),
+            "modifier_count": len(codes['modifier_codes']),
+            "total_count": sum(len(code_list) for code_list in codes.values())
         }
+        stats["specialties"][specialty] = specialty_stats
+        stats["total_codes"] += specialty_stats["total_count"]
+    
+    return {
+        "success": True,
+        "export_stats": stats,
+        "available_formats": ["json", "pdf"],
+        "available_specialties": list(specialty_organized.keys())
+    }
+
+@router.get("/stats")
+async def get_export_stats(request: Request):
+    """Get statistics for export functionality"""
+    try:
+        return response_cache.respond(request, "export_stats", _build_export_stats)
         
     except Exception as e:
         logger.error(f"Error getting export stats: {e}")
-        raise HTTPException(status_code=500, detail=f"Stats error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Stats error: {str(e)}") 
@@ -4,18 +4,74 @@ FHIR-Compliant API Router
 Provides FHIR REST API endpoints for CodeSystem and ValueSet resources
 """
 
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path, Request
 from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime
 
 from ..database import SessionLocal
 from ..fhir_models import FHIRCodeSystem, FHIRConcept, FHIRValueSet, FHIRConceptMap
+from ..services.code_hierarchy import code_hierarchy, FHIR_SYSTEM_URLS
+from ..services.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/fhir", tags=["FHIR"])
 
+def _hierarchy_properties(db, code_system: FHIRCodeSystem, code: str, requested: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """parent/child properties for $lookup, read from the hierarchy index"""
+    system = FHIR_SYSTEM_URLS.get(code_system.url)
+    wanted = {"parent", "child"} if not requested else {"parent", "child"} & set(requested)
+    if not system or not wanted:
+        return []
+
+    code_hierarchy.ensure_current(db)
+    node = code_hierarchy.get_node(db, system, code)
+    if node is None:
+        return []
+
+    related = []
+    if "parent" in wanted and node.parent_id is not None:
+        ancestors = code_hierarchy.ancestors(db, node)
+        if ancestors and ancestors[-1].node_type != "root":
+            related.append(("parent", ancestors[-1]))
+    if "child" in wanted:
+        related.extend(("child", child) for child in code_hierarchy.children(db, node))
+
+    return [
+        {
+            "name": "property",
+            "part": [
+                {"name": "code", "valueCode": relation},
+                {"name": "value", "valueCode": other.code},
+                {"name": "description", "valueString": other.display}
+            ]
+        }
+        for relation, other in related
+    ]
+
+def _subsumes(db, code_system: FHIRCodeSystem, code_a: str, code_b: str) -> Dict[str, Any]:
+    system = FHIR_SYSTEM_URLS.get(code_system.url)
+    if not system:
+        raise HTTPException(status_code=400, detail=f"CodeSystem {code_system.url} has no hierarchy")
+
+    code_hierarchy.ensure_current(db)
+    node_a = code_hierarchy.get_node(db, system, code_a)
+    node_b = code_hierarchy.get_node(db, system, code_b)
+    if node_a is None or node_b is None:
+        missing = code_a if node_a is None else code_b
+        raise HTTPException(status_code=404, detail=f"Code {missing} not found")
+
+    return {
+        "resourceType": "Parameters",
+        "parameter": [
+            {
+                "name": "outcome",
+                "valueCode": code_hierarchy.subsumption(node_a, node_b)
+            }
+        ]
+    }
+
 # FHIR CodeSystem endpoints
 @router.get("/CodeSystem")
 async def get_code_systems(
@@ -90,6 +146,30 @@ async def get_code_systems(
     finally:
         db.close()
 
+@router.get("/CodeSystem/$subsumes")
+async def subsumes_by_system(
+    system: str = Query(..., description="Canonical URL of the code system"),
+    codeA: str = Query(..., description="First code"),
+    codeB: str = Query(..., description="Second code")
+):
+    """
+    FHIR CodeSystem $subsumes operation (type level)
+    """
+    try:
+        db = SessionLocal()
+        code_system = db.query(FHIRCodeSystem).filter(FHIRCodeSystem.url == system).first()
+        if not code_system:
+            raise HTTPException(status_code=404, detail="CodeSystem not found")
+        return _subsumes(db, code_system, codeA, codeB)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in CodeSystem subsumes: {e}")
+        raise HTTPException(status_code=500, detail=f"Subsumes error: {str(e)}")
+    finally:
+        db.close()
+
 @router.get("/CodeSystem/{code_system_id}")
 async def get_code_system(code_system_id: int = Path(..., description="CodeSystem ID")):
     """
@@ -185,6 +265,8 @@ async def lookup_code(
                         "valueString": str(concept.property[prop_name])
                     })
         
+        result["parameter"].extend(_hierarchy_properties(db, concept.code_system, concept.code, property))
+        
         return result
         
     except HTTPException:
@@ -195,6 +277,30 @@ async def lookup_code(
     finally:
         db.close()
 
+@router.get("/CodeSystem/{code_system_id}/$subsumes")
+async def subsumes_code(
+    code_system_id: int = Path(..., description="CodeSystem ID"),
+    codeA: str = Query(..., description="First code"),
+    codeB: str = Query(..., description="Second code")
+):
+    """
+    FHIR CodeSystem $subsumes operation
+    """
+    try:
+        db = SessionLocal()
+        code_system = db.query(FHIRCodeSystem).filter(FHIRCodeSystem.id == code_system_id).first()
+        if not code_system:
+            raise HTTPException(status_code=404, detail="CodeSystem not found")
+        return _subsumes(db, code_system, codeA, codeB)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in CodeSystem subsumes: {e}")
+        raise HTTPException(status_code=500, detail=f"Subsumes error: {str(e)}")
+    finally:
+        db.close()
+
 # FHIR ValueSet endpoints
 @router.get("/ValueSet")
 async def get_value_sets(
@@ -429,10 +535,13 @@ async def get_concept_maps(
 
 # FHIR metadata endpoint
 @router.get("/metadata")
-async def get_fhir_metadata():
+async def get_fhir_metadata(request: Request):
     """
     FHIR CapabilityStatement endpoint
     """
+    return response_cache.respond(request, "fhir_metadata", _capability_statement)
+
+def _capability_statement():
     return {
         "resourceType": "CapabilityStatement",
         "status": "active",
@@ -464,6 +573,10 @@ async def get_fhir_metadata():
                             {"name": "url", "type": "uri"},
                             {"name": "name", "type": "string"},
                             {"name": "status", "type": "token"}
+                        ],
+                        "operation": [
+                            {"name": "lookup", "definition": "http://hl7.org/fhir/OperationDefinition/CodeSystem-lookup"},
+                            {"name": "subsumes", "definition": "http://hl7.org/fhir/OperationDefinition/CodeSystem-subsumes"}
                         ]
                     },
                     {
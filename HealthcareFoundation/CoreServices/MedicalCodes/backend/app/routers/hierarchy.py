@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Code Hierarchy API Endpoints
+Ancestor, descendant, subsumption and range queries over the ICD-10 and CPT
+hierarchy index
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Path
+from sqlalchemy.orm import Session
+import logging
+
+from ..database import get_db
+from ..services.code_hierarchy import code_hierarchy, HIERARCHY_SYSTEMS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/hierarchy", tags=["hierarchy"])
+
+def _check_system(system: str) -> str:
+    system = system.lower()
+    if system not in HIERARCHY_SYSTEMS:
+        raise HTTPException(status_code=400, detail=f"Unsupported system '{system}'. Use one of: {', '.join(HIERARCHY_SYSTEMS)}")
+    return system
+
+def _get_node_or_404(db: Session, system: str, code: str):
+    node = code_hierarchy.get_node(db, system, code)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Code {code} not found in {system} hierarchy")
+    return node
+
+@router.post("/rebuild")
+async def rebuild_hierarchy(db: Session = Depends(get_db)):
+    """Rebuild the hierarchy index from the code tables"""
+    try:
+        counts = code_hierarchy.rebuild(db, force=True)
+        return {"success": True, "nodes": counts}
+    except Exception as e:
+        logger.error(f"Error rebuilding hierarchy: {e}")
+        raise HTTPException(status_code=500, detail=f"Rebuild error: {str(e)}")
+
+@router.get("/{system}/subsumes")
+async def check_subsumption(
+    system: str = Path(..., description="Code system: icd10 or cpt"),
+    code_a: str = Query(..., description="First code"),
+    code_b: str = Query(..., description="Second code"),
+    db: Session = Depends(get_db)
+):
+    """Test whether code_a subsumes code_b"""
+    system = _check_system(system)
+    try:
+        code_hierarchy.ensure_current(db)
+        node_a = _get_node_or_404(db, system, code_a)
+        node_b = _get_node_or_404(db, system, code_b)
+        return {
+            "system": system,
+            "code_a": node_a.code,
+            "code_b": node_b.code,
+            "outcome": code_hierarchy.subsumption(node_a, node_b)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error checking subsumption: {e}")
+        raise HTTPException(status_code=500, detail=f"Hierarchy error: {str(e)}")
+
+@router.get("/{system}/range")
+async def get_code_range(
+    system: str = Path(..., description="Code system: icd10 or cpt"),
+    start: str = Query(..., description="First code of the range"),
+    end: str = Query(..., description="Last code of the range (its descendants are included)"),
+    billable_only: bool = Query(False, description="Only return billable codes"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum results"),
+    offset: int = Query(0, ge=0, description="Results to skip"),
+    db: Session = Depends(get_db)
+):
+    """Get every node from start through end in hierarchy order"""
+    system = _check_system(system)
+    try:
+        code_hierarchy.ensure_current(db)
+        query = code_hierarchy.range_query(db, system, start, end, billable_only)
+        if query is None:
+            raise HTTPException(status_code=404, detail=f"Range bounds {start}..{end} not found in {system} hierarchy")
+        return {
+            "system": system,
+            "start": start,
+            "end": end,
+            "billable_only": billable_only,
+            "total": query.count(),
+            "codes": [code_hierarchy.to_dict(n) for n in query.offset(offset).limit(limit).all()]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading code range: {e}")
+        raise HTTPException(status_code=500, detail=f"Hierarchy error: {str(e)}")
+
+@router.get("/{system}/{code}")
+async def get_hierarchy_node(
+    system: str = Path(..., description="Code system: icd10 or cpt"),
+    code: str = Path(..., description="Code, or a range code such as F30-F39"),
+    db: Session = Depends(get_db)
+):
+    """Get a node with its ancestors and direct children"""
+    system = _check_system(system)
+    try:
+        code_hierarchy.ensure_current(db)
+        node = _get_node_or_404(db, system, code)
+        return {
+            **code_hierarchy.to_dict(node),
+            "ancestors": [code_hierarchy.to_dict(n) for n in code_hierarchy.ancestors(db, node)],
+            "children": [code_hierarchy.to_dict(n) for n in code_hierarchy.children(db, node)]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading hierarchy node: {e}")
+        raise HTTPException(status_code=500, detail=f"Hierarchy error: {str(e)}")
+
+@router.get("/{system}/{code}/descendants")
+async def get_descendants(
+    system: str = Path(..., description="Code system: icd10 or cpt"),
+    code: str = Path(..., description="Code, or a range code such as F30-F39"),
+    billable_only: bool = Query(False, description="Only return billable codes"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum results"),
+    offset: int = Query(0, ge=0, description="Results to skip"),
+    db: Session = Depends(get_db)
+):
+    """Get every descendant of a node"""
+    system = _check_system(system)
+    try:
+        code_hierarchy.ensure_current(db)
+        node = _get_node_or_404(db, system, code)
+        query = code_hierarchy.descendants_query(db, node, billable_only)
+        return {
+            "system": system,
+            "code": node.code,
+            "billable_only": billable_only,
+            "total": query.count(),
+            "descendants": [code_hierarchy.to_dict(n) for n in query.offset(offset).limit(limit).all()]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading hierarchy descendants: {e}")
+        raise HTTPException(status_code=500, detail=f"Hierarchy error: {str(e)}")
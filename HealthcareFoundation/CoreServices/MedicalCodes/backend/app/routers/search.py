@@ -4,6 +4,7 @@ from typing import Optional
 from ..database import get_db
 from ..models import CPTCode, ICD10Code, HCPCSCode, ModifierCode
 from ..schemas import SearchResults
+from ..services.code_hierarchy import code_hierarchy
 
 router = APIRouter(prefix="/api", tags=["search"])
 
@@ -12,6 +13,8 @@ async def search_codes(
     query: str = Query(..., min_length=1, description="Search query"),
     code_type: Optional[str] = Query(None, description="Filter by code type: cpt, icd10, hcpcs, modifier"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    within: Optional[str] = Query(None, description="Only codes under this ICD-10/CPT hierarchy node, e.g. F30-F39 or F32"),
+    billable_only: bool = Query(False, description="Only billable ICD-10 codes"),
     limit: int = Query(50, ge=1, le=500, description="Maximum results per code type"),
     db: Session = Depends(get_db)
 ):
@@ -25,6 +28,20 @@ async def search_codes(
     
     search_term = f"%{query.upper()}%"
     
+    # A hierarchy node belongs to one system, so only that system is searched
+    within_codes = {}
+    if within:
+        code_hierarchy.ensure_current(db)
+        for system in ("cpt", "icd10"):
+            if code_type and code_type != system:
+                continue
+            codes = code_hierarchy.descendant_codes(db, system, within, billable_only and system == "icd10")
+            if codes is not None:
+                within_codes[system] = codes
+        if not within_codes:
+            raise HTTPException(status_code=404, detail=f"Hierarchy node {within} not found")
+        code_type = next(iter(within_codes)) if len(within_codes) == 1 else code_type
+    
     # Search CPT codes
     if not code_type or code_type == "cpt":
         cpt_query = db.query(CPTCode).filter(
@@ -33,6 +50,8 @@ async def search_codes(
         )
         if category:
             cpt_query = cpt_query.filter(CPTCode.category.ilike(f"%{category}%"))
+        if "cpt" in within_codes:
+            cpt_query = cpt_query.filter(CPTCode.code.in_(within_codes["cpt"]))
         
         results.cpt_codes = cpt_query.limit(limit).all()
     
@@ -44,11 +63,15 @@ async def search_codes(
         )
         if category:
             icd10_query = icd10_query.filter(ICD10Code.chapter.ilike(f"%{category}%"))
+        if "icd10" in within_codes:
+            icd10_query = icd10_query.filter(ICD10Code.code.in_(within_codes["icd10"]))
+        elif billable_only:
+            icd10_query = icd10_query.filter(ICD10Code.is_billable == 'Y')
         
         results.icd10_codes = icd10_query.limit(limit).all()
     
     # Search HCPCS codes
-    if not code_type or code_type == "hcpcs":
+    if (not code_type or code_type == "hcpcs") and not within:
         hcpcs_query = db.query(HCPCSCode).filter(
             (HCPCSCode.code.ilike(search_term)) |
             (HCPCSCode.description.ilike(search_term))
@@ -59,7 +82,7 @@ async def search_codes(
         results.hcpcs_codes = hcpcs_query.limit(limit).all()
     
     # Search Modifier codes
-    if not code_type or code_type == "modifier":
+    if (not code_type or code_type == "modifier") and not within:
         modifier_query = db.query(ModifierCode).filter(
             (ModifierCode.modifier.ilike(search_term)) |
             (ModifierCode.description.ilike(search_term))
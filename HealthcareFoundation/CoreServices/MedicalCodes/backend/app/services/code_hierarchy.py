@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Code Hierarchy Index
+Precomputes ICD-10 chapters -> blocks -> categories -> codes and CPT
+sections -> subsections -> codes as nested-set intervals. Descendant,
+subsumption and range questions become a single indexed interval lookup on
+code_hierarchy instead of string matching over the code tables.
+Requests always read the index as it is; a stale index is rebuilt in the
+background, once per version across workers.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from .code_set_version import code_set_version
+from ..database import SessionLocal
+from ..models import CPTCode, ICD10Code, CodeHierarchyNode
+
+logger = logging.getLogger(__name__)
+
+HIERARCHY_SYSTEMS = ("icd10", "cpt")
+
+# FHIR CodeSystem urls (see fhir_migration.py) that have a hierarchy
+FHIR_SYSTEM_URLS = {
+    "http://hl7.org/fhir/sid/icd-10": "icd10",
+    "http://www.ama-assn.org/go/cpt": "cpt",
+}
+
+SUBSUMES_EQUIVALENT = "equivalent"
+SUBSUMES_SUBSUMES = "subsumes"
+SUBSUMES_SUBSUMED_BY = "subsumed-by"
+SUBSUMES_NOT_SUBSUMED = "not-subsumed"
+
+# Serializes rebuilds across worker processes on PostgreSQL
+REBUILD_LOCK_KEY = 0x636F6465
+
+RANGE_PATTERN = re.compile(r"\(?([A-Z0-9]{3,5})\s*-\s*([A-Z0-9]{3,5})\)?\s*$")
+
+def normalize_code(code: str) -> str:
+    return (code or "").strip().upper()
+
+class _TreeNode:
+    __slots__ = ("code", "node_type", "display", "is_billable", "children", "members")
+
+    def __init__(self, code: str, node_type: str, display: Optional[str] = None, is_billable: bool = False):
+        self.code = code
+        self.node_type = node_type
+        self.display = display
+        self.is_billable = is_billable
+        self.children: Dict[str, "_TreeNode"] = {}
+        self.members: List[str] = []  # leaf codes below a grouping node, used to name ranges
+
+    def child(self, key: str, node_type: str, display: Optional[str] = None) -> "_TreeNode":
+        node = self.children.get(key)
+        if node is None:
+            node = _TreeNode(key, node_type, display)
+            self.children[key] = node
+        return node
+
+def _range_code(label: str, members: List[str], width: int) -> str:
+    """Use the range printed in the label (e.g. 'Mood disorders (F30-F39)') or derive one from the members"""
+    match = RANGE_PATTERN.search(normalize_code(label))
+    if match:
+        return f"{match.group(1)}-{match.group(2)}"
+    first, last = min(members)[:width], max(members)[:width]
+    return first if first == last else f"{first}-{last}"
+
+def _finalize_groups(node: _TreeNode, width: int) -> _TreeNode:
+    """Replace grouping keys (free text labels) with range codes, bottom up"""
+    children = {}
+    for child in node.children.values():
+        _finalize_groups(child, width)
+        if child.node_type not in ("category", "code"):
+            child.code = _range_code(child.display or "", child.members, width)
+        node.members.extend(child.members)
+        children[child.code + "\0" + (child.display or "")] = child
+    node.children = children
+    return node
+
+def build_icd10_tree(rows: List[Tuple[str, str, str, str, str]]) -> _TreeNode:
+    """rows: (code, description, chapter, block, is_billable)"""
+    root = _TreeNode("ICD-10", "root", "ICD-10")
+    codes = {normalize_code(row[0]): row for row in rows if row[0]}
+
+    for code, (_, description, chapter, block, is_billable) in sorted(codes.items()):
+        parent = root
+        if chapter:
+            parent = parent.child(f"chapter:{chapter}", "chapter", chapter)
+        if block:
+            parent = parent.child(f"block:{block}", "block", block)
+
+        category_code = code.replace(".", "")[:3]
+        category_row = codes.get(category_code)
+        category = parent.child(category_code, "category",
+                                category_row[1] if category_row else category_code)
+        category.members.append(code)
+        if code == category_code:
+            category.display = description
+            category.is_billable = is_billable == 'Y'
+            continue
+
+        # Subcategories nest under the longest stored prefix (F32.8 -> F32.81)
+        parent_node = category
+        compact = code.replace(".", "")
+        for length in range(4, len(compact)):
+            prefix = f"{compact[:3]}.{compact[3:length]}"
+            if prefix in codes:
+                parent_node = parent_node.children.get(prefix) or parent_node
+        leaf = parent_node.child(code, "code", description)
+        leaf.display = description
+        leaf.is_billable = is_billable == 'Y'
+
+    return _finalize_groups(root, width=3)
+
+def build_cpt_tree(rows: List[Tuple[str, str, str, str, str]]) -> _TreeNode:
+    """rows: (code, description, section, subsection, is_active)"""
+    root = _TreeNode("CPT", "root", "CPT")
+    for code, description, section, subsection, is_active in sorted(rows, key=lambda r: normalize_code(r[0])):
+        code = normalize_code(code)
+        if not code:
+            continue
+        parent = root
+        if section:
+            parent = parent.child(f"section:{section}", "section", section)
+        if subsection:
+            parent = parent.child(f"subsection:{subsection}", "subsection", subsection)
+        leaf = parent.child(code, "code", description)
+        leaf.is_billable = (is_active or 'Y') == 'Y'
+        leaf.members.append(code)
+    return _finalize_groups(root, width=5)
+
+def flatten_tree(system: str, root: _TreeNode, start_id: int, version: int) -> List[Dict[str, Any]]:
+    """Assign nested-set intervals with an iterative depth-first walk (children ordered by code)"""
+    mappings: List[Dict[str, Any]] = []
+    counter = 0
+    next_id = start_id
+    stack = [(root, None, 0, False, None)]
+
+    while stack:
+        node, parent_id, depth, exiting, mapping = stack.pop()
+        counter += 1
+        if exiting:
+            mapping["rgt"] = counter
+            continue
+
+        mapping = {
+            "id": next_id,
+            "system": system,
+            "code": node.code,
+            "node_type": node.node_type,
+            "display": node.display,
+            "parent_id": parent_id,
+            "depth": depth,
+            "lft": counter,
+            "rgt": None,
+            "is_billable": node.is_billable,
+            "code_set_version": version,
+        }
+        next_id += 1
+        mappings.append(mapping)
+
+        stack.append((node, parent_id, depth, True, mapping))
+        for child in sorted(node.children.values(), key=lambda c: (min(c.members or [c.code]), c.code), reverse=True):
+            stack.append((child, mapping["id"], depth + 1, False, None))
+    return mappings
+
+class CodeHierarchyIndex:
+    """Builds and queries the nested-set hierarchy stored in code_hierarchy"""
+
+    def __init__(self, batch_size: int = 5000, session_factory: Callable = SessionLocal):
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def built_version(db: Session) -> Optional[int]:
+        """Code set version the stored index was built from, None if it was never built"""
+        built = db.query(CodeHierarchyNode.code_set_version).filter(
+            CodeHierarchyNode.node_type == "root"
+        ).first()
+        return built[0] if built is not None else None
+
+    def rebuild(self, db: Session, version: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+        """Recompute every system's intervals from the code tables in one transaction
+
+        Skipped when the index is already at version or newer, unless forced;
+        the check is repeated once the rebuild lock is held, so concurrent
+        rebuilds for the same version run once.
+        """
+        if version is None:
+            version = code_set_version.get()
+
+        with self._lock:
+            if db.get_bind().dialect.name == "postgresql":
+                # Released when the transaction ends
+                db.execute(func.pg_advisory_xact_lock(REBUILD_LOCK_KEY).select())
+            built = self.built_version(db)
+            if not force and built is not None and built >= version:
+                db.rollback()
+                return {"icd10": 0, "cpt": 0, "code_set_version": built, "skipped": True}
+
+            icd10_rows = db.query(
+                ICD10Code.code, ICD10Code.description, ICD10Code.chapter, ICD10Code.block, ICD10Code.is_billable
+            ).filter(or_(ICD10Code.is_active.is_(None), ICD10Code.is_active != 'N')).all()
+            cpt_rows = db.query(
+                CPTCode.code, CPTCode.description, CPTCode.section, CPTCode.subsection, CPTCode.is_active
+            ).filter(or_(CPTCode.is_active.is_(None), CPTCode.is_active != 'N')).all()
+
+            icd10_nodes = flatten_tree("icd10", build_icd10_tree(icd10_rows), 1, version)
+            cpt_nodes = flatten_tree("cpt", build_cpt_tree(cpt_rows), len(icd10_nodes) + 1, version)
+
+            try:
+                db.query(CodeHierarchyNode).delete(synchronize_session=False)
+                nodes = icd10_nodes + cpt_nodes
+                for start in range(0, len(nodes), self.batch_size):
+                    db.bulk_insert_mappings(CodeHierarchyNode, nodes[start:start + self.batch_size])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        counts = {"icd10": len(icd10_nodes), "cpt": len(cpt_nodes), "code_set_version": version}
+        logger.info(f"Code hierarchy rebuilt: {counts}")
+        return counts
+
+    def ensure_current(self, db: Session) -> bool:
+        """Start a background rebuild when the index is older than the code set
+
+        Never blocks: callers keep reading the existing index until the new one
+        is committed. True if a rebuild was started.
+        """
+        version = code_set_version.get()
+        built = self.built_version(db)
+        if built is not None and built >= version:
+            return False
+        with self._refresh_lock:
+            thread = self._refresh_thread
+            if thread is not None and thread.is_alive():
+                return False
+            thread = threading.Thread(target=self._refresh, args=(version,), name="code-hierarchy-rebuild", daemon=True)
+            self._refresh_thread = thread
+            thread.start()
+        return True
+
+    def _refresh(self, version: int) -> None:
+        db = self.session_factory()
+        try:
+            self.rebuild(db, version)
+        except Exception as e:
+            logger.error(f"Background hierarchy rebuild failed: {e}")
+        finally:
+            db.close()
+
+    def get_node(self, db: Session, system: str, code: str) -> Optional[CodeHierarchyNode]:
+        """Look up a node; range codes shared by a chapter and its only block resolve to the block"""
+        node = db.query(CodeHierarchyNode).filter(
+            CodeHierarchyNode.system == system,
+            CodeHierarchyNode.code == normalize_code(code)
+        ).order_by(CodeHierarchyNode.depth.desc()).first()
+        if node is None:
+            # Sections and chapters can also be addressed by name, e.g. "Medicine"
+            node = db.query(CodeHierarchyNode).filter(
+                CodeHierarchyNode.system == system,
+                CodeHierarchyNode.node_type.notin_(("category", "code")),
+                func.upper(CodeHierarchyNode.display) == normalize_code(code)
+            ).order_by(CodeHierarchyNode.depth).first()
+        return node
+
+    def ancestors(self, db: Session, node: CodeHierarchyNode) -> List[CodeHierarchyNode]:
+        return db.query(CodeHierarchyNode).filter(
+            CodeHierarchyNode.system == node.system,
+            CodeHierarchyNode.lft < node.lft,
+            CodeHierarchyNode.rgt > node.rgt
+        ).order_by(CodeHierarchyNode.lft).all()
+
+    def children(self, db: Session, node: CodeHierarchyNode) -> List[CodeHierarchyNode]:
+        return db.query(CodeHierarchyNode).filter(
+            CodeHierarchyNode.parent_id == node.id
+        ).order_by(CodeHierarchyNode.lft).all()
+
+    def descendants_query(self, db: Session, node: CodeHierarchyNode, billable_only: bool = False):
+        query = db.query(CodeHierarchyNode).filter(
+            CodeHierarchyNode.system == node.system,
+            CodeHierarchyNode.lft > node.lft,
+            CodeHierarchyNode.rgt < node.rgt
+        )
+        if billable_only:
+            query = query.filter(CodeHierarchyNode.is_billable.is_(True))
+        return query.order_by(CodeHierarchyNode.lft)
+
+    def descendant_codes(self, db: Session, system: str, code: str, billable_only: bool = False):
+        """Subquery of leaf codes under a node, for filtering the code tables; None if unknown"""
+        node = self.get_node(db, system, code)
+        if node is None:
+            return None
+        query = db.query(CodeHierarchyNode.code).filter(
+            CodeHierarchyNode.system == node.system,
+            CodeHierarchyNode.lft >= node.lft,
+            CodeHierarchyNode.rgt <= node.rgt,
+            CodeHierarchyNode.node_type.in_(("category", "code"))
+        )
+        if billable_only:
+            query = query.filter(CodeHierarchyNode.is_billable.is_(True))
+        return query
+
+    def range_query(self, db: Session, system: str, start_code: str, end_code: str, billable_only: bool = False):
+        """Nodes from start_code through end_code (inclusive of both subtrees), in hierarchy order"""
+        start = self.get_node(db, system, start_code)
+        end = self.get_node(db, system, end_code)
+        if start is None or end is None:
+            return None
+        if start.lft > end.lft:
+            start, end = end, start
+        query = db.query(CodeHierarchyNode).filter(
+            CodeHierarchyNode.system == system,
+            CodeHierarchyNode.lft >= start.lft,
+            CodeHierarchyNode.rgt <= end.rgt
+        )
+        if billable_only:
+            query = query.filter(CodeHierarchyNode.is_billable.is_(True))
+        return query.order_by(CodeHierarchyNode.lft)
+
+    @staticmethod
+    def subsumption(node_a: CodeHierarchyNode, node_b: CodeHierarchyNode) -> str:
+        """FHIR $subsumes outcome of A relative to B"""
+        if node_a.lft == node_b.lft:
+            return SUBSUMES_EQUIVALENT
+        if node_a.lft < node_b.lft and node_b.rgt < node_a.rgt:
+            return SUBSUMES_SUBSUMES
+        if node_b.lft < node_a.lft and node_a.rgt < node_b.rgt:
+            return SUBSUMES_SUBSUMED_BY
+        return SUBSUMES_NOT_SUBSUMED
+
+    @staticmethod
+    def to_dict(node: CodeHierarchyNode) -> Dict[str, Any]:
+        return {
+            "system": node.system,
+            "code": node.code,
+            "display": node.display,
+            "node_type": node.node_type,
+            "depth": node.depth,
+            "is_billable": node.is_billable,
+            "descendant_count": (node.rgt - node.lft - 1) // 2
+        }
+
+# Global instance
+code_hierarchy = CodeHierarchyIndex()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Code Set Version Service
+Tracks a monotonically increasing version of the code tables. Anything derived
+from the code set (rendered exports, cached aggregates) is keyed by this version
+and becomes stale as soon as a data sync bumps it. With REDIS_URL set the
+counter lives in Redis so workers on every host agree; the version file is kept
+in step and used whenever Redis is unavailable.
+"""
+
+import json
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .redis_client import redis_connection
+
+logger = logging.getLogger(__name__)
+
+class CodeSetVersion:
+    """Code set version shared through Redis, falling back to a file shared by the host"""
+
+    redis_key = "medicalcodes:code_set_version"
+
+    def __init__(self, cache_dir: str = "./cache"):
+        self.cache_dir = cache_dir
+        self.version_file = os.path.join(self.cache_dir, "code_set_version.json")
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.version_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"version": 1, "updated_at": None}
+
+    def _get_shared(self) -> Optional[int]:
+        client = redis_connection.get()
+        if client is None:
+            return None
+        try:
+            value = client.get(self.redis_key)
+            if value is None:
+                # First worker after a Redis restart seeds it from the file
+                client.setnx(self.redis_key, int(self._read().get("version", 1)))
+                value = client.get(self.redis_key)
+            return int(value)
+        except Exception as e:
+            redis_connection.mark_failed(e)
+            return None
+
+    def get(self) -> int:
+        """Return the current code set version"""
+        shared = self._get_shared()
+        if shared is not None:
+            return shared
+        return int(self._read().get("version", 1))
+
+    def get_info(self) -> Dict[str, Any]:
+        """Return the current version together with when it last changed"""
+        return dict(self._read(), version=self.get())
+
+    def bump(self, reason: str = "data_sync") -> int:
+        """Advance the version; call after any write to the code tables"""
+        with self._lock:
+            version = self.get() + 1
+            client = redis_connection.get()
+            if client is not None:
+                try:
+                    version = int(client.incr(self.redis_key))
+                except Exception as e:
+                    redis_connection.mark_failed(e)
+            payload = {
+                "version": version,
+                "updated_at": datetime.now().isoformat(),
+                "reason": reason
+            }
+            tmp_file = f"{self.version_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_file, self.version_file)
+
+        logger.info(f"Code set version bumped to {version} ({reason})")
+        return version
+
+# Global instance
+code_set_version = CodeSetVersion()
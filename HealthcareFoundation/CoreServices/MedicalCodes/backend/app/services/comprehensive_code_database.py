@@ -19,6 +19,7 @@ import csv
 
 from ..database import SessionLocal
 from ..models import CPTCode, ICD10Code, HCPCSCode, ModifierCode
+from .code_set_version import code_set_version
 
 logger = logging.getLogger(__name__)
 
@@ -307,6 +308,9 @@ class ComprehensiveCodeDatabase:
                     'total_count': len(cpt_codes) + len(icd10_codes) + len(hcpcs_codes)
                 }, f, indent=2)
             
+            # Exports fall back to this cache when the database is empty
+            code_set_version.bump("comprehensive_load")
+            
             logger.info(f"✅ Comprehensive database loaded successfully!")
             logger.info(f"   - CPT codes: {len(cpt_codes)}")
             logger.info(f"   - ICD-10 codes: {len(icd10_codes)}")
@@ -7,7 +7,6 @@ Fetches and integrates data from official sources:
 - CMS HCPCS: https://www.cms.gov/medicare/coding-billing/healthcare-common-procedure-system
 """
 
-import asyncio
 import aiohttp
 import requests
 from bs4 import BeautifulSoup
@@ -20,6 +19,8 @@ from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from ..database import SessionLocal
 from ..models import CPTCode, ICD10Code, HCPCSCode, ModifierCode
+from .scraping_pipeline import scraping_pipeline
+from .code_set_version import code_set_version
 import time
 import os
 
@@ -318,55 +319,30 @@ class DataSyncService:
             logger.error(f"Error parsing structured HCPCS data: {e}")
         return hcpcs_codes
 
-    async def sync_all_data(self) -> Dict[str, int]:
-        """Synchronize all medical codes from official sources"""
-        logger.info("Starting full data synchronization...")
+    async def sync_all_data(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Synchronize all medical codes from official sources
         
-        results = {
-            'cpt_codes': 0,
-            'icd10_codes': 0,
-            'hcpcs_codes': 0,
-            'errors': 0
-        }
+        Runs the concurrent scraping pipeline: all sources are fetched through
+        one pooled, rate-limited client, unchanged pages are skipped via
+        conditional requests (unless force is set) and parsed records are
+        bulk upserted as they arrive.
+        """
+        logger.info("Starting full data synchronization...")
         
         try:
-            # Fetch data from all sources concurrently
-            cpt_task = self.fetch_cpt_data()
-            icd10_task = self.fetch_icd10_data()
-            hcpcs_task = self.fetch_hcpcs_data()
-            
-            cpt_codes, icd10_codes, hcpcs_codes = await asyncio.gather(
-                cpt_task, icd10_task, hcpcs_task, return_exceptions=True
-            )
-            
-            # Process CPT codes
-            if isinstance(cpt_codes, list):
-                results['cpt_codes'] = await self._update_cpt_codes(cpt_codes)
-            else:
-                logger.error(f"CPT data fetch failed: {cpt_codes}")
-                results['errors'] += 1
-            
-            # Process ICD-10 codes
-            if isinstance(icd10_codes, list):
-                results['icd10_codes'] = await self._update_icd10_codes(icd10_codes)
-            else:
-                logger.error(f"ICD-10 data fetch failed: {icd10_codes}")
-                results['errors'] += 1
-            
-            # Process HCPCS codes
-            if isinstance(hcpcs_codes, list):
-                results['hcpcs_codes'] = await self._update_hcpcs_codes(hcpcs_codes)
-            else:
-                logger.error(f"HCPCS data fetch failed: {hcpcs_codes}")
-                results['errors'] += 1
-            
+            results = await scraping_pipeline.run(force=force)
             logger.info(f"Data synchronization completed: {results}")
             return results
             
         except Exception as e:
             logger.error(f"Error during data synchronization: {e}")
-            results['errors'] += 1
-            return results
+            return {
+                'cpt_codes': 0,
+                'icd10_codes': 0,
+                'hcpcs_codes': 0,
+                'errors': 1
+            }
 
     async def _update_cpt_codes(self, code_updates: List[CodeUpdate]) -> int:
         """Update CPT codes in database"""
@@ -400,6 +376,8 @@ class DataSyncService:
                 updated_count += 1
             
             db.commit()
+            if updated_count:
+                code_set_version.bump("data_sync")
             logger.info(f"Updated {updated_count} CPT codes")
             return updated_count
             
@@ -441,6 +419,8 @@ class DataSyncService:
                 updated_count += 1
             
             db.commit()
+            if updated_count:
+                code_set_version.bump("data_sync")
             logger.info(f"Updated {updated_count} ICD-10 codes")
             return updated_count
             
@@ -480,6 +460,8 @@ class DataSyncService:
                 updated_count += 1
             
             db.commit()
+            if updated_count:
+                code_set_version.bump("data_sync")
             logger.info(f"Updated {updated_count} HCPCS codes")
             return updated_count
             
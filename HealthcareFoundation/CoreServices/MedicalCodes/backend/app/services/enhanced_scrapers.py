@@ -12,6 +12,7 @@ import logging
 from sqlalchemy.orm import Session
 
 from .specialized_scrapers import OfficialDataScraper, ScrapedCode
+from .code_set_version import code_set_version
 from ..database import SessionLocal
 from ..models import CPTCode, ICD10Code, HCPCSCode
 
@@ -77,6 +78,7 @@ class EnhancedDataScraper:
                 counts['hcpcs'] = await self._save_hcpcs_codes_to_db(scraped_data['hcpcs_codes'], db)
             
             db.commit()
+            code_set_version.bump("scrape_to_database")
             logger.info(f"Database save completed: CPT={counts['cpt']}, ICD10={counts['icd10']}, HCPCS={counts['hcpcs']}")
             return counts
             
@@ -203,6 +205,7 @@ class EnhancedDataScraper:
         try:
             saved_count = await self._save_cpt_codes_to_db(cpt_codes, db)
             db.commit()
+            code_set_version.bump("scrape_cpt_to_database")
             
             return {
                 'success': True,
@@ -236,6 +239,7 @@ class EnhancedDataScraper:
         try:
             saved_count = await self._save_icd10_codes_to_db(icd10_codes, db)
             db.commit()
+            code_set_version.bump("scrape_icd10_to_database")
             
             return {
                 'success': True,
@@ -269,6 +273,7 @@ class EnhancedDataScraper:
         try:
             saved_count = await self._save_hcpcs_codes_to_db(hcpcs_codes, db)
             db.commit()
+            code_set_version.bump("scrape_hcpcs_to_database")
             
             return {
                 'success': True,
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+PDF Export Job Service
+Renders PDF exports in a process pool so ReportLab never blocks the API event
+loop. Outputs are persisted under cache/exports keyed by (specialty,
+include_summary, code set version) and served until the next data sync.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from .code_set_version import code_set_version
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Fields that only make sense on the server side
+INTERNAL_FIELDS = ("output_path", "status_file")
+
+class SpecialtyNotFoundError(LookupError):
+    """Raised when the requested specialty has no codes to export"""
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_json_atomic(path: str, payload: Dict[str, Any]):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+def _update_status(status_file: str, **changes) -> Dict[str, Any]:
+    status = _read_json(status_file) or {}
+    status.update(changes)
+    status["updated_at"] = datetime.now().isoformat()
+    _write_json_atomic(status_file, status)
+    return status
+
+def _run_pdf_export_job(job: Dict[str, Any], render: Optional[Callable] = None) -> Dict[str, Any]:
+    """Process pool entry point: render one export and record progress on disk"""
+    if render is None:
+        # Imported here so the worker process only loads ReportLab when it renders
+        from ..routers.export import render_pdf_export as render
+
+    status_file = job["status_file"]
+    tmp_path = f"{job['output_path']}.{os.getpid()}.tmp"
+
+    def progress(stage: str, percent: int):
+        _update_status(status_file, status=JOB_RUNNING, stage=stage, progress=percent)
+
+    try:
+        progress("starting", 1)
+        result = render(job["specialty_filter"], job["include_summary"], tmp_path, progress)
+        os.replace(tmp_path, job["output_path"])
+        return _update_status(
+            status_file,
+            status=JOB_COMPLETED,
+            stage="completed",
+            progress=100,
+            completed_at=datetime.now().isoformat(),
+            **result
+        )
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        _update_status(
+            status_file,
+            status=JOB_FAILED,
+            stage="failed",
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise
+
+class PDFExportJobManager:
+    """
+    Submits PDF renders to a process pool and caches the results on disk.
+
+    render_func defaults to routers.export.render_pdf_export; a replacement must be
+    a module-level function so it can be sent to the spawned workers.
+    """
+
+    def __init__(self, export_dir: str = os.path.join("./cache", "exports"), max_workers: Optional[int] = None,
+                 stale_after_seconds: int = 900, poll_interval: float = 0.5, render_func: Optional[Callable] = None):
+        self.export_dir = export_dir
+        self.render_func = render_func
+        self.jobs_dir = os.path.join(self.export_dir, "jobs")
+        self.pdf_dir = os.path.join(self.export_dir, "pdf")
+        self.max_workers = max_workers or int(os.getenv("EXPORT_PROCESS_WORKERS", "2"))
+        self.stale_after_seconds = stale_after_seconds
+        self.poll_interval = poll_interval
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        os.makedirs(self.pdf_dir, exist_ok=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn gives each worker its own database engine instead of
+            # inheriting the parent's pooled connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    @staticmethod
+    def cache_key(specialty_filter: Optional[str], include_summary: bool, version: int) -> str:
+        return json.dumps([specialty_filter or "*", bool(include_summary), version])
+
+    def job_id_for(self, specialty_filter: Optional[str], include_summary: bool, version: Optional[int] = None) -> str:
+        """Job ids are content addresses, so identical requests share one render"""
+        if version is None:
+            version = code_set_version.get()
+        key = self.cache_key(specialty_filter, include_summary, version)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]
+
+    def _status_file(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _output_path(self, job_id: str) -> str:
+        return os.path.join(self.pdf_dir, f"{job_id}.pdf")
+
+    def _is_stale(self, status: Dict[str, Any]) -> bool:
+        updated_at = status.get("updated_at")
+        if not updated_at:
+            return True
+        age = (datetime.now() - datetime.fromisoformat(updated_at)).total_seconds()
+        return age > self.stale_after_seconds
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded job status, visible to every worker on the host"""
+        status = _read_json(self._status_file(job_id))
+        if status is None:
+            return None
+        status["is_current"] = status.get("code_set_version") == code_set_version.get()
+        return status
+
+    @staticmethod
+    def to_public(status: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in status.items() if key not in INTERNAL_FIELDS}
+
+    def submit(self, specialty_filter: Optional[str], include_summary: bool) -> Dict[str, Any]:
+        """
+        Start a render unless a current output exists or one is already running.
+
+        Returns the job status; 'cached' is True when the PDF can be served as is.
+        """
+        version = code_set_version.get()
+        job_id = self.job_id_for(specialty_filter, include_summary, version)
+        status_file = self._status_file(job_id)
+        output_path = self._output_path(job_id)
+
+        with self._lock:
+            status = _read_json(status_file)
+            if status and status.get("status") == JOB_COMPLETED and os.path.exists(output_path):
+                return dict(status, cached=True)
+
+            future = self._futures.get(job_id)
+            if future is not None and not future.done():
+                return dict(status or {"job_id": job_id, "status": JOB_QUEUED}, cached=False)
+
+            # Another worker may be rendering the same key
+            if status and status.get("status") in (JOB_QUEUED, JOB_RUNNING) and not self._is_stale(status):
+                return dict(status, cached=False)
+
+            self._purge_outdated(version)
+
+            specialty_suffix = f"_{specialty_filter}" if specialty_filter else ""
+            now = datetime.now().isoformat()
+            job = {
+                "job_id": job_id,
+                "status": JOB_QUEUED,
+                "stage": "queued",
+                "progress": 0,
+                "specialty_filter": specialty_filter,
+                "include_summary": include_summary,
+                "code_set_version": version,
+                "filename": f"medical_codes_export{specialty_suffix}_v{version}.pdf",
+                "created_at": now,
+                "updated_at": now,
+                "output_path": output_path,
+                "status_file": status_file
+            }
+            _write_json_atomic(status_file, job)
+
+            future = self._get_executor().submit(_run_pdf_export_job, job, self.render_func)
+            self._futures[job_id] = future
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+        logger.info(f"Submitted PDF export job {job_id} (specialty={specialty_filter}, version={version})")
+        return dict(job, cached=False)
+
+    def _on_done(self, job_id: str, future: Future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+        if future.cancelled():
+            _update_status(self._status_file(job_id), status=JOB_FAILED, stage="failed", error="Job cancelled")
+            return
+
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            # A worker died; replace the pool so later jobs can still run
+            with self._lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+        if error is not None:
+            status = _read_json(self._status_file(job_id)) or {}
+            # The worker records its own failures; this covers crashed workers
+            if status.get("status") != JOB_FAILED:
+                _update_status(
+                    self._status_file(job_id),
+                    status=JOB_FAILED,
+                    stage="failed",
+                    error=str(error),
+                    error_type=type(error).__name__
+                )
+            logger.error(f"PDF export job {job_id} failed: {error}")
+
+    def _purge_outdated(self, current_version: int):
+        """Remove outputs rendered against an older code set"""
+        for filename in os.listdir(self.jobs_dir):
+            if not filename.endswith(".json"):
+                continue
+            job_id = filename[:-len(".json")]
+            status = _read_json(self._status_file(job_id))
+            if not status or status.get("code_set_version") == current_version:
+                continue
+            if status.get("status") in (JOB_QUEUED, JOB_RUNNING) and not self._is_stale(status):
+                continue
+            for path in (self._output_path(job_id), self._status_file(job_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    async def render(self, specialty_filter: Optional[str], include_summary: bool) -> Dict[str, Any]:
+        """Submit (or reuse) a render and wait for it without blocking the event loop"""
+        status = self.submit(specialty_filter, include_summary)
+        job_id = status["job_id"]
+
+        while status.get("status") not in (JOB_COMPLETED, JOB_FAILED):
+            future = self._futures.get(job_id)
+            if future is not None:
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception:
+                    pass  # recorded in the job status below
+            elif self._is_stale(status):
+                status = self.submit(specialty_filter, include_summary)
+                continue
+            else:
+                await asyncio.sleep(self.poll_interval)
+            status = self.get_status(job_id) or status
+
+        if status["status"] == JOB_FAILED:
+            if status.get("error_type") == SpecialtyNotFoundError.__name__:
+                raise SpecialtyNotFoundError(status.get("error"))
+            raise RuntimeError(status.get("error") or "PDF export failed")
+        return status
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Global instance
+pdf_export_jobs = PDFExportJobManager()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Optional Redis Connection
+Shared by the code set version and the response cache so every API worker sees
+the same state. When REDIS_URL is unset, the redis package is missing or the
+server is unreachable, callers get None and fall back to in-process state.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class RedisConnection:
+    """Lazily connected Redis client that backs off after a failure"""
+
+    def __init__(self, url: Optional[str] = None, retry_after_seconds: float = 30.0):
+        self.url = url if url is not None else os.getenv("REDIS_URL", "")
+        self.retry_after_seconds = retry_after_seconds
+        self._client = None
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return a connected client, or None when Redis is not available"""
+        if not self.url or redis is None:
+            return None
+        if self._client is not None:
+            return self._client
+        if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_after_seconds:
+            return None
+
+        with self._lock:
+            if self._client is None:
+                try:
+                    client = redis.Redis.from_url(self.url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                    client.ping()
+                    self._client = client
+                    self._failed_at = None
+                    logger.info("Connected to Redis for shared caching")
+                except Exception as e:
+                    self._failed_at = time.monotonic()
+                    logger.warning(f"Redis unavailable, using in-process cache: {e}")
+        return self._client
+
+    def mark_failed(self, error: Exception):
+        """Drop the client after an operation failed; the next call retries after the backoff"""
+        logger.warning(f"Redis operation failed, using in-process cache: {error}")
+        self._client = None
+        self._failed_at = time.monotonic()
+
+# Global instance
+redis_connection = RedisConnection()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Caches serialized JSON for read endpoints whose output only changes when the
+code tables do. Entries are keyed by the code set version, so a data sync
+invalidates everything at once without explicit purges. Each entry carries a
+strong ETag (hash of the body) so polling clients can revalidate with
+If-None-Match and get a 304 without the endpoint doing any work.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from .code_set_version import code_set_version
+from .redis_client import redis_connection
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    version: int
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison per RFC 9110, as required for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+class ResponseCache:
+    """Version-keyed JSON response cache in Redis, with an in-process LRU fallback"""
+
+    def __init__(self, key_prefix: str = "medicalcodes:response", ttl_seconds: int = 86400, max_local_entries: int = 256):
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def _key(self, name: str, version: int, params: Optional[Dict[str, Any]]) -> str:
+        suffix = ""
+        if params:
+            suffix = ":" + hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return f"{self.key_prefix}:v{version}:{name}{suffix}"
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: CachedResponse):
+        with self._lock:
+            # Entries from older versions can never be hit again
+            for stale in [k for k, e in self._local.items() if e.version != entry.version]:
+                del self._local[stale]
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[CachedResponse]:
+        client = redis_connection.get()
+        if client is None:
+            return None
+        try:
+            values = client.hmget(key, "etag", "body", "version")
+        except Exception as e:
+            redis_connection.mark_failed(e)
+            return None
+        if not values or values[0] is None:
+            return None
+        etag, body, version = values
+        return CachedResponse(body=body, etag=etag.decode("utf-8"), version=int(version))
+
+    def _set_shared(self, key: str, entry: CachedResponse):
+        client = redis_connection.get()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={"etag": entry.etag, "body": entry.body, "version": entry.version})
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            redis_connection.mark_failed(e)
+
+    def get_or_build(self, name: str, build: Callable[[], Any], params: Optional[Dict[str, Any]] = None) -> CachedResponse:
+        """Return the cached response for the current code set, building it at most once per worker"""
+        version = code_set_version.get()
+        key = self._key(name, version, params)
+
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            entry = self._get_local(key) or self._get_shared(key)
+            if entry is None:
+                body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode("utf-8")
+                etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+                entry = CachedResponse(body=body, etag=etag, version=version)
+                self._set_shared(key, entry)
+            self._set_local(key, entry)
+
+        with self._lock:
+            self._build_locks.pop(key, None)
+        return entry
+
+    def respond(self, request: Request, name: str, build: Callable[[], Any],
+                params: Optional[Dict[str, Any]] = None) -> Response:
+        """JSON response with ETag, or 304 when the client already has this version"""
+        entry = self.get_or_build(name, build, params)
+        headers = {
+            "ETag": entry.etag,
+            # Clients may keep the body but must revalidate; revalidation is a 304
+            "Cache-Control": "no-cache",
+            "X-Code-Set-Version": str(entry.version)
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+# Global instance
+response_cache = ResponseCache()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Concurrent Scraping Pipeline for Official Medical Coding Sources
+Fetches every source page through one connection-pooled HTTP client with
+per-host concurrency limits and token-bucket rate limiting. Unchanged pages are
+skipped with conditional requests (ETag / If-Modified-Since), and parsed records
+stream through a bounded queue into a batched upsert stage.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .specialized_scrapers import OfficialDataScraper, ScrapedCode
+from .code_set_version import code_set_version
+from .code_hierarchy import code_hierarchy
+from ..database import SessionLocal
+from ..models import CPTCode, ICD10Code, HCPCSCode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,application/json;q=0.8,*/*;q=0.5',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+@dataclass
+class ScrapeSource:
+    """A set of pages that all yield codes for one code table"""
+    name: str
+    code_type: str  # 'cpt', 'icd10' or 'hcpcs'
+    urls: List[str]
+    parse: Callable[[bytes, str], List[ScrapedCode]]  # (content, content_type)
+
+@dataclass
+class SourceStats:
+    pages_fetched: int = 0
+    pages_not_modified: int = 0
+    pages_failed: int = 0
+    records_parsed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+class TokenBucket:
+    """Async token bucket: allows bursts of `capacity`, refills at `rate` tokens/second"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class ValidatorStore:
+    """Persists ETag / Last-Modified validators per URL between sync runs"""
+
+    def __init__(self, path: str = os.path.join("./cache", "scrape_validators.json")):
+        self.path = path
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self._validators = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._validators = {}
+
+    def get(self, url: str) -> Dict[str, str]:
+        return self._validators.get(url, {})
+
+    def update(self, validators: Dict[str, Dict[str, str]]):
+        self._validators.update(validators)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._validators, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+# table key -> (model, column defaults used when inserting a new code)
+UPSERT_TABLES = {
+    'cpt': (CPTCode, {'category': 'Category I', 'section': '', 'subsection': '', 'effective_date': None}),
+    'icd10': (ICD10Code, {'code_type': 'Diagnosis', 'chapter': '', 'block': '', 'is_billable': 'Y'}),
+    'hcpcs': (HCPCSCode, {'level': 'Level II', 'category': '', 'coverage_status': ''}),
+}
+
+class CodeUpserter:
+    """
+    Batched insert-or-update of scraped codes.
+
+    Each batch costs one SELECT for the existing rows plus one bulk INSERT and
+    one bulk UPDATE, instead of a lookup per code. Update semantics match the
+    per-row sync: descriptions are replaced, other columns only when the
+    scraped value is non-empty.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+
+    def upsert(self, code_type: str, records: Iterable[ScrapedCode]) -> int:
+        model, defaults = UPSERT_TABLES[code_type]
+        columns = list(defaults)
+
+        # Last occurrence of a code within the batch wins
+        latest: Dict[str, ScrapedCode] = {}
+        for record in records:
+            if record.code and record.description:
+                latest[record.code] = record
+        if not latest:
+            return 0
+
+        db = self.session_factory()
+        try:
+            existing = {
+                row.code: row
+                for row in db.query(model.id, model.code, *[getattr(model, column) for column in columns])
+                .filter(model.code.in_(list(latest)))
+            }
+
+            inserts = []
+            updates = []
+            for code, record in latest.items():
+                current = existing.get(code)
+                if current is None:
+                    row = {'code': code, 'description': record.description, 'is_active': record.is_active}
+                    for column, default in defaults.items():
+                        row[column] = getattr(record, column, None) or default
+                    inserts.append(row)
+                else:
+                    row = {'id': current.id, 'description': record.description}
+                    for column in columns:
+                        row[column] = getattr(record, column, None) or getattr(current, column)
+                    updates.append(row)
+
+            if inserts:
+                db.bulk_insert_mappings(model, inserts)
+            if updates:
+                db.bulk_update_mappings(model, updates)
+            db.commit()
+            return len(inserts) + len(updates)
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+def parse_structured_codes(code_type: str, data: Dict[str, Any]) -> List[ScrapedCode]:
+    """Parse a structured JSON code listing ({"codes": [...]}) into scraped codes"""
+    source = {'cpt': "AMA CPT API", 'icd10': "CMS ICD-10 API", 'hcpcs': "CMS HCPCS API"}[code_type]
+    codes = []
+    for item in data.get('codes', []):
+        codes.append(ScrapedCode(
+            code=item.get('code', ''),
+            description=item.get('description', ''),
+            category=item.get('category'),
+            section=item.get('section'),
+            subsection=item.get('subsection'),
+            chapter=item.get('chapter'),
+            block=item.get('block'),
+            level=item.get('level'),
+            coverage_status=item.get('coverage_status'),
+            code_type=item.get('code_type'),
+            is_billable=item.get('is_billable', 'Y'),
+            source=source
+        ))
+    return codes
+
+def _content_parser(code_type: str, html_parser: Callable[[bytes], List[ScrapedCode]]) -> Callable[[bytes, str], List[ScrapedCode]]:
+    def parse(content: bytes, content_type: str) -> List[ScrapedCode]:
+        if 'json' in content_type:
+            return parse_structured_codes(code_type, json.loads(content))
+        return html_parser(content)
+    return parse
+
+def build_official_sources(page_urls: Optional[Dict[str, List[str]]] = None) -> List[ScrapeSource]:
+    """
+    Build the CPT, ICD-10 and HCPCS sources.
+
+    page_urls overrides the pages per code type, e.g. to point the pipeline at
+    a local fixture server or to add listing pages.
+    """
+    scraper = OfficialDataScraper()
+    page_urls = page_urls or {}
+    return [
+        ScrapeSource(
+            name="AMA CPT",
+            code_type='cpt',
+            urls=page_urls.get('cpt', [scraper.cpt_scraper.page_url]),
+            parse=_content_parser('cpt', scraper.cpt_scraper.parse_cpt_page)
+        ),
+        ScrapeSource(
+            name="CMS ICD-10",
+            code_type='icd10',
+            urls=page_urls.get('icd10', [scraper.icd10_scraper.page_url]),
+            parse=_content_parser('icd10', scraper.icd10_scraper.parse_icd10_page)
+        ),
+        ScrapeSource(
+            name="CMS HCPCS",
+            code_type='hcpcs',
+            urls=page_urls.get('hcpcs', [scraper.hcpcs_scraper.page_url]),
+            parse=_content_parser('hcpcs', scraper.hcpcs_scraper.parse_hcpcs_page)
+        ),
+    ]
+
+class ScrapingPipeline:
+    """fetch (pooled, rate limited, conditional) -> parse (thread) -> queue -> bulk upsert"""
+
+    def __init__(
+        self,
+        sources: Optional[List[ScrapeSource]] = None,
+        upserter: Optional[CodeUpserter] = None,
+        validator_store: Optional[ValidatorStore] = None,
+        max_connections: int = 20,
+        max_concurrency_per_host: int = 4,
+        requests_per_second_per_host: float = 2.0,
+        batch_size: int = 500,
+        queue_size: int = 20,
+        request_timeout: float = 30.0,
+        max_retries: int = 2
+    ):
+        self.sources = sources
+        self.upserter = upserter or CodeUpserter()
+        self.validator_store = validator_store or ValidatorStore()
+        self.max_connections = max_connections
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.requests_per_second_per_host = requests_per_second_per_host
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+
+        self._host_limits: Dict[str, Tuple[asyncio.Semaphore, TokenBucket]] = {}
+
+    def _limits_for(self, url: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = (
+                asyncio.Semaphore(self.max_concurrency_per_host),
+                TokenBucket(self.requests_per_second_per_host, capacity=self.max_concurrency_per_host)
+            )
+        return self._host_limits[host]
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, force: bool) -> Optional[Tuple[bytes, str, Dict[str, str]]]:
+        """GET a page; returns None when the server answers 304 Not Modified"""
+        headers = {}
+        validators = {} if force else self.validator_store.get(url)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        semaphore, bucket = self._limits_for(url)
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                await bucket.acquire()
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return None
+                    if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = float(retry_after) if retry_after.isdigit() else (2 ** attempt) + random.random()
+                    else:
+                        response.raise_for_status()
+                        content = await response.read()
+                        new_validators = {
+                            key: value for key, value in (
+                                ('etag', response.headers.get('ETag')),
+                                ('last_modified', response.headers.get('Last-Modified'))
+                            ) if value
+                        }
+                        return content, response.headers.get('Content-Type', ''), new_validators
+            logger.warning(f"Retrying {url} in {delay:.1f}s (status {response.status})")
+            await asyncio.sleep(delay)
+
+    async def _produce(self, session, source: ScrapeSource, url: str, queue: asyncio.Queue,
+                       stats: SourceStats, pending_validators: Dict[str, Dict[str, str]], force: bool):
+        try:
+            fetched = await self._fetch(session, url, force)
+            if fetched is None:
+                stats.pages_not_modified += 1
+                logger.info(f"{source.name}: {url} not modified, skipping")
+                return
+
+            content, content_type, validators = fetched
+            stats.pages_fetched += 1
+
+            # BeautifulSoup parsing is CPU bound; keep it off the event loop
+            records = await asyncio.to_thread(source.parse, content, content_type)
+            stats.records_parsed += len(records)
+            for start in range(0, len(records), self.batch_size):
+                await queue.put((source.code_type, records[start:start + self.batch_size]))
+
+            if validators:
+                pending_validators[url] = validators
+
+        except Exception as e:
+            stats.pages_failed += 1
+            stats.errors.append(f"{url}: {e}")
+            logger.error(f"{source.name}: error fetching {url}: {e}")
+
+    async def _consume(self, queue: asyncio.Queue, upserted: Dict[str, int], errors: List[str]):
+        buffers: Dict[str, List[ScrapedCode]] = {code_type: [] for code_type in UPSERT_TABLES}
+
+        async def flush(code_type: str):
+            batch, buffers[code_type] = buffers[code_type], []
+            if not batch:
+                return
+            try:
+                upserted[code_type] += await asyncio.to_thread(self.upserter.upsert, code_type, batch)
+            except Exception as e:
+                errors.append(f"{code_type} upsert: {e}")
+                logger.error(f"Error upserting {len(batch)} {code_type} codes: {e}")
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            code_type, records = item
+            buffers[code_type].extend(records)
+            if len(buffers[code_type]) >= self.batch_size:
+                await flush(code_type)
+
+        for code_type in buffers:
+            await flush(code_type)
+
+    async def run(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Run one sync over all sources.
+
+        force ignores stored validators and refetches every page.
+        """
+        started = time.monotonic()
+        sources = self.sources or build_official_sources()
+        self._host_limits = {}
+
+        stats = {source.name: SourceStats() for source in sources}
+        upserted = {code_type: 0 for code_type in UPSERT_TABLES}
+        upsert_errors: List[str] = []
+        pending_validators: Dict[str, Dict[str, str]] = {}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_concurrency_per_host,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=DEFAULT_HEADERS) as session:
+            consumer = asyncio.create_task(self._consume(queue, upserted, upsert_errors))
+            await asyncio.gather(*[
+                self._produce(session, source, url, queue, stats[source.name], pending_validators, force)
+                for source in sources
+                for url in source.urls
+            ])
+            await queue.put(None)
+            await consumer
+
+        # Only remember validators once their records are safely stored,
+        # otherwise the next run would skip pages that never made it in
+        if pending_validators and not upsert_errors:
+            self.validator_store.update(pending_validators)
+
+        results = {
+            'cpt_codes': upserted['cpt'],
+            'icd10_codes': upserted['icd10'],
+            'hcpcs_codes': upserted['hcpcs'],
+            'errors': sum(s.pages_failed for s in stats.values()) + len(upsert_errors),
+            'sources': {name: vars(s) for name, s in stats.items()},
+            'duration_seconds': round(time.monotonic() - started, 3)
+        }
+        if upsert_errors:
+            results['upsert_errors'] = upsert_errors
+
+        if any(upserted.values()):
+            results['code_set_version'] = code_set_version.bump("data_sync")
+            await asyncio.to_thread(self._rebuild_hierarchy, results['code_set_version'])
+
+        logger.info(
+            f"Scraping pipeline finished in {results['duration_seconds']}s: "
+            f"CPT={upserted['cpt']}, ICD10={upserted['icd10']}, HCPCS={upserted['hcpcs']}, errors={results['errors']}"
+        )
+        return results
+
+    def _rebuild_hierarchy(self, version: int):
+        """Rebuild the hierarchy index now so queries don't pay for it lazily"""
+        db = self.upserter.session_factory()
+        try:
+            code_hierarchy.rebuild(db, version)
+        except Exception as e:
+            logger.error(f"Hierarchy rebuild after sync failed: {e}")
+        finally:
+            db.close()
+
+# Global instance
+scraping_pipeline = ScrapingPipeline()
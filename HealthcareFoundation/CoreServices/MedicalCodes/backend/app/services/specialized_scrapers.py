@@ -32,6 +32,7 @@ class ScrapedCode:
     block: Optional[str] = None
     level: Optional[str] = None
     coverage_status: Optional[str] = None
+    code_type: Optional[str] = None
     is_billable: str = "Y"
     is_active: str = "Y"
     effective_date: Optional[datetime] = None
@@ -43,6 +44,7 @@ class AMACPTScraper:
     
     def __init__(self):
         self.base_url = "https://www.ama-assn.org"
+        self.page_url = f"{self.base_url}/practice-management/cpt"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -59,60 +61,10 @@ class AMACPTScraper:
         
         try:
             # Main CPT page
-            response = self.session.get(f"{self.base_url}/practice-management/cpt")
+            response = self.session.get(self.page_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            cpt_codes = []
-            
-            # Look for CPT code sections
-            # AMA typically organizes CPT codes in sections
-            sections = soup.find_all(['div', 'section'], class_=re.compile(r'cpt|code|section', re.I))
-            
-            for section in sections:
-                # Look for code patterns (5-digit numbers)
-                code_elements = section.find_all(['span', 'div', 'td'], 
-                                               string=re.compile(r'^\d{5}$'))
-                
-                for code_elem in code_elements:
-                    code = code_elem.get_text().strip()
-                    
-                    # Find description (usually in nearby elements)
-                    description = self._find_description(code_elem)
-                    
-                    # Determine category and section
-                    category, section_name = self._determine_category_section(code_elem)
-                    
-                    if code and description:
-                        cpt_codes.append(ScrapedCode(
-                            code=code,
-                            description=description,
-                            category=category,
-                            section=section_name,
-                            source="AMA CPT"
-                        ))
-            
-            # Also try to find CPT codes in tables
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        code_cell = cells[0]
-                        desc_cell = cells[1] if len(cells) > 1 else None
-                        
-                        code_text = code_cell.get_text().strip()
-                        if re.match(r'^\d{5}$', code_text):
-                            description = desc_cell.get_text().strip() if desc_cell else ""
-                            
-                            if description:
-                                cpt_codes.append(ScrapedCode(
-                                    code=code_text,
-                                    description=description,
-                                    category="Category I",
-                                    source="AMA CPT"
-                                ))
+            cpt_codes = self.parse_cpt_page(response.content)
             
             logger.info(f"Scraped {len(cpt_codes)} CPT codes from AMA")
             return cpt_codes
@@ -121,6 +73,62 @@ class AMACPTScraper:
             logger.error(f"Error scraping AMA CPT codes: {e}")
             return []
     
+    def parse_cpt_page(self, content: bytes) -> List[ScrapedCode]:
+        """Extract CPT codes from an AMA CPT page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        cpt_codes = []
+        
+        # Look for CPT code sections
+        # AMA typically organizes CPT codes in sections
+        sections = soup.find_all(['div', 'section'], class_=re.compile(r'cpt|code|section', re.I))
+        
+        for section in sections:
+            # Look for code patterns (5-digit numbers)
+            code_elements = section.find_all(['span', 'div', 'td'], 
+                                           string=re.compile(r'^\d{5}$'))
+            
+            for code_elem in code_elements:
+                code = code_elem.get_text().strip()
+                
+                # Find description (usually in nearby elements)
+                description = self._find_description(code_elem)
+                
+                # Determine category and section
+                category, section_name = self._determine_category_section(code_elem)
+                
+                if code and description:
+                    cpt_codes.append(ScrapedCode(
+                        code=code,
+                        description=description,
+                        category=category,
+                        section=section_name,
+                        source="AMA CPT"
+                    ))
+        
+        # Also try to find CPT codes in tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    code_cell = cells[0]
+                    desc_cell = cells[1] if len(cells) > 1 else None
+                    
+                    code_text = code_cell.get_text().strip()
+                    if re.match(r'^\d{5}$', code_text):
+                        description = desc_cell.get_text().strip() if desc_cell else ""
+                        
+                        if description:
+                            cpt_codes.append(ScrapedCode(
+                                code=code_text,
+                                description=description,
+                                category="Category I",
+                                source="AMA CPT"
+                            ))
+        
+        return cpt_codes
+    
     def _find_description(self, code_element) -> str:
         """Find description for a CPT code"""
         # Look in parent element
@@ -184,6 +192,7 @@ class CMSICD10Scraper:
     
     def __init__(self):
         self.base_url = "https://www.cms.gov"
+        self.page_url = f"{self.base_url}/medicare/coding-billing/icd-10-codes"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -200,51 +209,10 @@ class CMSICD10Scraper:
         
         try:
             # Main ICD-10 page
-            response = self.session.get(f"{self.base_url}/medicare/coding-billing/icd-10-codes")
+            response = self.session.get(self.page_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            icd10_codes = []
-            
-            # Look for ICD-10 code patterns (letters followed by numbers)
-            code_elements = soup.find_all(['span', 'div', 'td'], 
-                                        string=re.compile(r'^[A-Z]\d{2}(\.\d{1,2})?$'))
-            
-            for code_elem in code_elements:
-                code = code_elem.get_text().strip()
-                description = self._find_icd10_description(code_elem)
-                chapter = self._find_icd10_chapter(code_elem)
-                
-                if code and description:
-                    icd10_codes.append(ScrapedCode(
-                        code=code,
-                        description=description,
-                        chapter=chapter,
-                        code_type="Diagnosis",
-                        source="CMS ICD-10"
-                    ))
-            
-            # Also look for codes in tables
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        code_cell = cells[0]
-                        desc_cell = cells[1] if len(cells) > 1 else None
-                        
-                        code_text = code_cell.get_text().strip()
-                        if re.match(r'^[A-Z]\d{2}(\.\d{1,2})?$', code_text):
-                            description = desc_cell.get_text().strip() if desc_cell else ""
-                            
-                            if description:
-                                icd10_codes.append(ScrapedCode(
-                                    code=code_text,
-                                    description=description,
-                                    code_type="Diagnosis",
-                                    source="CMS ICD-10"
-                                ))
+            icd10_codes = self.parse_icd10_page(response.content)
             
             logger.info(f"Scraped {len(icd10_codes)} ICD-10 codes from CMS")
             return icd10_codes
@@ -253,6 +221,53 @@ class CMSICD10Scraper:
             logger.error(f"Error scraping CMS ICD-10 codes: {e}")
             return []
     
+    def parse_icd10_page(self, content: bytes) -> List[ScrapedCode]:
+        """Extract ICD-10 codes from a CMS ICD-10 page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        icd10_codes = []
+        
+        # Look for ICD-10 code patterns (letters followed by numbers)
+        code_elements = soup.find_all(['span', 'div', 'td'], 
+                                    string=re.compile(r'^[A-Z]\d{2}(\.\d{1,2})?$'))
+        
+        for code_elem in code_elements:
+            code = code_elem.get_text().strip()
+            description = self._find_icd10_description(code_elem)
+            chapter = self._find_icd10_chapter(code_elem)
+            
+            if code and description:
+                icd10_codes.append(ScrapedCode(
+                    code=code,
+                    description=description,
+                    chapter=chapter,
+                    code_type="Diagnosis",
+                    source="CMS ICD-10"
+                ))
+        
+        # Also look for codes in tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    code_cell = cells[0]
+                    desc_cell = cells[1] if len(cells) > 1 else None
+                    
+                    code_text = code_cell.get_text().strip()
+                    if re.match(r'^[A-Z]\d{2}(\.\d{1,2})?$', code_text):
+                        description = desc_cell.get_text().strip() if desc_cell else ""
+                        
+                        if description:
+                            icd10_codes.append(ScrapedCode(
+                                code=code_text,
+                                description=description,
+                                code_type="Diagnosis",
+                                source="CMS ICD-10"
+                            ))
+        
+        return icd10_codes
+    
     def _find_icd10_description(self, code_element) -> str:
         """Find description for an ICD-10 code"""
         # Similar logic to CPT but adapted for ICD-10 structure
@@ -316,6 +331,7 @@ class CMSHCPCSScraper:
     
     def __init__(self):
         self.base_url = "https://www.cms.gov"
+        self.page_url = f"{self.base_url}/medicare/coding-billing/healthcare-common-procedure-system"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -332,51 +348,10 @@ class CMSHCPCSScraper:
         
         try:
             # Main HCPCS page
-            response = self.session.get(f"{self.base_url}/medicare/coding-billing/healthcare-common-procedure-system")
+            response = self.session.get(self.page_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            hcpcs_codes = []
-            
-            # Look for HCPCS code patterns (letter followed by 4 digits)
-            code_elements = soup.find_all(['span', 'div', 'td'], 
-                                        string=re.compile(r'^[A-Z]\d{4}$'))
-            
-            for code_elem in code_elements:
-                code = code_elem.get_text().strip()
-                description = self._find_hcpcs_description(code_elem)
-                category = self._find_hcpcs_category(code_elem)
-                
-                if code and description:
-                    hcpcs_codes.append(ScrapedCode(
-                        code=code,
-                        description=description,
-                        category=category,
-                        level="Level II",
-                        source="CMS HCPCS"
-                    ))
-            
-            # Also look for codes in tables
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        code_cell = cells[0]
-                        desc_cell = cells[1] if len(cells) > 1 else None
-                        
-                        code_text = code_cell.get_text().strip()
-                        if re.match(r'^[A-Z]\d{4}$', code_text):
-                            description = desc_cell.get_text().strip() if desc_cell else ""
-                            
-                            if description:
-                                hcpcs_codes.append(ScrapedCode(
-                                    code=code_text,
-                                    description=description,
-                                    level="Level II",
-                                    source="CMS HCPCS"
-                                ))
+            hcpcs_codes = self.parse_hcpcs_page(response.content)
             
             logger.info(f"Scraped {len(hcpcs_codes)} HCPCS codes from CMS")
             return hcpcs_codes
@@ -385,6 +360,53 @@ class CMSHCPCSScraper:
             logger.error(f"Error scraping CMS HCPCS codes: {e}")
             return []
     
+    def parse_hcpcs_page(self, content: bytes) -> List[ScrapedCode]:
+        """Extract HCPCS codes from a CMS HCPCS page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        hcpcs_codes = []
+        
+        # Look for HCPCS code patterns (letter followed by 4 digits)
+        code_elements = soup.find_all(['span', 'div', 'td'], 
+                                    string=re.compile(r'^[A-Z]\d{4}$'))
+        
+        for code_elem in code_elements:
+            code = code_elem.get_text().strip()
+            description = self._find_hcpcs_description(code_elem)
+            category = self._find_hcpcs_category(code_elem)
+            
+            if code and description:
+                hcpcs_codes.append(ScrapedCode(
+                    code=code,
+                    description=description,
+                    category=category,
+                    level="Level II",
+                    source="CMS HCPCS"
+                ))
+        
+        # Also look for codes in tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    code_cell = cells[0]
+                    desc_cell = cells[1] if len(cells) > 1 else None
+                    
+                    code_text = code_cell.get_text().strip()
+                    if re.match(r'^[A-Z]\d{4}$', code_text):
+                        description = desc_cell.get_text().strip() if desc_cell else ""
+                        
+                        if description:
+                            hcpcs_codes.append(ScrapedCode(
+                                code=code_text,
+                                description=description,
+                                level="Level II",
+                                source="CMS HCPCS"
+                            ))
+        
+        return hcpcs_codes
+    
     def _find_hcpcs_description(self, code_element) -> str:
         """Find description for an HCPCS code"""
         # Similar logic to other scrapers
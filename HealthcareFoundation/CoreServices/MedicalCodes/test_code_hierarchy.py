@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the code hierarchy index
+Builds the nested-set index from a small ICD-10 and CPT fixture in a throwaway
+SQLite database and checks descendant, billable, subsumption and range code
+lookups, plus rebuilds when the code set version changes
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+WORK_DIR = tempfile.mkdtemp(prefix="code_hierarchy_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(WORK_DIR, 'codes.db')}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.chdir(WORK_DIR)
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import CPTCode, ICD10Code, CodeHierarchyNode  # noqa: E402
+from app.services.code_hierarchy import (  # noqa: E402
+    CodeHierarchyIndex, build_icd10_tree, flatten_tree,
+    SUBSUMES_EQUIVALENT, SUBSUMES_NOT_SUBSUMED, SUBSUMES_SUBSUMED_BY, SUBSUMES_SUBSUMES
+)
+from app.services.code_set_version import code_set_version  # noqa: E402
+
+MENTAL = "Mental, Behavioral and Neurodevelopmental disorders (F01-F99)"
+MOOD = "Mood [affective] disorders (F30-F39)"
+SCHIZOPHRENIA = "Schizophrenia, schizotypal and delusional disorders (F20-F29)"
+INFECTIOUS = "Certain infectious and parasitic diseases (A00-B99)"
+
+# (code, description, chapter, block, is_billable)
+ICD10_ROWS = [
+    ("F20", "Schizophrenia", MENTAL, SCHIZOPHRENIA, "N"),
+    ("F20.0", "Paranoid schizophrenia", MENTAL, SCHIZOPHRENIA, "Y"),
+    ("F32", "Major depressive disorder, single episode", MENTAL, MOOD, "N"),
+    ("F32.8", "Other depressive episodes", MENTAL, MOOD, "N"),
+    ("F32.81", "Premenstrual dysphoric disorder", MENTAL, MOOD, "Y"),
+    ("F32.9", "Major depressive disorder, single episode, unspecified", MENTAL, MOOD, "Y"),
+    ("F33", "Major depressive disorder, recurrent", MENTAL, MOOD, "N"),
+    ("F33.0", "Major depressive disorder, recurrent, mild", MENTAL, MOOD, "Y"),
+    # A block label without a printed range, holding a single category
+    ("A00", "Cholera", INFECTIOUS, "Cholera", "N"),
+    ("A00.0", "Cholera due to Vibrio cholerae 01, biovar cholerae", INFECTIOUS, "Cholera", "Y"),
+    ("A00.1", "Cholera due to Vibrio cholerae 01, biovar eltor", INFECTIOUS, "Cholera", "Y"),
+]
+
+# (code, description, section, subsection, is_active)
+CPT_ROWS = [
+    ("99212", "Office visit, established patient, 10 minutes", "Evaluation and Management", "Office visits", "Y"),
+    ("99213", "Office visit, established patient, 20 minutes", "Evaluation and Management", "Office visits", "Y"),
+    ("90471", "Immunization administration", "Medicine", "Immunization administration", "Y"),
+    ("90472", "Immunization administration, each additional", "Medicine", "Immunization administration", "N"),
+]
+
+def seed_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.query(CodeHierarchyNode).delete()
+        db.query(ICD10Code).delete()
+        db.query(CPTCode).delete()
+        db.add_all(
+            ICD10Code(code=code, description=description, chapter=chapter, block=block, is_billable=billable)
+            for code, description, chapter, block, billable in ICD10_ROWS
+        )
+        db.add_all(
+            CPTCode(code=code, description=description, section=section, subsection=subsection, is_active=active)
+            for code, description, section, subsection, active in CPT_ROWS
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def codes(query):
+    return {row[0] for row in query.all()}
+
+def test_flatten_tree_intervals():
+    """Every node's interval nests inside its parent's, and children follow code order"""
+    nodes = flatten_tree("icd10", build_icd10_tree(ICD10_ROWS), 1, 1)
+    by_id = {node["id"]: node for node in nodes}
+    root = nodes[0]
+    assert root["node_type"] == "root" and (root["lft"], root["rgt"]) == (1, 2 * len(nodes))
+    for node in nodes[1:]:
+        parent = by_id[node["parent_id"]]
+        assert parent["lft"] < node["lft"] < node["rgt"] < parent["rgt"]
+        assert node["depth"] == parent["depth"] + 1
+
+    by_code = {}
+    for node in nodes:
+        by_code.setdefault(node["code"], []).append(node)
+    assert [n["node_type"] for n in by_code["F01-F99"]] == ["chapter"]
+    assert [n["node_type"] for n in by_code["F30-F39"]] == ["block"]
+    # Subcategories nest under the longest stored prefix
+    assert by_id[by_code["F32.81"][0]["parent_id"]]["code"] == "F32.8"
+    # The single-category block takes its range code from its only member
+    assert sorted(n["node_type"] for n in by_code["A00"]) == ["block", "category"]
+    chapters = [n["code"] for n in nodes if n["node_type"] == "chapter"]
+    assert chapters == ["A00-B99", "F01-F99"]
+
+def test_hierarchy_queries():
+    seed_database()
+    index = CodeHierarchyIndex()
+    db = SessionLocal()
+    try:
+        counts = index.rebuild(db, version=code_set_version.get())
+        print(f"   Built {counts['icd10']} ICD-10 and {counts['cpt']} CPT nodes")
+
+        # chapter -> block -> category -> code
+        mental = codes(index.descendant_codes(db, "icd10", "F01-F99"))
+        assert mental == {"F20", "F20.0", "F32", "F32.8", "F32.81", "F32.9", "F33", "F33.0"}
+        assert codes(index.descendant_codes(db, "icd10", "F30-F39")) == mental - {"F20", "F20.0"}
+        assert codes(index.descendant_codes(db, "icd10", "F32")) == {"F32", "F32.8", "F32.81", "F32.9"}
+        assert codes(index.descendant_codes(db, "icd10", "F01-F99", billable_only=True)) == {
+            "F20.0", "F32.81", "F32.9", "F33.0"
+        }
+        assert index.descendant_codes(db, "icd10", "Z99") is None
+
+        block = index.get_node(db, "icd10", "F30-F39")
+        assert [n.code for n in index.ancestors(db, block)] == ["ICD-10", "F01-F99"]
+        assert [n.code for n in index.children(db, block)] == ["F32", "F33"]
+        assert [n.code for n in index.descendants_query(db, block, billable_only=True)] == ["F32.81", "F32.9", "F33.0"]
+
+        # Subsumption in both directions
+        category = index.get_node(db, "icd10", "F32")
+        leaf = index.get_node(db, "icd10", "f32.81")
+        assert index.subsumption(block, leaf) == SUBSUMES_SUBSUMES
+        assert index.subsumption(leaf, block) == SUBSUMES_SUBSUMED_BY
+        assert index.subsumption(category, index.get_node(db, "icd10", "F32")) == SUBSUMES_EQUIVALENT
+        assert index.subsumption(category, index.get_node(db, "icd10", "F20")) == SUBSUMES_NOT_SUBSUMED
+
+        # A range code shared by a block and its only category resolves to the category
+        cholera = index.get_node(db, "icd10", "A00")
+        assert cholera.node_type == "category"
+        assert index.ancestors(db, cholera)[-1].node_type == "block"
+        assert codes(index.descendant_codes(db, "icd10", "A00")) == {"A00", "A00.0", "A00.1"}
+
+        # CPT sections by range code or name; inactive codes are left out of the index
+        medicine = index.get_node(db, "cpt", "Medicine")
+        assert medicine.node_type == "section"
+        assert codes(index.descendant_codes(db, "cpt", medicine.code)) == {"90471"}
+        assert [n.code for n in index.range_query(db, "cpt", "90471", "99212")] == ["90471", "99212"]
+    finally:
+        db.close()
+
+def test_rebuild_runs_once_per_version():
+    seed_database()
+    index = CodeHierarchyIndex()
+    db = SessionLocal()
+    try:
+        version = code_set_version.get()
+        assert not index.rebuild(db, version).get("skipped")
+        assert index.rebuild(db, version)["skipped"]
+        assert not index.rebuild(db, version, force=True).get("skipped")
+        assert not index.ensure_current(db)
+
+        # A new code set version is picked up in the background; reads are not blocked
+        new_version = code_set_version.bump("test")
+        started = time.monotonic()
+        assert index.ensure_current(db)
+        assert time.monotonic() - started < 0.5
+        assert index.get_node(db, "icd10", "F32") is not None
+        index._refresh_thread.join(timeout=10)
+        db.rollback()
+        assert index.built_version(db) == new_version
+        assert not index.ensure_current(db)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("🔄 Testing Code Hierarchy Index")
+    print("=" * 60)
+    try:
+        test_flatten_tree_intervals()
+        test_hierarchy_queries()
+        test_rebuild_runs_once_per_version()
+        print("✅ Code hierarchy tests passed")
+    except AssertionError as e:
+        print(f"❌ Code hierarchy test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the PDF export job manager
+Renders through a stub in the spawn process pool, so ReportLab and PostgreSQL
+are not needed, and checks submit, dedupe, completion, the on-disk cache and
+purging of outputs from an older code set version
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+WORK_DIR = tempfile.mkdtemp(prefix="export_jobs_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.chdir(WORK_DIR)
+
+from app.services.code_set_version import code_set_version  # noqa: E402
+from app.services.export_jobs import (  # noqa: E402
+    JOB_COMPLETED, PDFExportJobManager, SpecialtyNotFoundError
+)
+
+def stub_render(specialty_filter, include_summary, output_path, progress):
+    """Stands in for render_pdf_export; runs in the worker process"""
+    if specialty_filter == "Unknown":
+        raise SpecialtyNotFoundError(f"No codes found for specialty {specialty_filter}")
+    progress("rendering", 50)
+    time.sleep(0.5)
+    with open(output_path, "wb") as f:
+        f.write(b"%PDF-1.4 stub")
+    return {"record_count": 3}
+
+def test_export_jobs():
+    """Identical requests share one render, completed renders are reused until the version changes"""
+    manager = PDFExportJobManager(
+        export_dir=os.path.join(WORK_DIR, "exports"), max_workers=1, poll_interval=0.05, render_func=stub_render
+    )
+    try:
+        first = manager.submit("Cardiology", True)
+        again = manager.submit("Cardiology", True)
+        print(f"   Submitted job {first['job_id']} (version {first['code_set_version']})")
+        assert first["job_id"] == again["job_id"]
+        assert not first["cached"] and not again["cached"]
+        assert len(manager._futures) == 1
+
+        done = asyncio.run(manager.render("Cardiology", True))
+        assert done["status"] == JOB_COMPLETED and done["progress"] == 100
+        assert done["record_count"] == 3
+        with open(done["output_path"], "rb") as f:
+            assert f.read().startswith(b"%PDF")
+
+        cached = manager.submit("Cardiology", True)
+        assert cached["cached"] and cached["job_id"] == first["job_id"]
+        assert manager.get_status(first["job_id"])["is_current"]
+
+        try:
+            asyncio.run(manager.render("Unknown", False))
+            raise AssertionError("expected SpecialtyNotFoundError")
+        except SpecialtyNotFoundError:
+            pass
+
+        # A data sync makes every earlier output stale
+        code_set_version.bump("test")
+        assert not manager.get_status(first["job_id"])["is_current"]
+        renewed = manager.submit("Cardiology", True)
+        print(f"   After the version bump: job {renewed['job_id']} (version {renewed['code_set_version']})")
+        assert renewed["job_id"] != first["job_id"] and not renewed["cached"]
+        assert renewed["code_set_version"] == first["code_set_version"] + 1
+        assert manager.get_status(first["job_id"]) is None
+        assert not os.path.exists(done["output_path"])
+
+        assert asyncio.run(manager.render("Cardiology", True))["status"] == JOB_COMPLETED
+    finally:
+        manager.shutdown()
+
+if __name__ == "__main__":
+    print("🔄 Testing PDF Export Jobs")
+    print("=" * 60)
+    try:
+        test_export_jobs()
+        print("✅ PDF export job test passed")
+    except AssertionError as e:
+        print(f"❌ PDF export job test failed: {e}")
+        sys.exit(1)
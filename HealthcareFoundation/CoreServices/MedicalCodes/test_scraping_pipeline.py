@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the concurrent scraping pipeline
+Runs the pipeline against a local fixture HTTP server and a throwaway SQLite
+database, so no official sources or PostgreSQL instance are needed
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORK_DIR = tempfile.mkdtemp(prefix="scraping_pipeline_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(WORK_DIR, 'codes.db')}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.chdir(WORK_DIR)
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import CPTCode, ICD10Code, HCPCSCode  # noqa: E402
+from app.services.scraping_pipeline import (  # noqa: E402
+    ScrapingPipeline, ValidatorStore, build_official_sources
+)
+
+PAGES_PER_SOURCE = 3
+
+def _table(rows):
+    body = "".join(f"<tr><td>{code}</td><td>{description}</td></tr>" for code, description in rows)
+    return f"<html><body><table>{body}</table></body></html>".encode("utf-8")
+
+FIXTURE_PAGES = {}
+for page in range(PAGES_PER_SOURCE):
+    FIXTURE_PAGES[f"/cpt/{page}"] = _table([(f"9921{page}", f"Office visit level {page}")])
+    FIXTURE_PAGES[f"/icd10/{page}"] = _table([(f"F3{page}.9", f"Depressive episode {page}")])
+    FIXTURE_PAGES[f"/hcpcs/{page}"] = _table([(f"E060{page}", f"Equipment item {page}")])
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves fixture pages with ETag support and tracks concurrency"""
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    full_responses = 0
+    not_modified = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            content = FIXTURE_PAGES.get(self.path)
+            if content is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with cls.lock:
+                    cls.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            with cls.lock:
+                cls.full_responses += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(content)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+def test_scraping_pipeline():
+    """Fetch, upsert, then confirm unchanged pages are skipped on the next run"""
+    Base.metadata.create_all(bind=engine)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        sources = build_official_sources({
+            code_type: [f"{base_url}/{code_type}/{page}" for page in range(PAGES_PER_SOURCE)]
+            for code_type in ("cpt", "icd10", "hcpcs")
+        })
+        pipeline = ScrapingPipeline(
+            sources=sources,
+            validator_store=ValidatorStore(os.path.join(WORK_DIR, "validators.json")),
+            max_concurrency_per_host=2,
+            requests_per_second_per_host=50.0,
+            batch_size=2
+        )
+
+        first = asyncio.run(pipeline.run())
+        print(f"   First run: {first['cpt_codes']} CPT, {first['icd10_codes']} ICD-10, {first['hcpcs_codes']} HCPCS, errors={first['errors']}")
+        assert first["errors"] == 0
+        assert first["cpt_codes"] == first["icd10_codes"] == first["hcpcs_codes"] == PAGES_PER_SOURCE
+        assert FixtureHandler.max_in_flight <= 2, FixtureHandler.max_in_flight
+
+        db = SessionLocal()
+        try:
+            assert db.query(CPTCode).count() == PAGES_PER_SOURCE
+            assert db.query(ICD10Code).count() == PAGES_PER_SOURCE
+            assert db.query(HCPCSCode).count() == PAGES_PER_SOURCE
+        finally:
+            db.close()
+
+        second = asyncio.run(pipeline.run())
+        skipped = sum(stats["pages_not_modified"] for stats in second["sources"].values())
+        print(f"   Second run: {skipped} pages not modified, {second['cpt_codes']} CPT upserted")
+        assert skipped == PAGES_PER_SOURCE * 3
+        assert second["cpt_codes"] == second["icd10_codes"] == second["hcpcs_codes"] == 0
+        assert FixtureHandler.not_modified == PAGES_PER_SOURCE * 3
+
+        forced = asyncio.run(pipeline.run(force=True))
+        print(f"   Forced run: {forced['cpt_codes']} CPT re-upserted")
+        assert forced["cpt_codes"] == PAGES_PER_SOURCE
+
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    print("🔄 Testing Concurrent Scraping Pipeline")
+    print("=" * 60)
+    try:
+        test_scraping_pipeline()
+        print("✅ Scraping pipeline test passed")
+    except AssertionError as e:
+        print(f"❌ Scraping pipeline test failed: {e}")
+        sys.exit(1)
@@ -131,6 +131,7 @@ class ChargeValidationRule(Base):
     error_message = Column(String(255))
     
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 # Indexes for performance
 Index('ix_charges_encounter_id', Charge.encounter_id)
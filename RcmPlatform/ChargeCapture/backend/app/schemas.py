@@ -149,6 +149,22 @@ class BatchChargeResponse(BaseModel):
     created_charges: List[ChargeResponse]
     errors: List[Dict[str, Any]]
 
+class BatchChargeJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    success_count: int
+    error_count: int
+    created_charge_ids: List[uuid.UUID] = []
+    errors: List[Dict[str, Any]] = []
+    charges_per_second: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 # Validation schemas
 class ValidationError(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,100 @@
+# batch_jobs.py
+"""
+Background jobs for very large charge batches.
+
+A job is created when the batch is accepted and runs after the response is
+sent, in its own session, using ChargeService.create_charges_bulk. Progress is
+updated after every committed chunk. Jobs are kept in memory for this process;
+the oldest finished jobs are dropped beyond MAX_JOBS.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.schemas import ChargeCreate
+from app.services.services import ChargeService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchChargeJob:
+    job_id: str
+    total: int
+    status: str = "queued"  # queued, running, completed, failed
+    processed: int = 0
+    success_count: int = 0
+    error_count: int = 0
+    created_charge_ids: List[uuid.UUID] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    charges_per_second: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class BatchChargeJobStore:
+    MAX_JOBS = 100
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self._session_factory = session_factory
+        self._jobs: "OrderedDict[str, BatchChargeJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, total: int) -> BatchChargeJob:
+        job = BatchChargeJob(job_id=str(uuid.uuid4()), total=total)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            finished = [job_id for job_id, j in self._jobs.items() if j.status in ("completed", "failed")]
+            for job_id in finished[:max(0, len(self._jobs) - self.MAX_JOBS)]:
+                del self._jobs[job_id]
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchChargeJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def run(self, job_id: str, charges: List[ChargeCreate], captured_by: uuid.UUID) -> None:
+        """Create the job's charges; meant for BackgroundTasks."""
+        job = self.get(job_id)
+        if job is None:
+            return
+
+        def progress(processed: int, created: int, errors: int) -> None:
+            job.processed, job.success_count, job.error_count = processed, created, errors
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        db = self._session_factory()
+        try:
+            created, errors = ChargeService(db).create_charges_bulk(charges, captured_by, progress=progress)
+            job.created_charge_ids = [row["id"] for row in created]
+            job.errors = errors
+            job.processed = job.total
+            job.success_count, job.error_count = len(created), len(errors)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Batch charge job {job_id} failed: {str(e)}")
+            job.errors.append({"index": None, "error": str(e)})
+            job.status = "failed"
+        finally:
+            db.close()
+            job.finished_at = datetime.utcnow()
+            job.charges_per_second = round(job.processed / max(time.perf_counter() - started, 1e-9), 1)
+
+
+# Global instance
+batch_charge_jobs = BatchChargeJobStore()
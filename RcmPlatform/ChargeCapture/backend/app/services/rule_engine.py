@@ -0,0 +1,252 @@
+# rule_engine.py
+"""
+Compiled charge validation rules.
+
+Active ChargeValidationRule rows are compiled once into frozensets indexed by
+CPT code, so validating a charge only touches the rules that name its CPT.
+The compiled set is cached in-process and rebuilt when the rules version
+changes: locally when a session commits a rule insert/update/delete, and from
+the database fingerprint (row count and latest update) at most every
+RULE_CACHE_CHECK_SECONDS.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, object_session
+
+from app.models.models import ChargeValidationRule
+from app.schemas import ChargeCreate, ChargeValidation, ValidationError
+
+logger = logging.getLogger(__name__)
+
+RULE_CACHE_CHECK_SECONDS = float(os.getenv("RULE_CACHE_CHECK_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_name: str
+    rule_type: str
+    required_icd_codes: FrozenSet[str]
+    error_message: str
+
+    def apply(self, charge_data: ChargeCreate) -> Optional[ValidationError]:
+        if self.rule_type == "code_combination" and charge_data.icd_code not in self.required_icd_codes:
+            return ValidationError(
+                field="icd_code",
+                code="invalid_combination",
+                message=self.error_message,
+                severity="error"
+            )
+        return None
+
+
+class CompiledRuleSet:
+    """Active rules indexed by the CPT codes they apply to."""
+
+    # Rule types with a compiled evaluator; others are kept in the table but never fire
+    SUPPORTED_TYPES = ("code_combination",)
+
+    def __init__(self, rules: Iterable[ChargeValidationRule], version: int):
+        self.version = version
+        self.rule_count = 0
+        index: Dict[str, List[CompiledRule]] = {}
+        for rule in rules:
+            self.rule_count += 1
+            if rule.rule_type not in self.SUPPORTED_TYPES:
+                continue
+            config = rule.rule_config or {}
+            compiled = CompiledRule(
+                rule_name=rule.rule_name,
+                rule_type=rule.rule_type,
+                required_icd_codes=frozenset(config.get("required_icd_codes", [])),
+                error_message=rule.error_message or "Invalid CPT/ICD combination"
+            )
+            for cpt_code in set(config.get("cpt_codes", [])):
+                index.setdefault(cpt_code, []).append(compiled)
+        self.by_cpt: Dict[str, Tuple[CompiledRule, ...]] = {
+            cpt_code: tuple(compiled) for cpt_code, compiled in index.items()
+        }
+
+    def rules_for(self, cpt_code: Optional[str]) -> Tuple[CompiledRule, ...]:
+        return self.by_cpt.get(cpt_code, ())
+
+
+class ChargeRuleEngine:
+    """Validates charges against the cached, compiled rule set."""
+
+    def __init__(self, check_seconds: float = RULE_CACHE_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._version = 0
+        self._compiled: Optional[CompiledRuleSet] = None
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        """Bump the rules version so the next validation recompiles."""
+        with self._lock:
+            self._version += 1
+
+    @staticmethod
+    def _db_fingerprint(db: Session) -> Tuple[Any, ...]:
+        return tuple(db.query(
+            func.count(ChargeValidationRule.id),
+            func.max(ChargeValidationRule.updated_at)
+        ).one())
+
+    def get_rules(self, db: Session) -> CompiledRuleSet:
+        """Compiled active rules, rebuilt only when the version changes."""
+        now = time.monotonic()
+        if self._compiled is not None and now - self._checked_at >= self.check_seconds:
+            fingerprint = self._db_fingerprint(db)
+            with self._lock:
+                self._checked_at = now
+                if fingerprint != self._fingerprint:
+                    self._version += 1
+
+        compiled = self._compiled
+        if compiled is not None and compiled.version == self._version:
+            return compiled
+
+        with self._lock:
+            version = self._version
+        fingerprint = self._db_fingerprint(db)
+        rules = db.query(ChargeValidationRule).filter(ChargeValidationRule.is_active == True).all()
+        compiled = CompiledRuleSet(rules, version)
+        with self._lock:
+            self._compiled = compiled
+            self._fingerprint = fingerprint
+            self._checked_at = now
+        logger.info(f"Compiled {compiled.rule_count} charge validation rules (version {version})")
+        return compiled
+
+    @staticmethod
+    def prefetch_code_validity(
+        medical_code_service, cpt_codes: Iterable[str], icd_codes: Iterable[str]
+    ) -> Tuple[Dict[str, bool], Dict[str, bool]]:
+        """Validity of every distinct code, using the service's batch lookups when it has them."""
+        results = []
+        for codes, batch_name, single_name in (
+            (cpt_codes, "validate_cpt_codes", "validate_cpt_code"),
+            (icd_codes, "validate_icd_codes", "validate_icd_code"),
+        ):
+            codes = sorted({code for code in codes if code})
+            batch = getattr(medical_code_service, batch_name, None)
+            if batch is not None and codes:
+                valid = set(batch(codes))
+                results.append({code: code in valid for code in codes})
+            else:
+                single = getattr(medical_code_service, single_name)
+                results.append({code: bool(single(code)) for code in codes})
+        return results[0], results[1]
+
+    @staticmethod
+    def _basic_errors(charge_data: ChargeCreate) -> List[ValidationError]:
+        errors = []
+        if not charge_data.cpt_code:
+            errors.append(ValidationError(
+                field="cpt_code",
+                code="required",
+                message="CPT code is required",
+                severity="error"
+            ))
+
+        if not charge_data.icd_code:
+            errors.append(ValidationError(
+                field="icd_code",
+                code="required",
+                message="ICD code is required",
+                severity="error"
+            ))
+
+        if charge_data.cpt_code and len(charge_data.cpt_code) != 5:
+            errors.append(ValidationError(
+                field="cpt_code",
+                code="invalid_format",
+                message="CPT code must be 5 digits",
+                severity="error"
+            ))
+        return errors
+
+    def validate_many(
+        self, db: Session, charges: Sequence[ChargeCreate], medical_code_service=None
+    ) -> List[ChargeValidation]:
+        """Validate a batch of charges; results are in input order."""
+        rule_set = self.get_rules(db)
+        cpt_valid: Dict[str, bool] = {}
+        icd_valid: Dict[str, bool] = {}
+        if medical_code_service and charges:
+            cpt_valid, icd_valid = self.prefetch_code_validity(
+                medical_code_service,
+                (charge.cpt_code for charge in charges),
+                (charge.icd_code for charge in charges)
+            )
+
+        results = []
+        for charge_data in charges:
+            errors = self._basic_errors(charge_data)
+            warnings = []
+
+            if cpt_valid.get(charge_data.cpt_code) is False:
+                errors.append(ValidationError(
+                    field="cpt_code",
+                    code="invalid_code",
+                    message="CPT code not found in code database",
+                    severity="error"
+                ))
+            if icd_valid.get(charge_data.icd_code) is False:
+                errors.append(ValidationError(
+                    field="icd_code",
+                    code="invalid_code",
+                    message="ICD code not found in code database",
+                    severity="error"
+                ))
+
+            for rule in rule_set.rules_for(charge_data.cpt_code):
+                rule_result = rule.apply(charge_data)
+                if rule_result:
+                    if rule_result.severity == "error":
+                        errors.append(rule_result)
+                    else:
+                        warnings.append(rule_result)
+
+            results.append(ChargeValidation(
+                is_valid=len(errors) == 0,
+                errors=errors,
+                warnings=warnings
+            ))
+        return results
+
+
+# Global instance
+charge_rule_engine = ChargeRuleEngine()
+
+
+_RULES_CHANGED = "charge_validation_rules_changed"
+
+
+@event.listens_for(ChargeValidationRule, "after_insert")
+@event.listens_for(ChargeValidationRule, "after_update")
+@event.listens_for(ChargeValidationRule, "after_delete")
+def _rules_flushed(mapper, connection, target):
+    # Bumping here would let a concurrent validation cache the old committed rules under the new version
+    session = object_session(target)
+    if session is not None:
+        session.info[_RULES_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _rules_committed(session):
+    if session.info.pop(_RULES_CHANGED, False):
+        charge_rule_engine.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _rules_rolled_back(session):
+    session.info.pop(_RULES_CHANGED, None)
@@ -1,20 +1,27 @@
 # services.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, func, desc, insert
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List, Optional, Dict, Any, Callable
 from datetime import datetime, timedelta
+import os
 import uuid
 
-from app.models.models import Charge, Provider, Patient, Encounter, ChargeTemplate, ChargeValidationRule
+from app.models.models import Charge, Provider, Patient, Encounter, ChargeTemplate
 from app.schemas import (
     ChargeCreate, ChargeUpdate, ChargeSearchParams,
-    ChargeTemplateCreate, ValidationError, ChargeValidation
+    ChargeTemplateCreate, ChargeValidation
 )
+from app.services.rule_engine import ChargeRuleEngine, charge_rule_engine
+
+# Rows inserted and committed per transaction by create_charges_bulk
+CHARGE_BATCH_CHUNK_SIZE = int(os.getenv("CHARGE_BATCH_CHUNK_SIZE", "500"))
 
 class ChargeService:
-    def __init__(self, db: Session, medical_code_service=None):
+    def __init__(self, db: Session, medical_code_service=None, rule_engine: ChargeRuleEngine = charge_rule_engine):
         self.db = db
         self.medical_code_service = medical_code_service  # Your existing service
+        self.rule_engine = rule_engine
     
     def create_charge(self, charge_data: ChargeCreate, captured_by: uuid.UUID) -> Charge:
         """Create a new charge with validation"""
@@ -51,6 +58,114 @@ class ChargeService:
         self.db.refresh(charge)
         return charge
     
+    def create_charges_bulk(
+        self,
+        charges: List[ChargeCreate],
+        captured_by: uuid.UUID,
+        chunk_size: int = CHARGE_BATCH_CHUNK_SIZE,
+        progress: Optional[Callable[[int, int, int], None]] = None
+    ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Validate a batch together and bulk insert the valid charges in chunked transactions.
+        
+        Returns the created charge rows (with ids) and per-index errors. progress, if given,
+        is called after each chunk with (processed, created, errors).
+        """
+        errors = []
+        validations = self.validate_many(charges)
+        missing = self._missing_references(charges)
+        cpt_descriptions, icd_descriptions = self._prefetch_descriptions(charges)
+        
+        now = datetime.utcnow()
+        audit_entry = {
+            "action": "created",
+            "user_id": str(captured_by),
+            "timestamp": now.isoformat(),
+            "details": "Charge created in batch"
+        }
+        rows, indexes = [], []
+        for i, (charge_data, validation) in enumerate(zip(charges, validations)):
+            if not validation.is_valid:
+                errors.append(self._batch_error(i, charge_data, f"Charge validation failed: {validation.errors}"))
+                continue
+            if i in missing:
+                errors.append(self._batch_error(i, charge_data, missing[i]))
+                continue
+            row = charge_data.dict()
+            row["cpt_description"] = row["cpt_description"] or cpt_descriptions.get(row["cpt_code"])
+            row["icd_description"] = row["icd_description"] or icd_descriptions.get(row["icd_code"])
+            row.update(
+                status="draft",
+                captured_by=captured_by,
+                captured_at=now,
+                created_at=now,
+                updated_at=now,
+                validation_errors=[warning.dict() for warning in validation.warnings],
+                audit_log=[audit_entry]
+            )
+            rows.append(row)
+            indexes.append(i)
+        
+        created = []
+        processed = len(charges) - len(rows)
+        statement = insert(Charge).returning(Charge.id, sort_by_parameter_order=True)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                ids = self.db.execute(statement, chunk).scalars().all()
+                self.db.commit()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                errors.extend(
+                    self._batch_error(i, charges[i], f"Insert failed: {e.__class__.__name__}")
+                    for i in indexes[start:start + chunk_size]
+                )
+            else:
+                for row, charge_id in zip(chunk, ids):
+                    row["id"] = charge_id
+                created.extend(chunk)
+            processed += len(chunk)
+            if progress:
+                progress(processed, len(created), len(errors))
+        
+        errors.sort(key=lambda error: error["index"])
+        return created, errors
+    
+    def _missing_references(self, charges: List[ChargeCreate]) -> Dict[int, str]:
+        """Charges whose encounter, patient or provider does not exist, by index"""
+        found = {}
+        for model, field in ((Encounter, "encounter_id"), (Patient, "patient_id"), (Provider, "provider_id")):
+            ids = {getattr(charge_data, field) for charge_data in charges}
+            found[field] = {row_id for (row_id,) in self.db.query(model.id).filter(model.id.in_(ids))} if ids else set()
+        
+        missing = {}
+        for i, charge_data in enumerate(charges):
+            for field, label in (("encounter_id", "Encounter"), ("patient_id", "Patient"), ("provider_id", "Provider")):
+                if getattr(charge_data, field) not in found[field]:
+                    missing[i] = f"{label} {getattr(charge_data, field)} not found"
+                    break
+        return missing
+    
+    def _prefetch_descriptions(self, charges: List[ChargeCreate]) -> tuple[Dict[str, str], Dict[str, str]]:
+        """Descriptions for each distinct code missing one"""
+        if not self.medical_code_service:
+            return {}, {}
+        cpt_codes = {c.cpt_code for c in charges if not c.cpt_description}
+        icd_codes = {c.icd_code for c in charges if not c.icd_description}
+        cpt_info = {code: self.medical_code_service.get_cpt_code(code) for code in cpt_codes}
+        icd_info = {code: self.medical_code_service.get_icd_code(code) for code in icd_codes}
+        return (
+            {code: info.get('description') for code, info in cpt_info.items() if info},
+            {code: info.get('description') for code, info in icd_info.items() if info}
+        )
+    
+    @staticmethod
+    def _batch_error(index: int, charge_data: ChargeCreate, error: str) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "charge_data": charge_data.dict(),
+            "error": error
+        }
+    
     def update_charge(self, charge_id: uuid.UUID, charge_data: ChargeUpdate, updated_by: uuid.UUID) -> Optional[Charge]:
         """Update an existing charge"""
         charge = self.db.query(Charge).filter(Charge.id == charge_id).first()
@@ -134,91 +249,11 @@ class ChargeService:
     
     def validate_charge(self, charge_data: ChargeCreate) -> ChargeValidation:
         """Validate charge data against business rules"""
-        errors = []
-        warnings = []
-        
-        # Basic validation
-        if not charge_data.cpt_code:
-            errors.append(ValidationError(
-                field="cpt_code",
-                code="required",
-                message="CPT code is required",
-                severity="error"
-            ))
-        
-        if not charge_data.icd_code:
-            errors.append(ValidationError(
-                field="icd_code",
-                code="required",
-                message="ICD code is required",
-                severity="error"
-            ))
-        
-        # Code format validation
-        if charge_data.cpt_code and len(charge_data.cpt_code) != 5:
-            errors.append(ValidationError(
-                field="cpt_code",
-                code="invalid_format",
-                message="CPT code must be 5 digits",
-                severity="error"
-            ))
-        
-        # Validate against medical code service
-        if self.medical_code_service and charge_data.cpt_code:
-            if not self.medical_code_service.validate_cpt_code(charge_data.cpt_code):
-                errors.append(ValidationError(
-                    field="cpt_code",
-                    code="invalid_code",
-                    message="CPT code not found in code database",
-                    severity="error"
-                ))
-        
-        if self.medical_code_service and charge_data.icd_code:
-            if not self.medical_code_service.validate_icd_code(charge_data.icd_code):
-                errors.append(ValidationError(
-                    field="icd_code",
-                    code="invalid_code",
-                    message="ICD code not found in code database",
-                    severity="error"
-                ))
-        
-        # Business rule validation
-        validation_rules = self.db.query(ChargeValidationRule)\
-            .filter(ChargeValidationRule.is_active == True)\
-            .all()
-        
-        for rule in validation_rules:
-            rule_result = self._apply_validation_rule(rule, charge_data)
-            if rule_result:
-                if rule_result.severity == "error":
-                    errors.append(rule_result)
-                else:
-                    warnings.append(rule_result)
-        
-        return ChargeValidation(
-            is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings
-        )
+        return self.validate_many([charge_data])[0]
     
-    def _apply_validation_rule(self, rule: ChargeValidationRule, charge_data: ChargeCreate) -> Optional[ValidationError]:
-        """Apply a specific validation rule"""
-        # This is where you'd implement specific business rules
-        # Example: check if certain CPT/ICD combinations are valid
-        
-        if rule.rule_type == "code_combination":
-            # Example rule: certain CPT codes require specific ICD codes
-            config = rule.rule_config
-            if (charge_data.cpt_code in config.get("cpt_codes", []) and
-                charge_data.icd_code not in config.get("required_icd_codes", [])):
-                return ValidationError(
-                    field="icd_code",
-                    code="invalid_combination",
-                    message=rule.error_message or "Invalid CPT/ICD combination",
-                    severity="error"
-                )
-        
-        return None
+    def validate_many(self, charges: List[ChargeCreate]) -> List[ChargeValidation]:
+        """Validate a batch of charges against the compiled business rules"""
+        return self.rule_engine.validate_many(self.db, charges, self.medical_code_service)
     
     def get_missed_charges(self, date_from: datetime, date_to: datetime) -> List[Dict[str, Any]]:
         """Find encounters without charges (missed charges)"""
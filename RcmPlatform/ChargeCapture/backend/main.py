@@ -9,9 +9,10 @@ import uuid
 from app.database import get_db  # Fixed import path
 from app.models.models import Charge, Provider, Patient, Encounter, ChargeTemplate, ChargeValidationRule
 from app.services import ChargeService, ChargeTemplateService, ReportingService
+from app.services.batch_jobs import batch_charge_jobs
 from app.schemas import (
     ChargeCreate, ChargeUpdate, ChargeResponse, ChargeSearchParams, ChargeSearchResponse,
-    ChargeTemplateCreate, ChargeTemplateResponse, BatchChargeCreate, BatchChargeResponse,
+    ChargeTemplateCreate, ChargeTemplateResponse, BatchChargeCreate, BatchChargeResponse, BatchChargeJobResponse,
     ChargeValidation, ChargeMetrics, ProviderMetrics, EncounterResponse, PatientResponse
 )
 from app.api.agent import router as agent_router
@@ -134,33 +135,39 @@ async def validate_charge(
 @app.post("/charges/batch", response_model=BatchChargeResponse)
 async def create_batch_charges(
     batch_data: BatchChargeCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: uuid.UUID = Depends(get_current_user)
 ):
-    """Create multiple charges in batch"""
+    """Create multiple charges in batch (validated together, inserted in chunked transactions)"""
     charge_service = ChargeService(db)
-    created_charges = []
-    errors = []
-    
-    for i, charge_data in enumerate(batch_data.charges):
-        try:
-            charge = charge_service.create_charge(charge_data, current_user)
-            created_charges.append(ChargeResponse.from_orm(charge))
-        except Exception as e:
-            errors.append({
-                "index": i,
-                "charge_data": charge_data.dict(),
-                "error": str(e)
-            })
+    created_charges, errors = charge_service.create_charges_bulk(batch_data.charges, current_user)
     
     return BatchChargeResponse(
         success_count=len(created_charges),
         error_count=len(errors),
-        created_charges=created_charges,
+        created_charges=[ChargeResponse(**charge) for charge in created_charges],
         errors=errors
     )
 
+@app.post("/charges/batch/jobs", response_model=BatchChargeJobResponse, status_code=202)
+async def create_batch_charge_job(
+    batch_data: BatchChargeCreate,
+    background_tasks: BackgroundTasks,
+    current_user: uuid.UUID = Depends(get_current_user)
+):
+    """Queue a very large batch; poll the job for progress and per-index errors"""
+    job = batch_charge_jobs.create(len(batch_data.charges))
+    background_tasks.add_task(batch_charge_jobs.run, job.job_id, batch_data.charges, current_user)
+    return BatchChargeJobResponse(**job.to_dict())
+
+@app.get("/charges/batch/jobs/{job_id}", response_model=BatchChargeJobResponse)
+async def get_batch_charge_job(job_id: str = Path(..., description="Batch job ID")):
+    """Get the status of a batch charge job"""
+    job = batch_charge_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return BatchChargeJobResponse(**job.to_dict())
+
 @app.post("/charges/{charge_id}/submit")
 async def submit_charge_to_billing(
     charge_id: uuid.UUID = Path(..., description="Charge ID"),
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for batch charge creation.
+
+Seeds a provider, patient and encounters, then times the per-charge path
+(ChargeService.create_charge, one commit each) against the bulk path
+(ChargeService.create_charges_bulk, chunked transactions) on DATABASE_URL.
+Everything it creates is deleted afterwards. Results are printed as JSON.
+
+    python scripts/benchmark_batch_charges.py --charges 2000
+    python scripts/benchmark_batch_charges.py --charges 20000 --chunk-size 1000 --skip-per-charge
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models.models import Charge, Encounter, Patient, Provider  # noqa: E402
+from app.schemas import ChargeCreate  # noqa: E402
+from app.services.services import ChargeService  # noqa: E402
+
+CPT_CODES = ["99212", "99213", "99214", "99215", "93000", "36415", "81002", "90471"]
+ICD_CODES = ["I10", "E11.9", "Z00.00", "J06.9", "M54.5", "R51"]
+
+
+def seed(db, encounters):
+    suffix = uuid.uuid4().hex[:8]
+    provider = Provider(first_name="Bench", last_name="Provider", npi=suffix[:10], specialty="Internal Medicine")
+    patient = Patient(first_name="Bench", last_name="Patient", date_of_birth=datetime(1970, 1, 1), mrn=f"BENCH-{suffix}")
+    db.add_all([provider, patient])
+    db.flush()
+    rows = [
+        Encounter(patient_id=patient.id, provider_id=provider.id, encounter_date=datetime.utcnow(),
+                  encounter_type="office_visit", status="completed")
+        for _ in range(encounters)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return provider.id, patient.id, [row.id for row in rows]
+
+
+def make_charges(count, provider_id, patient_id, encounter_ids):
+    return [
+        ChargeCreate(
+            encounter_id=encounter_ids[i % len(encounter_ids)],
+            patient_id=patient_id,
+            provider_id=provider_id,
+            cpt_code=CPT_CODES[i % len(CPT_CODES)],
+            icd_code=ICD_CODES[i % len(ICD_CODES)],
+            units=1,
+            charge_amount=125,
+            capture_method="batch"
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    created = func()
+    elapsed = time.perf_counter() - started
+    return {
+        "path": label,
+        "charges": count,
+        "created": created,
+        "seconds": round(elapsed, 3),
+        "charges_per_second": round(count / max(elapsed, 1e-9), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-charge vs bulk batch charge creation")
+    parser.add_argument("--charges", type=int, default=2000)
+    parser.add_argument("--encounters", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--skip-per-charge", action="store_true", help="Only time the bulk path")
+    args = parser.parse_args()
+
+    engine.echo = False
+    user_id = uuid.uuid4()
+    db = SessionLocal()
+    provider_id, patient_id, encounter_ids = seed(db, args.encounters)
+    results = []
+    try:
+        if not args.skip_per_charge:
+            charges = make_charges(args.charges, provider_id, patient_id, encounter_ids)
+            service = ChargeService(db)
+            results.append(timed("per_charge", args.charges, lambda: sum(
+                1 for charge_data in charges if service.create_charge(charge_data, user_id)
+            )))
+
+        charges = make_charges(args.charges, provider_id, patient_id, encounter_ids)
+        service = ChargeService(db)
+        results.append(timed(f"bulk_chunk_{args.chunk_size}", args.charges, lambda: len(
+            service.create_charges_bulk(charges, user_id, chunk_size=args.chunk_size)[0]
+        )))
+
+        if len(results) == 2:
+            results.append({"speedup": round(results[1]["charges_per_second"] / results[0]["charges_per_second"], 1)})
+        print(json.dumps(results, indent=2))
+    finally:
+        db.rollback()
+        db.query(Charge).filter(Charge.provider_id == provider_id).delete(synchronize_session=False)
+        db.query(Encounter).filter(Encounter.provider_id == provider_id).delete(synchronize_session=False)
+        db.query(Patient).filter(Patient.id == patient_id).delete(synchronize_session=False)
+        db.query(Provider).filter(Provider.id == provider_id).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -104,7 +104,8 @@ CREATE TABLE charge_validation_rules (
     is_active BOOLEAN DEFAULT TRUE,
     error_message VARCHAR(255),
     
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create indexes for performance
@@ -140,6 +141,9 @@ CREATE TRIGGER update_charges_updated_at BEFORE UPDATE ON charges
 CREATE TRIGGER update_charge_templates_updated_at BEFORE UPDATE ON charge_templates
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_charge_validation_rules_updated_at BEFORE UPDATE ON charge_validation_rules
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- Insert sample data for testing
 INSERT INTO providers (first_name, last_name, npi, specialty) VALUES
 ('John', 'Smith', '1234567890', 'Cardiology'),
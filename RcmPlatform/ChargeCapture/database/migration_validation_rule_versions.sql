@@ -0,0 +1,9 @@
+-- Track rule changes so the backend's compiled rule cache can detect them
+ALTER TABLE charge_validation_rules
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+UPDATE charge_validation_rules SET updated_at = created_at WHERE updated_at IS NULL;
+
+DROP TRIGGER IF EXISTS update_charge_validation_rules_updated_at ON charge_validation_rules;
+CREATE TRIGGER update_charge_validation_rules_updated_at BEFORE UPDATE ON charge_validation_rules
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -6,12 +6,19 @@ from langgraph.prebuilt import ToolExecutor, ToolInvocation
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain.schema import BaseMessage
 from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import json
+import threading
+import time
 import uuid
 from datetime import datetime
 
 from .state import ClaimsAgentState
 from .tools import ClaimsTools
+from .monitoring import get_agent_metrics
+from .tool_cache import READ_ONLY_TOOLS, get_tool_result_cache
+from ..config import agent_settings
 from ..schemas.agent import TaskType, AgentStatus, AgentResponse
 
 class ClaimsProcessingGraph:
@@ -20,7 +27,17 @@ class ClaimsProcessingGraph:
     def __init__(self, llm, tools_instance: ClaimsTools):
         self.llm = llm
         self.tools = tools_instance.get_tools()
+        self.tools_by_name = {tool.name: tool for tool in self.tools}
         self.tool_executor = ToolExecutor(self.tools)
+        # Tools share their instance's Session, so each executor thread builds its own set
+        self._tools_factory = type(tools_instance)
+        self._worker_state = threading.local()
+        self.tool_pool = ThreadPoolExecutor(
+            max_workers=agent_settings.TOOL_MAX_CONCURRENCY,
+            thread_name_prefix="agent-tool"
+        )
+        self.tool_cache = get_tool_result_cache()
+        self.metrics = get_agent_metrics()
         self.graph = self._build_graph()
     
     def _build_graph(self) -> StateGraph:
@@ -168,37 +185,66 @@ class ClaimsProcessingGraph:
         
         return state
     
-    def _execute_tools(self, state: ClaimsAgentState) -> ClaimsAgentState:
-        """Execute the required tools"""
+    async def _execute_tools(self, state: ClaimsAgentState) -> ClaimsAgentState:
+        """Execute the required tools, running each wave of the plan concurrently"""
         
         state.add_thought("Executing tools based on plan")
         
         tool_results = {}
-        required_tools = state.processed_data.get("required_tools", [])
+        plan = self._build_execution_plan(state.processed_data.get("required_tools", []))
+        state.processed_data["execution_plan"] = plan
+        loop = asyncio.get_running_loop()
         
-        for tool_name in required_tools:
-            try:
+        for wave in plan:
+            calls = []
+            for tool_name in wave:
                 state.add_action(f"Executing tool: {tool_name}")
                 
-                # Prepare tool arguments based on context and task type
+                # Prepared per wave so arguments can use results of earlier waves
                 tool_args = self._prepare_tool_args(tool_name, state)
+                calls.append(loop.run_in_executor(self.tool_pool, self._execute_single_tool, tool_name, tool_args))
+            
+            outcomes = await asyncio.gather(*calls, return_exceptions=True)
+            
+            for tool_name, outcome in zip(wave, outcomes):
+                if isinstance(outcome, Exception):
+                    error_msg = f"Error executing tool {tool_name}: {str(outcome)}"
+                    state.errors.append(error_msg)
+                    state.add_thought(error_msg)
+                    continue
                 
-                # Execute tool
-                tool_result = self._execute_single_tool(tool_name, tool_args)
-                tool_results[tool_name] = tool_result
-                
+                tool_results[tool_name] = outcome
                 state.tools_used.append(tool_name)
                 state.add_thought(f"Tool {tool_name} executed successfully")
                 
-            except Exception as e:
-                error_msg = f"Error executing tool {tool_name}: {str(e)}"
-                state.errors.append(error_msg)
-                state.add_thought(error_msg)
+                # A claim created from an EDI file is the one later tools work on
+                if tool_name == "process_edi_file" and "claim_id" not in state.context:
+                    try:
+                        state.context["claim_id"] = json.loads(outcome)["claim_id"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        pass
         
         state.processed_data["tool_results"] = tool_results
         
         return state
     
+    def _build_execution_plan(self, tool_names: List[str]) -> List[List[str]]:
+        """
+        Group the planned tools into waves that can run concurrently.
+        Consecutive read-only tools share a wave; a state-changing tool runs
+        alone, after every tool planned before it and before every tool after it.
+        """
+        
+        waves: List[List[str]] = []
+        for tool_name in dict.fromkeys(tool_names):
+            if (tool_name in READ_ONLY_TOOLS and waves
+                    and all(planned in READ_ONLY_TOOLS for planned in waves[-1])):
+                waves[-1].append(tool_name)
+            else:
+                waves.append([tool_name])
+        
+        return waves
+    
     def _synthesize_results(self, state: ClaimsAgentState) -> ClaimsAgentState:
         """Synthesize the results from tool executions"""
         
@@ -369,16 +415,49 @@ class ClaimsProcessingGraph:
         
         return args
     
+    def _worker_tools(self) -> Dict[str, Any]:
+        """Tools bound to the current executor thread's own database session"""
+        
+        tools = getattr(self._worker_state, "tools", None)
+        if tools is None:
+            tools = {tool.name: tool for tool in self._tools_factory().get_tools()}
+            self._worker_state.tools = tools
+        return tools
+    
     def _execute_single_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
-        """Execute a single tool with given arguments"""
+        """Execute a single tool with given arguments on an executor thread"""
         
-        # Find the tool by name
-        tool = next((t for t in self.tools if t.name == tool_name), None)
-        if not tool:
+        if tool_name not in self.tools_by_name:
             raise ValueError(f"Tool {tool_name} not found")
         
-        # Execute the tool
-        return tool.run(args) if args else tool.run({})
+        read_only = tool_name in READ_ONLY_TOOLS
+        start = time.perf_counter()
+        
+        if read_only:
+            cached = self.tool_cache.get(tool_name, args)
+            if cached is not None:
+                self.metrics.record_tool_execution(tool_name, time.perf_counter() - start, True, cached=True)
+                return cached
+        
+        tool = self._worker_tools()[tool_name]
+        success = False
+        try:
+            result = tool.run(args)
+            # Tools report failures as "Error ..." strings instead of raising
+            success = not (isinstance(result, str) and result.startswith("Error"))
+        finally:
+            self.metrics.record_tool_execution(tool_name, time.perf_counter() - start, success)
+            # Ends the read transaction so the next call sees fresh rows, and frees the connection
+            db = getattr(tool, "db", None)
+            if db is not None:
+                db.close()
+        
+        if not read_only:
+            self.tool_cache.invalidate()
+        elif success:
+            self.tool_cache.set(tool_name, args, result)
+        
+        return result
     
     def _extract_validation_insights(self, state: ClaimsAgentState, tool_results: Dict[str, Any]):
         """Extract insights from validation results"""
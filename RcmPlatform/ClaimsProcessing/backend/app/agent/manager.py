@@ -13,6 +13,8 @@ from sqlalchemy.orm import Session
 # from .model_factory import ModelFactory
 # from ..config import agent_settings
 from ..database.connection import SessionLocal
+from ..config import settings, agent_settings
+from .task_store import TaskStore, create_task_store
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +25,16 @@ class AgentManager:
         # self.settings = agent_settings
         self.agent = None
         self.tools = None
-        self.active_tasks: Dict[str, Any] = {}
-        self.task_history: Dict[str, Any] = {}
+        self.task_store: TaskStore = create_task_store(
+            settings.REDIS_URL,
+            max_entries=agent_settings.TASK_STORE_MAX_ENTRIES,
+            ttl_seconds=agent_settings.TASK_TTL_HOURS * 3600
+        )
+    
+    @property
+    def active_tasks(self) -> Dict[str, Any]:
+        """Tasks still running on any worker"""
+        return self.task_store.active_tasks()
         
     async def initialize(self):
         """Mock initialization"""
@@ -37,11 +47,12 @@ class AgentManager:
         task_id = request.get("task_id") or f"task_{datetime.utcnow().timestamp()}"
         
         # Track active task
-        self.active_tasks[task_id] = {
+        task = {
             "start_time": datetime.utcnow(),
             "request": request,
             "status": "processing"
         }
+        self.task_store.put(task_id, task, active=True)
         
         # Mock response
         mock_response = {
@@ -56,43 +67,29 @@ class AgentManager:
             "completed_at": datetime.utcnow()
         }
         
-        # Update task tracking
-        self.active_tasks[task_id]["status"] = "completed"
-        self.active_tasks[task_id]["end_time"] = datetime.utcnow()
-        
-        # Move to history
-        self.task_history[task_id] = self.active_tasks.pop(task_id)
+        # Move to history with its result
+        task["status"] = "completed"
+        task["end_time"] = datetime.utcnow()
+        task["result"] = mock_response
+        self.task_store.put(task_id, task, active=False)
         
         return mock_response
     
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get status of a task"""
-        
-        if task_id in self.active_tasks:
-            return self.active_tasks[task_id]
-        elif task_id in self.task_history:
-            return self.task_history[task_id]
-        else:
-            return None
+        """Get status of a task, including tasks handled by other workers"""
+        return self.task_store.get(task_id)
     
     def get_active_tasks(self) -> Dict[str, Any]:
         """Get all active tasks"""
-        return self.active_tasks.copy()
+        return self.active_tasks
     
     def cleanup_old_tasks(self, max_age_hours: int = 24):
-        """Clean up old tasks from history"""
-        
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-        
-        to_remove = []
-        for task_id, task_info in self.task_history.items():
-            if task_info.get("end_time", datetime.utcnow()) < cutoff_time:
-                to_remove.append(task_id)
+        """Clean up tasks that finished more than max_age_hours ago"""
         
-        for task_id in to_remove:
-            del self.task_history[task_id]
+        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+        removed = self.task_store.remove_finished_before(cutoff_time)
         
-        logger.info(f"Cleaned up {len(to_remove)} old tasks")
+        logger.info(f"Cleaned up {removed} old tasks")
 
 # Global agent manager instance
 _agent_manager = None
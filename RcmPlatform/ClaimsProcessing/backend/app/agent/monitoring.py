@@ -18,6 +18,7 @@ class AgentMetrics:
         self.task_history = deque(maxlen=max_history_size)
         self.error_history = deque(maxlen=max_history_size)
         self.performance_metrics = defaultdict(list)
+        self.tool_history = deque(maxlen=max_history_size)
         
     def record_task_completion(self, 
                              task_type: str, 
@@ -59,6 +60,49 @@ class AgentMetrics:
         
         self.error_history.append(error_record)
     
+    def record_tool_execution(self, tool_name: str, duration: float, success: bool, cached: bool = False):
+        """Record the latency of a single tool call"""
+        
+        self.tool_history.append({
+            "timestamp": datetime.utcnow(),
+            "tool_name": tool_name,
+            "duration": duration,
+            "success": success,
+            "cached": cached
+        })
+    
+    def get_tool_latency_summary(self, hours_back: int = 24) -> Dict[str, Any]:
+        """Per-tool call counts, cache hits and latency percentiles (seconds)"""
+        
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+        
+        durations = defaultdict(list)
+        counts = defaultdict(lambda: {"calls": 0, "successes": 0, "cache_hits": 0})
+        for call in self.tool_history:
+            if call["timestamp"] < cutoff_time:
+                continue
+            stats = counts[call["tool_name"]]
+            stats["calls"] += 1
+            stats["successes"] += 1 if call["success"] else 0
+            if call["cached"]:
+                stats["cache_hits"] += 1
+            else:
+                durations[call["tool_name"]].append(call["duration"])
+        
+        summary = {}
+        for tool_name, stats in counts.items():
+            executed = sorted(durations[tool_name])
+            summary[tool_name] = {
+                "calls": stats["calls"],
+                "success_rate": round(stats["successes"] / stats["calls"] * 100, 2),
+                "cache_hit_rate": round(stats["cache_hits"] / stats["calls"] * 100, 2),
+                "avg_latency": round(sum(executed) / len(executed), 4) if executed else None,
+                "p95_latency": round(executed[min(len(executed) - 1, int(len(executed) * 0.95))], 4) if executed else None,
+                "max_latency": round(executed[-1], 4) if executed else None
+            }
+        
+        return summary
+    
     def get_performance_summary(self, hours_back: int = 24) -> Dict[str, Any]:
         """Get performance summary for the last N hours"""
         
@@ -0,0 +1,243 @@
+# =============================================================================
+# FILE: backend/app/agent/task_store.py
+# =============================================================================
+import heapq
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Task records at least this large (mostly tool outputs) are stored zlib-compressed
+COMPRESSION_THRESHOLD = 4096
+_PLAIN = b"j"
+_COMPRESSED = b"z"
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+def encode_task(record: Dict[str, Any]) -> bytes:
+    """Serialize a task record, compressing large ones"""
+    data = json.dumps(record, default=_json_default).encode("utf-8")
+    if len(data) >= COMPRESSION_THRESHOLD:
+        return _COMPRESSED + zlib.compress(data, 6)
+    return _PLAIN + data
+
+def decode_task(payload: bytes) -> Dict[str, Any]:
+    """Inverse of encode_task"""
+    marker, data = payload[:1], payload[1:]
+    if marker == _COMPRESSED:
+        data = zlib.decompress(data)
+    return json.loads(data)
+
+class InMemoryTaskStore:
+    """
+    Bounded, process-local task store.
+
+    Finished tasks live in an LRU capped at max_entries and expire ttl_seconds
+    after they finish. Expiry walks a heap ordered by expiry time, so it only
+    touches the tasks that are actually due instead of scanning every task.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._active: Dict[str, bytes] = {}
+        self._finished: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._expiry_index: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def put(self, task_id: str, record: Dict[str, Any], active: bool):
+        payload = encode_task(record)
+        with self._lock:
+            if active:
+                self._active[task_id] = payload
+                return
+            self._active.pop(task_id, None)
+            expires_at = time.time() + self.ttl_seconds
+            self._finished[task_id] = (expires_at, payload)
+            self._finished.move_to_end(task_id)
+            heapq.heappush(self._expiry_index, (expires_at, task_id))
+            self._expire_locked(time.time())
+            while len(self._finished) > self.max_entries:
+                self._finished.popitem(last=False)
+            # LRU evictions and re-puts leave stale index entries behind; rebuild
+            # the index from the live tasks so it stays proportional to max_entries
+            if len(self._expiry_index) > 2 * max(self.max_entries, 1):
+                self._expiry_index = [(entry[0], key) for key, entry in self._finished.items()]
+                heapq.heapify(self._expiry_index)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._active.get(task_id)
+            if payload is None:
+                entry = self._finished.get(task_id)
+                if entry is None or entry[0] <= time.time():
+                    return None
+                self._finished.move_to_end(task_id)
+                payload = entry[1]
+        return decode_task(payload)
+
+    def active_tasks(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            payloads = dict(self._active)
+        return {task_id: decode_task(payload) for task_id, payload in payloads.items()}
+
+    def remove_finished_before(self, cutoff: float) -> int:
+        """Drop finished tasks that finished before the cutoff (epoch seconds)"""
+        with self._lock:
+            return self._expire_locked(cutoff + self.ttl_seconds)
+
+    def _expire_locked(self, now: float) -> int:
+        removed = 0
+        while self._expiry_index and self._expiry_index[0][0] <= now:
+            expires_at, task_id = heapq.heappop(self._expiry_index)
+            entry = self._finished.get(task_id)
+            # Skip index entries superseded by a later put or already evicted by the LRU
+            if entry is not None and entry[0] == expires_at:
+                del self._finished[task_id]
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._active) + len(self._finished)
+
+class RedisTaskStore:
+    """
+    Durable task store shared by every worker.
+
+    Each task is one key with a TTL, so Redis expires finished tasks itself;
+    a sorted set scored by finish time answers age-based cleanup with a range
+    query, and a set tracks the tasks still running.
+    """
+
+    def __init__(self, client: "redis.Redis", ttl_seconds: float = 86400, key_prefix: str = "agent:task"):
+        self.client = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.key_prefix = key_prefix
+        self.finished_key = f"{key_prefix}s:finished"
+        self.active_key = f"{key_prefix}s:active"
+
+    def _key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:{task_id}"
+
+    def put(self, task_id: str, record: Dict[str, Any], active: bool):
+        pipe = self.client.pipeline()
+        pipe.set(self._key(task_id), encode_task(record), ex=self.ttl_seconds)
+        if active:
+            pipe.sadd(self.active_key, task_id)
+        else:
+            pipe.srem(self.active_key, task_id)
+            pipe.zadd(self.finished_key, {task_id: time.time()})
+        pipe.execute()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        payload = self.client.get(self._key(task_id))
+        return decode_task(payload) if payload is not None else None
+
+    def active_tasks(self) -> Dict[str, Dict[str, Any]]:
+        task_ids = sorted(member.decode() if isinstance(member, bytes) else member
+                          for member in self.client.smembers(self.active_key))
+        if not task_ids:
+            return {}
+        payloads = self.client.mget([self._key(task_id) for task_id in task_ids])
+        tasks = {}
+        expired = []
+        for task_id, payload in zip(task_ids, payloads):
+            if payload is None:
+                expired.append(task_id)
+            else:
+                tasks[task_id] = decode_task(payload)
+        if expired:
+            self.client.srem(self.active_key, *expired)
+        return tasks
+
+    def remove_finished_before(self, cutoff: float) -> int:
+        task_ids = self.client.zrangebyscore(self.finished_key, "-inf", cutoff)
+        if not task_ids:
+            return 0
+        pipe = self.client.pipeline()
+        pipe.delete(*[self._key(task_id.decode() if isinstance(task_id, bytes) else task_id) for task_id in task_ids])
+        pipe.zrem(self.finished_key, *task_ids)
+        # Index entries whose keys Redis has already expired
+        pipe.zremrangebyscore(self.finished_key, "-inf", time.time() - self.ttl_seconds)
+        deleted = pipe.execute()[0]
+        return deleted
+
+class TaskStore:
+    """
+    Agent task store: an in-memory LRU tier in front of an optional durable
+    tier. Reads fall through to the durable tier, so a task started on one
+    worker can be looked up from any other.
+    """
+
+    def __init__(self, memory: InMemoryTaskStore, durable: Optional[RedisTaskStore] = None):
+        self.memory = memory
+        self.durable = durable
+
+    def put(self, task_id: str, record: Dict[str, Any], active: bool = False):
+        self.memory.put(task_id, record, active)
+        if self.durable is not None:
+            try:
+                self.durable.put(task_id, record, active)
+            except Exception as e:
+                logger.warning(f"Could not persist agent task {task_id}: {e}")
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        record = self.memory.get(task_id)
+        if record is not None or self.durable is None:
+            return record
+        try:
+            return self.durable.get(task_id)
+        except Exception as e:
+            logger.warning(f"Could not load agent task {task_id}: {e}")
+            return None
+
+    def active_tasks(self) -> Dict[str, Dict[str, Any]]:
+        if self.durable is not None:
+            try:
+                return self.durable.active_tasks()
+            except Exception as e:
+                logger.warning(f"Could not list active agent tasks: {e}")
+        return self.memory.active_tasks()
+
+    def remove_finished_before(self, cutoff: datetime) -> int:
+        timestamp = cutoff.timestamp()
+        removed = self.memory.remove_finished_before(timestamp)
+        if self.durable is not None:
+            try:
+                removed = max(removed, self.durable.remove_finished_before(timestamp))
+            except Exception as e:
+                logger.warning(f"Could not clean up agent tasks: {e}")
+        return removed
+
+def create_task_store(redis_url: Optional[str], max_entries: int, ttl_seconds: float) -> TaskStore:
+    """Build the task store, using Redis as the durable tier when it is reachable"""
+    memory = InMemoryTaskStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if not redis_url or not REDIS_AVAILABLE:
+        logger.info("Agent task store: in-memory only")
+        return TaskStore(memory)
+    try:
+        client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+        client.ping()
+    except Exception as e:
+        logger.warning(f"Agent task store: Redis unavailable ({e}), using in-memory only")
+        return TaskStore(memory)
+    logger.info("Agent task store: in-memory LRU with Redis persistence")
+    return TaskStore(memory, RedisTaskStore(client, ttl_seconds=ttl_seconds))
@@ -0,0 +1,75 @@
+# =============================================================================
+# FILE: backend/app/agent/tool_cache.py
+# =============================================================================
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# Tools that only read claims data; their results can be reused until the TTL
+# expires or a state-changing tool runs
+READ_ONLY_TOOLS = frozenset({
+    "get_claim",
+    "get_payer_info",
+    "search_claims",
+    "analyze_rejection",
+    "generate_report",
+    "get_dashboard_stats",
+    "calculate_financial_metrics"
+})
+
+class ToolResultCache:
+    """Short-TTL, process-local cache of read-only tool results keyed by (tool, args)"""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(tool_name: str, args: Dict[str, Any]) -> Tuple[str, str]:
+        return tool_name, json.dumps(args, sort_keys=True, default=str)
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Optional[Any]:
+        key = self._key(tool_name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, tool_name: str, args: Dict[str, Any], value: Any):
+        key = self._key(tool_name, args)
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop expired entries first, then the oldest insertion
+                now = time.monotonic()
+                for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+# Global cache instance
+_tool_result_cache = None
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Get the global tool result cache"""
+    global _tool_result_cache
+    if _tool_result_cache is None:
+        from ..config import agent_settings
+        _tool_result_cache = ToolResultCache(ttl_seconds=agent_settings.TOOL_CACHE_TTL_SECONDS)
+    return _tool_result_cache
@@ -276,4 +276,4 @@ async def get_tool_usage_metrics():
             "average_duration": stats["total_duration"] / stats["usage_count"] if stats["usage_count"] > 0 else 0
         }
     
-    return {"tool_metrics": result}
+    return {"tool_metrics": result, "tool_latency": metrics.get_tool_latency_summary()}
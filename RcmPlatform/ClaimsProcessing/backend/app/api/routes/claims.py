@@ -1,9 +1,10 @@
 # =============================================================================
 # FILE: backend/app/api/routes/claims.py
 # =============================================================================
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ...database.connection import get_db
 from ...database.models import Claim, ClaimStatus, WorkQueue, WorkQueueStatus, WorkQueuePriority
@@ -14,9 +15,13 @@ from ...schemas.claims import (
     WorkQueueAssignment,
     WorkQueueUpdate,
     WorkQueueItem,
-    WorkQueueSummary
+    WorkQueueSummary,
+    BatchUploadResult,
+    BatchValidationRequest,
+    BatchValidationResult
 )
 from ...services.claim_processor import ClaimProcessor
+from ...services.work_queue import WorkQueueService, work_queue_summary_cache
 
 router = APIRouter()
 
@@ -32,13 +37,13 @@ def create_claim(claim: ClaimCreate, db: Session = Depends(get_db)):
     # you'd need to generate EDI from the structured data
     return {"message": "Claim creation from structured data not yet implemented"}
 
-@router.post("/upload", response_model=ClaimSchema)
+@router.post("/upload", response_model=BatchUploadResult)
 async def upload_claim_file(
     file: UploadFile = File(...),
     payer_id: int = 1,
     db: Session = Depends(get_db)
 ):
-    """Upload and process an EDI claim file"""
+    """Upload and process an EDI claim file; every claim in every ST/SE transaction is ingested"""
     
     if not file.filename.endswith(('.edi', '.txt', '.x12')):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload .edi, .txt, or .x12 files")
@@ -48,9 +53,8 @@ async def upload_claim_file(
         edi_content = content.decode('utf-8')
         
         processor = ClaimProcessor(db)
-        claim = processor.create_claim_from_edi(edi_content, payer_id)
-        
-        return claim
+        # Large batches take seconds to persist; keep the event loop free
+        return await run_in_threadpool(processor.create_claims_from_edi_batch, edi_content, payer_id, file.filename)
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
@@ -98,6 +102,16 @@ def update_claim(claim_id: int, claim_update: ClaimUpdate, db: Session = Depends
     
     return claim
 
+@router.post("/validate-batch", response_model=BatchValidationResult)
+async def validate_claims_batch(request: BatchValidationRequest, db: Session = Depends(get_db)):
+    """Validate many claims at once, e.g. a day's queued claims"""
+    
+    processor = ClaimProcessor(db)
+    try:
+        return await run_in_threadpool(processor.validate_claims_batch, request.claim_ids, request.status, request.limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch validation error: {str(e)}")
+
 @router.post("/{claim_id}/validate")
 def validate_claim(claim_id: int, db: Session = Depends(get_db)):
     """Validate a claim"""
@@ -216,6 +230,7 @@ def assign_claim_to_work_queue(
     
     db.add(work_queue_item)
     db.commit()
+    work_queue_summary_cache.invalidate()
     db.refresh(work_queue_item)
     
     # Return enriched work queue item
@@ -274,52 +289,29 @@ def get_available_agents():
 
 @router.get("/work-queue/", response_model=List[WorkQueueItem])
 def get_work_queue(
+    response: Response,
     status: WorkQueueStatus = None,
     assigned_to: str = None,
     priority: WorkQueuePriority = None,
+    after_id: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
 ):
-    """Get work queue items with optional filtering"""
-    
-    query = db.query(WorkQueue).join(Claim)
+    """Get work queue items with optional filtering, newest first; pass X-Next-Cursor back as after_id for the next page"""
+    
+    items, next_cursor = WorkQueueService(db).list_items(
+        status=status,
+        assigned_to=assigned_to,
+        priority=priority,
+        after_id=after_id,
+        skip=skip,
+        limit=limit
+    )
     
-    if status:
-        query = query.filter(WorkQueue.status == status)
-    if assigned_to:
-        query = query.filter(WorkQueue.assigned_to == assigned_to)
-    if priority:
-        query = query.filter(WorkQueue.priority == priority)
-    
-    work_queue_items = query.offset(skip).limit(limit).all()
-    
-    # Convert to response format
-    result = []
-    for item in work_queue_items:
-        claim = item.claim
-        result.append(WorkQueueItem(
-            id=item.id,
-            claim_id=claim.id,
-            claim_number=claim.claim_number,
-            patient_name=f"{claim.patient_first_name} {claim.patient_last_name}",
-            claim_type=claim.claim_type,
-            claim_status=claim.status,
-            assigned_by=item.assigned_by,
-            assigned_to=item.assigned_to,
-            assigned_at=item.assigned_at,
-            status=item.status,
-            priority=item.priority,
-            estimated_completion=item.estimated_completion,
-            actual_completion=item.actual_completion,
-            work_notes=item.work_notes,
-            action_taken=item.action_taken,
-            result_summary=item.result_summary,
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        ))
-    
-    return result
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return [WorkQueueItem(**item) for item in items]
 
 @router.post("/work-queue/{work_queue_id}/assign-to-agent")
 def assign_work_queue_to_agent(
@@ -381,6 +373,7 @@ def assign_work_queue_to_agent(
             claim.assigned_to = agent_id
         
         db.commit()
+        work_queue_summary_cache.invalidate()
         
         return {
             "success": True,
@@ -394,42 +387,9 @@ def assign_work_queue_to_agent(
         raise HTTPException(status_code=500, detail=f"Error assigning to agent: {str(e)}")
 
 @router.get("/work-queue/summary", response_model=WorkQueueSummary)
-def get_work_queue_summary(db: Session = Depends(get_db)):
+def get_work_queue_summary(fresh: bool = False, db: Session = Depends(get_db)):
     """Get work queue summary statistics"""
-    
-    # Get counts by status
-    total_items = db.query(WorkQueue).count()
-    pending = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.PENDING).count()
-    assigned = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.ASSIGNED).count()
-    in_progress = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.IN_PROGRESS).count()
-    completed = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.COMPLETED).count()
-    failed = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.FAILED).count()
-    cancelled = db.query(WorkQueue).filter(WorkQueue.status == WorkQueueStatus.CANCELLED).count()
-    
-    # Get counts by priority
-    by_priority = {}
-    for priority in WorkQueuePriority:
-        count = db.query(WorkQueue).filter(WorkQueue.priority == priority).count()
-        by_priority[priority.value] = count
-    
-    # Get counts by assignee
-    by_assignee = {}
-    assignees = db.query(WorkQueue.assigned_to).distinct().all()
-    for assignee in assignees:
-        count = db.query(WorkQueue).filter(WorkQueue.assigned_to == assignee[0]).count()
-        by_assignee[assignee[0]] = count
-    
-    return WorkQueueSummary(
-        total_items=total_items,
-        pending=pending,
-        assigned=assigned,
-        in_progress=in_progress,
-        completed=completed,
-        failed=failed,
-        cancelled=cancelled,
-        by_priority=by_priority,
-        by_assignee=by_assignee
-    )
+    return WorkQueueSummary(**WorkQueueService(db).summary(use_cache=not fresh))
 
 @router.patch("/work-queue/{work_queue_id}", response_model=WorkQueueItem)
 def update_work_queue_item(
@@ -456,6 +416,7 @@ def update_work_queue_item(
                 work_queue_item.actual_completion = work_queue_item.updated_at
     
     db.commit()
+    work_queue_summary_cache.invalidate()
     db.refresh(work_queue_item)
     
     # Return enriched response
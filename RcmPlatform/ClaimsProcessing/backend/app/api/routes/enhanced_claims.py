@@ -8,7 +8,7 @@ This module provides API endpoints that combine ClaimsProcessing's business logi
 with the foundational Claims service's FHIR-based CRUD operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 import logging
@@ -98,6 +98,25 @@ async def upload_claim_file(
         logger.error(f"Error processing file: {e}")
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
+@router.post("/fhir/bulk-push", response_model=Dict[str, Any])
+async def push_claims_to_fhir(
+    claim_ids: List[int] = Body(..., embed=True),
+    chunk_size: int = Query(100, ge=1, le=1000),
+    max_concurrency: int = Query(4, ge=1, le=16),
+    processor: EnhancedClaimProcessor = Depends(get_enhanced_processor)
+):
+    """
+    Create local claims in the Claims service
+    
+    Claims are sent as FHIR batch Bundles of chunk_size, so 10,000 claims take
+    100 requests; each claim's result is reported separately.
+    """
+    try:
+        return await processor.push_claims_to_fhir(claim_ids, chunk_size=chunk_size, max_concurrency=max_concurrency)
+    except Exception as e:
+        logger.error(f"Error pushing claims to Claims service: {e}")
+        raise HTTPException(status_code=500, detail=f"Error pushing claims: {str(e)}")
+
 @router.get("/", response_model=Dict[str, Any])
 async def get_claims(
     skip: int = Query(0, ge=0),
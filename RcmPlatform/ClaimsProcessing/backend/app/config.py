@@ -52,6 +52,10 @@ class AgentSettings(BaseSettings):
     MAX_TOOL_RETRIES: int = int(os.getenv("MAX_TOOL_RETRIES", "3"))
     AGENT_TIMEOUT: int = int(os.getenv("AGENT_TIMEOUT", "300"))  # 5 minutes
     ENABLE_AGENT_LOGGING: bool = os.getenv("ENABLE_AGENT_LOGGING", "true").lower() == "true"
+    TOOL_MAX_CONCURRENCY: int = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+    TOOL_CACHE_TTL_SECONDS: float = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "30"))
+    TASK_STORE_MAX_ENTRIES: int = int(os.getenv("TASK_STORE_MAX_ENTRIES", "1000"))
+    TASK_TTL_HOURS: int = int(os.getenv("TASK_TTL_HOURS", "24"))
     
     # LangGraph settings
     GRAPH_RECURSION_LIMIT: int = int(os.getenv("GRAPH_RECURSION_LIMIT", "50"))
@@ -2,7 +2,7 @@
 # FILE: backend/app/database/__init__.py
 # =============================================================================
 from app.database.connection import get_db, engine, Base
-from app.database.models import Claim, ServiceLine, DentalDetail, Payer, AgentTask
+from app.database.models import Claim, ServiceLine, DentalDetail, Payer, AgentTask, EDIInterchange, ProcedureFrequencyRule, ClaimDailySummary
 
-__all__ = ["get_db", "engine", "Base", "Claim", "ServiceLine", "DentalDetail", "Payer", "AgentTask"]
+__all__ = ["get_db", "engine", "Base", "Claim", "ServiceLine", "DentalDetail", "Payer", "AgentTask", "EDIInterchange", "ProcedureFrequencyRule", "ClaimDailySummary"]
 
@@ -1,7 +1,7 @@
 # =============================================================================
 # FILE: backend/app/database/models.py
 # =============================================================================
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Enum, ForeignKey, Numeric, JSON
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, Enum, ForeignKey, Numeric, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .connection import Base
@@ -87,6 +87,13 @@ class Claim(Base):
     parsed_data = Column(JSON)
     validation_errors = Column(JSON)
     
+    # Batch-ingested claims reference their interchange's raw EDI by offset
+    interchange_id = Column(Integer, ForeignKey("edi_interchanges.id"), index=True)
+    interchange = relationship("EDIInterchange", back_populates="claims")
+    edi_offset = Column(Integer)
+    edi_length = Column(Integer)
+    patient_control_number = Column(String(50), index=True)
+    
     # Work Queue Information
     work_queue_status = Column(Enum(WorkQueueStatus), default=WorkQueueStatus.PENDING)
     work_queue_priority = Column(Enum(WorkQueuePriority), default=WorkQueuePriority.MEDIUM)
@@ -105,6 +112,40 @@ class Claim(Base):
     service_lines = relationship("ServiceLine", back_populates="claim")
     dental_details = relationship("DentalDetail", back_populates="claim", uselist=False)
     agent_tasks = relationship("AgentTask", back_populates="claim")
+    
+    __table_args__ = (
+        # Keyset pagination within a status (reconciliation report)
+        Index("idx_claims_status_id", "status", "id"),
+    )
+
+class EDIInterchange(Base):
+    __tablename__ = "edi_interchanges"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    interchange_control_number = Column(String(20), index=True)
+    sender_id = Column(String(50))
+    receiver_id = Column(String(50))
+    claim_type = Column(Enum(ClaimType))
+    filename = Column(String(255))
+    content_hash = Column(String(64), index=True)
+    
+    # Raw EDI is stored once here; claims keep (edi_offset, edi_length) into it
+    raw_edi = Column(Text, nullable=False)
+    
+    transaction_count = Column(Integer, default=0)
+    claim_count = Column(Integer, default=0)
+    accepted_count = Column(Integer, default=0)
+    rejected_count = Column(Integer, default=0)
+    status = Column(String(20), default="processing")  # processing, completed, failed
+    
+    created_at = Column(DateTime, server_default=func.now())
+    completed_at = Column(DateTime)
+    
+    claims = relationship("Claim", back_populates="interchange")
+    
+    def claim_segment(self, claim: "Claim") -> str:
+        """Raw EDI of one claim's CLM loop"""
+        return self.raw_edi[claim.edi_offset:claim.edi_offset + claim.edi_length]
 
 class ServiceLine(Base):
     __tablename__ = "service_lines"
@@ -183,6 +224,34 @@ class Payer(Base):
     
     claims = relationship("Claim", back_populates="payer")
 
+class ProcedureFrequencyRule(Base):
+    __tablename__ = "procedure_frequency_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    procedure_code = Column(String(10), nullable=False, index=True)
+    claim_type = Column(String(10), nullable=False)  # 837D, 837P, 837I
+    frequency_limit = Column(String(50), nullable=False)  # e.g. "2 per year", "No limit"
+    time_period_days = Column(Integer, nullable=False)
+    age_restriction_min = Column(Integer)
+    age_restriction_max = Column(Integer)
+    description = Column(Text)
+    is_active = Column(Boolean, default=True)
+
+class ClaimDailySummary(Base):
+    """Per-day claim totals, maintained by triggers from migration_reporting.sql"""
+    __tablename__ = "claim_daily_summary"
+    
+    summary_date = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    claim_type = Column(String(10), primary_key=True)
+    payer_id = Column(Integer, primary_key=True, default=0)  # 0 when the claim has no payer
+    
+    claim_count = Column(Integer, nullable=False, default=0)
+    total_charge = Column(Numeric(14, 2), nullable=False, default=0)
+    allowed_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    paid_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    patient_responsibility = Column(Numeric(14, 2), nullable=False, default=0)
+
 class AgentTask(Base):
     __tablename__ = "agent_tasks"
     
@@ -218,6 +287,12 @@ class AgentTask(Base):
 
 class WorkQueue(Base):
     __tablename__ = "work_queue"
+    __table_args__ = (
+        # Filtered listings (newest first) and the grouped summary
+        Index("idx_work_queue_filters", "status", "priority", "assigned_to", "created_at"),
+        Index("idx_work_queue_assignee_created", "assigned_to", "created_at"),
+        Index("idx_work_queue_created_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False)
@@ -15,6 +15,7 @@ from .services.edi_parser import EDIParser
 from .services.claim_processor import ClaimProcessor
 from .api.routes import claims, payers, reports, agent, enhanced_claims
 from .agent.manager import get_agent_manager
+from .services.claims_service_client import close_claims_service_clients
 from .config import settings, agent_settings
 
 # Setup logging
@@ -90,6 +91,7 @@ async def cleanup():
     try:
         agent_manager = get_agent_manager()
         agent_manager.cleanup_old_tasks(max_age_hours=1)  # Clean up recent tasks
+        await close_claims_service_clients()
         logger.info("Application cleanup completed")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
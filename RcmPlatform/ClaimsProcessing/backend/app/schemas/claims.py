@@ -93,6 +93,40 @@ class Claim(ClaimBase):
     class Config:
         from_attributes = True
 
+class BatchClaimResult(BaseModel):
+    index: int
+    patient_control_number: Optional[str] = None
+    status: str  # accepted, rejected
+    claim_id: Optional[int] = None
+    claim_number: Optional[str] = None
+    errors: List[str] = []
+
+class BatchUploadResult(BaseModel):
+    interchange_ids: List[int]
+    total_claims: int
+    accepted: int
+    rejected: int
+    duration_seconds: float
+    claims: List[BatchClaimResult]
+
+class BatchValidationRequest(BaseModel):
+    claim_ids: Optional[List[int]] = None  # defaults to the oldest claims in `status`
+    status: ClaimStatus = ClaimStatus.QUEUED
+    limit: int = 20000
+
+class ClaimValidationResult(BaseModel):
+    claim_id: int
+    is_valid: bool
+    errors: List[str] = []
+    warnings: List[str] = []
+
+class BatchValidationResult(BaseModel):
+    total_claims: int
+    validated: int
+    rejected: int
+    duration_seconds: float
+    results: List[ClaimValidationResult]
+
 class PayerBase(BaseModel):
     name: str
     payer_id: str
@@ -0,0 +1,248 @@
+# =============================================================================
+# FILE: backend/app/services/batch_ingestion.py
+# =============================================================================
+import hashlib
+import logging
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..database.models import Claim, ServiceLine, DentalDetail, EDIInterchange, ClaimStatus, ClaimType
+from .edi_parser import EDIParser
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+
+class ClaimBatchIngestor:
+    """
+    Persists every claim of a multi-claim, multi-transaction 837 file.
+
+    Each interchange (ISA..IEA) is stored once in edi_interchanges; claims
+    reference their CLM loop in it by offset instead of copying the file.
+    Claims, service lines and dental details are written with multi-row
+    INSERTs in chunked transactions, so a failing chunk only rejects its own
+    claims.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000, parser: Optional[EDIParser] = None):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.edi_parser = parser or EDIParser()
+
+    def ingest(self, edi_content: str, payer_id: int, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Ingest every interchange in the file and return a per-claim accept/reject summary"""
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        interchange_ids: List[int] = []
+
+        for raw_interchange in self.split_interchanges(edi_content):
+            interchange_id, claim_results = self._ingest_interchange(raw_interchange, payer_id, filename, len(results))
+            interchange_ids.append(interchange_id)
+            results.extend(claim_results)
+
+        if not results:
+            raise ValueError("No claims found in EDI file")
+
+        accepted = sum(1 for result in results if result['status'] == ACCEPTED)
+        summary = {
+            'interchange_ids': interchange_ids,
+            'total_claims': len(results),
+            'accepted': accepted,
+            'rejected': len(results) - accepted,
+            'duration_seconds': round(time.perf_counter() - started, 3),
+            'claims': results
+        }
+        logger.info(
+            f"Ingested {summary['total_claims']} claims from {len(interchange_ids)} interchange(s): "
+            f"{accepted} accepted, {summary['rejected']} rejected in {summary['duration_seconds']}s"
+        )
+        return summary
+
+    def split_interchanges(self, edi_content: str) -> List[str]:
+        """Split a file into its ISA..IEA interchanges (one when there is no ISA)"""
+        starts = []
+        position = edi_content.find('ISA')
+        while position != -1:
+            # Only an ISA at the start of a segment opens an interchange
+            preceding = edi_content[:position].rstrip()
+            if not preceding or preceding.endswith(self.edi_parser.segment_terminator):
+                starts.append(position)
+            position = edi_content.find('ISA', position + 3)
+
+        if len(starts) <= 1:
+            return [edi_content]
+        return [edi_content[start:end] for start, end in zip(starts, starts[1:] + [len(edi_content)])]
+
+    def _ingest_interchange(self, raw_edi: str, payer_id: int, filename: Optional[str],
+                            index_base: int) -> Tuple[int, List[Dict[str, Any]]]:
+        parsed = self.edi_parser.parse_837_file(raw_edi, with_offsets=True)
+        header = parsed['header_info']
+        claim_type = parsed['claim_type']
+
+        interchange = EDIInterchange(
+            interchange_control_number=header.get('interchange_control_number'),
+            sender_id=header.get('application_sender_code'),
+            receiver_id=header.get('application_receiver_code'),
+            claim_type=claim_type,
+            filename=filename,
+            content_hash=hashlib.sha256(raw_edi.encode('utf-8')).hexdigest(),
+            raw_edi=raw_edi,
+            transaction_count=header.get('transaction_count', 0),
+            claim_count=len(parsed['claims'])
+        )
+        self.db.add(interchange)
+        self.db.commit()
+
+        results: List[Dict[str, Any]] = []
+        accepted_rows: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        seen_control_numbers = set()
+
+        for position, edi_claim in enumerate(parsed['claims']):
+            control_number = edi_claim.get('claim_number', '')
+            errors = self._check_claim(edi_claim, seen_control_numbers)
+            seen_control_numbers.add(control_number)
+
+            result = {
+                'index': index_base + position,
+                'patient_control_number': control_number,
+                'status': REJECTED if errors else ACCEPTED,
+                'claim_id': None,
+                'claim_number': None,
+                'errors': errors
+            }
+            results.append(result)
+            if not errors:
+                accepted_rows.append((result, edi_claim))
+
+        for start in range(0, len(accepted_rows), self.chunk_size):
+            chunk = accepted_rows[start:start + self.chunk_size]
+            try:
+                self._insert_chunk(chunk, interchange.id, claim_type, payer_id)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Chunk of {len(chunk)} claims failed for interchange {interchange.id}: {e}")
+                for result, _ in chunk:
+                    result.update(status=REJECTED, claim_id=None, claim_number=None,
+                                  errors=[f"Database error: {str(e)}"])
+
+        accepted = sum(1 for result in results if result['status'] == ACCEPTED)
+        interchange.accepted_count = accepted
+        interchange.rejected_count = len(results) - accepted
+        interchange.status = "completed"
+        interchange.completed_at = datetime.utcnow()
+        self.db.commit()
+
+        return interchange.id, results
+
+    def _check_claim(self, edi_claim: Dict[str, Any], seen_control_numbers: set) -> List[str]:
+        """Structural checks that decide acceptance at ingestion time"""
+        errors = []
+        control_number = edi_claim.get('claim_number')
+        if not control_number:
+            errors.append("CLM01 patient control number is missing")
+        elif control_number in seen_control_numbers:
+            errors.append(f"Duplicate patient control number {control_number} in interchange")
+
+        lines = edi_claim.get('service_lines', [])
+        if not lines:
+            errors.append("Claim has no service lines")
+
+        total_charge = edi_claim.get('total_charge', 0) or 0
+        if total_charge <= 0:
+            errors.append("CLM02 total charge must be greater than zero")
+        elif lines:
+            line_total = sum(line.get('charge_amount', 0) or 0 for line in lines)
+            if abs(line_total - total_charge) > 0.005:
+                errors.append(f"CLM02 total {total_charge:.2f} does not match service line charges {line_total:.2f}")
+
+        for number, line in enumerate(lines, 1):
+            if not line.get('procedure_code'):
+                errors.append(f"Service line {number}: procedure code is missing")
+        return errors
+
+    def _insert_chunk(self, chunk: List[Tuple[Dict[str, Any], Dict[str, Any]]], interchange_id: int,
+                      claim_type: ClaimType, payer_id: int):
+        claim_rows = []
+        for result, edi_claim in chunk:
+            result['claim_number'] = self._generate_claim_number()
+            claim_rows.append({
+                'claim_number': result['claim_number'],
+                'claim_type': claim_type,
+                'status': ClaimStatus.QUEUED,
+                'patient_first_name': edi_claim.get('patient_first_name', ''),
+                'patient_last_name': edi_claim.get('patient_last_name', ''),
+                'patient_id': edi_claim.get('patient_id', ''),
+                'provider_name': edi_claim.get('provider_name', ''),
+                'provider_npi': edi_claim.get('provider_npi', ''),
+                'payer_id': payer_id,
+                'total_charge': _to_decimal(edi_claim.get('total_charge')),
+                'parsed_data': _json_safe(edi_claim),
+                'interchange_id': interchange_id,
+                'edi_offset': edi_claim.get('edi_offset'),
+                'edi_length': edi_claim.get('edi_length'),
+                'patient_control_number': edi_claim.get('claim_number')
+            })
+
+        # RETURNING in parameter order maps every generated id back to its claim
+        claim_ids = self.db.execute(
+            insert(Claim).returning(Claim.id, sort_by_parameter_order=True),
+            claim_rows
+        ).scalars().all()
+
+        line_rows = []
+        dental_rows = []
+        for claim_id, (result, edi_claim) in zip(claim_ids, chunk):
+            result['claim_id'] = claim_id
+            for line_number, line in enumerate(edi_claim.get('service_lines', []), 1):
+                line_rows.append({
+                    'claim_id': claim_id,
+                    'line_number': line_number,
+                    'procedure_code': line.get('procedure_code', ''),
+                    'service_date_from': line.get('service_date'),
+                    'charge_amount': _to_decimal(line.get('charge_amount')),
+                    'units': line.get('units', 1),
+                    'modifier_1': line.get('modifier_1') or None,
+                    'modifier_2': line.get('modifier_2') or None
+                })
+            dental = edi_claim.get('dental_details')
+            if claim_type == ClaimType.DENTAL and dental:
+                dental_rows.append({
+                    'claim_id': claim_id,
+                    'tooth_number': dental.get('tooth_number'),
+                    'months_of_treatment': dental.get('months_of_treatment')
+                })
+
+        if line_rows:
+            self.db.execute(insert(ServiceLine), line_rows)
+        if dental_rows:
+            self.db.execute(insert(DentalDetail), dental_rows)
+
+    def _generate_claim_number(self) -> str:
+        """Generate unique claim number; wider than single uploads since batches create thousands at once"""
+        return f"CLM{uuid.uuid4().hex[:12].upper()}"
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value or 0))
+    except InvalidOperation:
+        return Decimal("0")
+
+def _json_safe(edi_claim: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a parsed claim with datetimes as ISO strings for the JSON column"""
+    def convert(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, dict):
+            return {key: convert(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+    return convert(edi_claim)
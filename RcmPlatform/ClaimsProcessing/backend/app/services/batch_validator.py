@@ -0,0 +1,343 @@
+# =============================================================================
+# FILE: backend/app/services/batch_validator.py
+# =============================================================================
+import bisect
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, defer
+
+from ..database.models import Claim, ServiceLine, Payer, ProcedureFrequencyRule, ClaimStatus
+from .validators import ClaimValidator
+from .reporting import report_refresher
+
+logger = logging.getLogger(__name__)
+
+# A compiled payer rule appends its findings to (errors, warnings)
+RuleCheck = Callable[[Claim, List[str], List[str]], None]
+
+# Claims that never reached the payer do not count towards frequency limits
+NON_COUNTING_STATUSES = (ClaimStatus.REJECTED, ClaimStatus.DENIED)
+
+PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30.4375, 'year': 365.25}
+
+@dataclass
+class FrequencyLimit:
+    procedure_code: str
+    max_count: int
+    period_days: int
+    description: str = ''
+    age_min: Optional[int] = None
+    age_max: Optional[int] = None
+
+@dataclass
+class CompiledRuleSet:
+    """A payer's validation_rules JSON compiled into predicates"""
+    version: str
+    checks: List[RuleCheck] = field(default_factory=list)
+    frequency_limits: Dict[str, FrequencyLimit] = field(default_factory=dict)
+
+def rules_version(rules: Optional[Dict[str, Any]]) -> str:
+    """Content hash of a rule document; any edit yields a new version"""
+    canonical = json.dumps(rules or {}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+def parse_period(value: Any) -> Optional[Tuple[int, int]]:
+    """(max_count, period_days) from '6_months', '2 per year', '1 per 3 years' or {'count': 2, 'days': 365}"""
+    if isinstance(value, dict):
+        count, days = value.get('count', 1), value.get('days', 0)
+        return (int(count), int(days)) if days else None
+    text = str(value).lower()
+    match = re.match(r'^\s*(\d+)\s+per\s+(?:(\d+)\s*)?(day|week|month|year)s?\s*$', text)
+    if match:
+        return int(match.group(1)), round(int(match.group(2) or 1) * PERIOD_DAYS[match.group(3)])
+    match = re.match(r'^\s*(\d+)[_ ](day|week|month|year)s?\s*$', text)
+    if match:
+        return 1, round(int(match.group(1)) * PERIOD_DAYS[match.group(2)])
+    return None
+
+def _procedure_codes(claim: Claim) -> List[str]:
+    return [line.procedure_code for line in claim.service_lines if line.procedure_code]
+
+def compile_rules(rules: Optional[Dict[str, Any]]) -> CompiledRuleSet:
+    """Turn a payer rule document into predicate functions, once per rule version"""
+    rules = rules or {}
+    compiled = CompiledRuleSet(version=rules_version(rules))
+    checks = compiled.checks
+
+    for key in ('max_procedures_per_claim', 'max_service_lines'):
+        if rules.get(key):
+            limit = int(rules[key])
+            def check_line_count(claim, errors, warnings, limit=limit):
+                if len(claim.service_lines) > limit:
+                    errors.append(f"Payer allows at most {limit} service lines per claim")
+            checks.append(check_line_count)
+
+    if rules.get('max_claim_amount'):
+        max_amount = float(rules['max_claim_amount'])
+        def check_amount(claim, errors, warnings):
+            if claim.total_charge is not None and float(claim.total_charge) > max_amount:
+                errors.append(f"Total charge exceeds payer maximum of {max_amount:.2f}")
+        checks.append(check_amount)
+
+    if rules.get('require_diagnosis_code'):
+        def check_diagnosis(claim, errors, warnings):
+            if not any(line.diagnosis_code_1 for line in claim.service_lines):
+                errors.append("Payer requires a diagnosis code")
+        checks.append(check_diagnosis)
+
+    if rules.get('require_npi'):
+        def check_npi(claim, errors, warnings):
+            if not claim.provider_npi:
+                errors.append("Payer requires a provider NPI")
+        checks.append(check_npi)
+
+    if rules.get('require_taxonomy'):
+        def check_taxonomy(claim, errors, warnings):
+            if not claim.provider_taxonomy:
+                errors.append("Payer requires a provider taxonomy code")
+        checks.append(check_taxonomy)
+
+    for key, label in (('require_predetermination', 'predetermination'), ('prior_auth_required', 'prior authorization')):
+        codes = frozenset(rules.get(key) or ())
+        if codes:
+            def check_flagged_codes(claim, errors, warnings, codes=codes, label=label):
+                for code in _procedure_codes(claim):
+                    if code in codes:
+                        warnings.append(f"{code} requires {label} from this payer")
+            checks.append(check_flagged_codes)
+
+    for code, period in (rules.get('frequency_limits') or {}).items():
+        parsed = parse_period(period)
+        if parsed:
+            compiled.frequency_limits[code] = FrequencyLimit(code, parsed[0], parsed[1], f"Payer limit: {period}")
+        else:
+            logger.warning(f"Ignoring unrecognized frequency limit {code}={period!r}")
+
+    return compiled
+
+class PayerRuleCache:
+    """Compiled payer rule sets, recompiled only when a payer's rules change"""
+
+    def __init__(self):
+        self._compiled: Dict[int, CompiledRuleSet] = {}
+        self._lock = threading.Lock()
+
+    def get(self, payer_id: Optional[int], rules: Optional[Dict[str, Any]]) -> CompiledRuleSet:
+        version = rules_version(rules)
+        compiled = self._compiled.get(payer_id)
+        if compiled is not None and compiled.version == version:
+            return compiled
+        compiled = compile_rules(rules)
+        with self._lock:
+            self._compiled[payer_id] = compiled
+        return compiled
+
+    def clear(self):
+        with self._lock:
+            self._compiled.clear()
+
+class BatchClaimValidator:
+    """
+    Validates many claims per round trip.
+
+    Each chunk of claims is loaded with its service lines and dental details
+    in one eager query, payer rules come from the compiled rule cache, and
+    frequency limits are checked against one grouped patient-history query
+    per chunk. Results are written back with a single bulk update.
+    """
+
+    def __init__(self, db: Session, validator: Optional[ClaimValidator] = None, chunk_size: int = 2000):
+        self.db = db
+        self.validator = validator or ClaimValidator()
+        self.chunk_size = chunk_size
+
+    def validate_claims(self, claim_ids: List[int], update_status: bool = True) -> Dict[str, Any]:
+        """Validate claims by id and (optionally) move them to VALIDATED or REJECTED"""
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(claim_ids), self.chunk_size):
+            results.extend(self._validate_chunk(claim_ids[start:start + self.chunk_size], update_status))
+
+        valid = sum(1 for result in results if result['is_valid'])
+        summary = {
+            'total_claims': len(results),
+            'validated': valid,
+            'rejected': len(results) - valid,
+            'duration_seconds': round(time.perf_counter() - started, 3),
+            'results': results
+        }
+        logger.info(f"Validated {summary['total_claims']} claims in {summary['duration_seconds']}s: "
+                    f"{valid} valid, {summary['rejected']} rejected")
+        return summary
+
+    def validate_status(self, status: ClaimStatus = ClaimStatus.QUEUED, limit: int = 20000,
+                        update_status: bool = True) -> Dict[str, Any]:
+        """Validate the oldest claims currently in a status"""
+        claim_ids = [row.id for row in self.db.query(Claim.id).filter(Claim.status == status)
+                     .order_by(Claim.id).limit(limit).all()]
+        return self.validate_claims(claim_ids, update_status)
+
+    def _load_claims(self, claim_ids: List[int]) -> List[Claim]:
+        return (
+            self.db.query(Claim)
+            .options(
+                joinedload(Claim.service_lines),
+                joinedload(Claim.dental_details),
+                # Raw and parsed EDI are not needed to validate
+                defer(Claim.raw_edi_data),
+                defer(Claim.parsed_data)
+            )
+            .filter(Claim.id.in_(claim_ids))
+            .order_by(Claim.id)
+            .all()
+        )
+
+    def _payer_rules(self, claims: List[Claim]) -> Dict[Optional[int], CompiledRuleSet]:
+        payer_ids = {claim.payer_id for claim in claims if claim.payer_id is not None}
+        rules = {payer_id: None for payer_id in payer_ids}
+        if payer_ids:
+            for payer_id, validation_rules in (self.db.query(Payer.id, Payer.validation_rules)
+                                               .filter(Payer.id.in_(payer_ids)).all()):
+                rules[payer_id] = validation_rules
+        compiled = {payer_id: payer_rule_cache.get(payer_id, payer_rules) for payer_id, payer_rules in rules.items()}
+        compiled[None] = payer_rule_cache.get(None, None)
+        return compiled
+
+    def _table_limits(self) -> Dict[Tuple[str, str], FrequencyLimit]:
+        limits = {}
+        for rule in self.db.query(ProcedureFrequencyRule).filter(ProcedureFrequencyRule.is_active == True).all():
+            parsed = parse_period(rule.frequency_limit)
+            if parsed and rule.time_period_days:
+                limits[(rule.claim_type, rule.procedure_code)] = FrequencyLimit(
+                    rule.procedure_code, parsed[0], rule.time_period_days, rule.description or rule.frequency_limit,
+                    rule.age_restriction_min, rule.age_restriction_max
+                )
+        return limits
+
+    def _validate_chunk(self, claim_ids: List[int], update_status: bool) -> List[Dict[str, Any]]:
+        claims = self._load_claims(claim_ids)
+        payer_rules = self._payer_rules(claims)
+        table_limits = self._table_limits()
+
+        outcomes = {}
+        for claim in claims:
+            result = self.validator.validate_claim(claim, check_frequencies=False)
+            errors, warnings = result['errors'], result['warnings']
+            for check in payer_rules[claim.payer_id].checks:
+                check(claim, errors, warnings)
+            outcomes[claim.id] = (errors, warnings)
+
+        self._check_frequencies(claims, payer_rules, table_limits, outcomes)
+
+        results = []
+        updates = []
+        for claim in claims:
+            errors, warnings = outcomes[claim.id]
+            is_valid = not errors
+            results.append({'claim_id': claim.id, 'is_valid': is_valid, 'errors': errors, 'warnings': warnings})
+            updates.append({
+                'id': claim.id,
+                'status': ClaimStatus.VALIDATED if is_valid else ClaimStatus.REJECTED,
+                'validation_errors': {'errors': errors, 'warnings': warnings}
+            })
+
+        if update_status and updates:
+            self.db.bulk_update_mappings(Claim, updates)
+            self.db.commit()
+            # Rejections changed; the category view catches up in the background
+            report_refresher.request_refresh()
+        return results
+
+    def _limit_for(self, claim: Claim, code: str, payer_rules: Dict[Optional[int], CompiledRuleSet],
+                   table_limits: Dict[Tuple[str, str], FrequencyLimit]) -> Optional[FrequencyLimit]:
+        # A payer's own limit overrides the general rule table
+        return (payer_rules[claim.payer_id].frequency_limits.get(code)
+                or table_limits.get((claim.claim_type.value if claim.claim_type else '', code)))
+
+    def _check_frequencies(self, claims: List[Claim], payer_rules: Dict[Optional[int], CompiledRuleSet],
+                           table_limits: Dict[Tuple[str, str], FrequencyLimit],
+                           outcomes: Dict[int, Tuple[List[str], List[str]]]):
+        # (claim, line, limit, service date) for every line under a frequency limit
+        limited = []
+        for claim in claims:
+            if not claim.patient_id:
+                continue
+            for line in claim.service_lines:
+                limit = self._limit_for(claim, line.procedure_code, payer_rules, table_limits)
+                if limit is not None:
+                    limited.append((claim, line, limit, line.service_date_from or claim.created_at or datetime.utcnow()))
+        if not limited:
+            return
+
+        self._check_age_restrictions(limited, outcomes)
+
+        patients = {claim.patient_id for claim, _, _, _ in limited}
+        codes = {line.procedure_code for _, line, _, _ in limited}
+        earliest = min(date - timedelta(days=limit.period_days) for _, _, limit, date in limited)
+        latest = max(date for _, _, _, date in limited)
+
+        # One grouped query for the whole chunk's patient history
+        service_date = func.coalesce(ServiceLine.service_date_from, Claim.created_at)
+        history_rows = (
+            self.db.query(Claim.patient_id, ServiceLine.procedure_code, service_date, func.count())
+            .join(ServiceLine, ServiceLine.claim_id == Claim.id)
+            .filter(
+                Claim.patient_id.in_(patients),
+                ServiceLine.procedure_code.in_(codes),
+                Claim.status.notin_(NON_COUNTING_STATUSES),
+                service_date >= earliest,
+                service_date <= latest
+            )
+            .group_by(Claim.patient_id, ServiceLine.procedure_code, service_date)
+            .all()
+        )
+
+        # The chunk's own lines are in the history too; take them out and re-add them in order below
+        own = Counter(
+            (claim.patient_id, line.procedure_code, date)
+            for claim, line, _, date in limited if claim.status not in NON_COUNTING_STATUSES
+        )
+        events: Dict[Tuple[str, str], List[Tuple[datetime, int, int]]] = defaultdict(list)
+        for patient_id, code, date, count in history_rows:
+            if isinstance(date, str):
+                date = datetime.fromisoformat(date)
+            count -= own.get((patient_id, code, date), 0)
+            events[(patient_id, code)].extend([(date, 0, 0)] * max(count, 0))
+        for claim, line, _, date in limited:
+            events[(claim.patient_id, line.procedure_code)].append((date, 1, claim.id))
+        for key in events:
+            events[key].sort()
+
+        for claim, line, limit, date in limited:
+            series = events[(claim.patient_id, line.procedure_code)]
+            position = bisect.bisect_left(series, (date, 1, claim.id))
+            window_start = bisect.bisect_left(series, (date - timedelta(days=limit.period_days),))
+            prior = position - window_start
+            if prior >= limit.max_count:
+                outcomes[claim.id][0].append(
+                    f"Frequency limit exceeded for {line.procedure_code}: {prior} in the previous "
+                    f"{limit.period_days} days, limit {limit.max_count} ({limit.description})"
+                )
+
+    def _check_age_restrictions(self, limited, outcomes: Dict[int, Tuple[List[str], List[str]]]):
+        for claim, line, limit, date in limited:
+            if claim.patient_dob is None or (limit.age_min is None and limit.age_max is None):
+                continue
+            age = (date - claim.patient_dob).days / 365.25
+            if limit.age_min is not None and age < limit.age_min:
+                outcomes[claim.id][0].append(f"{line.procedure_code} is limited to patients aged {limit.age_min} or older")
+            if limit.age_max is not None and age >= limit.age_max + 1:
+                outcomes[claim.id][0].append(f"{line.procedure_code} is limited to patients aged {limit.age_max} or younger")
+
+# Global instance
+payer_rule_cache = PayerRuleCache()
@@ -10,6 +10,8 @@ from ..database.models import Claim, ServiceLine, DentalDetail, ClaimStatus, Cla
 from ..schemas.claims import ClaimCreate
 from .edi_parser import EDIParser
 from .validators import ClaimValidator
+from .batch_ingestion import ClaimBatchIngestor
+from .batch_validator import BatchClaimValidator
 
 class ClaimProcessor:
     """Enhanced claim processing service with AI agent integration"""
@@ -94,31 +96,33 @@ class ClaimProcessor:
         
         return db_claim
     
+    def create_claims_from_edi_batch(self, edi_content: str, payer_id: int, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Create every claim in a multi-claim, multi-transaction EDI file"""
+        ingestor = ClaimBatchIngestor(self.db, parser=self.edi_parser)
+        return ingestor.ingest(edi_content, payer_id, filename)
+    
     def validate_claim(self, claim_id: int) -> Dict[str, Any]:
         """Validate a claim and update its status"""
         
-        claim = self.db.query(Claim).filter(Claim.id == claim_id).first()
-        if not claim:
+        if not self.db.query(Claim.id).filter(Claim.id == claim_id).first():
             raise ValueError(f"Claim {claim_id} not found")
         
-        # Update status to validating
-        claim.status = ClaimStatus.VALIDATING
-        self.db.commit()
-        
-        # Run validation
-        validation_result = self.validator.validate_claim(claim)
-        
-        # Update claim with validation results
-        claim.validation_errors = validation_result['errors']
+        # Same engine as batch validation, so payer rules and frequency history apply
+        result = BatchClaimValidator(self.db, self.validator).validate_claims([claim_id])['results'][0]
         
-        if validation_result['is_valid']:
-            claim.status = ClaimStatus.VALIDATED
-        else:
-            claim.status = ClaimStatus.REJECTED
-        
-        self.db.commit()
-        
-        return validation_result
+        return {
+            'is_valid': result['is_valid'],
+            'errors': result['errors'],
+            'warnings': result['warnings']
+        }
+    
+    def validate_claims_batch(self, claim_ids: Optional[List[int]] = None,
+                              status: ClaimStatus = ClaimStatus.QUEUED, limit: int = 20000) -> Dict[str, Any]:
+        """Validate the given claims, or the oldest claims in a status, in bulk"""
+        validator = BatchClaimValidator(self.db, self.validator)
+        if claim_ids:
+            return validator.validate_claims(claim_ids[:limit])
+        return validator.validate_status(status, limit)
     
     def submit_claim(self, claim_id: int) -> bool:
         """Submit validated claim to payer"""
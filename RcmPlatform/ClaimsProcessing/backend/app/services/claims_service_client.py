@@ -9,35 +9,161 @@ Claims service, enabling ClaimsProcessing to use FHIR-based CRUD operations
 while maintaining its high-level business logic and AI capabilities.
 """
 
+import asyncio
 import httpx
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Callable, Dict, List, Optional, Any
 from fastapi import HTTPException
 from datetime import datetime
 import json
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it the pool uses HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for Claims service calls.
+
+    closed:    requests pass; failure_threshold consecutive failures open the circuit
+    open:      requests are refused at once, so callers fall back without waiting on timeouts
+    half_open: after reset_timeout seconds one probe request passes; success closes
+               the circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.transitions = {self.OPEN: 0, self.HALF_OPEN: 0, self.CLOSED: 0}
+        self.rejected_requests = 0
+        self.last_transition_at: Optional[str] = None
+        self._probe_in_flight = False
+        self._listeners: List[Callable[[str, str, str], None]] = []
+
+    def add_listener(self, callback: Callable[[str, str, str], None]):
+        """Register callback(name, old_state, new_state), e.g. to export transitions as metrics"""
+        self._listeners.append(callback)
+
+    def allow_request(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected_requests += 1
+                return False
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected_requests += 1
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+    def release_probe(self):
+        """Let another probe through when one ended without an outcome (e.g. cancelled)"""
+        self._probe_in_flight = False
+
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        self.transitions[state] += 1
+        self.last_transition_at = datetime.utcnow().isoformat()
+        log = logger.warning if state == self.OPEN else logger.info
+        log(f"Claims service circuit '{self.name}': {previous} -> {state}")
+        for listener in self._listeners:
+            try:
+                listener(self.name, previous, state)
+            except Exception as e:
+                logger.error(f"Circuit breaker listener failed: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_total": self.transitions[self.OPEN],
+            "half_opened_total": self.transitions[self.HALF_OPEN],
+            "closed_total": self.transitions[self.CLOSED],
+            "rejected_requests": self.rejected_requests,
+            "last_transition_at": self.last_transition_at
+        }
+
 class ClaimsServiceClient:
     """Client for interacting with the Claims service API"""
     
-    def __init__(self, base_url: str = "http://localhost:8001", timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8001",
+        timeout: int = 30,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
         """
         Initialize the Claims service client
         
         Args:
             base_url: Base URL of the Claims service
             timeout: Request timeout in seconds
+            connect_timeout: Connection timeout in seconds
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds before an open circuit lets a probe through
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            http2=HTTP2_AVAILABLE
+        )
+        self.circuit_breaker = CircuitBreaker(self.base_url, failure_threshold, reset_timeout)
         
     async def __aenter__(self):
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The connection pool is application-scoped; aclose() runs on shutdown
+        pass
+    
+    async def aclose(self):
         await self.client.aclose()
+
         
     async def _make_request(
         self, 
@@ -63,6 +189,12 @@ class ClaimsServiceClient:
         """
         url = f"{self.base_url}/api/v1{endpoint}"
         
+        if not self.circuit_breaker.allow_request():
+            raise HTTPException(
+                status_code=503,
+                detail="Claims service unavailable: circuit open"
+            )
+        
         try:
             response = await self.client.request(
                 method=method,
@@ -70,6 +202,11 @@ class ClaimsServiceClient:
                 json=data,
                 params=params
             )
+            # 4xx answers mean the service is up; only 5xx count against the circuit
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
             response.raise_for_status()
             return response.json()
             
@@ -80,6 +217,7 @@ class ClaimsServiceClient:
                 detail=f"Claims service error: {e.response.text}"
             )
         except httpx.RequestError as e:
+            self.circuit_breaker.record_failure()
             logger.error(f"Claims service request error: {e}")
             raise HTTPException(
                 status_code=503,
@@ -91,6 +229,8 @@ class ClaimsServiceClient:
                 status_code=500,
                 detail=f"Internal error: {str(e)}"
             )
+        finally:
+            self.circuit_breaker.release_probe()
     
     # Claim CRUD Operations
     
@@ -126,6 +266,89 @@ class ClaimsServiceClient:
         """Delete a claim from the Claims service"""
         return await self._make_request("DELETE", f"/claims/{claim_id}")
     
+    # Bundle Operations
+    
+    async def submit_bundle(self, entries: List[Dict], bundle_type: str = "batch") -> Dict:
+        """Submit one FHIR Bundle (transaction or batch) of at most 1000 entries"""
+        bundle = {"resourceType": "Bundle", "type": bundle_type, "entry": entries}
+        return await self._make_request("POST", "/", data=bundle)
+    
+    async def submit_bundles(
+        self,
+        entries: List[Dict],
+        bundle_type: str = "batch",
+        chunk_size: int = 100,
+        max_concurrency: int = 4
+    ) -> List[Dict]:
+        """
+        Submit entries as Bundles of chunk_size, with at most max_concurrency
+        Bundles in flight
+        
+        Returns:
+            One result per entry, in input order: success, status, id and error.
+            A chunk whose request fails marks only its own entries as failed.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: List[Optional[Dict]] = [None] * len(entries)
+        
+        async def send(start: int):
+            chunk = entries[start:start + chunk_size]
+            async with semaphore:
+                try:
+                    response = await self.submit_bundle(chunk, bundle_type)
+                    for offset, entry in enumerate(response.get("entry", [])[:len(chunk)]):
+                        results[start + offset] = self._bundle_entry_result(entry.get("response", {}))
+                except Exception as e:
+                    error = str(getattr(e, "detail", e))
+                    for offset in range(len(chunk)):
+                        results[start + offset] = {"success": False, "status": None, "id": None, "error": error}
+        
+        await asyncio.gather(*(send(start) for start in range(0, len(entries), chunk_size)))
+        return [
+            result or {"success": False, "status": None, "id": None, "error": "Missing from Bundle response"}
+            for result in results
+        ]
+    
+    @staticmethod
+    def _bundle_entry_result(response: Dict) -> Dict:
+        status = response.get("status") or ""
+        location = response.get("location") or ""
+        issues = (response.get("outcome") or {}).get("issue") or []
+        return {
+            "success": status.startswith("2"),
+            "status": status,
+            "id": location.split("/", 1)[1] if "/" in location else None,
+            "error": issues[0].get("diagnostics") if issues else None
+        }
+    
+    async def create_claims_bulk(
+        self,
+        claims: List[Dict],
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        atomic: bool = False
+    ) -> List[Dict]:
+        """
+        Create claims with one request per chunk_size claims. atomic makes each
+        chunk a transaction Bundle (all of the chunk or none of it).
+        """
+        entries = [{"resource": claim, "request": {"method": "POST", "url": "Claim"}} for claim in claims]
+        return await self.submit_bundles(entries, "transaction" if atomic else "batch", chunk_size, max_concurrency)
+    
+    async def update_claims_bulk(
+        self,
+        updates: Dict[str, Dict],
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        atomic: bool = False
+    ) -> List[Dict]:
+        """Update claims, given as {claim_id: changes}, with one request per chunk_size claims"""
+        entries = [
+            {"resource": changes, "request": {"method": "PUT", "url": f"Claim/{claim_id}"}}
+            for claim_id, changes in updates.items()
+        ]
+        return await self.submit_bundles(entries, "transaction" if atomic else "batch", chunk_size, max_concurrency)
+    
     # ClaimResponse Operations
     
     async def create_claim_response(self, response_data: Dict) -> Dict:
@@ -215,10 +438,11 @@ class ClaimsServiceClient:
     async def health_check(self) -> Dict:
         """Check if Claims service is healthy"""
         try:
-            return await self._make_request("GET", "/health")
+            health = await self._make_request("GET", "/health")
         except Exception as e:
             logger.warning(f"Claims service health check failed: {e}")
-            return {"status": "unhealthy", "error": str(e)}
+            health = {"status": "unhealthy", "error": str(e)}
+        return {**health, "circuit_breaker": self.circuit_breaker.metrics(), "http2": HTTP2_AVAILABLE}
 
 # Data Transformation Utilities
 
@@ -258,6 +482,7 @@ class ClaimsDataTransformer:
             'insurer_id': edi_claim_data.get('payer_id', ''),
             'provider_id': edi_claim_data.get('provider_npi', ''),
             'created': datetime.utcnow().isoformat(),
+            'insurance': edi_claim_data.get('insurance', []),  # Required by the Claims service
             'item': []
         }
         
@@ -395,9 +620,12 @@ class ClaimsDataTransformer:
 
 # Factory function for creating client instances
 
+# One client per base URL, so every caller in the process shares its connection pool and circuit breaker
+_shared_clients: Dict[str, ClaimsServiceClient] = {}
+
 def create_claims_service_client(base_url: str = None) -> ClaimsServiceClient:
     """
-    Factory function to create Claims service client
+    Factory function to get the shared Claims service client
     
     Args:
         base_url: Optional base URL override
@@ -409,4 +637,13 @@ def create_claims_service_client(base_url: str = None) -> ClaimsServiceClient:
         # Default to Claims service URL from environment or config
         base_url = "http://localhost:8001"
     
-    return ClaimsServiceClient(base_url=base_url) 
\ No newline at end of file
+    base_url = base_url.rstrip('/')
+    if base_url not in _shared_clients:
+        _shared_clients[base_url] = ClaimsServiceClient(base_url=base_url)
+    return _shared_clients[base_url]
+
+async def close_claims_service_clients():
+    """Close the shared clients' connection pools; call on application shutdown"""
+    for client in list(_shared_clients.values()):
+        await client.aclose()
+    _shared_clients.clear() 
\ No newline at end of file
@@ -1,255 +1,419 @@
 # =============================================================================
 # FILE: backend/app/services/edi_parser.py
 # =============================================================================
-import re
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from ..database.models import ClaimType
 
-class EDIParser:
-    """Enhanced EDI X12 parser for 837 files"""
-    
-    def __init__(self):
-        self.segment_terminator = '~'
-        self.element_separator = '*'
-        self.component_separator = '^'
-    
-    def parse_837_file(self, edi_content: str) -> Dict[str, Any]:
-        """Parse 837 EDI file and extract claim data"""
-        segments = self._split_segments(edi_content)
-        
-        # Determine claim type from GS segment
-        claim_type = self._determine_claim_type(segments)
-        
-        # Parse header information
-        header_info = self._parse_header(segments)
-        
-        # Parse claims
-        claims = self._parse_claims(segments, claim_type)
-        
+# SV101-1 / SV202-1 / SV301-1 product or service ID qualifiers
+PRODUCT_QUALIFIERS = frozenset({'HC', 'AD', 'ER', 'HP', 'IV', 'N4', 'WK', 'ZZ'})
+
+# Implementation guide in GS08 -> claim type (5010 and 4010)
+IMPLEMENTATION_TYPES = {
+    'X222': ClaimType.PROFESSIONAL, 'X223': ClaimType.INSTITUTIONAL, 'X224': ClaimType.DENTAL,
+    'X098': ClaimType.PROFESSIONAL, 'X096': ClaimType.INSTITUTIONAL, 'X097': ClaimType.DENTAL
+}
+
+WHITESPACE = ' \r\n\t'
+
+@dataclass
+class X12Delimiters:
+    """Separators of one interchange"""
+    segment: str = '~'
+    element: str = '*'
+    component: str = ':'
+
+    @classmethod
+    def from_isa(cls, text: str, start: int) -> Optional["X12Delimiters"]:
+        """Read delimiters from the ISA at text[start]; None until the whole ISA has arrived"""
+        if len(text) <= start + 3:
+            return None
+        element = text[start + 3]
+        position = start + 3
+        # ISA16 (component separator) follows the 16th element separator; the terminator follows ISA16
+        for _ in range(15):
+            position = text.find(element, position + 1)
+            if position == -1:
+                return None
+        if len(text) <= position + 2:
+            return None
+        return cls(segment=text[position + 2], element=element, component=text[position + 1])
+
+def _element(elements: List[str], index: int) -> str:
+    return elements[index] if len(elements) > index else ''
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+def _to_units(value: str) -> int:
+    try:
+        return int(float(value)) if value else 1
+    except ValueError:
+        return 1
+
+def _d8_date(value: str) -> Optional[datetime]:
+    """CCYYMMDD without strptime, which dominates parse time on large files"""
+    if len(value) != 8 or not value.isdigit():
+        return None
+    try:
+        return datetime(int(value[:4]), int(value[4:6]), int(value[6:]))
+    except ValueError:
+        return None
+
+class Streaming837Parser:
+    """
+    Incremental, single-pass 837 parser.
+
+    feed() accepts the file in chunks of any size. Delimiters are read from
+    each ISA header, every segment is split into elements exactly once, and a
+    loop-aware state machine (2000A billing provider, 2000B subscriber, 2000C
+    patient, 2300 claim, 2400 service line) attaches each segment to the
+    right context in one forward pass. A claim is complete at the next
+    HL/CLM/SE/GE/IEA; feed() returns the claims completed by that chunk.
+    """
+
+    def __init__(self, with_offsets: bool = False, collect_claims: bool = True):
+        self.with_offsets = with_offsets
+        self.collect_claims = collect_claims
+        self.delimiters: Optional[X12Delimiters] = None
+        self.claim_type: Optional[ClaimType] = None
+        self.header_info: Dict[str, Any] = {'transaction_count': 0}
+        self.claims: List[Dict[str, Any]] = []
+        self.segment_count = 0
+
+        self._buffer = ''
+        self._buffer_offset = 0
+        self._segment_start = 0
+        self._last_end = 0
+        self._completed: List[Dict[str, Any]] = []
+
+        self._loop: Optional[str] = None
+        self._provider: Dict[str, Any] = {}
+        self._subscriber: Dict[str, Any] = {}
+        self._patient: Dict[str, Any] = {}
+        self._claim: Optional[Dict[str, Any]] = None
+        self._claim_start = 0
+        self._line: Optional[Dict[str, Any]] = None
+
+        self._handlers = {
+            'ISA': self._on_isa, 'GS': self._on_gs, 'ST': self._on_st, 'HL': self._on_hl,
+            'NM1': self._on_nm1, 'SBR': self._on_sbr, 'CLM': self._on_clm, 'LX': self._on_lx,
+            'SV1': self._on_sv1, 'SV2': self._on_sv2, 'SV3': self._on_sv3, 'TOO': self._on_too,
+            'DN1': self._on_dn1, 'DN2': self._on_dn2, 'DTP': self._on_dtp,
+            'SE': self._on_trailer, 'GE': self._on_trailer, 'IEA': self._on_trailer
+        }
+
+    def feed(self, data: str) -> List[Dict[str, Any]]:
+        """Consume a chunk and return the claims it completed"""
+        self._buffer += data
+        self._consume(final=False)
+        return self._drain()
+
+    def close(self) -> Dict[str, Any]:
+        """Flush the trailing segment and open claim and return the parse result"""
+        self._consume(final=True)
+        self._finish_claim()
+        self._drain()
         return {
-            'claim_type': claim_type,
-            'header_info': header_info,
-            'claims': claims,
-            'raw_edi': edi_content
+            'claim_type': self.claim_type or ClaimType.PROFESSIONAL,
+            'header_info': self.header_info,
+            'claims': self.claims
         }
-    
-    def _split_segments(self, edi_content: str) -> List[str]:
-        """Split EDI content into segments"""
-        # Remove any whitespace and split by segment terminator
-        clean_content = edi_content.strip().replace('\n', '').replace('\r', '')
-        return [seg.strip() for seg in clean_content.split(self.segment_terminator) if seg.strip()]
-    
-    def _determine_claim_type(self, segments: List[str]) -> ClaimType:
-        """Determine claim type from GS segment"""
-        for segment in segments:
-            if segment.startswith('GS'):
-                elements = segment.split(self.element_separator)
-                if len(elements) > 1:
-                    functional_group = elements[1]
-                    if functional_group == 'HC':  # Healthcare Claim
-                        # Look at version to determine type
-                        if len(elements) > 7:
-                            version = elements[7]
-                            if 'D' in version:
-                                return ClaimType.DENTAL
-                            elif 'P' in version:
-                                return ClaimType.PROFESSIONAL
-                            elif 'I' in version:
-                                return ClaimType.INSTITUTIONAL
-        
-        return ClaimType.PROFESSIONAL  # Default
-    
-    def _parse_header(self, segments: List[str]) -> Dict[str, Any]:
-        """Parse ISA and GS header segments"""
-        header = {}
-        
-        for segment in segments:
-            if segment.startswith('ISA'):
-                elements = segment.split(self.element_separator)
-                if len(elements) >= 16:
-                    header['interchange_control_number'] = elements[13]
-                    header['interchange_date'] = elements[9]
-                    header['interchange_time'] = elements[10]
-                    
-            elif segment.startswith('GS'):
-                elements = segment.split(self.element_separator)
-                if len(elements) >= 8:
-                    header['functional_group_control_number'] = elements[6]
-                    header['application_sender_code'] = elements[2]
-                    header['application_receiver_code'] = elements[3]
-        
-        return header
-    
-    def _parse_claims(self, segments: List[str], claim_type: ClaimType) -> List[Dict[str, Any]]:
-        """Parse individual claims from segments"""
-        claims = []
-        current_claim = None
-        current_service_lines = []
-        
-        i = 0
-        while i < len(segments):
-            segment = segments[i]
-            
-            if segment.startswith('CLM'):
-                # Start of new claim
-                if current_claim:
-                    current_claim['service_lines'] = current_service_lines
-                    claims.append(current_claim)
-                
-                current_claim = self._parse_clm_segment(segment)
-                current_service_lines = []
-                
-                # Add claim type specific details
-                if claim_type == ClaimType.DENTAL:
-                    current_claim['dental_details'] = self._parse_dental_details(segments, i)
-            
-            elif segment.startswith('NM1') and current_claim:
-                # Name segments for patient, provider, etc.
-                self._parse_nm1_segment(segment, current_claim, segments, i)
-            
-            elif segment.startswith('SBR') and current_claim:
-                # Subscriber information
-                self._parse_sbr_segment(segment, current_claim)
-            
-            elif segment.startswith('SV1') and current_claim:
-                # Professional service line
-                service_line = self._parse_sv1_segment(segment)
-                current_service_lines.append(service_line)
-            
-            elif segment.startswith('SV3') and current_claim and claim_type == ClaimType.DENTAL:
-                # Dental service line
-                service_line = self._parse_sv3_segment(segment)
-                current_service_lines.append(service_line)
-            
-            elif segment.startswith('DTP') and current_claim:
-                # Date/Time segments
-                self._parse_dtp_segment(segment, current_claim, current_service_lines)
-            
-            i += 1
-        
-        # Add last claim
-        if current_claim:
-            current_claim['service_lines'] = current_service_lines
-            claims.append(current_claim)
-        
-        return claims
-    
-    def _parse_clm_segment(self, segment: str) -> Dict[str, Any]:
-        """Parse CLM (Claim Information) segment"""
-        elements = segment.split(self.element_separator)
-        
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        completed, self._completed = self._completed, []
+        if self.collect_claims:
+            self.claims.extend(completed)
+        return completed
+
+    def _consume(self, final: bool):
+        while self._buffer:
+            if self.delimiters is None and not self._detect_delimiters(final):
+                return
+            if not self._consume_segments(final):
+                return
+
+    def _detect_delimiters(self, final: bool) -> bool:
+        """Pick delimiters from the leading ISA, or defaults for a fragment without one"""
+        content = self._buffer.lstrip(WHITESPACE)
+        if not content or (len(content) < 3 and not final):
+            return False
+        if content.startswith('ISA'):
+            delimiters = X12Delimiters.from_isa(content, 0)
+            if delimiters is None:
+                if not final:
+                    return False
+                delimiters = X12Delimiters()
+        else:
+            delimiters = X12Delimiters()
+        self.delimiters = delimiters
+        return True
+
+    def _consume_segments(self, final: bool) -> bool:
+        """
+        Handle every complete segment in the buffer; returns True when an ISA
+        with different delimiters stopped the pass and the rest must be rescanned.
+        """
+        buffer = self._buffer
+        delimiters = self.delimiters
+        terminator = delimiters.segment
+        element = delimiters.element
+        handlers = self._handlers
+        base = self._buffer_offset
+
+        limit = len(buffer) if final else buffer.rfind(terminator) + 1
+        if limit <= 0:
+            return False
+
+        position = 0
+        rescan = False
+        # One C-level split for the whole chunk; offsets follow from piece lengths
+        for piece in buffer[:limit].split(terminator):
+            stop = min(position + len(piece) + 1, limit)
+            text = piece.lstrip(WHITESPACE)
+            segment_start = position + len(piece) - len(text)
+            text = text.rstrip(WHITESPACE)
+            if text:
+                if text.startswith('ISA'):
+                    isa = X12Delimiters.from_isa(buffer, segment_start)
+                    if isa is not None and isa != delimiters:
+                        # A later interchange with its own delimiters
+                        self.delimiters = isa
+                        position = segment_start
+                        rescan = True
+                        break
+                if '\n' in text or '\r' in text:
+                    text = text.replace('\n', '').replace('\r', '')
+                self._segment_start = base + segment_start
+                self.segment_count += 1
+                elements = text.split(element)
+                handler = handlers.get(elements[0])
+                if handler is not None:
+                    handler(elements)
+                self._last_end = base + stop
+            position = stop
+
+        self._buffer = buffer[position:]
+        self._buffer_offset = base + position
+        return rescan
+
+    def _finish_claim(self):
+        if self._claim is None:
+            return
+        if self.with_offsets:
+            self._claim['edi_offset'] = self._claim_start
+            self._claim['edi_length'] = self._last_end - self._claim_start
+        self._completed.append(self._claim)
+        self._claim = None
+        self._line = None
+
+    def _set_name(self, target: Dict[str, Any], prefix: str, elements: List[str]):
+        if prefix == 'patient':
+            target['patient_last_name'] = _element(elements, 3)
+            target['patient_first_name'] = _element(elements, 4)
+            target['patient_id'] = _element(elements, 9)
+        else:
+            target['provider_name'] = _element(elements, 3)
+            target['provider_npi'] = _element(elements, 9)
+
+    def _procedure(self, composite: str) -> List[str]:
+        """Split a procedure composite into [code, modifier...], dropping the qualifier"""
+        parts = composite.split(self.delimiters.component)
+        if len(parts) > 1 and parts[0] in PRODUCT_QUALIFIERS:
+            return parts[1:]
+        return parts
+
+    # Envelope --------------------------------------------------------------
+
+    def _on_isa(self, elements: List[str]):
+        if len(elements) >= 16 and 'interchange_control_number' not in self.header_info:
+            self.header_info['interchange_control_number'] = elements[13]
+            self.header_info['interchange_date'] = elements[9]
+            self.header_info['interchange_time'] = elements[10]
+
+    def _on_gs(self, elements: List[str]):
+        if len(elements) >= 8 and 'functional_group_control_number' not in self.header_info:
+            self.header_info['functional_group_control_number'] = elements[6]
+            self.header_info['application_sender_code'] = elements[2]
+            self.header_info['application_receiver_code'] = elements[3]
+        if self.claim_type is None and _element(elements, 1) == 'HC':
+            version = _element(elements, 8)
+            self.claim_type = IMPLEMENTATION_TYPES.get(version[6:10], ClaimType.PROFESSIONAL)
+
+    def _on_st(self, elements: List[str]):
+        self._finish_claim()
+        self.header_info['transaction_count'] += 1
+        self._loop = 'header'
+        self._provider, self._subscriber, self._patient = {}, {}, {}
+
+    def _on_trailer(self, elements: List[str]):
+        self._finish_claim()
+        self._loop = None
+
+    # Hierarchical levels ---------------------------------------------------
+
+    def _on_hl(self, elements: List[str]):
+        self._finish_claim()
+        level = _element(elements, 3)
+        if level == '20':
+            self._loop = '2000A'
+            self._provider = {}
+        elif level == '22':
+            self._loop = '2000B'
+            self._subscriber, self._patient = {}, {}
+        elif level == '23':
+            self._loop = '2000C'
+            self._patient = {}
+        else:
+            self._loop = f'2000:{level}'
+
+    def _on_nm1(self, elements: List[str]):
+        entity = _element(elements, 1)
+        if self._claim is not None:
+            # Names inside the claim loop override the hierarchy, as the split parser did
+            if entity == 'QC':
+                self._set_name(self._claim, 'patient', elements)
+            elif entity == '85':
+                self._set_name(self._claim, 'provider', elements)
+        elif entity == '85' and self._loop == '2000A':
+            self._set_name(self._provider, 'provider', elements)
+        elif entity == 'IL' and self._loop == '2000B':
+            self._set_name(self._subscriber, 'patient', elements)
+        elif entity == 'QC' and self._loop == '2000C':
+            self._set_name(self._patient, 'patient', elements)
+
+    def _on_sbr(self, elements: List[str]):
+        # SBR after CLM is 2320 other subscriber information, not this subscriber
+        if self._loop == '2000B' and self._claim is None:
+            self._subscriber['payer_responsibility'] = _element(elements, 1) or 'P'
+            self._subscriber['individual_relationship_code'] = _element(elements, 2) or '18'
+
+    # Claim and service lines -----------------------------------------------
+
+    def _on_clm(self, elements: List[str]):
+        self._finish_claim()
+        facility = _element(elements, 5).split(self.delimiters.component)
         claim = {
-            'claim_number': elements[1] if len(elements) > 1 else '',
-            'total_charge': float(elements[2]) if len(elements) > 2 and elements[2] else 0.0,
-            'place_of_service': elements[5] if len(elements) > 5 else '',
-            'claim_frequency_code': elements[6] if len(elements) > 6 else '1',
+            'claim_number': _element(elements, 1),
+            'total_charge': _to_float(_element(elements, 2)),
+            'place_of_service': facility[0],
+            'claim_frequency_code': facility[2] if len(facility) > 2 and facility[2] else '1',
         }
-        
-        return claim
-    
-    def _parse_nm1_segment(self, segment: str, claim: Dict[str, Any], segments: List[str], index: int):
-        """Parse NM1 (Name) segments"""
-        elements = segment.split(self.element_separator)
-        
-        if len(elements) < 3:
+        claim.update(self._provider)
+        # The subscriber is the patient unless a 2000C patient level was given
+        claim.update(self._subscriber)
+        claim.update(self._patient)
+        claim['service_lines'] = []
+        if self.claim_type == ClaimType.DENTAL:
+            claim['dental_details'] = {}
+
+        self._claim = claim
+        self._claim_start = self._segment_start
+        self._line = None
+        self._loop = '2300'
+
+    def _on_lx(self, elements: List[str]):
+        if self._claim is not None:
+            self._loop = '2400'
+            self._line = None
+
+    def _add_line(self, line: Dict[str, Any]):
+        self._claim['service_lines'].append(line)
+        self._line = line
+
+    def _on_sv1(self, elements: List[str]):
+        if self._claim is None:
             return
-        
-        entity_type = elements[1]
-        entity_name_type = elements[2]
-        
-        if entity_type == 'QC':  # Patient
-            claim['patient_last_name'] = elements[3] if len(elements) > 3 else ''
-            claim['patient_first_name'] = elements[4] if len(elements) > 4 else ''
-            claim['patient_id'] = elements[9] if len(elements) > 9 else ''
-        
-        elif entity_type == '85':  # Billing Provider
-            claim['provider_name'] = elements[3] if len(elements) > 3 else ''
-            claim['provider_npi'] = elements[9] if len(elements) > 9 else ''
-    
-    def _parse_sbr_segment(self, segment: str, claim: Dict[str, Any]):
-        """Parse SBR (Subscriber Information) segment"""
-        elements = segment.split(self.element_separator)
-        
-        claim['payer_responsibility'] = elements[1] if len(elements) > 1 else 'P'
-        claim['individual_relationship_code'] = elements[2] if len(elements) > 2 else '18'
-    
-    def _parse_sv1_segment(self, segment: str) -> Dict[str, Any]:
-        """Parse SV1 (Professional Service) segment"""
-        elements = segment.split(self.element_separator)
-        
-        # Parse procedure code (may have modifiers)
-        procedure_info = elements[1].split(self.component_separator) if len(elements) > 1 else ['']
-        
-        service_line = {
-            'procedure_code': procedure_info[0],
-            'modifier_1': procedure_info[1] if len(procedure_info) > 1 else '',
-            'modifier_2': procedure_info[2] if len(procedure_info) > 2 else '',
-            'charge_amount': float(elements[2]) if len(elements) > 2 and elements[2] else 0.0,
-            'units': int(elements[4]) if len(elements) > 4 and elements[4] else 1,
-        }
-        
-        return service_line
-    
-    def _parse_sv3_segment(self, segment: str) -> Dict[str, Any]:
-        """Parse SV3 (Dental Service) segment"""
-        elements = segment.split(self.element_separator)
-        
-        # Parse procedure code and tooth information
-        procedure_info = elements[1].split(self.component_separator) if len(elements) > 1 else ['']
-        
-        service_line = {
-            'procedure_code': procedure_info[0],
-            'tooth_surface': procedure_info[1] if len(procedure_info) > 1 else '',
-            'charge_amount': float(elements[2]) if len(elements) > 2 and elements[2] else 0.0,
-            'units': int(elements[4]) if len(elements) > 4 and elements[4] else 1,
-        }
-        
-        return service_line
-    
-    def _parse_dental_details(self, segments: List[str], start_index: int) -> Dict[str, Any]:
-        """Parse dental-specific segments like DN1, DN2"""
-        dental_details = {}
-        
-        # Look for DN1 and DN2 segments after current claim
-        for i in range(start_index, min(start_index + 20, len(segments))):
-            segment = segments[i]
-            
-            if segment.startswith('DN1'):
-                # Orthodontic information
-                elements = segment.split(self.element_separator)
-                dental_details['months_of_treatment'] = int(elements[1]) if len(elements) > 1 and elements[1] else None
-            
-            elif segment.startswith('DN2'):
-                # Tooth status information
-                elements = segment.split(self.element_separator)
-                dental_details['tooth_number'] = elements[1] if len(elements) > 1 else ''
-                dental_details['tooth_status'] = elements[2] if len(elements) > 2 else ''
-        
-        return dental_details
-    
-    def _parse_dtp_segment(self, segment: str, claim: Dict[str, Any], service_lines: List[Dict[str, Any]]):
-        """Parse DTP (Date/Time Period) segments"""
-        elements = segment.split(self.element_separator)
-        
-        if len(elements) < 4:
+        procedure = self._procedure(_element(elements, 1))
+        self._add_line({
+            'procedure_code': procedure[0],
+            'modifier_1': procedure[1] if len(procedure) > 1 else '',
+            'modifier_2': procedure[2] if len(procedure) > 2 else '',
+            'charge_amount': _to_float(_element(elements, 2)),
+            'units': _to_units(_element(elements, 4)),
+        })
+
+    def _on_sv2(self, elements: List[str]):
+        if self._claim is None:
+            return
+        revenue_code = _element(elements, 1)
+        procedure = self._procedure(_element(elements, 2))
+        self._add_line({
+            'procedure_code': procedure[0] or revenue_code,
+            'revenue_code': revenue_code,
+            'modifier_1': procedure[1] if len(procedure) > 1 else '',
+            'modifier_2': procedure[2] if len(procedure) > 2 else '',
+            'charge_amount': _to_float(_element(elements, 3)),
+            'units': _to_units(_element(elements, 5)),
+        })
+
+    def _on_sv3(self, elements: List[str]):
+        if self._claim is None or self.claim_type != ClaimType.DENTAL:
             return
-        
-        date_qualifier = elements[1]
-        date_format = elements[2]
-        date_value = elements[3]
-        
-        # Convert date based on format
-        if date_format == 'D8' and len(date_value) == 8:
-            # CCYYMMDD format
-            try:
-                parsed_date = datetime.strptime(date_value, '%Y%m%d')
-                
-                if date_qualifier == '472':  # Service Date
-                    if service_lines:
-                        service_lines[-1]['service_date'] = parsed_date
-                elif date_qualifier == '431':  # Onset of Illness
-                    claim['illness_onset_date'] = parsed_date
-                    
-            except ValueError:
-                pass  # Invalid date format
+        procedure = self._procedure(_element(elements, 1))
+        self._add_line({
+            'procedure_code': procedure[0],
+            'tooth_surface': '',
+            'charge_amount': _to_float(_element(elements, 2)),
+            'units': _to_units(_element(elements, 6)),
+        })
+
+    def _on_too(self, elements: List[str]):
+        if self._line is not None:
+            self._line['tooth_number'] = _element(elements, 2)
+            self._line['tooth_surface'] = ''.join(_element(elements, 3).split(self.delimiters.component))
+
+    def _on_dn1(self, elements: List[str]):
+        if self._claim is not None and 'dental_details' in self._claim:
+            months = _element(elements, 1)
+            self._claim['dental_details']['months_of_treatment'] = int(months) if months.isdigit() else None
+
+    def _on_dn2(self, elements: List[str]):
+        if self._claim is not None and 'dental_details' in self._claim:
+            self._claim['dental_details']['tooth_number'] = _element(elements, 1)
+            self._claim['dental_details']['tooth_status'] = _element(elements, 2)
+
+    def _on_dtp(self, elements: List[str]):
+        if self._claim is None or len(elements) < 4 or elements[2] != 'D8':
+            return
+        parsed_date = _d8_date(elements[3])
+        if parsed_date is None:
+            return
+        qualifier = elements[1]
+        if qualifier == '472':  # Service Date
+            if self._line is not None:
+                self._line['service_date'] = parsed_date
+            else:
+                self._claim['service_date'] = parsed_date
+        elif qualifier == '431':  # Onset of Illness
+            self._claim['illness_onset_date'] = parsed_date
+
+class EDIParser:
+    """Enhanced EDI X12 parser for 837 files"""
+
+    def __init__(self):
+        # Defaults for fragments without an ISA; interchanges carry their own
+        self.segment_terminator = '~'
+        self.element_separator = '*'
+        self.component_separator = ':'
+
+    def stream(self, with_offsets: bool = False, collect_claims: bool = True) -> Streaming837Parser:
+        """Incremental parser for streamed uploads: call feed() per chunk, then close()"""
+        return Streaming837Parser(with_offsets=with_offsets, collect_claims=collect_claims)
+
+    def parse_837_file(self, edi_content: str, with_offsets: bool = False) -> Dict[str, Any]:
+        """
+        Parse 837 EDI file and extract claim data
+
+        With with_offsets each claim also carries 'edi_offset' and 'edi_length',
+        the character span of its CLM loop within edi_content.
+        """
+        parser = self.stream(with_offsets=with_offsets)
+        parser.feed(edi_content)
+        result = parser.close()
+        result['raw_edi'] = edi_content
+        return result
@@ -12,7 +12,7 @@ the foundational Claims service's FHIR-based CRUD operations.
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from .claims_service_client import ClaimsServiceClient, ClaimsDataTransformer, create_claims_service_client
 from .edi_parser import EDIParser
@@ -96,6 +96,72 @@ class EnhancedClaimProcessor:
                 'processed_at': datetime.utcnow().isoformat()
             }
     
+    async def push_claims_to_fhir(
+        self,
+        claim_ids: List[int],
+        chunk_size: int = 100,
+        max_concurrency: int = 4
+    ) -> Dict:
+        """
+        Create local claims in the Claims service as FHIR Bundles
+        
+        Args:
+            claim_ids: Local claim IDs
+            chunk_size: Claims per Bundle request
+            max_concurrency: Bundle requests in flight at once
+            
+        Returns:
+            Per-claim FHIR IDs or errors, with totals
+        """
+        claims = (
+            self.db.query(LocalClaim)
+            .options(joinedload(LocalClaim.service_lines))
+            .filter(LocalClaim.id.in_(claim_ids))
+            .order_by(LocalClaim.id)
+            .all()
+        )
+        
+        fhir_claims = []
+        for claim in claims:
+            fhir_claims.append(self.transformer.edi_claim_to_fhir({
+                'claim_number': claim.claim_number,
+                'claim_type': claim.claim_type.value if claim.claim_type else '837P',
+                'status': 'active',
+                'patient_id': claim.patient_id or '',
+                'payer_id': str(claim.payer_id or ''),
+                'provider_npi': claim.provider_npi or '',
+                'total_charge': claim.total_charge or 0,
+                'service_lines': [{
+                    'line_number': line.line_number,
+                    'procedure_code': line.procedure_code or '',
+                    'procedure_description': line.procedure_description or '',
+                    'service_date_from': line.service_date_from.isoformat() if line.service_date_from else '',
+                    'units': line.units or 1,
+                    'charge_amount': line.charge_amount or 0
+                } for line in claim.service_lines]
+            }))
+        
+        async with self.claims_client as client:
+            results = await client.create_claims_bulk(fhir_claims, chunk_size=chunk_size, max_concurrency=max_concurrency)
+        
+        found = {claim.id for claim in claims}
+        claim_results = [
+            {'claim_id': claim.id, 'fhir_id': result['id'], 'success': result['success'], 'error': result['error']}
+            for claim, result in zip(claims, results)
+        ]
+        claim_results += [
+            {'claim_id': claim_id, 'fhir_id': None, 'success': False, 'error': 'Claim not found'}
+            for claim_id in claim_ids if claim_id not in found
+        ]
+        created = sum(1 for result in claim_results if result['success'])
+        return {
+            'total': len(claim_results),
+            'created': created,
+            'failed': len(claim_results) - created,
+            'requests': -(-len(fhir_claims) // chunk_size),
+            'results': claim_results
+        }
+    
     async def get_claim(self, claim_id: str, use_fhir: bool = True) -> Dict:
         """
         Get a claim by ID, optionally from Claims service
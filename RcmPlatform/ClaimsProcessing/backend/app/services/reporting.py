@@ -0,0 +1,237 @@
+# =============================================================================
+# FILE: backend/app/services/reporting.py
+# =============================================================================
+import logging
+import threading
+import time
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from ..database.connection import SessionLocal
+from ..database.models import Claim, ClaimDailySummary, ClaimStatus, ClaimType
+
+logger = logging.getLogger(__name__)
+
+RECONCILED_STATUSES = (ClaimStatus.PAID, ClaimStatus.ADJUSTED)
+
+def _label(enum_class, raw: Any) -> Any:
+    """Stored status/type (member name or value) as the API value, e.g. 'REJECTED' -> 'rejected'"""
+    if isinstance(raw, enum_class):
+        return raw.value
+    if raw in enum_class.__members__:
+        return enum_class[raw].value
+    return raw
+
+def _category(error: str) -> str:
+    return error.split(':')[0] if ':' in error else 'Other'
+
+class ReportingService:
+    """
+    Reads /reports data from the pre-aggregated tables of
+    migration_reporting.sql: claim_daily_summary (kept current by triggers)
+    and the claim_rejection_categories materialized view (refreshed
+    concurrently). Databases without them (SQLite in development, or before
+    the migration) get the same shapes from live aggregate queries.
+    """
+
+    # Per database URL: whether the reporting tables exist
+    _available: Dict[str, bool] = {}
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def uses_summary_tables(self) -> bool:
+        bind = self.db.get_bind()
+        key = str(bind.url)
+        if key not in self._available:
+            available = False
+            if bind.dialect.name == 'postgresql':
+                available = self.db.execute(text(
+                    "SELECT to_regclass('claim_daily_summary') IS NOT NULL "
+                    "AND to_regclass('claim_rejection_categories') IS NOT NULL"
+                )).scalar()
+            self._available[key] = bool(available)
+        return self._available[key]
+
+    def dashboard(self) -> Dict[str, Any]:
+        if self.uses_summary_tables():
+            source = ClaimDailySummary
+            count = func.sum(ClaimDailySummary.claim_count)
+            recent_filter = ClaimDailySummary.summary_date >= date.today() - timedelta(days=30)
+        else:
+            source = Claim
+            count = func.count(Claim.id)
+            recent_filter = Claim.created_at >= datetime.utcnow() - timedelta(days=30)
+
+        status_counts = self.db.query(source.status, count).group_by(source.status).all()
+        type_counts = self.db.query(source.claim_type, count).group_by(source.claim_type).all()
+        recent_claims = self.db.query(count).filter(recent_filter).scalar()
+        financial = self.db.query(
+            func.sum(source.total_charge), func.sum(source.allowed_amount), func.sum(source.paid_amount)
+        ).first()
+
+        return {
+            "status_distribution": [{"status": _label(ClaimStatus, s), "count": int(c)} for s, c in status_counts if c],
+            "type_distribution": [{"type": _label(ClaimType, t), "count": int(c)} for t, c in type_counts if c],
+            "recent_claims_30_days": int(recent_claims or 0),
+            "financial_summary": {
+                "total_charged": float(financial[0] or 0),
+                "total_allowed": float(financial[1] or 0),
+                "total_paid": float(financial[2] or 0)
+            }
+        }
+
+    def _status_totals(self) -> Dict[str, Dict[str, float]]:
+        """Claim count and amounts per API status value"""
+        if self.uses_summary_tables():
+            source, count = ClaimDailySummary, func.sum(ClaimDailySummary.claim_count)
+        else:
+            source, count = Claim, func.count(Claim.id)
+        totals: Dict[str, Dict[str, float]] = {}
+        for status, claims, charged, paid, responsibility in self.db.query(
+            source.status, count, func.sum(source.total_charge), func.sum(source.paid_amount),
+            func.sum(source.patient_responsibility)
+        ).group_by(source.status).all():
+            entry = totals.setdefault(_label(ClaimStatus, status), {'claims': 0, 'charged': 0.0, 'paid': 0.0, 'responsibility': 0.0})
+            entry['claims'] += int(claims or 0)
+            entry['charged'] += float(charged or 0)
+            entry['paid'] += float(paid or 0)
+            entry['responsibility'] += float(responsibility or 0)
+        return totals
+
+    def rejection_analysis(self) -> Dict[str, Any]:
+        totals = self._status_totals()
+        total_claims = sum(entry['claims'] for entry in totals.values())
+        total_rejected = totals.get(ClaimStatus.REJECTED.value, {}).get('claims', 0)
+
+        refreshed_at = None
+        if self.uses_summary_tables():
+            rows = self.db.execute(text(
+                "SELECT category, error_count, refreshed_at FROM claim_rejection_categories ORDER BY error_count DESC"
+            )).all()
+            error_categories = {row.category: int(row.error_count) for row in rows}
+            refreshed_at = rows[0].refreshed_at if rows else report_refresher.last_refreshed_at
+            report_refresher.refresh_if_stale(refreshed_at)
+        else:
+            # Only the JSON column, never the EDI payloads
+            error_categories: Dict[str, int] = {}
+            for (validation_errors,) in self.db.query(Claim.validation_errors).filter(
+                Claim.status == ClaimStatus.REJECTED, Claim.validation_errors.isnot(None)
+            ).yield_per(1000):
+                errors = validation_errors.get('errors', []) if isinstance(validation_errors, dict) else []
+                for error in errors:
+                    category = _category(error)
+                    error_categories[category] = error_categories.get(category, 0) + 1
+
+        return {
+            "total_rejected": total_rejected,
+            "error_categories": error_categories,
+            "rejection_rate": total_rejected / max(total_claims, 1) * 100,
+            "categories_refreshed_at": refreshed_at
+        }
+
+    def reconciliation_summary(self) -> Dict[str, Any]:
+        totals = self._status_totals()
+        reconciled = [totals[s.value] for s in RECONCILED_STATUSES if s.value in totals]
+        charged = sum(entry['charged'] for entry in reconciled)
+        paid = sum(entry['paid'] for entry in reconciled)
+        responsibility = sum(entry['responsibility'] for entry in reconciled)
+        return {
+            "total_claims": sum(entry['claims'] for entry in reconciled),
+            "total_charged": charged,
+            "total_paid": paid,
+            "total_adjustments": charged - paid - responsibility
+        }
+
+    def reconciliation_page(self, after_id: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One keyset page of paid/adjusted claims, ordered by id"""
+        rows = (
+            self.db.query(
+                Claim.id, Claim.claim_number, Claim.claim_type, Claim.total_charge, Claim.allowed_amount,
+                Claim.paid_amount, Claim.patient_responsibility
+            )
+            .filter(Claim.status.in_(RECONCILED_STATUSES), Claim.id > after_id)
+            .order_by(Claim.id)
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        data = []
+        for row in rows:
+            total_charge = float(row.total_charge or 0)
+            paid = float(row.paid_amount or 0)
+            responsibility = float(row.patient_responsibility or 0)
+            data.append({
+                "claim_id": row.id,
+                "claim_number": row.claim_number,
+                "claim_type": row.claim_type,
+                "total_charge": total_charge,
+                "allowed_amount": float(row.allowed_amount or 0),
+                "paid_amount": paid,
+                "patient_responsibility": responsibility,
+                "adjustment_amount": total_charge - paid - responsibility
+            })
+        return {
+            "reconciliation_data": data,
+            "next_cursor": rows[-1].id if has_more and rows else None
+        }
+
+class ReportRefresher:
+    """Debounced, non-blocking REFRESH MATERIALIZED VIEW CONCURRENTLY of the rejection categories"""
+
+    def __init__(self, min_interval_seconds: float = 30.0, max_staleness_seconds: float = 300.0):
+        self.min_interval_seconds = min_interval_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.last_refreshed_at: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._pending: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def request_refresh(self):
+        """Schedule a refresh, coalescing requests that arrive within min_interval_seconds"""
+        with self._lock:
+            if self._pending is not None:
+                return
+            delay = max(0.0, self._last_refresh + self.min_interval_seconds - time.monotonic())
+            self._pending = threading.Timer(delay, self._run)
+            self._pending.daemon = True
+            self._pending.start()
+
+    def refresh_if_stale(self, refreshed_at: Optional[datetime]):
+        if refreshed_at is None:
+            return
+        if refreshed_at.tzinfo is not None:
+            refreshed_at = refreshed_at.astimezone().replace(tzinfo=None)
+        if (datetime.now() - refreshed_at).total_seconds() > self.max_staleness_seconds:
+            self.request_refresh()
+
+    def refresh(self) -> bool:
+        """Refresh now; False when the database has no reporting views"""
+        db = SessionLocal()
+        try:
+            if not ReportingService(db).uses_summary_tables():
+                return False
+            db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY claim_rejection_categories"))
+            db.commit()
+            self.last_refreshed_at = datetime.now()
+            return True
+        finally:
+            db.close()
+
+    def _run(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing reporting views: {e}")
+        finally:
+            with self._lock:
+                self._last_refresh = time.monotonic()
+                self._pending = None
+
+# Global instance
+report_refresher = ReportRefresher()
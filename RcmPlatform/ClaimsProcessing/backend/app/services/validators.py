@@ -15,8 +15,13 @@ class ClaimValidator:
         self.cpt_codes = self._load_cpt_codes()
         self.frequency_rules = self._load_frequency_rules()
     
-    def validate_claim(self, claim: Claim) -> Dict[str, Any]:
-        """Main validation method"""
+    def validate_claim(self, claim: Claim, check_frequencies: bool = True) -> Dict[str, Any]:
+        """
+        Main validation method
+        
+        BatchClaimValidator passes check_frequencies=False and checks limits
+        against patient history itself.
+        """
         
         errors = []
         warnings = []
@@ -40,7 +45,8 @@ class ClaimValidator:
             errors.extend(self._validate_institutional_claim(claim))
         
         # Frequency validation
-        warnings.extend(self._validate_frequencies(claim))
+        if check_frequencies:
+            warnings.extend(self._validate_frequencies(claim))
         
         return {
             'is_valid': len(errors) == 0,
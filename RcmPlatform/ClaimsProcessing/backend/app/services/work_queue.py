@@ -0,0 +1,162 @@
+# =============================================================================
+# FILE: backend/app/services/work_queue.py
+# =============================================================================
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..database.models import Claim, WorkQueue, WorkQueueStatus, WorkQueuePriority
+
+# Claim columns shown in work queue listings; the EDI payload columns are never loaded
+LISTING_CLAIM_COLUMNS = (
+    Claim.claim_number,
+    Claim.patient_first_name,
+    Claim.patient_last_name,
+    Claim.claim_type,
+    Claim.status.label("claim_status"),
+)
+
+class WorkQueueSummaryCache:
+    """Short-TTL, process-local cache of the work queue summary"""
+
+    def __init__(self, ttl_seconds: float = 5.0):
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            return None
+
+    def set(self, value: Dict[str, Any]):
+        with self._lock:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+class WorkQueueService:
+    """Work queue listing and summary queries"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def summary(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Counts by status, priority and assignee from one GROUP BY over
+        (status, priority, assigned_to), which the idx_work_queue_filters
+        index can answer with an index-only scan.
+        """
+        if use_cache:
+            cached = work_queue_summary_cache.get()
+            if cached is not None:
+                return cached
+
+        rows = (
+            self.db.query(WorkQueue.status, WorkQueue.priority, WorkQueue.assigned_to, func.count(WorkQueue.id))
+            .group_by(WorkQueue.status, WorkQueue.priority, WorkQueue.assigned_to)
+            .all()
+        )
+
+        by_status = {status: 0 for status in WorkQueueStatus}
+        by_priority = {priority.value: 0 for priority in WorkQueuePriority}
+        by_assignee: Dict[str, int] = {}
+        total_items = 0
+        for status, priority, assigned_to, count in rows:
+            total_items += count
+            if status is not None:
+                by_status[status] += count
+            if priority is not None:
+                by_priority[priority.value] += count
+            by_assignee[assigned_to] = by_assignee.get(assigned_to, 0) + count
+
+        result = {
+            "total_items": total_items,
+            "pending": by_status[WorkQueueStatus.PENDING],
+            "assigned": by_status[WorkQueueStatus.ASSIGNED],
+            "in_progress": by_status[WorkQueueStatus.IN_PROGRESS],
+            "completed": by_status[WorkQueueStatus.COMPLETED],
+            "failed": by_status[WorkQueueStatus.FAILED],
+            "cancelled": by_status[WorkQueueStatus.CANCELLED],
+            "by_priority": by_priority,
+            "by_assignee": by_assignee
+        }
+        work_queue_summary_cache.set(result)
+        return result
+
+    def list_items(
+        self,
+        status: Optional[WorkQueueStatus] = None,
+        assigned_to: Optional[str] = None,
+        priority: Optional[WorkQueuePriority] = None,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Newest-first page of work queue items with their claim columns joined
+        in the same query. Pass the returned cursor back as after_id to get the
+        next page; skip is only honoured without after_id.
+        """
+        query = self.db.query(WorkQueue, *LISTING_CLAIM_COLUMNS).join(Claim, WorkQueue.claim_id == Claim.id)
+
+        if status:
+            query = query.filter(WorkQueue.status == status)
+        if assigned_to:
+            query = query.filter(WorkQueue.assigned_to == assigned_to)
+        if priority:
+            query = query.filter(WorkQueue.priority == priority)
+
+        if after_id:
+            # Resolved in SQL so the comparison uses the stored created_at, and a
+            # row-value comparison so the (..., created_at) indexes drive the scan
+            after_created_at = select(WorkQueue.created_at).where(WorkQueue.id == after_id).scalar_subquery()
+            query = query.filter(tuple_(WorkQueue.created_at, WorkQueue.id) < tuple_(after_created_at, after_id))
+        elif skip:
+            query = query.offset(skip)
+
+        rows = (
+            query.order_by(WorkQueue.created_at.desc(), WorkQueue.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = []
+        for row in rows:
+            item = row.WorkQueue
+            items.append({
+                "id": item.id,
+                "claim_id": item.claim_id,
+                "claim_number": row.claim_number,
+                "patient_name": f"{row.patient_first_name} {row.patient_last_name}",
+                "claim_type": row.claim_type,
+                "claim_status": row.claim_status,
+                "assigned_by": item.assigned_by,
+                "assigned_to": item.assigned_to,
+                "assigned_at": item.assigned_at,
+                "status": item.status,
+                "priority": item.priority,
+                "estimated_completion": item.estimated_completion,
+                "actual_completion": item.actual_completion,
+                "work_notes": item.work_notes,
+                "action_taken": item.action_taken,
+                "result_summary": item.result_summary,
+                "created_at": item.created_at,
+                "updated_at": item.updated_at
+            })
+
+        next_cursor = rows[-1].WorkQueue.id if has_more and rows else None
+        return items, next_cursor
+
+# Global instance
+work_queue_summary_cache = WorkQueueSummaryCache()
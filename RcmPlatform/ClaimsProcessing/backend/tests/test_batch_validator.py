@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database.models import Claim, ClaimStatus, ClaimType, Payer, ServiceLine
+from app.services.batch_validator import BatchClaimValidator, payer_rule_cache
+from app.services.claim_processor import ClaimProcessor
+
+VALID_NPI = "1234567897"
+RULES = {
+    "require_diagnosis_code": True,
+    "max_claim_amount": 1000,
+    "frequency_limits": {"99214": "2 per year"}
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_rule_cache():
+    payer_rule_cache.clear()
+
+
+def add_payer(db, rules=None, payer_id="P1"):
+    payer = Payer(name=f"Payer {payer_id}", payer_id=payer_id, validation_rules=rules)
+    db.add(payer)
+    db.commit()
+    return payer
+
+
+def add_claim(db, payer, patient_id="PAT1", code="99214", service_date=datetime(2024, 1, 15),
+              total_charge=150, diagnosis="J069", status=ClaimStatus.QUEUED):
+    claim = Claim(
+        claim_number=f"C{db.query(Claim).count() + 1:06d}",
+        claim_type=ClaimType.PROFESSIONAL,
+        status=status,
+        patient_first_name="JOHN",
+        patient_last_name="DOE",
+        patient_dob=datetime(1980, 1, 1),
+        patient_id=patient_id,
+        provider_name="BILLING PROVIDER",
+        provider_npi=VALID_NPI,
+        payer_id=payer.id,
+        total_charge=total_charge,
+        service_lines=[ServiceLine(line_number=1, procedure_code=code, diagnosis_code_1=diagnosis,
+                                   service_date_from=service_date, charge_amount=total_charge, units=1)]
+    )
+    db.add(claim)
+    db.commit()
+    return claim
+
+
+def test_batch_accepts_clean_claims_and_rejects_over_frequency_limit(session):
+    payer = add_payer(session, RULES)
+    visits = [add_claim(session, payer, service_date=datetime(2024, 1, 15) + timedelta(days=30 * i))
+              for i in range(3)]
+    other_patient = add_claim(session, payer, patient_id="PAT2")
+    unlimited = add_claim(session, payer, code="99213", service_date=datetime(2024, 4, 15))
+
+    summary = BatchClaimValidator(session).validate_claims([c.id for c in visits + [other_patient, unlimited]])
+    results = {result["claim_id"]: result for result in summary["results"]}
+
+    assert summary["validated"] == 4 and summary["rejected"] == 1
+    assert results[visits[0].id]["is_valid"] and results[visits[1].id]["is_valid"]
+    assert results[visits[2].id]["errors"] == [
+        "Frequency limit exceeded for 99214: 2 in the previous 365 days, limit 2 (Payer limit: 2 per year)"
+    ]
+    session.expire_all()
+    assert session.get(Claim, visits[0].id).status == ClaimStatus.VALIDATED
+    assert session.get(Claim, visits[2].id).status == ClaimStatus.REJECTED
+
+
+def test_history_outside_the_batch_counts_and_rejections_do_not(session):
+    payer = add_payer(session, RULES)
+    add_claim(session, payer, service_date=datetime(2024, 1, 15), status=ClaimStatus.PAID)
+    add_claim(session, payer, service_date=datetime(2024, 2, 15), status=ClaimStatus.DENIED)
+    add_claim(session, payer, service_date=datetime(2023, 1, 15), status=ClaimStatus.PAID)
+    second = add_claim(session, payer, service_date=datetime(2024, 3, 15))
+    third = add_claim(session, payer, service_date=datetime(2024, 4, 15))
+
+    first_run = BatchClaimValidator(session).validate_claims([second.id])
+    assert first_run["validated"] == 1
+    second_run = BatchClaimValidator(session).validate_claims([third.id])
+    assert second_run["rejected"] == 1
+
+
+def test_payer_predicates(session):
+    payer = add_payer(session, RULES)
+    no_rules = add_payer(session, None, payer_id="P2")
+    too_expensive = add_claim(session, payer, patient_id="A", total_charge=1500)
+    no_rules_claim = add_claim(session, no_rules, patient_id="B", code="99214")
+
+    results = {r["claim_id"]: r for r in BatchClaimValidator(session).validate_claims(
+        [too_expensive.id, no_rules_claim.id], update_status=False)["results"]}
+
+    assert results[too_expensive.id]["errors"] == ["Total charge exceeds payer maximum of 1000.00"]
+    assert results[no_rules_claim.id]["is_valid"]
+
+
+def test_single_claim_validate_applies_payer_rules_and_stores_errors_and_warnings(session):
+    payer = add_payer(session, {**RULES, "prior_auth_required": ["99214"]})
+    claim = add_claim(session, payer, total_charge=1500)
+
+    result = ClaimProcessor(session).validate_claim(claim.id)
+
+    assert result == {
+        "is_valid": False,
+        "errors": ["Total charge exceeds payer maximum of 1000.00"],
+        "warnings": ["99214 requires prior authorization from this payer"]
+    }
+    session.expire_all()
+    stored = session.get(Claim, claim.id)
+    assert stored.status == ClaimStatus.REJECTED
+    assert stored.validation_errors == {"errors": result["errors"], "warnings": result["warnings"]}
+
+    with pytest.raises(ValueError):
+        ClaimProcessor(session).validate_claim(claim.id + 100)
@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+from fastapi import HTTPException
+
+from app.services.claims_service_client import CircuitBreaker, ClaimsServiceClient
+
+RESET_TIMEOUT = 0.05
+
+
+class StubClaimsService:
+    """MockTransport handler answering with queued statuses (an exception is raised instead)."""
+
+    def __init__(self):
+        self.answers = []
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self, request):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        answer = self.answers.pop(0) if self.answers else 200
+        if isinstance(answer, Exception):
+            raise answer
+        return httpx.Response(answer, json={"status": "ok"})
+
+
+def make_client(service):
+    client = ClaimsServiceClient(failure_threshold=3, reset_timeout=RESET_TIMEOUT)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(service))
+    return client
+
+
+async def call(client):
+    try:
+        await client.get_claim("C1")
+        return 200
+    except HTTPException as e:
+        return e.status_code
+
+
+def test_circuit_opens_refuses_and_probes_once():
+    service = StubClaimsService()
+    client = make_client(service)
+    breaker = client.circuit_breaker
+
+    async def scenario():
+        # 5xx answers and transport errors both count as failures
+        service.answers = [500, httpx.ConnectError("refused"), 503]
+        assert [await call(client) for _ in range(3)] == [500, 503, 503]
+        assert breaker.state == CircuitBreaker.OPEN and service.calls == 3
+
+        # Open: refused without reaching the service
+        assert await call(client) == 503
+        assert service.calls == 3 and breaker.rejected_requests == 1
+
+        # Half-open: exactly one probe passes while the others are refused
+        await asyncio.sleep(RESET_TIMEOUT)
+        service.release = asyncio.Event()
+        probes = [asyncio.ensure_future(call(client)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert breaker.state == CircuitBreaker.HALF_OPEN and service.calls == 4
+        service.answers = [502]
+        service.release.set()
+        assert sorted(await asyncio.gather(*probes)) == [502, 503, 503]
+        service.release = None
+
+        # The failed probe reopened the circuit
+        assert breaker.state == CircuitBreaker.OPEN
+        assert await call(client) == 503 and service.calls == 4
+
+        # A 4xx probe shows the service is up and closes the circuit
+        await asyncio.sleep(RESET_TIMEOUT)
+        service.answers = [404]
+        assert await call(client) == 404
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.consecutive_failures == 0
+        assert await call(client) == 200
+        await client.aclose()
+
+    asyncio.run(scenario())
+    metrics = breaker.metrics()
+    assert (metrics["opened_total"], metrics["half_opened_total"], metrics["closed_total"]) == (2, 2, 1)
+
+
+def test_failures_below_threshold_do_not_open():
+    breaker = CircuitBreaker("claims", failure_threshold=3, reset_timeout=RESET_TIMEOUT)
+    transitions = []
+    breaker.add_listener(lambda name, old, new: transitions.append((old, new)))
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and transitions == []
+    breaker.record_failure()
+    assert transitions == [(CircuitBreaker.CLOSED, CircuitBreaker.OPEN)]
+    assert not breaker.allow_request()
+
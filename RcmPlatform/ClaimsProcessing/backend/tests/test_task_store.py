@@ -0,0 +1,31 @@
+import time
+
+from app.agent.task_store import InMemoryTaskStore, decode_task, encode_task
+
+
+def test_expiry_index_stays_bounded_under_lru_eviction():
+    store = InMemoryTaskStore(max_entries=10, ttl_seconds=3600)
+    for i in range(20000):
+        store.put(f"task-{i}", {"task_id": f"task-{i}", "status": "completed"}, active=False)
+
+    assert len(store) == 10
+    assert len(store._expiry_index) <= 20
+    assert store.get("task-19999")["status"] == "completed"
+    assert store.get("task-0") is None
+
+
+def test_finished_tasks_expire_and_active_tasks_do_not():
+    store = InMemoryTaskStore(max_entries=10, ttl_seconds=60)
+    store.put("running", {"status": "processing"}, active=True)
+    store.put("done", {"status": "completed"}, active=False)
+
+    assert store.remove_finished_before(time.time() + 1) == 1
+    assert store.get("done") is None
+    assert store.active_tasks() == {"running": {"status": "processing"}}
+
+
+def test_large_records_round_trip_compressed():
+    record = {"result": "x" * 10000}
+    payload = encode_task(record)
+    assert payload[:1] == b"z" and len(payload) < 1000
+    assert decode_task(payload) == record
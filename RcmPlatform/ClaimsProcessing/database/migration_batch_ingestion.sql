@@ -0,0 +1,34 @@
+-- Migration script to add multi-claim 837 batch ingestion
+-- Run this script to update existing database schema
+
+-- Create edi_interchanges table if it doesn't exist; the raw file is stored once per interchange
+CREATE TABLE IF NOT EXISTS edi_interchanges (
+    id SERIAL PRIMARY KEY,
+    interchange_control_number VARCHAR(20),
+    sender_id VARCHAR(50),
+    receiver_id VARCHAR(50),
+    claim_type VARCHAR(10),
+    filename VARCHAR(255),
+    content_hash VARCHAR(64),
+    raw_edi TEXT NOT NULL,
+    transaction_count INTEGER DEFAULT 0,
+    claim_count INTEGER DEFAULT 0,
+    accepted_count INTEGER DEFAULT 0,
+    rejected_count INTEGER DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'processing',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+-- Claims reference their CLM loop inside the interchange instead of copying it
+ALTER TABLE claims
+ADD COLUMN IF NOT EXISTS interchange_id INTEGER REFERENCES edi_interchanges(id),
+ADD COLUMN IF NOT EXISTS edi_offset INTEGER,
+ADD COLUMN IF NOT EXISTS edi_length INTEGER,
+ADD COLUMN IF NOT EXISTS patient_control_number VARCHAR(50);
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_edi_interchanges_control_number ON edi_interchanges(interchange_control_number);
+CREATE INDEX IF NOT EXISTS idx_edi_interchanges_content_hash ON edi_interchanges(content_hash);
+CREATE INDEX IF NOT EXISTS idx_claims_interchange_id ON claims(interchange_id);
+CREATE INDEX IF NOT EXISTS idx_claims_patient_control_number ON claims(patient_control_number);
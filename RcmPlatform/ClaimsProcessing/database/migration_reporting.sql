@@ -0,0 +1,150 @@
+-- Migration script to add incrementally maintained reporting tables
+-- Run this script to update existing database schema (PostgreSQL 11+)
+
+-- Per-day claim counts and amounts by status, type and payer.
+-- Maintained by statement-level triggers, so dashboards read a few hundred rows
+-- no matter how many claims exist.
+CREATE TABLE IF NOT EXISTS claim_daily_summary (
+    summary_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    claim_type VARCHAR(10) NOT NULL,
+    payer_id INTEGER NOT NULL DEFAULT 0, -- 0 when the claim has no payer
+    claim_count INTEGER NOT NULL DEFAULT 0,
+    total_charge NUMERIC(14,2) NOT NULL DEFAULT 0,
+    allowed_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+    paid_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+    patient_responsibility NUMERIC(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (summary_date, status, claim_type, payer_id)
+);
+
+-- Applies one statement's changes to claim_daily_summary in a single upsert.
+-- Transition tables hold every affected row, so a 1000-row bulk insert costs one
+-- grouped upsert instead of 1000 row-level updates of the same summary rows.
+CREATE OR REPLACE FUNCTION claim_daily_summary_apply()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO claim_daily_summary AS s (summary_date, status, claim_type, payer_id, claim_count,
+                                              total_charge, allowed_amount, paid_amount, patient_responsibility)
+        SELECT COALESCE(created_at, CURRENT_TIMESTAMP)::date, status::text, claim_type::text, COALESCE(payer_id, 0), COUNT(*),
+               COALESCE(SUM(total_charge), 0), COALESCE(SUM(allowed_amount), 0),
+               COALESCE(SUM(paid_amount), 0), COALESCE(SUM(patient_responsibility), 0)
+        FROM new_rows
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (summary_date, status, claim_type, payer_id) DO UPDATE SET
+            claim_count = s.claim_count + EXCLUDED.claim_count,
+            total_charge = s.total_charge + EXCLUDED.total_charge,
+            allowed_amount = s.allowed_amount + EXCLUDED.allowed_amount,
+            paid_amount = s.paid_amount + EXCLUDED.paid_amount,
+            patient_responsibility = s.patient_responsibility + EXCLUDED.patient_responsibility;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE claim_daily_summary s SET
+            claim_count = s.claim_count - d.claim_count,
+            total_charge = s.total_charge - d.total_charge,
+            allowed_amount = s.allowed_amount - d.allowed_amount,
+            paid_amount = s.paid_amount - d.paid_amount,
+            patient_responsibility = s.patient_responsibility - d.patient_responsibility
+        FROM (
+            SELECT COALESCE(created_at, CURRENT_TIMESTAMP)::date AS summary_date, status::text AS status, claim_type::text AS claim_type,
+                   COALESCE(payer_id, 0) AS payer_id, COUNT(*) AS claim_count,
+                   COALESCE(SUM(total_charge), 0) AS total_charge, COALESCE(SUM(allowed_amount), 0) AS allowed_amount,
+                   COALESCE(SUM(paid_amount), 0) AS paid_amount,
+                   COALESCE(SUM(patient_responsibility), 0) AS patient_responsibility
+            FROM old_rows
+            GROUP BY 1, 2, 3, 4
+        ) d
+        WHERE s.summary_date = d.summary_date AND s.status = d.status
+          AND s.claim_type = d.claim_type AND s.payer_id = d.payer_id;
+
+    ELSE
+        -- Only rows whose reported columns changed (status transitions, payments) move totals
+        INSERT INTO claim_daily_summary AS s (summary_date, status, claim_type, payer_id, claim_count,
+                                              total_charge, allowed_amount, paid_amount, patient_responsibility)
+        SELECT summary_date, status, claim_type, payer_id, SUM(sign),
+               SUM(sign * total_charge), SUM(sign * allowed_amount),
+               SUM(sign * paid_amount), SUM(sign * patient_responsibility)
+        FROM (
+            SELECT -1 AS sign, COALESCE(o.created_at, CURRENT_TIMESTAMP)::date AS summary_date, o.status::text AS status, o.claim_type::text AS claim_type,
+                   COALESCE(o.payer_id, 0) AS payer_id, COALESCE(o.total_charge, 0) AS total_charge,
+                   COALESCE(o.allowed_amount, 0) AS allowed_amount, COALESCE(o.paid_amount, 0) AS paid_amount,
+                   COALESCE(o.patient_responsibility, 0) AS patient_responsibility
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.status, o.claim_type, o.payer_id, o.created_at, o.total_charge, o.allowed_amount, o.paid_amount, o.patient_responsibility)
+                  IS DISTINCT FROM
+                  (n.status, n.claim_type, n.payer_id, n.created_at, n.total_charge, n.allowed_amount, n.paid_amount, n.patient_responsibility)
+            UNION ALL
+            SELECT 1, COALESCE(n.created_at, CURRENT_TIMESTAMP)::date, n.status::text, n.claim_type::text,
+                   COALESCE(n.payer_id, 0), COALESCE(n.total_charge, 0), COALESCE(n.allowed_amount, 0),
+                   COALESCE(n.paid_amount, 0), COALESCE(n.patient_responsibility, 0)
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.status, o.claim_type, o.payer_id, o.created_at, o.total_charge, o.allowed_amount, o.paid_amount, o.patient_responsibility)
+                  IS DISTINCT FROM
+                  (n.status, n.claim_type, n.payer_id, n.created_at, n.total_charge, n.allowed_amount, n.paid_amount, n.patient_responsibility)
+        ) delta
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (summary_date, status, claim_type, payer_id) DO UPDATE SET
+            claim_count = s.claim_count + EXCLUDED.claim_count,
+            total_charge = s.total_charge + EXCLUDED.total_charge,
+            allowed_amount = s.allowed_amount + EXCLUDED.allowed_amount,
+            paid_amount = s.paid_amount + EXCLUDED.paid_amount,
+            patient_responsibility = s.patient_responsibility + EXCLUDED.patient_responsibility;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS claims_summary_insert_trigger ON claims;
+CREATE TRIGGER claims_summary_insert_trigger
+    AFTER INSERT ON claims
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION claim_daily_summary_apply();
+
+DROP TRIGGER IF EXISTS claims_summary_update_trigger ON claims;
+CREATE TRIGGER claims_summary_update_trigger
+    AFTER UPDATE ON claims
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION claim_daily_summary_apply();
+
+DROP TRIGGER IF EXISTS claims_summary_delete_trigger ON claims;
+CREATE TRIGGER claims_summary_delete_trigger
+    AFTER DELETE ON claims
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION claim_daily_summary_apply();
+
+-- Backfill from existing claims; the lock keeps concurrent writes out until the triggers see them
+BEGIN;
+LOCK TABLE claims IN SHARE MODE;
+TRUNCATE claim_daily_summary;
+INSERT INTO claim_daily_summary (summary_date, status, claim_type, payer_id, claim_count,
+                                 total_charge, allowed_amount, paid_amount, patient_responsibility)
+SELECT COALESCE(created_at, CURRENT_TIMESTAMP)::date, status::text, claim_type::text, COALESCE(payer_id, 0), COUNT(*),
+       COALESCE(SUM(total_charge), 0), COALESCE(SUM(allowed_amount), 0),
+       COALESCE(SUM(paid_amount), 0), COALESCE(SUM(patient_responsibility), 0)
+FROM claims
+GROUP BY 1, 2, 3, 4;
+COMMIT;
+
+-- Rejection categories computed in SQL over the validation_errors JSON.
+-- Refreshed CONCURRENTLY by the API after validation runs, so reads never block.
+CREATE MATERIALIZED VIEW IF NOT EXISTS claim_rejection_categories AS
+SELECT
+    CASE WHEN position(':' IN e.error) > 0 THEN split_part(e.error, ':', 1) ELSE 'Other' END AS category,
+    COUNT(*) AS error_count,
+    COUNT(DISTINCT c.id) AS claim_count,
+    now() AS refreshed_at
+FROM claims c
+CROSS JOIN LATERAL jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(c.validation_errors::jsonb -> 'errors') = 'array'
+         THEN c.validation_errors::jsonb -> 'errors'
+         ELSE '[]'::jsonb END
+) AS e(error)
+WHERE upper(c.status::text) = 'REJECTED'
+GROUP BY 1;
+
+-- REFRESH ... CONCURRENTLY requires a unique index on plain columns
+CREATE UNIQUE INDEX IF NOT EXISTS idx_claim_rejection_categories_category ON claim_rejection_categories(category);
+
+-- Keyset pagination of the reconciliation report
+CREATE INDEX IF NOT EXISTS idx_claims_status_id ON claims(status, id);
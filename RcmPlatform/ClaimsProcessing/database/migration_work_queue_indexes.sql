@@ -0,0 +1,19 @@
+-- Migration script to add composite work queue indexes
+-- Run this script to update existing database schema
+
+-- Status/priority/assignee filters with newest-first keyset pagination; also
+-- covers the single grouped query behind /work-queue/summary
+CREATE INDEX IF NOT EXISTS idx_work_queue_filters ON work_queue(status, priority, assigned_to, created_at);
+
+-- Assignee-only listings
+CREATE INDEX IF NOT EXISTS idx_work_queue_assignee_created ON work_queue(assigned_to, created_at);
+
+-- Unfiltered listings ordered by (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_work_queue_created_id ON work_queue(created_at, id);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_work_queue_status;
+DROP INDEX IF EXISTS idx_work_queue_assigned_to;
+DROP INDEX IF EXISTS idx_work_queue_created_at;
+
+ANALYZE work_queue;
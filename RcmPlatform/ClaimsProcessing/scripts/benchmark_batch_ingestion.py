@@ -0,0 +1,198 @@
+# =============================================================================
+# FILE: scripts/benchmark_batch_ingestion.py
+# =============================================================================
+#!/usr/bin/env python3
+"""
+Benchmark multi-claim 837 ingestion.
+
+Generates a clearinghouse-style batch (default 50,000 claims split over
+several ST/SE transactions), ingests it with ClaimBatchIngestor and compares
+the throughput with committing one claim at a time on a sample.
+
+Uses DATABASE_URL when set, otherwise a throwaway SQLite database:
+
+    python scripts/benchmark_batch_ingestion.py --claims 50000
+    DATABASE_URL=postgresql://... python scripts/benchmark_batch_ingestion.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+def generate_837_batch(claim_count: int, claims_per_transaction: int = 5000, lines_per_claim: int = 2,
+                       invalid_every: int = 0) -> str:
+    """Build an 837P interchange with claim_count CLM loops; every invalid_every-th claim has a bad total"""
+    segments = [
+        "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       *240101*1200*^*00501*000000001*0*P*:",
+        "GS*HC*SENDER*RECEIVER*20240101*1200*1*X*005010X222A1",
+    ]
+    transaction = 0
+    for first in range(0, claim_count, claims_per_transaction):
+        transaction += 1
+        body = [
+            f"ST*837*{transaction:04d}*005010X222A1",
+            "BHT*0019*00*0123*20240101*1200*CH",
+            "NM1*41*2*SUBMITTER*****46*123456789",
+            "NM1*40*2*RECEIVER*****46*987654321",
+            "HL*1**20*1",
+            "NM1*85*2*BILLING PROVIDER*****XX*1234567893",
+        ]
+        hl = 1
+        for number in range(first, min(first + claims_per_transaction, claim_count)):
+            hl += 1
+            charge = 100.00 * lines_per_claim
+            if invalid_every and number % invalid_every == invalid_every - 1:
+                charge += 1
+            body += [
+                f"HL*{hl}*1*22*0",
+                "SBR*P*18*******CI",
+                f"NM1*IL*1*PATIENT{number}*JOHN****MI*M{number:09d}",
+                "NM1*PR*2*PAYER*****PI*12345",
+                f"CLM*PCN{number:09d}*{charge:.2f}***11:B:1*Y*A*Y*I",
+                f"NM1*QC*1*PATIENT{number}*JOHN****MI*M{number:09d}",
+                "HI*ABK:J069",
+            ]
+            for line in range(1, lines_per_claim + 1):
+                body += [
+                    f"LX*{line}",
+                    "SV1*HC:99213*100.00*UN*1***1",
+                    "DTP*472*D8*20240101",
+                ]
+        body.append(f"SE*{len(body) + 1}*{transaction:04d}")
+        segments += body
+    segments += ["GE*%d*1" % transaction, "IEA*1*000000001"]
+    return "~\n".join(segments) + "~\n"
+
+# Luhn-valid NPI, so seeded claims pass ClaimValidator's NPI check
+VALID_NPI = "1234567897"
+
+# Payer rules exercised by the validation benchmark: two predicates and one frequency limit
+VALIDATION_PAYER_RULES = {
+    "require_diagnosis_code": True,
+    "max_claim_amount": 5000,
+    "frequency_limits": {"99214": "2 per year"}
+}
+
+def seed_validation_claims(db, models, payer_id: int, claim_count: int, visits_per_patient: int = 4):
+    """
+    Insert claims that pass every static check, for timing BatchClaimValidator.
+
+    Each patient has visits_per_patient visits a month apart; the first three
+    bill 99214, which VALIDATION_PAYER_RULES limits to 2 per year, so every
+    patient's third 99214 visit is rejected by the frequency check. Returns
+    (claim_ids, expected_rejected).
+    """
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+
+    first_visit = datetime(2024, 1, 15)
+    run = int(time.time())
+    claim_rows, line_rows, expected_rejected = [], [], 0
+    for number in range(claim_count):
+        patient, visit = divmod(number, visits_per_patient)
+        code = "99214" if visit < 3 else "99213"
+        expected_rejected += visit == 2
+        claim_rows.append({
+            "claim_number": f"VAL{run}-{number:09d}",
+            "claim_type": models.ClaimType.PROFESSIONAL,
+            "status": models.ClaimStatus.QUEUED,
+            "patient_first_name": "JOHN",
+            "patient_last_name": f"PATIENT{patient}",
+            "patient_dob": datetime(1980, 1, 1),
+            "patient_id": f"VAL{run}-{patient:09d}",
+            "provider_name": "BILLING PROVIDER",
+            "provider_npi": VALID_NPI,
+            "payer_id": payer_id,
+            "total_charge": 150,
+        })
+        line_rows.append({
+            "line_number": 1,
+            "procedure_code": code,
+            "diagnosis_code_1": "J069",
+            "service_date_from": first_visit + timedelta(days=30 * visit),
+            "charge_amount": 150,
+            "units": 1,
+        })
+
+    claim_ids = []
+    for start in range(0, claim_count, 5000):
+        ids = db.execute(
+            insert(models.Claim).returning(models.Claim.id, sort_by_parameter_order=True),
+            claim_rows[start:start + 5000]
+        ).scalars().all()
+        db.execute(insert(models.ServiceLine), [
+            {**line, "claim_id": claim_id} for claim_id, line in zip(ids, line_rows[start:start + 5000])
+        ])
+        claim_ids.extend(ids)
+    db.commit()
+    return claim_ids, expected_rejected
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch 837 ingestion")
+    parser.add_argument("--claims", type=int, default=50000, help="Claims in the generated file")
+    parser.add_argument("--per-transaction", type=int, default=5000, help="Claims per ST/SE transaction")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Claims per database transaction")
+    parser.add_argument("--validate", action="store_true",
+                        help="Also time batch validation of as many seeded claims under payer rules and a frequency limit")
+    parser.add_argument("--legacy-sample", type=int, default=200, help="Claims to time through the legacy single-claim path (0 to skip)")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='claims_bench_'), 'claims.db')}"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app.database.connection import SessionLocal, engine
+    from app.database import models
+    from app.services.batch_ingestion import ClaimBatchIngestor
+    from app.services.batch_validator import BatchClaimValidator
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        payer = db.query(models.Payer).first()
+        if payer is None:
+            payer = models.Payer(name="Benchmark Payer", payer_id=f"BENCH{int(time.time())}")
+            db.add(payer)
+            db.commit()
+
+        edi_content = generate_837_batch(args.claims, args.per_transaction, invalid_every=1000)
+        print(f"📄 Generated {args.claims:,} claims ({len(edi_content) / 1_000_000:.1f} MB) on {engine.url.get_backend_name()}")
+
+        start = time.perf_counter()
+        summary = ClaimBatchIngestor(db, chunk_size=args.chunk_size).ingest(edi_content, payer.id, "benchmark.edi")
+        elapsed = time.perf_counter() - start
+        print(f"⚡ Batch ingestion: {elapsed:.2f}s, {summary['total_claims'] / elapsed:,.0f} claims/s "
+              f"({summary['accepted']:,} accepted, {summary['rejected']:,} rejected)")
+
+        if args.validate:
+            payer.validation_rules = VALIDATION_PAYER_RULES
+            db.commit()
+            claim_ids, expected_rejected = seed_validation_claims(db, models, payer.id, args.claims)
+            start = time.perf_counter()
+            validation = BatchClaimValidator(db).validate_claims(claim_ids)
+            elapsed = time.perf_counter() - start
+            limited = sum(1 for result in validation['results']
+                          if any(error.startswith("Frequency limit exceeded") for error in result['errors']))
+            print(f"✅ Batch validation: {elapsed:.2f}s, {validation['total_claims'] / elapsed:,.0f} claims/s "
+                  f"({validation['validated']:,} valid, {validation['rejected']:,} rejected, "
+                  f"{limited:,} over a frequency limit)")
+            assert validation['rejected'] == limited == expected_rejected, "unexpected validation outcomes"
+            assert validation['validated'] == len(claim_ids) - expected_rejected
+
+        if args.legacy_sample:
+            # One commit per claim, as when every claim arrives in its own upload
+            sample = generate_837_batch(args.legacy_sample, args.per_transaction)
+            start = time.perf_counter()
+            ClaimBatchIngestor(db, chunk_size=1).ingest(sample, payer.id, "benchmark-per-claim.edi")
+            per_claim = (time.perf_counter() - start) / args.legacy_sample
+            print(f"🐢 Per-claim commits: {1 / per_claim:,.0f} claims/s, "
+                  f"~{per_claim * args.claims:.1f}s projected for {args.claims:,} claims")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
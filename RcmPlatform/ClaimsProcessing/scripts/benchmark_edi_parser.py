@@ -0,0 +1,75 @@
+# =============================================================================
+# FILE: scripts/benchmark_edi_parser.py
+# =============================================================================
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass 837 parser against the previous split-based parser.
+
+Parses the same generated batch with LegacyEDIParser, EDIParser and the
+incremental stream API fed in fixed-size chunks, and checks that all three
+find the same claims:
+
+    python scripts/benchmark_edi_parser.py --claims 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(SCRIPTS_DIR, "..", "backend")
+
+def timed(label: str, parse, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<28} {best:8.3f}s  {len(result['claims']) / best:>10,.0f} claims/s")
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 837 parsing")
+    parser.add_argument("--claims", type=int, default=50000, help="Claims in the generated file")
+    parser.add_argument("--lines", type=int, default=2, help="Service lines per claim")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="Characters per feed() call")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser; the best is reported")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    sys.path.insert(0, BACKEND_DIR)
+    sys.path.insert(0, SCRIPTS_DIR)
+
+    from app.services.edi_parser import EDIParser
+    from benchmark_batch_ingestion import generate_837_batch
+    from legacy_edi_parser import LegacyEDIParser
+
+    edi_content = generate_837_batch(args.claims, lines_per_claim=args.lines)
+    print(f"📄 {args.claims:,} claims, {len(edi_content) / 1_000_000:.1f} MB")
+
+    def stream():
+        stream_parser = EDIParser().stream(with_offsets=True)
+        for start in range(0, len(edi_content), args.chunk_size):
+            stream_parser.feed(edi_content[start:start + args.chunk_size])
+        return stream_parser.close()
+
+    legacy, legacy_time = timed("split-based (legacy)", lambda: LegacyEDIParser().parse_837_file(edi_content, with_offsets=True), args.repeat)
+    single, single_time = timed("single-pass", lambda: EDIParser().parse_837_file(edi_content, with_offsets=True), args.repeat)
+    streamed, _ = timed(f"single-pass, {args.chunk_size:,}-char feed()", stream, args.repeat)
+
+    print(f"⚡ Speedup: {legacy_time / single_time:.1f}x")
+
+    def spans(result):
+        return [(c['claim_number'], c['edi_offset'], c['edi_length'], len(c['service_lines'])) for c in result['claims']]
+
+    if spans(legacy) == spans(single) == spans(streamed):
+        print("✅ All parsers found the same claims, spans and service lines")
+    else:
+        print("❌ Parsers disagree")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
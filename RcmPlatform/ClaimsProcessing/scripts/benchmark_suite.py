@@ -0,0 +1,479 @@
+# =============================================================================
+# FILE: scripts/benchmark_suite.py
+# =============================================================================
+#!/usr/bin/env python3
+"""
+Reproducible load benchmark for the claims API.
+
+Generates synthetic 837 files (configurable size and professional / dental /
+institutional mix, with a share of invalid claims) and drives
+
+  * POST /api/claims/upload
+  * POST /api/claims/{id}/validate
+  * GET  /api/claims/work-queue/ and /api/claims/work-queue/summary
+  * GET  /api/reports/dashboard, /rejection-analysis and /reconciliation
+  * POST /api/enhanced-claims/fhir/bulk-push (against a stub Claims service)
+
+with open-loop Poisson arrivals at a fixed rate per scenario. Latency is
+measured from each request's scheduled start, so a slow server cannot hide
+queueing delay by slowing the load down; time from actual send is reported as
+service time. Both go into HDR-style histograms, and the run is written as a
+JSON report that --compare diffs against an earlier one.
+
+By default the API runs in-process against DATABASE_URL, or a throwaway SQLite
+database when it is unset, and a stub Claims service listens on
+--claims-service-port (8001, the URL EnhancedClaimProcessor uses):
+
+    python scripts/benchmark_suite.py --duration 30 --output baseline.json
+    DATABASE_URL=postgresql://... python scripts/benchmark_suite.py --compare baseline.json
+    python scripts/benchmark_suite.py --url http://localhost:8000 --rates validate=50,work_queue=20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+DEFAULT_RATES = {
+    "upload": 0.5,
+    "validate": 20,
+    "work_queue": 10,
+    "work_queue_summary": 5,
+    "reports_dashboard": 2,
+    "reports_rejections": 1,
+    "reports_reconciliation": 2,
+    "fhir_push": 0.5,
+}
+
+# GS08 implementation guide per claim type; the parser derives the claim type from it
+IMPLEMENTATION_GUIDES = {
+    "professional": "005010X222A1",
+    "dental": "005010X224A2",
+    "institutional": "005010X223A2",
+}
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of microsecond values: log-linear buckets with 128
+    sub-buckets per power of two, so every recorded value is kept to within
+    1% while the bucket count stays small and mergeable across runs.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, seconds: float):
+        value = max(1, int(seconds * 1_000_000))
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS - 1)
+        bucket = (value >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile: float) -> int:
+        if not self.total:
+            return 0
+        threshold = self.total * percentile / 100
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= threshold:
+                return min(bucket, self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, Any]:
+        if not self.total:
+            return {}
+        summary = {"min": self.min / 1000, "mean": round(self.sum / self.total / 1000, 3), "max": self.max / 1000}
+        for percentile in PERCENTILES:
+            summary[f"p{percentile:g}".replace(".", "_")] = self.percentile(percentile) / 1000
+        return summary
+
+class ScenarioStats:
+    def __init__(self):
+        self.response_time = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.status_codes: Dict[str, int] = {}
+        self.errors = 0
+        self.dropped = 0
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        completed = self.response_time.total
+        return {
+            "requests": completed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "throughput_rps": round(completed / duration, 2) if duration else 0,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "latency_ms": self.response_time.summary_ms(),
+            "service_time_ms": self.service_time.summary_ms(),
+            "histogram_us": {str(bucket): count for bucket, count in sorted(self.response_time.counts.items())},
+        }
+
+def generate_837_file(claim_type: str, claims: int, lines_per_claim: int, invalid_ratio: float,
+                      rng: random.Random, prefix: str) -> str:
+    """One 837 interchange of a single claim type; invalid claims carry a total that does not match their lines"""
+    version = IMPLEMENTATION_GUIDES[claim_type]
+    segments = [
+        "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       *240101*1200*^*00501*000000001*0*P*:",
+        f"GS*HC*SENDER*RECEIVER*20240101*1200*1*X*{version}",
+        f"ST*837*0001*{version}",
+        "BHT*0019*00*0123*20240101*1200*CH",
+        "NM1*41*2*SUBMITTER*****46*123456789",
+        "NM1*40*2*RECEIVER*****46*987654321",
+        "HL*1**20*1",
+        "NM1*85*2*BILLING PROVIDER*****XX*1234567893",
+    ]
+    for number in range(claims):
+        line_charges = [rng.choice((75.00, 100.00, 150.00, 240.00)) for _ in range(lines_per_claim)]
+        charge = sum(line_charges) + (1 if rng.random() < invalid_ratio else 0)
+        facility = "13:A:1" if claim_type == "institutional" else "11:B:1"
+        segments += [
+            f"HL*{number + 2}*1*22*0",
+            "SBR*P*18*******CI",
+            f"NM1*IL*1*PATIENT{number}*JOHN****MI*M{number:09d}",
+            "NM1*PR*2*PAYER*****PI*12345",
+            f"CLM*{prefix}{number:05d}*{charge:.2f}***{facility}*Y*A*Y*I",
+            "HI*ABK:J069",
+        ]
+        for line, line_charge in enumerate(line_charges, start=1):
+            segments.append(f"LX*{line}")
+            if claim_type == "dental":
+                segments += [f"SV3*AD:D{rng.choice((1110, 2391, 2740))}*{line_charge:.2f}****1",
+                             f"TOO*JP*{rng.randint(1, 32)}*O"]
+            elif claim_type == "institutional":
+                segments.append(f"SV2*0450*HC:99283*{line_charge:.2f}*UN*1")
+            else:
+                segments.append(f"SV1*HC:99213*{line_charge:.2f}*UN*1***1")
+            segments.append("DTP*472*D8*20240101")
+    segments.append(f"SE*{len(segments) - 1}*0001")
+    segments += ["GE*1*1", "IEA*1*000000001"]
+    return "~\n".join(segments) + "~\n"
+
+class ClaimsServiceStub:
+    """Minimal Claims service: accepts every resource and answers Bundles with a 201 per entry"""
+
+    def __init__(self, port: int):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @staticmethod
+    def _handler():
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/fhir+json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._reply(200, {"status": "healthy"} if self.path.endswith("/health") else {})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if body.get("resourceType") != "Bundle":
+                    self._reply(201, {**body, "id": str(uuid.uuid4())})
+                    return
+                entries = [{"response": {"status": "201 Created",
+                                         "location": f"{entry.get('resource', {}).get('resourceType', 'Claim')}/{uuid.uuid4()}"}}
+                           for entry in body.get("entry", [])]
+                self._reply(200, {"resourceType": "Bundle", "type": f"{body.get('type', 'batch')}-response", "entry": entries})
+
+            do_PUT = do_POST
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+class BenchmarkSuite:
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed + 1)
+        self.claim_ids: List[int] = []
+        self.upload_files: List[Tuple[str, str]] = []
+        self.files_sent = 0
+
+    def build_upload_files(self, count: int):
+        """Pre-generate upload bodies so generation time never counts as latency"""
+        rng = random.Random(self.args.seed)
+        # Claim numbers are unique, so each run gets its own prefix
+        run_tag = uuid.uuid4().hex[:8].upper()
+        kinds, weights = zip(*self.args.mix.items())
+        for number in range(count):
+            claim_type = rng.choices(kinds, weights)[0]
+            content = generate_837_file(claim_type, self.args.claims_per_file, self.args.lines_per_claim,
+                                        self.args.invalid_ratio, rng, f"L{run_tag}{number:05d}")
+            self.upload_files.append((f"load_{self.args.seed}_{number}.edi", content))
+
+    def _track_upload(self, response: httpx.Response):
+        if response.status_code == 200:
+            self.claim_ids += [claim["claim_id"] for claim in response.json()["claims"] if claim.get("claim_id")]
+
+    async def upload(self) -> httpx.Response:
+        filename, content = self.upload_files[self.files_sent % len(self.upload_files)]
+        self.files_sent += 1
+        response = await self.client.post("/api/claims/upload", params={"payer_id": 1},
+                                          files={"file": (filename, content.encode(), "text/plain")})
+        self._track_upload(response)
+        return response
+
+    async def validate(self) -> httpx.Response:
+        return await self.client.post(f"/api/claims/{self.rng.choice(self.claim_ids)}/validate")
+
+    async def work_queue(self) -> httpx.Response:
+        params = {"limit": 50}
+        if self.rng.random() < 0.5:
+            params["status"] = "ASSIGNED"
+        return await self.client.get("/api/claims/work-queue/", params=params)
+
+    async def work_queue_summary(self) -> httpx.Response:
+        return await self.client.get("/api/claims/work-queue/summary")
+
+    async def reports_dashboard(self) -> httpx.Response:
+        return await self.client.get("/api/reports/dashboard")
+
+    async def reports_rejections(self) -> httpx.Response:
+        return await self.client.get("/api/reports/rejection-analysis")
+
+    async def reports_reconciliation(self) -> httpx.Response:
+        return await self.client.get("/api/reports/reconciliation", params={"limit": 100})
+
+    async def fhir_push(self) -> httpx.Response:
+        claim_ids = self.rng.sample(self.claim_ids, min(100, len(self.claim_ids)))
+        return await self.client.post("/api/enhanced-claims/fhir/bulk-push", json={"claim_ids": claim_ids})
+
+    async def seed(self):
+        """Upload the seed files and queue a quarter of their claims; not measured"""
+        for _ in range(self.args.seed_files):
+            response = await self.upload()
+            response.raise_for_status()
+        for number, claim_id in enumerate(self.claim_ids[::4]):
+            await self.client.post(f"/api/claims/{claim_id}/assign",
+                                   json={"assigned_to": f"user-{number % 10}", "priority": "MEDIUM"})
+        if not self.claim_ids:
+            raise RuntimeError("Seeding produced no claims; check the upload response")
+
+    def schedule(self) -> List[Tuple[float, str]]:
+        """Poisson arrivals per scenario over the run, from a seeded generator"""
+        rng = random.Random(self.args.seed)
+        arrivals = []
+        for name, rate in sorted(self.args.rates.items()):
+            if rate <= 0:
+                continue
+            offset = rng.expovariate(rate)
+            while offset < self.args.duration:
+                arrivals.append((offset, name))
+                offset += rng.expovariate(rate)
+        return sorted(arrivals)
+
+    async def _issue(self, name: str, intended_start: float, stats: ScenarioStats):
+        sent_at = time.perf_counter()
+        try:
+            response = await getattr(self, name)()
+            status = str(response.status_code)
+            failed = response.status_code >= 400
+        except Exception as e:
+            status = type(e).__name__
+            failed = True
+        finished = time.perf_counter()
+        stats.response_time.record(finished - intended_start)
+        stats.service_time.record(finished - sent_at)
+        stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+        stats.errors += 1 if failed else 0
+
+    async def run(self) -> Tuple[Dict[str, ScenarioStats], float]:
+        arrivals = self.schedule()
+        stats = {name: ScenarioStats() for name, rate in self.args.rates.items() if rate > 0}
+        in_flight = set()
+        start = time.perf_counter()
+        for offset, name in arrivals:
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= self.args.max_in_flight:
+                stats[name].dropped += 1
+                continue
+            task = asyncio.create_task(self._issue(name, start + offset, stats[name]))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return stats, time.perf_counter() - start
+
+def parse_weights(value: str) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print per-scenario changes against a baseline report"""
+    print(f"\n🔁 Compared with {baseline.get('environment', {}).get('git_commit') or 'baseline'} "
+          f"({baseline.get('started_at', '?')})")
+    print(f"  {'scenario':<24}{'p50 ms':>16}{'p99 ms':>18}{'throughput':>18}{'errors':>10}")
+
+    def change(new: float, old: float) -> str:
+        if not old:
+            return f"{new:>8.1f}        "
+        return f"{new:>8.1f} ({(new - old) / old * 100:+5.0f}%)"
+
+    for name, scenario in report["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            print(f"  {name:<24}  (not in baseline)")
+            continue
+        print(f"  {name:<24}{change(scenario['latency_ms'].get('p50', 0), old['latency_ms'].get('p50', 0)):>16}"
+              f"{change(scenario['latency_ms'].get('p99', 0), old['latency_ms'].get('p99', 0)):>18}"
+              f"{change(scenario['throughput_rps'], old['throughput_rps']):>18}"
+              f"{scenario['errors'] - old['errors']:>+10}")
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        database = "remote"
+    else:
+        if "DATABASE_URL" not in os.environ:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='claims_load_'), 'claims.db')}"
+        sys.path.insert(0, BACKEND_DIR)
+        from app.main import app
+        from app.database.connection import engine
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout)
+        database = engine.url.get_backend_name()
+
+    async with client:
+        suite = BenchmarkSuite(client, args)
+        uploads = sum(1 for _, name in suite.schedule() if name == "upload")
+        suite.build_upload_files(args.seed_files + uploads)
+        print(f"📄 Generated {len(suite.upload_files)} files of {args.claims_per_file} claims ({args.mix})")
+
+        await suite.seed()
+        print(f"🌱 Seeded {len(suite.claim_ids):,} claims from {args.seed_files} files")
+
+        print(f"🚀 Running {args.duration}s at {sum(rate for rate in args.rates.values()):.1f} req/s")
+        stats, elapsed = await suite.run()
+
+    scenarios = {name: scenario.to_dict(elapsed) for name, scenario in sorted(stats.items())}
+    completed = sum(scenario["requests"] for scenario in scenarios.values())
+    return {
+        "suite": "claims-processing-load",
+        "format_version": 1,
+        "started_at": datetime.utcnow().isoformat(),
+        "config": {
+            "seed": args.seed,
+            "duration_seconds": args.duration,
+            "rates": args.rates,
+            "mix": args.mix,
+            "claims_per_file": args.claims_per_file,
+            "lines_per_claim": args.lines_per_claim,
+            "invalid_ratio": args.invalid_ratio,
+            "seed_files": args.seed_files,
+            "max_in_flight": args.max_in_flight,
+        },
+        "environment": {
+            "target": args.url or "in-process",
+            "database": database,
+            "python": platform.python_version(),
+            "git_commit": git_commit(),
+        },
+        "totals": {
+            "requests": completed,
+            "errors": sum(scenario["errors"] for scenario in scenarios.values()),
+            "dropped": sum(scenario["dropped"] for scenario in scenarios.values()),
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_rps": round(completed / elapsed, 2) if elapsed else 0,
+        },
+        "scenarios": scenarios,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for upload, validation, work queue and reports")
+    parser.add_argument("--url", help="Benchmark a running API instead of an in-process one")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--rates", type=parse_weights, default=DEFAULT_RATES,
+                        help="Arrivals per second per scenario, e.g. upload=1,validate=50 (others off)")
+    parser.add_argument("--mix", type=parse_weights, default={"professional": 70, "dental": 20, "institutional": 10},
+                        help="Relative share of each claim type among generated files")
+    parser.add_argument("--claims-per-file", type=int, default=50, help="Claims per generated 837 file")
+    parser.add_argument("--lines-per-claim", type=int, default=2, help="Service lines per claim")
+    parser.add_argument("--invalid-ratio", type=float, default=0.05, help="Share of claims with a mismatched total")
+    parser.add_argument("--seed-files", type=int, default=10, help="Files uploaded before the measured run")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for files and arrivals")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Arrivals beyond this many outstanding requests are dropped")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--claims-service-port", type=int, default=8001, help="Port of the stub Claims service")
+    parser.add_argument("--no-claims-stub", action="store_true", help="Use a real Claims service instead of the stub")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    if args.no_claims_stub:
+        report = asyncio.run(run_suite(args))
+    else:
+        with ClaimsServiceStub(args.claims_service_port):
+            report = asyncio.run(run_suite(args))
+
+    totals = report["totals"]
+    print(f"\n📊 {totals['requests']:,} requests in {totals['elapsed_seconds']}s "
+          f"({totals['throughput_rps']} req/s), {totals['errors']} errors, {totals['dropped']} dropped")
+    print(f"  {'scenario':<24}{'requests':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, scenario in report["scenarios"].items():
+        latency = scenario["latency_ms"]
+        print(f"  {name:<24}{scenario['requests']:>10}{latency.get('p50', 0):>10.1f}{latency.get('p90', 0):>10.1f}"
+              f"{latency.get('p99', 0):>10.1f}{latency.get('max', 0):>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# =============================================================================
+# FILE: scripts/benchmark_work_queue.py
+# =============================================================================
+#!/usr/bin/env python3
+"""
+Benchmark the work queue summary and listing.
+
+Seeds work_queue with --rows items (default 1,000,000) spread over
+statuses, priorities and assignees, then compares:
+
+  * the old summary (one COUNT per status, priority and assignee) with the
+    single grouped query of WorkQueueService.summary
+  * OFFSET pagination with keyset pagination at increasing depths
+
+Uses DATABASE_URL when set, otherwise a throwaway SQLite database:
+
+    python scripts/benchmark_work_queue.py --rows 1000000
+    DATABASE_URL=postgresql://... python scripts/benchmark_work_queue.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+def timed(label: str, fn, repeat: int = 3):
+    """Best of repeat runs"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<42} {best * 1000:10.1f} ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark work queue summary and pagination")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Work queue rows to seed")
+    parser.add_argument("--claims", type=int, default=20_000, help="Claims the rows point at")
+    parser.add_argument("--assignees", type=int, default=50, help="Distinct assignees")
+    parser.add_argument("--page-size", type=int, default=100, help="Rows per page")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='work_queue_bench_'), 'claims.db')}"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from sqlalchemy import insert
+    from app.database.connection import SessionLocal, engine
+    from app.database import models
+    from app.database.models import WorkQueue, WorkQueueStatus, WorkQueuePriority
+    from app.services.work_queue import WorkQueueService
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        statuses = list(WorkQueueStatus)
+        priorities = list(WorkQueuePriority)
+        base_time = datetime(2024, 1, 1)
+
+        start = time.perf_counter()
+        claim_ids = []
+        for first in range(0, args.claims, 5000):
+            rows = [{
+                "claim_number": f"WQB{int(time.time())}{number:09d}",
+                "claim_type": models.ClaimType.PROFESSIONAL,
+                "status": models.ClaimStatus.QUEUED,
+                "patient_first_name": "PATIENT",
+                "patient_last_name": str(number),
+                "total_charge": 100
+            } for number in range(first, min(first + 5000, args.claims))]
+            claim_ids += db.execute(insert(models.Claim).returning(models.Claim.id, sort_by_parameter_order=True), rows).scalars().all()
+        for first in range(0, args.rows, 20000):
+            db.execute(insert(WorkQueue), [{
+                "claim_id": claim_ids[number % len(claim_ids)],
+                "assigned_by": "benchmark",
+                "assigned_to": f"user-{number % args.assignees}",
+                "status": statuses[number % len(statuses)],
+                "priority": priorities[(number // 7) % len(priorities)],
+                "created_at": base_time + timedelta(seconds=number),
+                "updated_at": base_time + timedelta(seconds=number)
+            } for number in range(first, min(first + 20000, args.rows))])
+        db.commit()
+        total = db.query(WorkQueue).count()
+        print(f"📋 Seeded {args.rows:,} work queue rows ({total:,} total) in {time.perf_counter() - start:.1f}s "
+              f"on {engine.url.get_backend_name()}")
+
+        def legacy_summary():
+            # The per-value COUNT queries the summary endpoint used to issue
+            counts = {"total": db.query(WorkQueue).count()}
+            for status in WorkQueueStatus:
+                counts[status.value] = db.query(WorkQueue).filter(WorkQueue.status == status).count()
+            for priority in WorkQueuePriority:
+                counts[priority.value] = db.query(WorkQueue).filter(WorkQueue.priority == priority).count()
+            for (assignee,) in db.query(WorkQueue.assigned_to).distinct().all():
+                counts[assignee] = db.query(WorkQueue).filter(WorkQueue.assigned_to == assignee).count()
+            return counts
+
+        service = WorkQueueService(db)
+        print("\n📊 Summary")
+        legacy = timed(f"per-value COUNTs ({12 + args.assignees} queries)", legacy_summary, repeat=1)
+        summary = timed("single grouped query", lambda: service.summary(use_cache=False))
+        timed("cached (TTL)", lambda: service.summary())
+        assert legacy["total"] == summary["total_items"], "summary totals differ"
+
+        print(f"\n📄 Listing, {args.page_size} rows per page")
+        for depth in (0, 1_000, 100_000, args.rows // 2):
+            if depth >= args.rows:
+                continue
+
+            def offset_page():
+                # The old listing: OFFSET, then a lazy claim load per row
+                items = (
+                    db.query(WorkQueue).join(models.Claim)
+                    .order_by(WorkQueue.created_at.desc(), WorkQueue.id.desc())
+                    .offset(depth).limit(args.page_size).all()
+                )
+                db.expire_all()
+                return [item.claim.claim_number for item in items]
+
+            # Cursor of the row just before the page, as a client walking forward would hold
+            after_id = None
+            if depth:
+                after_id = (
+                    db.query(WorkQueue.id)
+                    .order_by(WorkQueue.created_at.desc(), WorkQueue.id.desc())
+                    .offset(depth - 1).limit(1).scalar()
+                )
+
+            timed(f"OFFSET {depth:,}", offset_page)
+            timed(f"keyset at {depth:,}", lambda: service.list_items(after_id=after_id, limit=args.page_size))
+
+        print("\n🔎 Filtered listing (status + priority + assignee)")
+        timed("keyset, first page", lambda: service.list_items(
+            status=WorkQueueStatus.ASSIGNED, priority=WorkQueuePriority.HIGH,
+            assigned_to="user-1", limit=args.page_size
+        ))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 # File: app/api/api_v1/endpoints/eligibility.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import date
-import uuid
+from typing import Optional
+import json
 
 from app.core.database import get_db
+from app.crud.crud_eligibility import eligibility_request, eligibility_response
+from app.services.eligibility_service import eligibility_service
 
 router = APIRouter()
 
@@ -17,6 +20,8 @@ class EligibilityRequest(BaseModel):
     subscriber_last_name: str
     subscriber_dob: date
     service_type: str = "30"
+    payer_id: Optional[str] = None
+    date_of_service: Optional[date] = None
 
 
 @router.post("/inquiry")
@@ -25,22 +30,8 @@ async def create_eligibility_inquiry(
     db: Session = Depends(get_db),
     request_data: EligibilityRequest
 ):
-    """Create EDI 270 eligibility inquiry."""
-    try:
-        request_id = str(uuid.uuid4())
-        
-        # Mock EDI 270 generation
-        edi_270 = f"ISA*00*          *00*          *ZZ*SUBMITTER      *ZZ*RECEIVER       *20240101*1200*^*00501*{request_id[:9]}*0*T*:~"
-        
-        return {
-            "request_id": request_id,
-            "edi_270": edi_270,
-            "status": "submitted",
-            "message": "Eligibility inquiry submitted successfully"
-        }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Create EDI 270 eligibility inquiry, answered from cache when coverage is known."""
+    return await eligibility_service.inquire(db, request_data)
 
 
 @router.get("/response/{request_id}")
@@ -50,19 +41,53 @@ async def get_eligibility_response(
     request_id: str
 ):
     """Get eligibility response."""
-    try:
-        # Mock EDI 271 response
-        edi_271 = f"ISA*00*          *00*          *ZZ*RECEIVER       *ZZ*SUBMITTER      *20240101*1200*^*00501*{request_id[:9]}*0*T*:~"
-        
+    response = eligibility_response.get_by_request_id(db, request_id=request_id)
+    if response is not None:
         return {
             "request_id": request_id,
-            "edi_271": edi_271,
-            "is_eligible": True,
-            "benefits_info": {
-                "medical": {"deductible": "$1000", "copay": "$25"},
-                "prescription": {"generic_copay": "$10", "brand_copay": "$40"}
-            }
+            "edi_271": response.edi_271_content,
+            "is_eligible": response.is_eligible,
+            "coverage_status": response.coverage_status,
+            "effective_date": response.effective_date,
+            "termination_date": response.termination_date,
+            "benefits_info": json.loads(response.benefits_info) if response.benefits_info else None
         }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    pending = eligibility_service.cache.pending_request(request_id)
+    if pending is not None:
+        return {"request_id": request_id, "status": "submitted", "message": "Awaiting EDI 271 response"}
+
+    request = eligibility_request.get_by_request_id(db, request_id=request_id)
+    if request is not None and request.status == "error":
+        return {"request_id": request_id, "status": "error", "message": "Payer did not answer; the inquiry can be retried"}
+
+    raise HTTPException(status_code=404, detail="Eligibility response not found")
+
+
+@router.post("/271")
+async def receive_eligibility_responses(
+    *,
+    db: Session = Depends(get_db),
+    edi_271: str = Body(..., media_type="text/plain")
+):
+    """Receive an EDI 271 interchange; refreshes cached eligibility for its members."""
+    results = eligibility_service.receive_271(db, edi_271)
+    return {
+        "received": len(results),
+        "request_ids": [result["request_id"] for result in results]
+    }
+
+
+@router.post("/batch-270")
+async def build_batch_eligibility_inquiries(
+    *,
+    db: Session = Depends(get_db),
+    date_of_service: date
+):
+    """Build per-payer batch 270s for pending requests on a date of service."""
+    envelopes = eligibility_service.build_batch_270(db, date_of_service)
+    return {
+        "date_of_service": date_of_service,
+        "envelopes": envelopes,
+        "inquiries": sum(len(envelope["request_ids"]) for envelope in envelopes)
+    }
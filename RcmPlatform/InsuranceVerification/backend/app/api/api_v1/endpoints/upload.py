@@ -1,42 +1,60 @@
 # File: app/api/api_v1/endpoints/upload.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
+from app.services.ocr_jobs import ocr_job_queue
 
 router = APIRouter()
 
 
+def _job_response(job, message: str, size: Optional[int] = None) -> dict:
+    response = job.to_dict()
+    response["message"] = message
+    response["extracted_data"] = job.result["extracted_data"] if job.result else None
+    if size is not None:
+        response["size"] = size
+    return response
+
+
 @router.post("/insurance-card")
 async def upload_insurance_card(
     *,
     db: Session = Depends(get_db),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    wait_seconds: float = Query(settings.OCR_UPLOAD_WAIT_SECONDS, ge=0, le=60)
 ):
-    """Upload and process insurance card."""
-    try:
-        # Simple file validation
-        if file.content_type not in ["image/jpeg", "image/png", "application/pdf"]:
-            raise HTTPException(status_code=400, detail="Invalid file type")
-        
-        # Read file content
-        content = await file.read()
-        
-        # Mock OCR extraction
-        extracted_data = {
-            "patient_name": "John Doe",
-            "member_id": "123456789",
-            "insurance_company": "Sample Insurance"
-        }
-        
-        return {
-            "message": "File uploaded successfully",
-            "filename": file.filename,
-            "size": len(content),
-            "extracted_data": extracted_data
-        }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Upload an insurance card and queue it for OCR.
+
+    Waits up to wait_seconds for the result; a job still running is returned
+    pending and can be polled at /insurance-card/jobs/{job_id}.
+    """
+    if file.content_type not in settings.ALLOWED_FILE_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid file type")
+
+    # Read file content
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Empty file")
+    if len(content) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    job = ocr_job_queue.submit(content, file.content_type, file.filename)
+    job = await ocr_job_queue.wait(job, wait_seconds)
+
+    message = "File processed successfully" if job.result else "File queued for processing"
+    return _job_response(job, message, size=len(content))
+
+
+@router.get("/insurance-card/jobs/{job_id}")
+async def get_insurance_card_job(job_id: str):
+    """Get the status and result of an insurance card OCR job."""
+    job = ocr_job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="OCR job not found")
+    return _job_response(job, "OCR job status")
 
 
 @router.get("/insurance-cards")
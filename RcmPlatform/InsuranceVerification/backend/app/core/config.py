@@ -45,10 +45,30 @@ class Settings(BaseSettings):
     
     # OCR Configuration
     TESSERACT_CMD: str = "/usr/bin/tesseract"
+    OCR_TARGET_DPI: int = 300  # Images scanned above this are downscaled before denoising
+    OCR_MAX_DIMENSION: int = 2000  # Longest side in pixels when the image carries no DPI
+    OCR_MAX_WORKERS: int = 2
+    OCR_MAX_PENDING_JOBS: int = 100
+    OCR_CACHE_SIZE: int = 512
+    OCR_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    OCR_JOB_TTL_SECONDS: int = 60 * 60
+    OCR_UPLOAD_WAIT_SECONDS: float = 10.0  # How long an upload waits for its job before returning it pending
     
     # EDI Configuration
     EDI_SUBMITTER_ID: str = "SUBMITTER"
     EDI_RECEIVER_ID: str = "RECEIVER"
+    
+    # Eligibility cache
+    ELIGIBILITY_CACHE_TTL_SECONDS: int = 12 * 60 * 60
+    ELIGIBILITY_CACHE_SIZE: int = 50000  # Payer/member pairs
+    ELIGIBILITY_PENDING_TTL_SECONDS: int = 15 * 60  # How long a sent 270 dedupes repeat inquiries
+    ELIGIBILITY_BATCH_MAX_TRANSACTIONS: int = 1000  # 270 transactions per batch interchange
+    
+    # Clearinghouse (unset: 271s arrive through POST /eligibility/271)
+    CLEARINGHOUSE_URL: Optional[str] = None
+    CLEARINGHOUSE_TIMEOUT_SECONDS: float = 120.0
+    CLEARINGHOUSE_PAYER_CONCURRENCY: int = 2  # Interchanges in flight per payer endpoint
+    CLEARINGHOUSE_MAX_CONNECTIONS: int = 20
 
     model_config = {
         "env_file": ".env",
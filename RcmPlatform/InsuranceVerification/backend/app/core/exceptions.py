@@ -54,6 +54,18 @@ class OCRException(DetailedHTTPException):
         )
 
 
+class OCRQueueFullException(DetailedHTTPException):
+    """Exception raised when the OCR job queue is at capacity."""
+    
+    def __init__(self, detail: str = "OCR queue is full, retry later"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": "5"},
+            error_code="OCR_QUEUE_FULL"
+        )
+
+
 class EDIException(DetailedHTTPException):
     """Exception for EDI processing errors."""
     
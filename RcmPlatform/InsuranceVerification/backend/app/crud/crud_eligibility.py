@@ -1,12 +1,17 @@
 # File: app/crud/crud_eligibility.py
-from typing import List, Optional
+import json
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, insert, update
 
 from app.crud.base import CRUDBase
 from app.models.models import EligibilityRequest, EligibilityResponse
 from app.schemas.eligibility import EligibilityRequestCreate, EligibilityRequest as EligibilityRequestSchema
 
+logger = logging.getLogger(__name__)
+
 
 class CRUDEligibilityRequest(CRUDBase[EligibilityRequest, EligibilityRequestCreate, EligibilityRequestSchema]):
     """CRUD operations for EligibilityRequest."""
@@ -42,6 +47,88 @@ class CRUDEligibilityRequest(CRUDBase[EligibilityRequest, EligibilityRequestCrea
             .all()
         )
     
+    def get_by_date_of_service(
+        self, db: Session, *, date_of_service: date, status: Optional[str] = None
+    ) -> List[EligibilityRequest]:
+        """Get eligibility requests for a date of service, oldest first."""
+        query = db.query(EligibilityRequest).filter(EligibilityRequest.date_of_service == date_of_service)
+        if status:
+            query = query.filter(EligibilityRequest.status == status)
+        return query.order_by(EligibilityRequest.id).all()
+    
+    def create_request(
+        self,
+        db: Session,
+        *,
+        request_id: str,
+        edi_270_content: str,
+        obj_in: EligibilityRequestCreate,
+        status: str = "submitted"
+    ) -> Optional[EligibilityRequest]:
+        """Create eligibility request with its generated EDI 270."""
+        try:
+            db_request = EligibilityRequest(
+                request_id=request_id,
+                member_id=obj_in.member_id,
+                provider_npi=obj_in.provider_npi,
+                service_type=getattr(obj_in.service_type, "value", obj_in.service_type),
+                subscriber_first_name=obj_in.subscriber_first_name,
+                subscriber_last_name=obj_in.subscriber_last_name,
+                subscriber_dob=obj_in.subscriber_dob,
+                payer_id=obj_in.payer_id,
+                date_of_service=obj_in.date_of_service,
+                edi_270_content=edi_270_content,
+                status=status
+            )
+            db.add(db_request)
+            db.commit()
+            db.refresh(db_request)
+            return db_request
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating eligibility request {request_id}: {str(e)}")
+            return None
+    
+    def create_pending_bulk(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """Insert pending requests (no 270 yet) in one executemany (caller commits)."""
+        if not rows:
+            return 0
+        db.execute(insert(EligibilityRequest), [
+            {**row, 'edi_270_content': '', 'status': 'pending'} for row in rows
+        ])
+        return len(rows)
+    
+    def get_keys_for_date(self, db: Session, *, date_of_service: date) -> set:
+        """(payer_id, member_id, service_type) already requested for a date of service."""
+        return {
+            (row.payer_id, row.member_id, row.service_type) for row in
+            db.query(EligibilityRequest.payer_id, EligibilityRequest.member_id, EligibilityRequest.service_type)
+            .filter(EligibilityRequest.date_of_service == date_of_service)
+        }
+    
+    def requeue_errors_for_date(self, db: Session, *, date_of_service: date) -> int:
+        """Set errored requests for a date of service back to pending (caller commits)."""
+        result = db.execute(
+            update(EligibilityRequest)
+            .where(EligibilityRequest.date_of_service == date_of_service)
+            .where(EligibilityRequest.status == 'error')
+            .values(status='pending')
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def update_status_bulk(self, db: Session, *, request_ids: List[str], status: str) -> int:
+        """Set the status of many requests in one statement (caller commits)."""
+        if not request_ids:
+            return 0
+        result = db.execute(
+            update(EligibilityRequest)
+            .where(EligibilityRequest.request_id.in_(request_ids))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
     def update_status(self, db: Session, *, request_id: str, status: str) -> Optional[EligibilityRequest]:
         """Update request status."""
         request = self.get_by_request_id(db, request_id=request_id)
@@ -87,6 +174,32 @@ class CRUDEligibilityResponse(CRUDBase[EligibilityResponse, None, None]):
         except Exception as e:
             db.rollback()
             return None
+    
+    def create_responses_bulk(self, db: Session, *, results: List[Dict[str, Any]]) -> int:
+        """Insert parsed 271 results for known requests in one executemany (caller commits)."""
+        request_ids = [result['request_id'] for result in results if result.get('request_id')]
+        if not request_ids:
+            return 0
+        known = {
+            row.request_id for row in
+            db.query(EligibilityRequest.request_id).filter(EligibilityRequest.request_id.in_(request_ids))
+        }
+        rows = [
+            {
+                'request_id': result['request_id'],
+                'edi_271_content': result['edi_271_content'],
+                'is_eligible': result['is_eligible'],
+                'benefits_info': json.dumps(result.get('benefits') or {}),
+                'payer_id': result.get('payer_id'),
+                'coverage_status': result.get('coverage_status'),
+                'effective_date': result.get('effective_date'),
+                'termination_date': result.get('termination_date')
+            }
+            for result in results if result.get('request_id') in known
+        ]
+        if rows:
+            db.execute(insert(EligibilityResponse), rows)
+        return len(rows)
 
 
 eligibility_request = CRUDEligibilityRequest(EligibilityRequest)
@@ -7,6 +7,8 @@ from app.core.config import settings
 from app.core.database import engine
 from app.api.api_v1.api import api_router
 from app.models import models
+from app.services.ocr_jobs import ocr_job_queue
+from app.services.clearinghouse_client import clearinghouse_client
 
 
 @asynccontextmanager
@@ -15,7 +17,8 @@ async def lifespan(app: FastAPI):
     models.Base.metadata.create_all(bind=engine)
     yield
     # Shutdown
-    pass
+    ocr_job_queue.shutdown()
+    await clearinghouse_client.aclose()
 
 
 def create_application() -> FastAPI:
@@ -1,5 +1,5 @@
 # File: app/models/models.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -38,9 +38,16 @@ class EligibilityRequest(Base, TimestampMixin):
     subscriber_first_name = Column(String(100))
     subscriber_last_name = Column(String(100))
     subscriber_dob = Column(Date)
+    payer_id = Column(String(50))
+    date_of_service = Column(Date)
     edi_270_content = Column(Text, nullable=False)
     status = Column(String(20), default="pending", index=True)
 
+    __table_args__ = (
+        # Next-day pre-verification picks requests by date of service and status
+        Index("idx_eligibility_requests_dos_status", "date_of_service", "status"),
+    )
+
 
 class EligibilityResponse(Base, TimestampMixin):
     __tablename__ = "eligibility_responses"
@@ -50,3 +57,7 @@ class EligibilityResponse(Base, TimestampMixin):
     edi_271_content = Column(Text, nullable=False)
     is_eligible = Column(Boolean, nullable=False, default=False)
     benefits_info = Column(Text)  # JSON as text for simplicity
+    payer_id = Column(String(50))
+    coverage_status = Column(String(50))
+    effective_date = Column(Date)
+    termination_date = Column(Date)
@@ -0,0 +1,74 @@
+# File: app/services/clearinghouse_client.py
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import EDIException
+
+logger = logging.getLogger(__name__)
+
+
+class ClearinghouseClient:
+    """Sends 270 interchanges to the clearinghouse and returns the 271s.
+
+    Each payer endpoint gets its own concurrency limit so one slow payer
+    cannot hold every pooled connection.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        payer_concurrency: int = settings.CLEARINGHOUSE_PAYER_CONCURRENCY,
+        timeout: float = settings.CLEARINGHOUSE_TIMEOUT_SECONDS,
+        max_connections: int = settings.CLEARINGHOUSE_MAX_CONNECTIONS
+    ):
+        self.base_url = (base_url or settings.CLEARINGHOUSE_URL or "").rstrip("/")
+        self.payer_concurrency = payer_concurrency
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind(self) -> None:
+        # Clients and semaphores belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._limits = {}
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections)
+            )
+
+    async def send_270(self, edi_270: str, payer_id: str) -> str:
+        """Send one 270 interchange for a payer and return its 271."""
+        if not self.base_url:
+            raise EDIException("No clearinghouse configured", "270")
+        self._bind()
+        limit = self._limits.setdefault(payer_id, asyncio.Semaphore(self.payer_concurrency))
+        async with limit:
+            try:
+                response = await self._client.post(
+                    f"{self.base_url}/270",
+                    content=edi_270.encode(),
+                    headers={"Content-Type": "application/edi-x12", "X-Payer-Id": payer_id}
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Clearinghouse request for payer {payer_id} failed: {str(e)}")
+                raise EDIException(f"Clearinghouse request failed: {str(e)}", "270")
+            return response.text
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+# Create singleton instance
+clearinghouse_client = ClearinghouseClient()
@@ -1,7 +1,8 @@
 # File: app/services/edi_service.py
+import re
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Tuple
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from app.core.config import settings
@@ -14,6 +15,25 @@ logger = logging.getLogger(__name__)
 class EDIService:
     """Service for handling EDI 270/271 transactions."""
     
+    # EB01 codes: active coverage (this service's own 271s use Y/N)
+    ELIGIBLE_CODES = {'1', '2', '3', '4', '5', 'Y'}
+    INELIGIBLE_CODES = {'6', '7', '8', 'N'}
+    BENEFIT_CODES = {
+        'A': 'coinsurance',
+        'B': 'copay',
+        'C': 'deductible',
+        'G': 'out_of_pocket_max'
+    }
+    # AAA03 reject reasons most payers send; others are reported by code
+    REJECT_REASONS = {
+        '41': 'Authorization/access restrictions',
+        '42': 'Unable to respond at current time',
+        '72': 'Invalid/missing subscriber/insured ID',
+        '73': 'Invalid/missing subscriber/insured name',
+        '75': 'Subscriber/insured not found',
+        '79': 'Invalid participant identification'
+    }
+    
     def __init__(self):
         self.submitter_id = settings.EDI_SUBMITTER_ID
         self.receiver_id = settings.EDI_RECEIVER_ID
@@ -26,7 +46,76 @@ class EDIService:
         
         return interchange_control_num, group_control_num, transaction_control_num
     
-    def generate_edi_270(self, request_data: EligibilityRequestCreate) -> Tuple[str, str, Dict[str, str]]:
+    def _build_270_transaction(
+        self,
+        request_data: EligibilityRequestCreate,
+        transaction_control_num: str,
+        current_date: str,
+        current_time: str,
+        trace_number: Optional[str] = None
+    ) -> List[str]:
+        """Build the ST..SE segments of one EDI 270 transaction."""
+        # Format date of birth
+        dob_formatted = request_data.subscriber_dob.strftime("%Y%m%d")
+        
+        segments = []
+        
+        # ST - Transaction Set Header
+        segments.append(
+            f"ST*270*{transaction_control_num}*005010X279A1~"
+        )
+        
+        # BHT - Beginning of Hierarchical Transaction
+        segments.append(
+            f"BHT*0022*13*{transaction_control_num}*{current_date}*{current_time}~"
+        )
+        
+        # HL - Information Source Level
+        segments.append("HL*1**20*1~")
+        
+        # PRV - Provider Information (if needed)
+        segments.append("PRV*BI*PXC*207Q00000X~")
+        
+        # NM1 - Information Source Name
+        segments.append(f"NM1*PR*2*{request_data.provider_npi}*****PI*{request_data.provider_npi}~")
+        
+        # HL - Information Receiver Level
+        segments.append("HL*2*1*21*1~")
+        
+        # NM1 - Information Receiver Name (Subscriber)
+        segments.append(
+            f"NM1*1P*1*{request_data.subscriber_last_name}*{request_data.subscriber_first_name}****MI*{request_data.member_id}~"
+        )
+        
+        # DMG - Demographic Information
+        segments.append(f"DMG*D8*{dob_formatted}~")
+        
+        # HL - Subscriber Level
+        segments.append("HL*3*2*22*0~")
+        
+        # TRN - Trace Number (echoed back in the 271 TRN*2)
+        segments.append(f"TRN*1*{trace_number or transaction_control_num}~")
+        
+        # DTP - Date of service
+        date_of_service = getattr(request_data, "date_of_service", None)
+        if date_of_service:
+            segments.append(f"DTP*291*D8*{date_of_service.strftime('%Y%m%d')}~")
+        
+        # EQ - Eligibility or Benefit Inquiry (enum members format as their name)
+        service_type = getattr(request_data.service_type, "value", request_data.service_type)
+        segments.append(f"EQ*{service_type}~")
+        
+        # SE - Transaction Set Trailer
+        segment_count = len(segments) + 1  # +1 for SE segment itself
+        segments.append(f"SE*{segment_count}*{transaction_control_num}~")
+        
+        return segments
+    
+    def generate_edi_270(
+        self,
+        request_data: EligibilityRequestCreate,
+        trace_number: Optional[str] = None
+    ) -> Tuple[str, str, Dict[str, str]]:
         """Generate EDI 270 (Eligibility Inquiry) transaction."""
         try:
             logger.info(f"Generating EDI 270 for member: {request_data.member_id}")
@@ -38,9 +127,6 @@ class EDIService:
             current_date = datetime.now().strftime("%Y%m%d")
             current_time = datetime.now().strftime("%H%M")
             
-            # Format date of birth
-            dob_formatted = request_data.subscriber_dob.strftime("%Y%m%d")
-            
             # Build EDI 270 segments
             segments = []
             
@@ -54,48 +140,9 @@ class EDIService:
                 f"GS*HS*{self.submitter_id}*{self.receiver_id}*{current_date}*{current_time}*{group_control_num}*X*005010X279A1~"
             )
             
-            # ST - Transaction Set Header
-            segments.append(
-                f"ST*270*{transaction_control_num}*005010X279A1~"
-            )
-            
-            # BHT - Beginning of Hierarchical Transaction
-            segments.append(
-                f"BHT*0022*13*{transaction_control_num}*{current_date}*{current_time}~"
-            )
-            
-            # HL - Information Source Level
-            segments.append("HL*1**20*1~")
-            
-            # PRV - Provider Information (if needed)
-            segments.append("PRV*BI*PXC*207Q00000X~")
-            
-            # NM1 - Information Source Name
-            segments.append(f"NM1*PR*2*{request_data.provider_npi}*****PI*{request_data.provider_npi}~")
-            
-            # HL - Information Receiver Level
-            segments.append("HL*2*1*21*1~")
-            
-            # NM1 - Information Receiver Name (Subscriber)
-            segments.append(
-                f"NM1*1P*1*{request_data.subscriber_last_name}*{request_data.subscriber_first_name}*****MI*{request_data.member_id}~"
-            )
-            
-            # DMG - Demographic Information
-            segments.append(f"DMG*D8*{dob_formatted}~")
-            
-            # HL - Subscriber Level
-            segments.append("HL*3*2*22*0~")
-            
-            # TRN - Trace Number
-            segments.append(f"TRN*1*{transaction_control_num}~")
-            
-            # EQ - Eligibility or Benefit Inquiry
-            segments.append(f"EQ*{request_data.service_type}~")
-            
-            # SE - Transaction Set Trailer
-            segment_count = len(segments) + 1  # +1 for SE segment itself
-            segments.append(f"SE*{segment_count}*{transaction_control_num}~")
+            segments.extend(self._build_270_transaction(
+                request_data, transaction_control_num, current_date, current_time, trace_number
+            ))
             
             # GE - Functional Group Trailer
             segments.append(f"GE*1*{group_control_num}~")
@@ -118,6 +165,44 @@ class EDIService:
             logger.error(f"Error generating EDI 270: {str(e)}")
             raise EDIException(f"Failed to generate EDI 270: {str(e)}", "270")
     
+    def generate_edi_270_batch(
+        self,
+        requests: List[Tuple[str, EligibilityRequestCreate]],
+        receiver_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """Generate one EDI 270 interchange holding a transaction per (trace number, request).
+
+        Returns the interchange and each trace number's ST..SE transaction.
+        """
+        try:
+            receiver_id = receiver_id or self.receiver_id
+            logger.info(f"Generating batch EDI 270 with {len(requests)} transactions for {receiver_id}")
+            
+            interchange_control_num, group_control_num, _ = self.generate_control_numbers()
+            current_date = datetime.now().strftime("%Y%m%d")
+            current_time = datetime.now().strftime("%H%M")
+            
+            segments = [
+                f"ISA*00*          *00*          *ZZ*{self.submitter_id:<15}*ZZ*{receiver_id:<15}*{current_date}*{current_time}*^*00501*{interchange_control_num}*0*T*:~",
+                f"GS*HS*{self.submitter_id}*{receiver_id}*{current_date}*{current_time}*{group_control_num}*X*005010X279A1~"
+            ]
+            transactions = {}
+            for index, (trace_number, request_data) in enumerate(requests, start=1):
+                transaction = self._build_270_transaction(
+                    request_data, f"{index:04d}", current_date, current_time, trace_number
+                )
+                transactions[trace_number] = '\n'.join(transaction)
+                segments.extend(transaction)
+            
+            segments.append(f"GE*{len(requests)}*{group_control_num}~")
+            segments.append(f"IEA*1*{interchange_control_num}~")
+            
+            return '\n'.join(segments), transactions
+            
+        except Exception as e:
+            logger.error(f"Error generating batch EDI 270: {str(e)}")
+            raise EDIException(f"Failed to generate batch EDI 270: {str(e)}", "270")
+    
     def generate_edi_271(self, request_id: str, eligibility_data: Dict[str, Any]) -> str:
         """Generate EDI 271 (Eligibility Response) transaction."""
         try:
@@ -162,14 +247,18 @@ class EDIService:
             segments.append("PRV*BI*PXC*207Q00000X~")
             
             # NM1 - Information Source Name
-            segments.append("NM1*PR*2*INSURANCE COMPANY*****PI*12345~")
+            payer_name = eligibility_data.get('payer_name', 'INSURANCE COMPANY')
+            payer_id = eligibility_data.get('payer_id', '12345')
+            segments.append(f"NM1*PR*2*{payer_name}*****PI*{payer_id}~")
             
             # HL - Information Receiver Level
             segments.append("HL*2*1*21*1~")
             
             # NM1 - Information Receiver Name
             member_id = eligibility_data.get('member_id', 'UNKNOWN')
-            segments.append(f"NM1*1P*1*DOE*JOHN*****MI*{member_id}~")
+            last_name = eligibility_data.get('subscriber_last_name', 'DOE')
+            first_name = eligibility_data.get('subscriber_first_name', 'JOHN')
+            segments.append(f"NM1*1P*1*{last_name}*{first_name}****MI*{member_id}~")
             
             # N3 - Address Information
             segments.append("N3*123 MAIN ST~")
@@ -186,6 +275,14 @@ class EDIService:
             # TRN - Trace Number
             segments.append(f"TRN*2*{request_id}~")
             
+            # DTP - Coverage period
+            effective_date = eligibility_data.get('effective_date')
+            termination_date = eligibility_data.get('termination_date')
+            if effective_date and termination_date:
+                segments.append(f"DTP*291*RD8*{effective_date:%Y%m%d}-{termination_date:%Y%m%d}~")
+            elif effective_date:
+                segments.append(f"DTP*346*D8*{effective_date:%Y%m%d}~")
+            
             # EB - Eligibility or Benefit Information
             service_type = eligibility_data.get('service_type', '30')
             segments.append(f"EB*{eligible_code}*{service_type}~")
@@ -202,7 +299,7 @@ class EDIService:
                 
                 # Add deductible information
                 if benefits.get("medical", {}).get("deductible"):
-                    segments.append(f"EB*A*30**27*{benefits['medical']['deductible'].replace('$', '')}~")
+                    segments.append(f"EB*C*30**27*{benefits['medical']['deductible'].replace('$', '')}~")
                 
                 # Add copay information
                 if benefits.get("medical", {}).get("copay"):
@@ -227,6 +324,110 @@ class EDIService:
             logger.error(f"Error generating EDI 271: {str(e)}")
             raise EDIException(f"Failed to generate EDI 271: {str(e)}", "271")
     
+    @staticmethod
+    def _parse_edi_date(qualifier: str, value: str) -> Tuple[Optional[date], Optional[date]]:
+        """Parse a DTP date (D8) or range (RD8) into (start, end)."""
+        def d8(text):
+            return datetime.strptime(text, "%Y%m%d").date()
+        
+        if qualifier == "RD8" and "-" in value:
+            start, end = value.split("-", 1)
+            return d8(start), d8(end)
+        if qualifier == "D8":
+            return d8(value), d8(value)
+        return None, None
+    
+    def parse_edi_271(self, edi_content: str) -> List[Dict[str, Any]]:
+        """Parse every 271 transaction in an interchange into eligibility results."""
+        try:
+            results = []
+            current = None
+            for raw in edi_content.split('~'):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                elements = raw.split('*')
+                segment_id = elements[0]
+                
+                if segment_id == 'ST':
+                    current = {
+                        'request_id': None,
+                        'transaction_control_number': elements[2] if len(elements) > 2 else None,
+                        'payer_id': None,
+                        'payer_name': None,
+                        'member_id': None,
+                        'is_eligible': False,
+                        'coverage_status': None,
+                        'service_types': [],
+                        'effective_date': None,
+                        'termination_date': None,
+                        'benefits': {},
+                        'messages': [],
+                        'errors': [],
+                        'segments': []
+                    }
+                if current is None:
+                    continue
+                current['segments'].append(raw + '~')
+                
+                if segment_id == 'BHT' and len(elements) > 3 and not current['request_id']:
+                    current['request_id'] = elements[3]
+                elif segment_id == 'TRN' and len(elements) > 2 and elements[1] == '2':
+                    current['request_id'] = elements[2]
+                elif segment_id == 'NM1' and len(elements) > 9:
+                    if elements[1] == 'PR':
+                        current['payer_name'] = elements[3] or None
+                        current['payer_id'] = elements[9]
+                    elif elements[1] in ('IL', '1P') and 'MI' in elements[8:10]:
+                        # Older 271s from this service padded NM1 with an extra element
+                        position = elements.index('MI', 8) + 1
+                        current['member_id'] = elements[position] if len(elements) > position else None
+                elif segment_id == 'DTP' and len(elements) > 3:
+                    start, end = self._parse_edi_date(elements[2], elements[3])
+                    if elements[1] in ('291', '307'):
+                        current['effective_date'] = current['effective_date'] or start
+                        current['termination_date'] = current['termination_date'] or end
+                    elif elements[1] in ('346', '356'):
+                        current['effective_date'] = start
+                    elif elements[1] in ('347', '357'):
+                        current['termination_date'] = end
+                elif segment_id == 'EB' and len(elements) > 1:
+                    code = elements[1]
+                    if code in self.ELIGIBLE_CODES or code in self.INELIGIBLE_CODES:
+                        if current['coverage_status'] is None:
+                            current['is_eligible'] = code in self.ELIGIBLE_CODES
+                            current['coverage_status'] = 'active' if current['is_eligible'] else 'inactive'
+                        # EB03 carries the service type; this service's own 271s put it in EB02
+                        service_type = elements[3] if len(elements) > 3 and elements[3] else (
+                            elements[2] if len(elements) > 2 and elements[2].isdigit() else None
+                        )
+                        if service_type and service_type not in current['service_types']:
+                            current['service_types'].append(service_type)
+                    elif code in self.BENEFIT_CODES:
+                        amounts = [e for e in elements[5:] if re.fullmatch(r'\d+(\.\d+)?', e or '')]
+                        if amounts:
+                            current['benefits'].setdefault(self.BENEFIT_CODES[code], float(amounts[0]))
+                elif segment_id == 'MSG' and len(elements) > 1:
+                    current['messages'].append(elements[1])
+                elif segment_id == 'AAA' and len(elements) > 3:
+                    # AAA01 N means the request was invalid; AAA04 says whether to resubmit
+                    reason = elements[3]
+                    current['errors'].append({
+                        'reason_code': reason,
+                        'reason': self.REJECT_REASONS.get(reason, f'Rejected ({reason})'),
+                        'follow_up': elements[4] if len(elements) > 4 else None
+                    })
+                elif segment_id == 'SE':
+                    current['edi_271_content'] = '\n'.join(current.pop('segments'))
+                    results.append(current)
+                    current = None
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error parsing EDI 271: {str(e)}")
+            raise EDIException(f"Failed to parse EDI 271: {str(e)}", "271")
+    
     def validate_edi_270(self, edi_content: str) -> bool:
         """Validate EDI 270 format and required segments."""
         try:
@@ -236,7 +437,7 @@ class EDIService:
             found_segments = set()
             for segment in segments:
                 if segment.strip():
-                    segment_id = segment.split('*')[0]
+                    segment_id = segment.strip().split('*')[0]
                     found_segments.add(segment_id)
             
             missing_segments = set(required_segments) - found_segments
@@ -0,0 +1,176 @@
+# File: app/services/eligibility_batch_service.py
+import asyncio
+import csv
+import logging
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.crud_eligibility import eligibility_request
+from app.schemas.eligibility import RequestStatus
+from app.services.clearinghouse_client import ClearinghouseClient
+from app.services.eligibility_cache import rejection_reason
+from app.services.eligibility_service import EligibilityService, eligibility_service
+
+logger = logging.getLogger(__name__)
+
+APPOINTMENT_FIELDS = (
+    "member_id", "payer_id", "provider_npi", "subscriber_first_name",
+    "subscriber_last_name", "subscriber_dob", "date_of_service", "service_type"
+)
+
+
+class EligibilityBatchService:
+    """Nightly pre-verification: queue the next day's appointments, send per-payer
+    batch 270s to the clearinghouse and record the 271s in bulk."""
+
+    def __init__(
+        self,
+        service: EligibilityService = eligibility_service,
+        client: Optional[ClearinghouseClient] = None,
+        max_transactions: int = settings.ELIGIBILITY_BATCH_MAX_TRANSACTIONS
+    ):
+        self.service = service
+        self.client = client or ClearinghouseClient()
+        self.max_transactions = max_transactions
+
+    @staticmethod
+    def load_appointments(path: str) -> List[Dict[str, Any]]:
+        """Read a schedule export (CSV with APPOINTMENT_FIELDS columns)."""
+        appointments = []
+        with open(path, newline="") as handle:
+            for row in csv.DictReader(handle):
+                appointment = {field: (row.get(field) or "").strip() or None for field in APPOINTMENT_FIELDS}
+                appointment["subscriber_dob"] = datetime.strptime(appointment["subscriber_dob"], "%Y-%m-%d").date()
+                appointment["date_of_service"] = datetime.strptime(appointment["date_of_service"], "%Y-%m-%d").date()
+                appointment["service_type"] = appointment["service_type"] or "30"
+                appointments.append(appointment)
+        return appointments
+
+    def queue_appointments(
+        self, db: Session, appointments: Iterable[Dict[str, Any]], date_of_service: date
+    ) -> Dict[str, int]:
+        """Insert one pending request per payer, member and service type not yet known."""
+        existing = eligibility_request.get_keys_for_date(db, date_of_service=date_of_service)
+        rows, counts = [], {"appointments": 0, "duplicates": 0, "already_verified": 0}
+        for appointment in appointments:
+            if appointment["date_of_service"] != date_of_service:
+                continue
+            counts["appointments"] += 1
+            payer_id = appointment["payer_id"] or settings.EDI_RECEIVER_ID
+            request_key = (payer_id, appointment["member_id"], appointment["service_type"])
+            if request_key in existing:
+                counts["duplicates"] += 1
+                continue
+            existing.add(request_key)
+            if self.service.cache.get(request_key + (date_of_service,)) is not None:
+                counts["already_verified"] += 1
+                continue
+            rows.append({
+                **{field: appointment[field] for field in APPOINTMENT_FIELDS},
+                "payer_id": payer_id,
+                "request_id": str(uuid.uuid4())
+            })
+
+        eligibility_request.create_pending_bulk(db, rows=rows)
+        db.commit()
+        counts["queued"] = len(rows)
+        return counts
+
+    async def _send(self, db: Session, envelope: Dict[str, Any], db_lock: asyncio.Lock, metrics: Dict[str, Any]) -> None:
+        request_ids = envelope["request_ids"]
+        try:
+            edi_271 = await self.client.send_270(envelope["edi_270"], envelope["payer_id"])
+        except Exception as e:
+            metrics["failed"] += len(request_ids)
+            async with db_lock:
+                await asyncio.to_thread(self._fail, db, request_ids, e)
+            return
+
+        # One session, so 271s are recorded one interchange at a time, off the event loop
+        async with db_lock:
+            results = await asyncio.to_thread(self.service.receive_271, db, edi_271)
+        # Rejected transactions were already marked errored by receive_271
+        rejected = sum(1 for result in results if rejection_reason(result))
+        metrics["responses"] += len(results) - rejected
+        metrics["failed"] += rejected
+        metrics["eligible"] += sum(1 for result in results if result["is_eligible"])
+        answered = {result["request_id"] for result in results}
+        unanswered = [request_id for request_id in request_ids if request_id not in answered]
+        if unanswered:
+            metrics["failed"] += len(unanswered)
+            async with db_lock:
+                await asyncio.to_thread(self._fail, db, unanswered, RuntimeError("No 271 transaction returned"))
+
+    def _fail(self, db: Session, request_ids: List[str], error: Exception) -> None:
+        for request_id in request_ids:
+            self.service.cache.fail(request_id, error)
+        eligibility_request.update_status_bulk(db, request_ids=request_ids, status=RequestStatus.ERROR.value)
+        db.commit()
+
+    async def run(
+        self,
+        db: Session,
+        date_of_service: date,
+        appointments: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Pre-verify a day's schedule; returns counts and throughput."""
+        started = time.perf_counter()
+        metrics: Dict[str, Any] = {
+            "date_of_service": date_of_service.isoformat(),
+            "appointments": 0, "duplicates": 0, "already_verified": 0, "queued": 0, "requeued": 0,
+            "envelopes": 0, "inquiries_sent": 0, "responses": 0, "eligible": 0, "failed": 0
+        }
+
+        # Requests a failed earlier run left errored are sent again, not counted as duplicates
+        metrics["requeued"] = eligibility_request.requeue_errors_for_date(db, date_of_service=date_of_service)
+        db.commit()
+        if appointments is not None:
+            metrics.update(self.queue_appointments(db, appointments, date_of_service))
+        queued_at = time.perf_counter()
+
+        envelopes = self.service.build_batch_270(db, date_of_service, self.max_transactions)
+        metrics["envelopes"] = len(envelopes)
+        metrics["inquiries_sent"] = sum(len(envelope["request_ids"]) for envelope in envelopes)
+        built_at = time.perf_counter()
+
+        db_lock = asyncio.Lock()
+        try:
+            await asyncio.gather(*(self._send(db, envelope, db_lock, metrics) for envelope in envelopes))
+        finally:
+            await self.client.aclose()
+        finished = time.perf_counter()
+
+        metrics["ineligible"] = metrics["responses"] - metrics["eligible"]
+        metrics["seconds"] = {
+            "queue": round(queued_at - started, 3),
+            "build_270": round(built_at - queued_at, 3),
+            "clearinghouse": round(finished - built_at, 3),
+            "total": round(finished - started, 3)
+        }
+        metrics["inquiries_per_second"] = round(metrics["inquiries_sent"] / max(finished - started, 1e-9), 1)
+        logger.info(f"Eligibility pre-verification for {date_of_service}: {metrics}")
+        return metrics
+
+    def receive_271_files(self, db: Session, paths: Iterable[str]) -> Dict[str, Any]:
+        """Record 271 files dropped by a batch clearinghouse."""
+        started = time.perf_counter()
+        files = responses = eligible = 0
+        for path in paths:
+            with open(path) as handle:
+                results = self.service.receive_271(db, handle.read())
+            files += 1
+            responses += len(results)
+            eligible += sum(1 for result in results if result["is_eligible"])
+        elapsed = time.perf_counter() - started
+        return {
+            "files": files,
+            "responses": responses,
+            "eligible": eligible,
+            "seconds": round(elapsed, 3),
+            "responses_per_second": round(responses / max(elapsed, 1e-9), 1)
+        }
@@ -0,0 +1,221 @@
+# File: app/services/eligibility_cache.py
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (payer_id, member_id, service_type, date_of_service)
+CacheKey = Tuple[str, str, str, date]
+
+
+def rejection_reason(result: Dict[str, Any]) -> Optional[str]:
+    """Why a parsed 271 does not answer eligibility, or None when it does.
+
+    AAA rejections (e.g. 42, payer unable to respond) and 271s without a
+    coverage EB are not answers and must not be cached as "ineligible".
+    """
+    errors = result.get('errors')
+    if errors:
+        return "; ".join(error['reason'] for error in errors)
+    if result.get('coverage_status') is None:
+        return "271 carried no eligibility (EB) segment"
+    return None
+
+
+@dataclass
+class _CachedEligibility:
+    result: Dict[str, Any]
+    date_of_service: Optional[date]
+    expires_at: float
+
+    def covers(self, date_of_service: date) -> bool:
+        """A 271 with a coverage period answers any date of service inside it."""
+        effective = self.result.get('effective_date')
+        termination = self.result.get('termination_date')
+        if effective or termination:
+            return (effective is None or effective <= date_of_service) and \
+                (termination is None or date_of_service <= termination)
+        return date_of_service == self.date_of_service
+
+
+@dataclass
+class PendingInquiry:
+    """A 270 that has been sent and is waiting for its 271."""
+    key: CacheKey
+    request_id: str
+    edi_270: Optional[str] = None
+    started_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+
+
+class EligibilityCache:
+    """Eligibility results by (payer, member, service type, date of service).
+
+    A cached 271 serves every date of service inside its coverage period until
+    the TTL lapses, and any newer 271 for the same payer and member replaces it.
+    Inquiries already sent are tracked so concurrent callers share one 270.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.ELIGIBILITY_CACHE_TTL_SECONDS,
+        max_members: int = settings.ELIGIBILITY_CACHE_SIZE,
+        pending_ttl: float = settings.ELIGIBILITY_PENDING_TTL_SECONDS
+    ):
+        self.ttl = ttl
+        self.max_members = max_members
+        self.pending_ttl = pending_ttl
+        self._lock = threading.Lock()
+        self._members: "OrderedDict[Tuple[str, str], Dict[str, _CachedEligibility]]" = OrderedDict()
+        self._pending: Dict[CacheKey, PendingInquiry] = {}
+        self._pending_by_request: Dict[str, PendingInquiry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        payer_id, member_id, service_type, date_of_service = key
+        with self._lock:
+            entries = self._members.get((payer_id, member_id))
+            entry = entries.get(service_type) if entries else None
+            if entry is not None and entry.expires_at < time.monotonic():
+                del entries[service_type]
+                entry = None
+            if entry is None or not entry.covers(date_of_service):
+                self.misses += 1
+                return None
+            self._members.move_to_end((payer_id, member_id))
+            self.hits += 1
+            return entry.result
+
+    def _pending_for(self, key: CacheKey) -> Optional[PendingInquiry]:
+        pending = self._pending.get(key)
+        if pending is not None and time.monotonic() - pending.started_at > self.pending_ttl:
+            # The 271 never came back; let the next inquiry send a new 270
+            self._drop_pending(pending)
+            return None
+        return pending
+
+    def _drop_pending(self, pending: PendingInquiry) -> None:
+        if self._pending.get(pending.key) is pending:
+            del self._pending[pending.key]
+        self._pending_by_request.pop(pending.request_id, None)
+
+    def pending(self, key: CacheKey) -> Optional[PendingInquiry]:
+        with self._lock:
+            return self._pending_for(key)
+
+    def pending_request(self, request_id: str) -> Optional[PendingInquiry]:
+        with self._lock:
+            pending = self._pending_by_request.get(request_id)
+            return self._pending_for(pending.key) if pending else None
+
+    def begin(self, key: CacheKey, request_id: str, awaitable: bool = False) -> Tuple[PendingInquiry, bool]:
+        """Register an inquiry for key, or return the one already in flight.
+
+        Returns (pending, created); only the creator should send a 270.
+        """
+        with self._lock:
+            existing = self._pending_for(key)
+            if existing is not None:
+                return existing, False
+            pending = PendingInquiry(key=key, request_id=request_id)
+            if awaitable:
+                pending.future = asyncio.get_running_loop().create_future()
+            self._pending[key] = pending
+            self._pending_by_request[request_id] = pending
+            return pending, True
+
+    @staticmethod
+    def _resolve(pending: PendingInquiry, result: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None) -> None:
+        future = pending.future
+        if future is None:
+            return
+        loop = future.get_loop()
+
+        def settle():
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        # 271s may be received on another thread (batch intake) or after the loop closed
+        try:
+            loop.call_soon_threadsafe(settle)
+        except RuntimeError:
+            pass
+
+    def store(self, result: Dict[str, Any]) -> bool:
+        """Cache a parsed 271, replacing anything held for its payer and member.
+
+        Rejections are not cached and return False; the caller should fail()
+        the inquiry instead.
+        """
+        if rejection_reason(result) is not None:
+            return False
+        with self._lock:
+            pending = self._pending_by_request.get(result.get('request_id'))
+            if pending is not None:
+                payer_id, member_id, service_type, date_of_service = pending.key
+                service_types = set(result.get('service_types') or []) | {service_type}
+                self._drop_pending(pending)
+            else:
+                payer_id, member_id = result.get('payer_id'), result.get('member_id')
+                service_types = set(result.get('service_types') or [])
+                date_of_service = None
+
+            if payer_id and member_id and service_types:
+                expires_at = time.monotonic() + self.ttl
+                self._members[(payer_id, member_id)] = {
+                    service_type: _CachedEligibility(result, date_of_service, expires_at)
+                    for service_type in service_types
+                }
+                self._members.move_to_end((payer_id, member_id))
+                while len(self._members) > self.max_members:
+                    self._members.popitem(last=False)
+
+        if pending is not None:
+            self._resolve(pending, result=result)
+        return True
+
+    def fail(self, request_id: str, error: Exception) -> None:
+        """Forget an inquiry whose 270 could not be answered."""
+        with self._lock:
+            pending = self._pending_by_request.get(request_id)
+            if pending is not None:
+                self._drop_pending(pending)
+        if pending is not None:
+            self._resolve(pending, error=error)
+
+    def invalidate(self, payer_id: str, member_id: str) -> None:
+        with self._lock:
+            self._members.pop((payer_id, member_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._members.clear()
+            self._pending.clear()
+            self._pending_by_request.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "members": len(self._members),
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Create singleton instance
+eligibility_cache = EligibilityCache()
@@ -0,0 +1,220 @@
+# File: app/services/eligibility_service.py
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import EligibilityException
+from app.crud.crud_eligibility import eligibility_request, eligibility_response
+from app.schemas.eligibility import EligibilityRequestCreate, RequestStatus
+from app.services.clearinghouse_client import clearinghouse_client
+from app.services.edi_service import EDIService
+from app.services.eligibility_cache import CacheKey, EligibilityCache, eligibility_cache, rejection_reason
+
+logger = logging.getLogger(__name__)
+
+# Sends a 270 to a payer and returns its 271
+Transport = Callable[[str, str], Awaitable[str]]
+
+
+class EligibilityService:
+    """Eligibility inquiries answered from the cache, a shared in-flight 270, or a new 270."""
+
+    def __init__(
+        self,
+        cache: EligibilityCache = eligibility_cache,
+        edi_service: Optional[EDIService] = None,
+        transport: Optional[Transport] = None
+    ):
+        self.cache = cache
+        self.edi_service = edi_service or EDIService()
+        self.transport = transport
+
+    def cache_key(self, request_data: Any) -> CacheKey:
+        service_type = getattr(request_data.service_type, "value", request_data.service_type)
+        return (
+            request_data.payer_id or settings.EDI_RECEIVER_ID,
+            request_data.member_id,
+            service_type or "30",
+            request_data.date_of_service or date.today()
+        )
+
+    @staticmethod
+    def _completed(result: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            "request_id": result["request_id"],
+            "status": RequestStatus.COMPLETED.value,
+            "cached": cached,
+            "is_eligible": result["is_eligible"],
+            "coverage_status": result.get("coverage_status"),
+            "effective_date": result.get("effective_date"),
+            "termination_date": result.get("termination_date"),
+            "benefits_info": result.get("benefits"),
+            "edi_271": result.get("edi_271_content")
+        }
+
+    async def inquire(self, db: Session, request_data: EligibilityRequestCreate) -> Dict[str, Any]:
+        """Answer an eligibility inquiry, sending a 270 only when nothing can answer it."""
+        key = self.cache_key(request_data)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._completed(cached, cached=True)
+
+        pending, created = self.cache.begin(key, str(uuid.uuid4()), awaitable=self.transport is not None)
+        if not created:
+            future = pending.future
+            if future is not None and future.get_loop() is asyncio.get_running_loop():
+                result = await asyncio.shield(future)
+                return self._completed(result, cached=True)
+            return {
+                "request_id": pending.request_id,
+                "edi_270": pending.edi_270,
+                "status": RequestStatus.PENDING.value if pending.edi_270 is None else "submitted",
+                "cached": False,
+                "message": "Eligibility inquiry already in progress"
+            }
+
+        request_id = pending.request_id
+        try:
+            edi_270, _, _ = self.edi_service.generate_edi_270(request_data, trace_number=request_id)
+        except Exception as e:
+            self.cache.fail(request_id, e)
+            raise
+        pending.edi_270 = edi_270
+        eligibility_request.create_request(
+            db, request_id=request_id, edi_270_content=edi_270, obj_in=request_data, status="submitted"
+        )
+
+        if self.transport is None:
+            # The 271 arrives later through receive_271
+            return {
+                "request_id": request_id,
+                "edi_270": edi_270,
+                "status": "submitted",
+                "cached": False,
+                "message": "Eligibility inquiry submitted successfully"
+            }
+
+        try:
+            edi_271 = await self.transport(edi_270, key[0])
+        except Exception as e:
+            logger.error(f"Eligibility inquiry {request_id} failed: {str(e)}")
+            self.cache.fail(request_id, e)
+            eligibility_request.update_status(db, request_id=request_id, status=RequestStatus.ERROR.value)
+            raise EligibilityException(f"Eligibility inquiry failed: {str(e)}", request_id)
+
+        for result in self.receive_271(db, edi_271):
+            if result["request_id"] == request_id:
+                reason = rejection_reason(result)
+                if reason is not None:
+                    raise EligibilityException(f"Payer did not answer the inquiry: {reason}", request_id)
+                response = self._completed(result, cached=False)
+                response["edi_270"] = edi_270
+                return response
+
+        error = EligibilityException("271 response did not answer the inquiry", request_id)
+        self.cache.fail(request_id, error)
+        raise error
+
+    def receive_271(self, db: Session, edi_271: str) -> List[Dict[str, Any]]:
+        """Record every transaction of a 271 interchange and refresh the cache.
+
+        Transactions the payer rejected (AAA) or that carry no eligibility mark
+        their request as errored, so it is retried, and are not cached.
+        """
+        results = self.edi_service.parse_edi_271(edi_271)
+        answers, rejected = [], []
+        for result in results:
+            if rejection_reason(result) is None:
+                answers.append(result)
+            elif result["request_id"]:
+                rejected.append(result["request_id"])
+        try:
+            eligibility_response.create_responses_bulk(db, results=answers)
+            eligibility_request.update_status_bulk(
+                db,
+                request_ids=[result["request_id"] for result in answers if result["request_id"]],
+                status=RequestStatus.COMPLETED.value
+            )
+            eligibility_request.update_status_bulk(db, request_ids=rejected, status=RequestStatus.ERROR.value)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error recording 271 responses: {str(e)}")
+
+        # Cached even if recording failed: the payer's answer is still current
+        for result in results:
+            reason = rejection_reason(result)
+            if reason is None:
+                self.cache.store(result)
+            elif result["request_id"]:
+                logger.warning(f"Eligibility inquiry {result['request_id']} rejected: {reason}")
+                self.cache.fail(
+                    result["request_id"],
+                    EligibilityException(f"Payer did not answer the inquiry: {reason}", result["request_id"])
+                )
+        return results
+
+    def build_batch_270(
+        self,
+        db: Session,
+        date_of_service: date,
+        max_transactions: int = settings.ELIGIBILITY_BATCH_MAX_TRANSACTIONS
+    ) -> List[Dict[str, Any]]:
+        """Build 270 interchanges per payer, up to max_transactions each, for the
+        pending requests on a date of service.
+
+        Requests already answered by the cache or covered by an inquiry in flight
+        are left out, as are repeats of the same payer, member and service type.
+        """
+        requests = eligibility_request.get_by_date_of_service(
+            db, date_of_service=date_of_service, status=RequestStatus.PENDING.value
+        )
+        by_payer: "OrderedDict[str, List]" = OrderedDict()
+        keys, skipped = set(), 0
+        for request in requests:
+            key = self.cache_key(request)
+            if key in keys or self.cache.get(key) is not None or self.cache.pending(key) is not None:
+                skipped += 1
+                continue
+            keys.add(key)
+            by_payer.setdefault(key[0], []).append((key, request))
+
+        envelopes = []
+        chunks = []
+        for payer_id, items in by_payer.items():
+            for start in range(0, len(items), max_transactions):
+                chunks.append((payer_id, items[start:start + max_transactions]))
+        for payer_id, items in chunks:
+            content, transactions = self.edi_service.generate_edi_270_batch(
+                [(request.request_id, request) for _, request in items], receiver_id=payer_id
+            )
+            for key, request in items:
+                request.edi_270_content = transactions[request.request_id]
+                request.status = "submitted"
+                pending, created = self.cache.begin(key, request.request_id)
+                if created:
+                    pending.edi_270 = request.edi_270_content
+            envelopes.append({
+                "payer_id": payer_id,
+                "edi_270": content,
+                "request_ids": [request.request_id for _, request in items]
+            })
+        db.commit()
+
+        logger.info(
+            f"Built {len(envelopes)} batch 270s for {date_of_service} "
+            f"covering {len(keys)} inquiries ({skipped} skipped)"
+        )
+        return envelopes
+
+
+# Create singleton instance
+eligibility_service = EligibilityService(
+    transport=clearinghouse_client.send_270 if settings.CLEARINGHOUSE_URL else None
+)
@@ -0,0 +1,204 @@
+# File: app/services/ocr_jobs.py
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.exceptions import OCRQueueFullException
+from app.schemas.eligibility import RequestStatus
+from app.services.ocr_service import process_insurance_card
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OCRJob:
+    """An insurance card OCR job and, once finished, its result."""
+    job_id: str
+    content_hash: str
+    content_type: str
+    filename: Optional[str] = None
+    status: RequestStatus = RequestStatus.PENDING
+    cached: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (RequestStatus.COMPLETED, RequestStatus.ERROR)
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = self.status
+        if status == RequestStatus.PENDING and self.future is not None and self.future.running():
+            status = RequestStatus.PROCESSING
+        return {
+            "job_id": self.job_id,
+            "status": status.value,
+            "filename": self.filename,
+            "content_hash": self.content_hash,
+            "cached": self.cached,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at
+        }
+
+
+class OCRJobQueue:
+    """Runs OCR in a bounded process pool, deduplicating and caching by content hash."""
+
+    def __init__(
+        self,
+        max_workers: int = settings.OCR_MAX_WORKERS,
+        max_pending: int = settings.OCR_MAX_PENDING_JOBS,
+        cache_size: int = settings.OCR_CACHE_SIZE,
+        cache_ttl: float = settings.OCR_CACHE_TTL_SECONDS,
+        job_ttl: float = settings.OCR_JOB_TTL_SECONDS,
+        executor: Optional[Executor] = None,
+        processor: Callable[[bytes, str], Dict[str, Any]] = process_insurance_card
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.job_ttl = job_ttl
+        self._executor = executor
+        self._processor = processor
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, OCRJob] = {}
+        self._in_flight: Dict[str, OCRJob] = {}
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _cached_result(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(content_hash)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._cache[content_hash]
+            return None
+        self._cache.move_to_end(content_hash)
+        return result
+
+    def _prune_jobs(self) -> None:
+        now = datetime.utcnow()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and (now - job.completed_at).total_seconds() > self.job_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, content: bytes, content_type: str, filename: Optional[str] = None) -> OCRJob:
+        """Queue content for OCR; cached and in-flight content does not run again."""
+        content_hash = self.content_hash(content)
+        with self._lock:
+            self._prune_jobs()
+
+            in_flight = self._in_flight.get(content_hash)
+            if in_flight is not None:
+                return in_flight
+
+            job = OCRJob(
+                job_id=str(uuid.uuid4()),
+                content_hash=content_hash,
+                content_type=content_type,
+                filename=filename
+            )
+            cached = self._cached_result(content_hash)
+            if cached is not None:
+                job.status = RequestStatus.COMPLETED
+                job.cached = True
+                job.result = cached
+                job.completed_at = job.created_at
+                self._jobs[job.job_id] = job
+                return job
+
+            if len(self._in_flight) >= self.max_pending:
+                raise OCRQueueFullException()
+
+            self._jobs[job.job_id] = job
+            self._in_flight[content_hash] = job
+            job.future = self._get_executor().submit(self._processor, content, content_type)
+
+        # Registered outside the lock: it runs inline if the future already finished
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _finish(self, job: OCRJob, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"OCR job {job.job_id} failed: {str(e)}")
+            result = None
+            error = str(e) or e.__class__.__name__
+        else:
+            error = None
+
+        with self._lock:
+            if result is not None:
+                self._cache[job.content_hash] = (time.monotonic() + self.cache_ttl, result)
+                self._cache.move_to_end(job.content_hash)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            job.result = result
+            job.error = error
+            job.completed_at = datetime.utcnow()
+            job.status = RequestStatus.ERROR if error else RequestStatus.COMPLETED
+            self._in_flight.pop(job.content_hash, None)
+
+    def get(self, job_id: str) -> Optional[OCRJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def wait(self, job: OCRJob, timeout: float) -> OCRJob:
+        """Wait up to timeout seconds for a job without blocking the event loop."""
+        if job.future is None or job.done or timeout <= 0:
+            return job
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        def wake(_):
+            # Runs on the pool's manager thread after _finish; the loop may be gone
+            try:
+                loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+            except RuntimeError:
+                pass
+
+        # Unlike asyncio.wrap_future, timing out here leaves the pool future running
+        job.future.add_done_callback(wake)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Create singleton instance
+ocr_job_queue = OCRJobQueue()
@@ -5,9 +5,10 @@ import pytesseract
 import fitz  # PyMuPDF
 import logging
 from PIL import Image
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import re
 import io
+import time
 
 from app.core.config import settings
 from app.core.exceptions import OCRException
@@ -24,7 +25,20 @@ class OCRService:
         if settings.TESSERACT_CMD:
             pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
     
-    def preprocess_image(self, image: np.ndarray) -> np.ndarray:
+    def downscale_image(self, image: np.ndarray, source_dpi: Optional[float] = None) -> np.ndarray:
+        """Shrink image to the target DPI (or maximum dimension) before denoising."""
+        height, width = image.shape[:2]
+        scale = 1.0
+        if source_dpi and source_dpi > settings.OCR_TARGET_DPI:
+            scale = settings.OCR_TARGET_DPI / source_dpi
+        if max(height, width) * scale > settings.OCR_MAX_DIMENSION:
+            scale = settings.OCR_MAX_DIMENSION / max(height, width)
+        if scale >= 1.0:
+            return image
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    
+    def preprocess_image(self, image: np.ndarray, source_dpi: Optional[float] = None) -> np.ndarray:
         """Preprocess image for better OCR results."""
         try:
             # Convert to grayscale if needed
@@ -33,6 +47,9 @@ class OCRService:
             else:
                 gray = image
             
+            # Denoising cost grows with pixel count, so downscale first
+            gray = self.downscale_image(gray, source_dpi)
+            
             # Apply noise reduction
             denoised = cv2.fastNlMeansDenoising(gray)
             
@@ -51,36 +68,56 @@ class OCRService:
             logger.error(f"Error preprocessing image: {str(e)}")
             raise OCRException(f"Failed to preprocess image: {str(e)}")
     
+    @staticmethod
+    def text_from_ocr_data(data: Dict[str, List]) -> Tuple[str, float]:
+        """Rebuild text and mean word confidence from image_to_data output."""
+        lines: Dict[Tuple[int, int, int], List[str]] = {}
+        confidences = []
+        for i, word in enumerate(data['text']):
+            word = (word or '').strip()
+            if not word:
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(key, []).append(word)
+            conf = float(data['conf'][i])
+            if conf > 0:
+                confidences.append(conf)
+        
+        text_lines = []
+        previous_block = None
+        for (block, _, _), words in lines.items():
+            if previous_block is not None and block != previous_block:
+                text_lines.append('')
+            text_lines.append(' '.join(words))
+            previous_block = block
+        
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        return '\n'.join(text_lines), avg_confidence
+    
     def extract_text_from_image(self, image_data: bytes) -> Tuple[str, float]:
         """Extract text from image using OCR."""
         try:
             # Load image
             image = Image.open(io.BytesIO(image_data))
-            image_np = np.array(image)
+            dpi = image.info.get('dpi')
+            image_np = np.array(image.convert('L'))
             
             # Preprocess image
-            processed_image = self.preprocess_image(image_np)
+            processed_image = self.preprocess_image(image_np, dpi[0] if dpi else None)
             
-            # Configure OCR with confidence data
-            config = '--psm 6 -c tessedit_create_tsv=1'
-            
-            # Extract text with confidence scores
+            # One Tesseract pass gives both the words and their confidences
             data = pytesseract.image_to_data(
                 processed_image, 
-                config=config, 
+                config='--psm 6', 
                 output_type=pytesseract.Output.DICT
             )
-            
-            # Calculate average confidence
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
-            # Extract text
-            text = pytesseract.image_to_string(processed_image, config='--psm 6')
+            text, avg_confidence = self.text_from_ocr_data(data)
             
             logger.info(f"OCR completed with confidence: {avg_confidence:.2f}%")
             return text.strip(), avg_confidence
             
+        except OCRException:
+            raise
         except Exception as e:
             logger.error(f"Error extracting text from image: {str(e)}")
             raise OCRException(f"Failed to extract text from image: {str(e)}")
@@ -229,3 +266,30 @@ class OCRService:
             logger.error(f"Error parsing insurance card text: {str(e)}")
             raise OCRException(f"Failed to parse insurance card information: {str(e)}")
 
+
+def process_insurance_card(content: bytes, content_type: str) -> Dict[str, Any]:
+    """Extract and parse an insurance card; runs inside an OCR worker process."""
+    started = time.perf_counter()
+    service = OCRService()
+    try:
+        if content_type == "application/pdf":
+            text, confidence = service.extract_text_from_pdf(content)
+        else:
+            text, confidence = service.extract_text_from_image(content)
+    except OCRException as e:
+        # HTTP exceptions do not pickle back to the parent process
+        raise RuntimeError(e.detail) from None
+    
+    extracted_data, parse_error = None, None
+    try:
+        extracted_data = service.parse_insurance_card_text(text).model_dump(exclude={"raw_text"}, exclude_none=True)
+    except OCRException as e:
+        parse_error = e.detail
+    
+    return {
+        "raw_text": text,
+        "confidence_score": confidence,
+        "extracted_data": extracted_data,
+        "parse_error": parse_error,
+        "processing_time_ms": int((time.perf_counter() - started) * 1000)
+    }
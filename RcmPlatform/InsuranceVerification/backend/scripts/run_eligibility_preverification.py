@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Nightly eligibility pre-verification for the next day's appointments.
+
+Appointments come from a schedule export CSV with the columns member_id,
+payer_id, provider_npi, subscriber_first_name, subscriber_last_name,
+subscriber_dob, date_of_service and service_type. Pending requests already
+in eligibility_requests for the date are verified too, and requests a failed
+earlier run left errored are sent again. 270s are sent per payer in batch
+interchanges to CLEARINGHOUSE_URL, and the 271s are recorded in bulk.
+Throughput metrics are printed as JSON.
+
+    python scripts/run_eligibility_preverification.py --appointments schedule.csv
+    python scripts/run_eligibility_preverification.py --synthetic 10000 --stub --latency 0.2
+    python scripts/run_eligibility_preverification.py --responses /drop/271/*.x12
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.clearinghouse_client import ClearinghouseClient  # noqa: E402
+from app.services.eligibility_batch_service import EligibilityBatchService  # noqa: E402
+
+
+def synthetic_appointments(count, date_of_service, payers=5, seed=7):
+    """Appointments for count visits by ~0.8*count members across a few payers."""
+    rng = random.Random(seed)
+    members = max(1, int(count * 0.8))
+    return [
+        {
+            "member_id": f"M{member:08d}",
+            "payer_id": f"PAYER{member % payers + 1}",
+            "provider_npi": "1234567890",
+            "subscriber_first_name": "TEST",
+            "subscriber_last_name": f"PATIENT{member}",
+            "subscriber_dob": date(1950, 1, 1) + timedelta(days=member % 20000),
+            "date_of_service": date_of_service,
+            "service_type": "30"
+        }
+        for member in (rng.randrange(members) for _ in range(count))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-verify eligibility for a day's appointments")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today() + timedelta(days=1),
+                        help="Date of service (default tomorrow)")
+    parser.add_argument("--appointments", help="Schedule export CSV")
+    parser.add_argument("--synthetic", type=int, help="Generate this many appointments instead")
+    parser.add_argument("--clearinghouse-url", default=settings.CLEARINGHOUSE_URL)
+    parser.add_argument("--stub", action="store_true", help="Run against an in-process stub clearinghouse")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub response latency in seconds")
+    parser.add_argument("--payer-concurrency", type=int, default=settings.CLEARINGHOUSE_PAYER_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=settings.ELIGIBILITY_BATCH_MAX_TRANSACTIONS,
+                        help="270 transactions per interchange")
+    parser.add_argument("--responses", nargs="+", help="Record these 271 files instead of sending 270s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    url = args.clearinghouse_url
+    if args.stub:
+        from scripts.stub_clearinghouse import create_server
+        url = create_server(latency=args.latency).url
+
+    job = EligibilityBatchService(
+        client=ClearinghouseClient(url, payer_concurrency=args.payer_concurrency),
+        max_transactions=args.batch_size
+    )
+    db = SessionLocal()
+    try:
+        if args.responses:
+            print(json.dumps(job.receive_271_files(db, args.responses), indent=2))
+            return
+
+        if not url:
+            parser.error("Set CLEARINGHOUSE_URL, --clearinghouse-url or --stub")
+
+        appointments = None
+        if args.appointments:
+            appointments = job.load_appointments(args.appointments)
+        elif args.synthetic:
+            appointments = synthetic_appointments(args.synthetic, args.date)
+
+        metrics = asyncio.run(job.run(db, args.date, appointments))
+        print(json.dumps(metrics, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
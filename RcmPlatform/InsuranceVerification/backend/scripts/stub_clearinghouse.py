@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Local stub clearinghouse for eligibility pre-verification.
+
+POST /270 with a 270 interchange (X-Payer-Id header) returns a 271 answering
+every transaction in it. Members whose ID ends in 0 are reported inactive;
+everyone else has coverage for the current calendar year.
+
+    python scripts/stub_clearinghouse.py --port 8270 --latency 0.2
+    CLEARINGHOUSE_URL=http://localhost:8270 python scripts/run_eligibility_preverification.py ...
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.edi_service import EDIService  # noqa: E402
+
+
+def answer_270(edi_service, edi_270, payer_id, effective_date=None, termination_date=None):
+    """Build the 271 for every 270 transaction in an interchange.
+
+    Coverage defaults to the current calendar year.
+    """
+    today = date.today()
+    responses = []
+    for transaction in edi_270.split("ST*270*")[1:]:
+        fields = {}
+        for segment in transaction.split("~"):
+            elements = segment.strip().split("*")
+            if elements[0] == "TRN":
+                fields["trace"] = elements[2]
+            elif elements[0] == "NM1" and elements[1] in ("1P", "IL"):
+                fields["member_id"] = elements[-1]
+                fields["last_name"], fields["first_name"] = elements[3], elements[4]
+            elif elements[0] == "EQ":
+                fields["service_type"] = elements[1]
+        responses.append(edi_service.generate_edi_271(fields["trace"], {
+            "is_eligible": not fields["member_id"].endswith("0"),
+            "member_id": fields["member_id"],
+            "subscriber_last_name": fields["last_name"],
+            "subscriber_first_name": fields["first_name"],
+            "service_type": fields.get("service_type", "30"),
+            "payer_id": payer_id,
+            "effective_date": effective_date or date(today.year, 1, 1),
+            "termination_date": termination_date or date(today.year, 12, 31),
+            "benefits": {"medical": {"deductible": "$1000", "copay": "$25"}}
+        }))
+    return "\n".join(responses)
+
+
+def create_server(host="127.0.0.1", port=0, latency=0.0):
+    """Start a stub clearinghouse in a daemon thread; returns the server.
+
+    server.max_in_flight records the peak concurrent requests per payer.
+    """
+    edi_service = EDIService()
+    lock = threading.Lock()
+    in_flight = defaultdict(int)
+    max_in_flight = defaultdict(int)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payer_id = self.headers.get("X-Payer-Id", "UNKNOWN")
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            with lock:
+                in_flight[payer_id] += 1
+                max_in_flight[payer_id] = max(max_in_flight[payer_id], in_flight[payer_id])
+            try:
+                time.sleep(latency)
+                content = answer_270(edi_service, body, payer_id).encode()
+            finally:
+                with lock:
+                    in_flight[payer_id] -= 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/edi-x12")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.max_in_flight = max_in_flight
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub clearinghouse answering 270s with 271s")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8270)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency)
+    print(f"Stub clearinghouse listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -42,3 +42,14 @@ def client() -> Generator:
     with TestClient(app) as c:
         yield c
 
+
+
+@pytest.fixture
+def session() -> Generator:
+    """A fresh in-memory database per test, for service-level tests."""
+    test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=test_engine)
+    db = sessionmaker(bind=test_engine)()
+    yield db
+    db.close()
+    test_engine.dispose()
@@ -0,0 +1,106 @@
+# File: tests/test_eligibility_batch.py
+import asyncio
+import csv
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.models import EligibilityRequest, EligibilityResponse
+from app.services.clearinghouse_client import ClearinghouseClient
+from app.services.eligibility_batch_service import EligibilityBatchService, APPOINTMENT_FIELDS
+from app.services.eligibility_cache import EligibilityCache
+from app.services.eligibility_service import EligibilityService
+from scripts.run_eligibility_preverification import synthetic_appointments
+from scripts.stub_clearinghouse import answer_270, create_server
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+@pytest.fixture(scope="module")
+def clearinghouse():
+    server = create_server(latency=0.05)
+    yield server
+    server.shutdown()
+
+
+def make_job(url, payer_concurrency=2, max_transactions=50):
+    return EligibilityBatchService(
+        service=EligibilityService(cache=EligibilityCache()),
+        client=ClearinghouseClient(url, payer_concurrency=payer_concurrency),
+        max_transactions=max_transactions
+    )
+
+
+def test_nightly_preverification_against_stub(session, clearinghouse):
+    appointments = synthetic_appointments(400, TOMORROW, payers=3)
+    appointments.append({**appointments[0], "date_of_service": TOMORROW + timedelta(days=1)})
+    unique = {(a["payer_id"], a["member_id"]) for a in appointments if a["date_of_service"] == TOMORROW}
+
+    job = make_job(clearinghouse.url)
+    metrics = asyncio.run(job.run(session, TOMORROW, appointments))
+
+    assert metrics["appointments"] == 400
+    assert metrics["queued"] == metrics["inquiries_sent"] == metrics["responses"] == len(unique)
+    assert metrics["duplicates"] == 400 - len(unique) and metrics["failed"] == 0
+    # Envelopes hold up to 50 transactions and never mix payers
+    assert metrics["envelopes"] == sum(
+        -(-len({m for p, m in unique if p == payer}) // 50) for payer in {p for p, _ in unique}
+    )
+    assert metrics["inquiries_per_second"] > 0
+    assert max(clearinghouse.max_in_flight.values()) == 2
+
+    statuses = {status for (status,) in session.query(EligibilityRequest.status)}
+    assert statuses == {"completed"}
+    assert session.query(EligibilityResponse).count() == len(unique)
+    ineligible = {m for _, m in unique if m.endswith("0")}
+    assert metrics["ineligible"] == len(ineligible)
+
+    # The day is already verified: a second run sends nothing
+    again = asyncio.run(job.run(session, TOMORROW, appointments))
+    assert again["queued"] == again["inquiries_sent"] == 0
+    payer_id, member_id = next(iter(unique))
+    assert job.service.cache.get((payer_id, member_id, "30", TOMORROW)) is not None
+
+
+def test_unreachable_clearinghouse_marks_requests_failed(session):
+    job = make_job("http://127.0.0.1:9")
+    metrics = asyncio.run(job.run(session, TOMORROW, synthetic_appointments(20, TOMORROW)))
+    assert metrics["failed"] == metrics["inquiries_sent"] > 0
+    assert {status for (status,) in session.query(EligibilityRequest.status)} == {"error"}
+    assert job.service.cache.stats()["pending"] == 0
+
+
+def test_rerun_after_failed_run_resends_errored_requests(session, clearinghouse):
+    appointments = synthetic_appointments(20, TOMORROW)
+    failed = asyncio.run(make_job("http://127.0.0.1:9").run(session, TOMORROW, appointments))
+    assert failed["failed"] == failed["queued"] > 0
+
+    rerun = asyncio.run(make_job(clearinghouse.url).run(session, TOMORROW, appointments))
+    assert rerun["requeued"] == rerun["inquiries_sent"] == rerun["responses"] == failed["queued"]
+    assert rerun["queued"] == 0 and rerun["failed"] == 0
+    assert session.query(EligibilityRequest).count() == failed["queued"]
+    assert {status for (status,) in session.query(EligibilityRequest.status)} == {"completed"}
+
+
+def test_load_appointments_and_receive_271_files(session, clearinghouse, tmp_path):
+    schedule = tmp_path / "schedule.csv"
+    with open(schedule, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=APPOINTMENT_FIELDS)
+        writer.writeheader()
+        for appointment in synthetic_appointments(10, TOMORROW):
+            writer.writerow({**appointment, "service_type": ""})
+    appointments = EligibilityBatchService.load_appointments(str(schedule))
+    assert appointments[0]["date_of_service"] == TOMORROW and appointments[0]["service_type"] == "30"
+
+    job = make_job(clearinghouse.url)
+    job.queue_appointments(session, appointments, TOMORROW)
+    envelopes = job.service.build_batch_270(session, TOMORROW)
+    paths = []
+    for index, envelope in enumerate(envelopes):
+        path = tmp_path / f"response_{index}.x12"
+        path.write_text(answer_270(job.service.edi_service, envelope["edi_270"], envelope["payer_id"]))
+        paths.append(str(path))
+
+    metrics = job.receive_271_files(session, paths)
+    assert metrics["files"] == len(envelopes)
+    assert metrics["responses"] == session.query(EligibilityResponse).count() > 0
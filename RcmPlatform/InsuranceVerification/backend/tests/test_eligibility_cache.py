@@ -0,0 +1,214 @@
+# File: tests/test_eligibility_cache.py
+import asyncio
+from datetime import date, timedelta
+
+from app.core.exceptions import EligibilityException
+from app.models.models import EligibilityRequest, EligibilityResponse
+from app.schemas.eligibility import EligibilityRequestCreate
+from app.services.edi_service import EDIService
+from app.services.eligibility_cache import EligibilityCache, rejection_reason
+from app.services.eligibility_service import EligibilityService
+from scripts.stub_clearinghouse import answer_270
+
+edi_service = EDIService()
+TODAY = date.today()
+YEAR_START, YEAR_END = date(TODAY.year, 1, 1), date(TODAY.year, 12, 31)
+
+
+def inquiry(member_id="W101", payer_id="PAYER1", date_of_service=TODAY, service_type="30"):
+    return EligibilityRequestCreate(
+        member_id=member_id,
+        provider_npi="1234567890",
+        subscriber_first_name="Jane",
+        subscriber_last_name="Smith",
+        subscriber_dob=date(1980, 1, 1),
+        service_type=service_type,
+        payer_id=payer_id,
+        date_of_service=date_of_service
+    )
+
+
+def respond_271(edi_270, payer_id="PAYER1", **coverage):
+    return answer_270(edi_service, edi_270, payer_id, **coverage)
+
+
+def reject_271(edi_270, reason="42"):
+    """A 271 carrying only an AAA rejection for the 270's trace number."""
+    trace = edi_270.split("TRN*1*")[1].split("~")[0]
+    return "\n".join([
+        "ST*271*0001*005010X279A1~", f"BHT*0022*11*{trace}*20240101*1200~", "HL*1**20*1~",
+        "NM1*PR*2*PAYER ONE*****PI*PAYER1~", f"AAA*Y**{reason}*R~", "HL*3*2*22*0~",
+        f"TRN*2*{trace}~", "SE*8*0001~"
+    ])
+
+
+def test_271_round_trip_parses_coverage_window():
+    edi_271 = edi_service.generate_edi_271("REQ-1", {
+        "is_eligible": True, "member_id": "W101", "payer_id": "PAYER1",
+        "effective_date": YEAR_START, "termination_date": YEAR_END,
+        "benefits": {"medical": {"deductible": "$1000", "copay": "$25"}}
+    })
+    [result] = edi_service.parse_edi_271(edi_271)
+    assert result["request_id"] == "REQ-1"
+    assert result["member_id"] == "W101" and result["payer_id"] == "PAYER1"
+    assert result["is_eligible"] and result["service_types"] == ["30"]
+    assert (result["effective_date"], result["termination_date"]) == (YEAR_START, YEAR_END)
+    assert result["benefits"] == {"deductible": 1000.0, "copay": 25.0}
+
+
+def test_cache_honours_coverage_window_and_new_271s():
+    cache = EligibilityCache()
+    key = ("PAYER1", "W101", "30", TODAY)
+    pending, created = cache.begin(key, "REQ-1")
+    assert created and cache.begin(key, "REQ-2") == (pending, False)
+
+    [result] = edi_service.parse_edi_271(respond_271(
+        edi_service.generate_edi_270(inquiry(), trace_number="REQ-1")[0], termination_date=TODAY + timedelta(days=1)
+    ))
+    cache.store(result)
+    assert cache.pending(key) is None
+    assert cache.get(key)["request_id"] == "REQ-1"
+    # Any date of service inside the coverage period is answered from the same 271
+    assert cache.get(("PAYER1", "W101", "30", TODAY + timedelta(days=1))) is not None
+    assert cache.get(("PAYER1", "W101", "30", TODAY + timedelta(days=2))) is None
+    assert cache.get(("PAYER2", "W101", "30", TODAY)) is None
+
+    # A newer 271 for the member replaces the cached answer
+    [terminated] = edi_service.parse_edi_271(edi_service.generate_edi_271("REQ-3", {
+        "is_eligible": False, "member_id": "W101", "payer_id": "PAYER1"
+    }))
+    cache.store(terminated)
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_ttl_expires_entries():
+    cache = EligibilityCache(ttl=0)
+    key = ("PAYER1", "W101", "30", TODAY)
+    cache.begin(key, "REQ-1")
+    [result] = edi_service.parse_edi_271(respond_271(edi_service.generate_edi_270(inquiry(), trace_number="REQ-1")[0]))
+    cache.store(result)
+    assert cache.get(key) is None
+
+
+def test_concurrent_inquiries_share_one_270(session):
+    calls = []
+
+    async def transport(edi_270, payer_id):
+        calls.append(payer_id)
+        await asyncio.sleep(0.05)
+        return respond_271(edi_270)
+
+    service = EligibilityService(cache=EligibilityCache(), transport=transport)
+
+    async def run():
+        return await asyncio.gather(*(service.inquire(session, inquiry()) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert calls == ["PAYER1"]
+    assert len({r["request_id"] for r in results}) == 1
+    assert all(r["is_eligible"] for r in results)
+    assert sum(not r["cached"] for r in results) == 1
+
+    # Later inquiries for another date inside the coverage period hit the cache
+    again = asyncio.run(service.inquire(session, inquiry(date_of_service=YEAR_END)))
+    assert again["cached"] and calls == ["PAYER1"]
+    assert session.query(EligibilityRequest).count() == 1
+    assert session.query(EligibilityResponse).one().coverage_status == "active"
+
+
+def test_inquiry_without_transport_waits_for_271(session):
+    service = EligibilityService(cache=EligibilityCache())
+    first = asyncio.run(service.inquire(session, inquiry()))
+    repeat = asyncio.run(service.inquire(session, inquiry()))
+    assert first["status"] == "submitted"
+    assert repeat["request_id"] == first["request_id"] and not repeat["cached"]
+
+    service.receive_271(session, respond_271(first["edi_270"]))
+    answered = asyncio.run(service.inquire(session, inquiry()))
+    assert answered["cached"] and answered["request_id"] == first["request_id"]
+    assert session.query(EligibilityRequest).one().status == "completed"
+
+
+def test_batch_270_groups_pending_requests_by_payer(session):
+    tomorrow = TODAY + timedelta(days=1)
+    service = EligibilityService(cache=EligibilityCache())
+    rows = [
+        ("R1", "W1", "PAYER1"), ("R2", "W2", "PAYER1"), ("R3", "W1", "PAYER1"),
+        ("R4", "W3", "PAYER2"), ("R5", "W4", "PAYER2")
+    ]
+    for request_id, member_id, payer_id in rows:
+        session.add(EligibilityRequest(
+            request_id=request_id, member_id=member_id, provider_npi="1234567890",
+            service_type="30", subscriber_first_name="Jane", subscriber_last_name="Smith",
+            subscriber_dob=date(1980, 1, 1), payer_id=payer_id, date_of_service=tomorrow,
+            edi_270_content="", status="pending"
+        ))
+    session.commit()
+
+    # W4 was verified today for a coverage period that includes tomorrow
+    asyncio.run(service.inquire(session, inquiry(member_id="W4", payer_id="PAYER2")))
+    [pending_w4] = [r for r in session.query(EligibilityRequest) if r.member_id == "W4" and r.status == "submitted"]
+    service.receive_271(session, respond_271(pending_w4.edi_270_content, "PAYER2"))
+
+    envelopes = service.build_batch_270(session, tomorrow)
+    assert [(e["payer_id"], e["request_ids"]) for e in envelopes] == [("PAYER1", ["R1", "R2"]), ("PAYER2", ["R4"])]
+    envelope = envelopes[0]["edi_270"]
+    assert envelope.count("ISA*") == 1 and envelope.count("ST*270*") == 2
+    assert "GE*2*" in envelope and "DTP*291*D8*" in envelope
+    assert edi_service.validate_edi_270(envelope)
+
+    # 271s for the batch answer the requests and fill the cache
+    results = service.receive_271(session, respond_271(envelope))
+    assert {r["request_id"] for r in results} == {"R1", "R2"}
+    assert service.cache.get(("PAYER1", "W1", "30", tomorrow)) is not None
+    assert service.build_batch_270(session, tomorrow) == []
+
+
+def test_rejected_271_is_not_cached_and_request_is_retried(session):
+    [rejected] = edi_service.parse_edi_271(reject_271(edi_service.generate_edi_270(inquiry(), trace_number="REQ-1")[0]))
+    assert rejected["errors"] == [{"reason_code": "42", "reason": "Unable to respond at current time", "follow_up": "R"}]
+    assert not rejected["is_eligible"] and rejected["service_types"] == []
+    assert rejection_reason(rejected) == "Unable to respond at current time"
+
+    answers = [reject_271]
+    calls = []
+
+    async def transport(edi_270, payer_id):
+        calls.append(payer_id)
+        await asyncio.sleep(0.05)
+        return answers[len(calls) - 1](edi_270)
+
+    service = EligibilityService(cache=EligibilityCache(), transport=transport)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.inquire(session, inquiry()) for _ in range(5)), return_exceptions=True
+        )
+
+    # The inquirer and every caller waiting on its 270 see the failure, not "ineligible"
+    results = asyncio.run(run())
+    assert calls == ["PAYER1"] and all(isinstance(r, EligibilityException) for r in results)
+    assert session.query(EligibilityRequest).one().status == "error"
+    assert session.query(EligibilityResponse).count() == 0
+    assert service.cache.get(("PAYER1", "W101", "30", TODAY)) is None
+    assert service.cache.stats()["pending"] == 0
+
+    # The next inquiry sends a new 270
+    answers.append(respond_271)
+    retried = asyncio.run(service.inquire(session, inquiry()))
+    assert calls == ["PAYER1", "PAYER1"] and retried["is_eligible"] and not retried["cached"]
+
+
+def test_271_without_coverage_marks_request_errored(session):
+    service = EligibilityService(cache=EligibilityCache())
+    submitted = asyncio.run(service.inquire(session, inquiry()))
+    no_coverage = "\n".join(
+        line for line in respond_271(submitted["edi_270"]).split("\n")
+        if not line.startswith(("EB*Y", "EB*N"))
+    )
+    [result] = service.receive_271(session, no_coverage)
+    assert rejection_reason(result) is not None and not service.cache.store(result)
+    assert session.query(EligibilityRequest).one().status == "error"
+    assert service.cache.get(("PAYER1", "W101", "30", TODAY)) is None
+    assert service.cache.pending_request(submitted["request_id"]) is None
@@ -0,0 +1,140 @@
+# File: tests/test_ocr_jobs.py
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import fitz
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import OCRQueueFullException
+from app.main import app
+from app.services.ocr_jobs import OCRJobQueue, ocr_job_queue
+from app.services.ocr_service import OCRService
+
+client = TestClient(app)
+
+CARD_TEXT = "Aetna\nName: Jane Smith\nMember ID: W123456789\nGroup: GRP-100\nEffective: 01/01/2024"
+
+
+def make_card_pdf(text=CARD_TEXT):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def test_text_from_ocr_data_single_pass():
+    """Text and confidence are rebuilt from one image_to_data result."""
+    data = {
+        "block_num": [0, 1, 1, 1, 1, 1, 2],
+        "par_num": [0, 1, 1, 1, 1, 1, 1],
+        "line_num": [0, 1, 1, 2, 2, 2, 1],
+        "text": ["", "Member", "ID:", "W123", "", "Group", "Aetna"],
+        "conf": ["-1", "90", "80.5", 70, "-1", "60", "95"],
+    }
+    text, confidence = OCRService.text_from_ocr_data(data)
+    assert text == "Member ID:\nW123 Group\n\nAetna"
+    assert confidence == pytest.approx((90 + 80.5 + 70 + 60 + 95) / 5)
+
+
+def test_downscale_image_to_target_dpi():
+    service = OCRService()
+    image = np.zeros((3000, 1800), dtype=np.uint8)
+    assert service.downscale_image(image, source_dpi=600).shape == (1500, 900)
+    # Below the target DPI the longest side is still capped
+    assert service.downscale_image(image, source_dpi=150).shape == (2000, 1200)
+    assert service.downscale_image(np.zeros((800, 500), dtype=np.uint8)).shape == (800, 500)
+
+
+def test_process_pool_job_and_content_cache():
+    """A card runs once in the pool; the same bytes are then served from cache."""
+    executor = ProcessPoolExecutor(max_workers=1)
+    queue = OCRJobQueue(executor=executor)
+    content = make_card_pdf()
+    try:
+        job = queue.submit(content, "application/pdf", "card.pdf")
+        assert queue.submit(content, "application/pdf", "card.pdf") is job
+        asyncio.run(queue.wait(job, timeout=60))
+        assert job.status.value == "completed", job.error
+        assert job.result["extracted_data"]["member_id"] == "W123456789"
+        assert job.result["extracted_data"]["insurance_company"] == "Aetna"
+
+        again = queue.submit(content, "application/pdf", "copy.pdf")
+        assert again.job_id != job.job_id
+        assert again.cached and again.future is None
+        assert again.result == job.result
+        assert queue.get(again.job_id) is again
+    finally:
+        queue.shutdown()
+
+
+def test_failed_job_is_not_cached():
+    queue = OCRJobQueue(executor=ThreadPoolExecutor(max_workers=1))
+    try:
+        job = queue.submit(b"not an image", "image/png")
+        asyncio.run(queue.wait(job, timeout=10))
+        assert job.status.value == "error" and job.error
+        retry = queue.submit(b"not an image", "image/png")
+        assert not retry.cached and retry.job_id != job.job_id
+        asyncio.run(queue.wait(retry, timeout=10))
+    finally:
+        queue.shutdown()
+
+
+started = threading.Event()
+release = threading.Event()
+
+
+def blocking_processor(content, content_type):
+    started.set()
+    release.wait(10)
+    return {"raw_text": content.decode(), "extracted_data": None}
+
+
+def test_queue_is_bounded():
+    release.clear()
+    queue = OCRJobQueue(max_pending=2, executor=ThreadPoolExecutor(max_workers=1), processor=blocking_processor)
+    try:
+        first = queue.submit(b"a", "image/png")
+        queue.submit(b"b", "image/png")
+        assert started.wait(5)
+        assert first.to_dict()["status"] == "processing"
+        with pytest.raises(OCRQueueFullException):
+            queue.submit(b"c", "image/png")
+        release.set()
+        asyncio.run(queue.wait(first, timeout=10))
+        assert first.status.value == "completed"
+    finally:
+        release.set()
+        queue.shutdown()
+
+
+def test_upload_returns_job_and_status_endpoint():
+    content = make_card_pdf()
+    try:
+        response = client.post(
+            "/api/v1/upload/insurance-card?wait_seconds=60",
+            files={"file": ("card.pdf", content, "application/pdf")}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["extracted_data"]["member_id"] == "W123456789"
+
+        status = client.get(f"/api/v1/upload/insurance-card/jobs/{data['job_id']}")
+        assert status.status_code == 200
+        assert status.json()["result"]["raw_text"] == data["result"]["raw_text"]
+
+        again = client.post(
+            "/api/v1/upload/insurance-card?wait_seconds=0",
+            files={"file": ("card.pdf", content, "application/pdf")}
+        ).json()
+        assert again["cached"] and again["status"] == "completed"
+    finally:
+        ocr_job_queue.shutdown()
+
+    assert client.get("/api/v1/upload/insurance-card/jobs/unknown").status_code == 404
@@ -35,6 +35,8 @@ CREATE TABLE eligibility_requests (
     subscriber_first_name VARCHAR(100),
     subscriber_last_name VARCHAR(100),
     subscriber_dob DATE,
+    payer_id VARCHAR(50),
+    date_of_service DATE,
     edi_270_content TEXT NOT NULL,
     status VARCHAR(20) DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -48,6 +50,7 @@ CREATE TABLE eligibility_responses (
     edi_271_content TEXT NOT NULL,
     is_eligible BOOLEAN NOT NULL DEFAULT FALSE,
     benefits_info JSONB,
+    payer_id VARCHAR(50),
     coverage_status VARCHAR(50),
     effective_date DATE,
     termination_date DATE,
@@ -55,6 +58,8 @@ CREATE TABLE eligibility_responses (
     deductible_amount DECIMAL(10,2),
     out_of_pocket_max DECIMAL(10,2),
     processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (request_id) REFERENCES eligibility_requests(request_id)
 );
 
@@ -116,6 +121,7 @@ CREATE INDEX idx_insurance_cards_member_id ON insurance_cards(member_id);
 CREATE INDEX idx_eligibility_requests_request_id ON eligibility_requests(request_id);
 CREATE INDEX idx_eligibility_requests_member_id ON eligibility_requests(member_id);
 CREATE INDEX idx_eligibility_requests_status ON eligibility_requests(status);
+CREATE INDEX idx_eligibility_requests_dos_status ON eligibility_requests(date_of_service, status);
 CREATE INDEX idx_eligibility_responses_request_id ON eligibility_responses(request_id);
 CREATE INDEX idx_transaction_logs_request_id ON transaction_logs(request_id);
 CREATE INDEX idx_transaction_logs_created_at ON transaction_logs(created_at);
@@ -0,0 +1,14 @@
+-- Payer, date of service and coverage window columns for the eligibility cache
+-- and next-day batch 270 pre-verification, on an existing database.
+-- File: database/migration_eligibility_cache.sql
+
+\c health_insurance_db;
+
+ALTER TABLE eligibility_requests ADD COLUMN IF NOT EXISTS payer_id VARCHAR(50);
+ALTER TABLE eligibility_requests ADD COLUMN IF NOT EXISTS date_of_service DATE;
+
+ALTER TABLE eligibility_responses ADD COLUMN IF NOT EXISTS payer_id VARCHAR(50);
+ALTER TABLE eligibility_responses ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE eligibility_responses ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_eligibility_requests_dos_status ON eligibility_requests(date_of_service, status);
@@ -1,9 +1,15 @@
 # File: app/api/endpoints/prior_authorization.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import os
+import uuid
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
 from app.services import prior_auth_service
+from app.services.edi_278_batch_service import edi_278_batch_service
 from app.schemas.prior_authorization import (
     PriorAuthorizationRequestCreate,
     PriorAuthorizationRequest,
@@ -58,18 +64,22 @@ def process_authorization_decision(
 
 @router.get("/requests", response_model=List[PriorAuthorizationRequest])
 def search_authorization_requests(
+    response: Response,
     patient_name: Optional[str] = Query(None, description="Patient name"),
     member_id: Optional[str] = Query(None, description="Member ID"),
     provider_npi: Optional[str] = Query(None, description="Provider NPI"),
     status: Optional[str] = Query(None, description="Request status"),
     service_date_from: Optional[str] = Query(None, description="Service date from (YYYY-MM-DD)"),
     service_date_to: Optional[str] = Query(None, description="Service date to (YYYY-MM-DD)"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    phonetic: bool = Query(False, description="Match patient names that sound alike"),
+    after_id: Optional[int] = Query(None, description="Cursor: X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with after_id)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    exact_count: bool = Query(False, description="Count every match instead of stopping at 1000"),
     db: Session = Depends(get_db)
 ):
-    """Search authorization requests"""
-    return prior_auth_service.search_authorization_requests(
+    """Search authorization requests, newest first"""
+    page = prior_auth_service.search_authorization_requests(
         db,
         patient_name=patient_name,
         member_id=member_id,
@@ -77,9 +87,17 @@ def search_authorization_requests(
         status=status,
         service_date_from=service_date_from,
         service_date_to=service_date_to,
+        phonetic=phonetic,
+        after_id=after_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        exact_count=exact_count
     )
+    if page["next_cursor"] is not None:
+        response.headers["X-Next-Cursor"] = str(page["next_cursor"])
+    response.headers["X-Total-Count"] = str(page["total"])
+    response.headers["X-Total-Count-Exact"] = "true" if page["total_is_exact"] else "false"
+    return page["items"]
 
 
 @router.get("/patients/{patient_id}/requests", response_model=List[PriorAuthorizationRequest])
@@ -175,3 +193,40 @@ def edi_278_decision(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
+@router.post("/edi278/batch")
+def generate_edi_278_batch(
+    request_ids: Optional[List[str]] = Body(None, embed=True, description="Requests to include (default: all with the given status)"),
+    status: Optional[str] = Query("submitted", description="Only include requests with this status"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Write many stored requests as one EDI 278 interchange file"""
+    os.makedirs(settings.EDI_BATCH_DIRECTORY, exist_ok=True)
+    file_name = f"278_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}.edi"
+    try:
+        return edi_278_batch_service.generate_batch(
+            db, edi_278_batch_service.batch_path(file_name), request_ids=request_ids, status=status
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/edi278/batch/{file_name}")
+def download_edi_278_batch(file_name: str):
+    """Download a generated EDI 278 batch file"""
+    path = edi_278_batch_service.batch_path(file_name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Batch file not found")
+    return FileResponse(path, media_type="application/edi-x12", filename=os.path.basename(path))
+
+
+@router.post("/edi278/responses")
+def process_edi_278_responses(
+    file: UploadFile = File(..., description="EDI 278 response file"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Record every 278 response in a file and update the matching request statuses"""
+    try:
+        return edi_278_batch_service.apply_responses(db, file.file)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -28,11 +28,20 @@ class Settings(BaseSettings):
     # EDI Configuration
     EDI_SUBMITTER_ID: str = "PROVIDER001"
     EDI_RECEIVER_ID: str = "PAYER001"
+    EDI_BATCH_DIRECTORY: str = "./edi_batches"
     
     # Authorization Settings
     DEFAULT_AUTH_DAYS: int = 90
     MAX_UNITS_AUTO_APPROVE: int = 10
     REQUIRE_CLINICAL_INFO: bool = True
+    EXPIRATION_NOTICE_DAYS: int = 30
+    URGENT_REVIEW_HOURS: int = 24
+
+    # Follow-up / expiration scheduler
+    WORK_QUEUE_BATCH_SIZE: int = 100
+    WORK_QUEUE_LEASE_SECONDS: int = 300
+    WORK_QUEUE_POLL_SECONDS: float = 30.0
+    WORK_QUEUE_MAX_ATTEMPTS: int = 5
 
     model_config = {
         "env_file": ".env",
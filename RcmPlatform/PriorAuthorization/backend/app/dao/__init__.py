@@ -4,12 +4,16 @@ from .prior_authorization_dao import EnhancedAuthorizationDAO
 from .patient_dao import EnhancedPatientDAO
 from .codes_dao import EnhancedCodesDAO
 from .audit_dao import AuthorizationAuditDAO
+from .rollup_dao import AuthorizationRollupDAO
+from .work_queue_dao import AuthorizationWorkQueueDAO
 
 __all__ = [
     "BaseDAO",
     "EnhancedAuthorizationDAO", 
     "EnhancedPatientDAO",
     "EnhancedCodesDAO",
-    "AuthorizationAuditDAO"
+    "AuthorizationAuditDAO",
+    "AuthorizationRollupDAO",
+    "AuthorizationWorkQueueDAO"
 ]
 
@@ -31,7 +31,7 @@ class AuthorizationAuditDAO(BaseDAO[AuthorizationAudit]):
             "notes": notes,
             "previous_status": previous_status,
             "new_status": new_status,
-            "metadata": metadata
+            "action_metadata": metadata
         }
         return self.create(db, obj_in=audit_data)
 
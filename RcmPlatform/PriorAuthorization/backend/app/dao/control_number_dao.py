@@ -0,0 +1,52 @@
+# File: app/dao/control_number_dao.py
+from typing import List
+from sqlalchemy.orm import Session
+from sqlalchemy import text, update, insert
+from app.models.models import EDIControlCounter, edi_control_number_seq
+
+# X12 control numbers are nine digits
+MAX_CONTROL_NUMBER = 999999999
+
+
+class ControlNumberDAO:
+    """
+    Allocates EDI control numbers from edi_control_number_seq.
+
+    A block of any size costs one round trip. Numbers are unique and increase
+    in allocation order until the sequence cycles past MAX_CONTROL_NUMBER.
+    """
+
+    def allocate(self, db: Session, count: int) -> List[int]:
+        """Allocate count control numbers, in increasing order"""
+        if count <= 0:
+            return []
+        if db.get_bind().dialect.name == "postgresql":
+            result = db.execute(
+                text("SELECT nextval(:sequence) FROM generate_series(1, :count)"),
+                {"sequence": edi_control_number_seq.name, "count": count}
+            )
+            return sorted(result.scalars())
+        return self._allocate_from_counter(db, count)
+
+    def _allocate_from_counter(self, db: Session, count: int) -> List[int]:
+        name = edi_control_number_seq.name
+        last_value = db.execute(
+            update(EDIControlCounter)
+            .where(EDIControlCounter.name == name)
+            .values(last_value=EDIControlCounter.last_value + count)
+            .returning(EDIControlCounter.last_value)
+        ).scalar()
+        if last_value is None:
+            db.execute(insert(EDIControlCounter).values(name=name, last_value=count))
+            last_value = count
+        first = last_value - count
+        return [(first + offset) % MAX_CONTROL_NUMBER + 1 for offset in range(count)]
+
+    @staticmethod
+    def format(number: int) -> str:
+        """Zero-padded nine-digit control number"""
+        return f"{number:09d}"
+
+
+# Global instance
+control_number_dao = ControlNumberDAO()
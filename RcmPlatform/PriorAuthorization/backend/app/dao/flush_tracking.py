@@ -0,0 +1,42 @@
+# File: app/dao/flush_tracking.py
+from typing import Iterable, Set
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app.models.models import PriorAuthorizationRequest, PriorAuthorizationResponse
+
+
+def _changed(obj, columns: Iterable[str]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[column].history.has_changes() for column in columns)
+
+
+def _request_ids(obj) -> Set[str]:
+    """Current and previous request_id of a request or response"""
+    ids = set(inspect(obj).attrs.request_id.history.deleted or ())
+    request_id = obj.request_id
+    if request_id is None and isinstance(obj, PriorAuthorizationResponse) and obj.request is not None:
+        request_id = obj.request.request_id
+    ids.add(request_id)
+    return {request_id for request_id in ids if request_id}
+
+
+def affected_request_ids(
+    session: Session,
+    request_columns: Iterable[str],
+    response_columns: Iterable[str]
+) -> Set[str]:
+    """request_ids of the requests and responses pending in a flush that touch the tracked columns.
+
+    New and deleted requests/responses always count; dirty ones only when a
+    tracked column changed.
+    """
+    affected = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (PriorAuthorizationRequest, PriorAuthorizationResponse)):
+            affected |= _request_ids(obj)
+    for obj in session.dirty:
+        if isinstance(obj, PriorAuthorizationRequest) and _changed(obj, request_columns):
+            affected |= _request_ids(obj)
+        elif isinstance(obj, PriorAuthorizationResponse) and _changed(obj, response_columns):
+            affected |= _request_ids(obj)
+    return affected
@@ -1,7 +1,7 @@
 # File: app/dao/enhanced_authorization_dao.py
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func, text, case
+from sqlalchemy import and_, or_, desc, func, case, select, tuple_, union
 from app.dao.base_dao import BaseDAO
 from app.models.models import (
     PriorAuthorizationRequest, 
@@ -16,9 +16,18 @@ from app.schemas.statistics import (
     AuthorizationStatistics,
     ProviderStatistics
 )
+from app.dao.rollup_dao import rollup_dao, normalize_response_code, ROLE_REQUESTING
 from datetime import date, datetime, timedelta
 import uuid
 
+# Searches stop counting matches here unless an exact count is asked for
+SEARCH_COUNT_CAP = 1000
+
+# EDI 278 response codes as grouped in statistics; None is a request with no response yet
+APPROVED_CODES = ('A1', 'A2')
+DENIED_CODE = 'A3'
+PENDING_CODES = ('A4', None)
+
 
 class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
     def __init__(self):
@@ -47,59 +56,136 @@ class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
             return AuthorizationSummary.model_validate(request)
         return None
 
-    def advanced_search(
-        self, 
-        db: Session, 
-        search_request: AuthorizationSearchRequest,
-        skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[AuthorizationSummary], int]:
-        """Advanced authorization search with count"""
-        query = db.query(PriorAuthorizationRequest)
+    def _search_filters(self, db: Session, search_request: AuthorizationSearchRequest) -> List[Any]:
+        """Filter clauses for every search criterion except the provider NPI"""
+        model = PriorAuthorizationRequest
+        filters = []
         
-        # Build filters
         if search_request.patient_name:
-            query = query.filter(
-                or_(
-                    PriorAuthorizationRequest.patient_first_name.ilike(f"%{search_request.patient_name}%"),
-                    PriorAuthorizationRequest.patient_last_name.ilike(f"%{search_request.patient_name}%")
+            name = search_request.patient_name.strip()
+            if search_request.phonetic and db.get_bind().dialect.name == "postgresql":
+                # Served by the dmetaphone expression indexes
+                filters.append(
+                    or_(
+                        func.dmetaphone(model.patient_first_name) == func.dmetaphone(name),
+                        func.dmetaphone(model.patient_last_name) == func.dmetaphone(name)
+                    )
+                )
+            else:
+                # Served by the pg_trgm GIN indexes, which support leading-wildcard ILIKE
+                filters.append(
+                    or_(
+                        model.patient_first_name.ilike(f"%{name}%"),
+                        model.patient_last_name.ilike(f"%{name}%")
+                    )
                 )
-            )
         
         if search_request.member_id:
-            query = query.filter(PriorAuthorizationRequest.member_id == search_request.member_id)
-        
-        if search_request.provider_npi:
-            query = query.filter(
-                or_(
-                    PriorAuthorizationRequest.requesting_provider_npi == search_request.provider_npi,
-                    PriorAuthorizationRequest.servicing_provider_npi == search_request.provider_npi
-                )
-            )
+            filters.append(model.member_id == search_request.member_id)
         
         if search_request.status:
-            query = query.filter(PriorAuthorizationRequest.status == search_request.status)
+            filters.append(model.status == search_request.status)
         
         if search_request.service_date_from:
-            query = query.filter(PriorAuthorizationRequest.service_date_from >= search_request.service_date_from)
+            filters.append(model.service_date_from >= search_request.service_date_from)
         
         if search_request.service_date_to:
-            query = query.filter(PriorAuthorizationRequest.service_date_to <= search_request.service_date_to)
+            filters.append(model.service_date_to <= search_request.service_date_to)
         
         if search_request.created_from:
-            query = query.filter(PriorAuthorizationRequest.created_at >= search_request.created_from)
+            filters.append(model.created_at >= search_request.created_from)
         
         if search_request.created_to:
-            query = query.filter(PriorAuthorizationRequest.created_at <= search_request.created_to)
+            filters.append(model.created_at <= search_request.created_to)
         
         if search_request.priority:
-            query = query.filter(PriorAuthorizationRequest.priority == search_request.priority.value)
+            filters.append(model.priority == search_request.priority.value)
+        
+        return filters
+
+    def search_requests(
+        self,
+        db: Session,
+        search_request: AuthorizationSearchRequest,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[PriorAuthorizationRequest], Optional[int]]:
+        """
+        Newest-first page of matching requests and the cursor for the next page.
+        Pass the cursor back as after_id; skip is only honoured without after_id.
+        """
+        model = PriorAuthorizationRequest
+        order = (desc(model.created_at), desc(model.id))
+        filters = self._search_filters(db, search_request)
+        
+        if after_id:
+            # Row-value comparison so the (..., created_at, id) indexes drive the scan
+            after_created_at = select(model.created_at).where(model.id == after_id).scalar_subquery()
+            filters.append(tuple_(model.created_at, model.id) < tuple_(after_created_at, after_id))
+            skip = 0
         
-        # Get total count
-        total = query.count()
+        if search_request.provider_npi:
+            # One ordered index scan per NPI column, merged, instead of an OR that
+            # has to collect and sort every match before the limit applies
+            branches = []
+            for column in (model.requesting_provider_npi, model.servicing_provider_npi):
+                branch = (
+                    select(model.id, model.created_at)
+                    .where(column == search_request.provider_npi, *filters)
+                    .order_by(*order)
+                    .limit(skip + limit + 1)
+                    .subquery()
+                )
+                branches.append(select(branch.c.id, branch.c.created_at))
+            matches = union(*branches).subquery()
+            query = db.query(model).join(matches, model.id == matches.c.id)
+        else:
+            query = db.query(model).filter(*filters)
         
-        # Get paginated results
-        requests = query.order_by(desc(PriorAuthorizationRequest.created_at)).offset(skip).limit(limit).all()
+        rows = query.order_by(*order).offset(skip).limit(limit + 1).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def count_search(
+        self,
+        db: Session,
+        search_request: AuthorizationSearchRequest,
+        exact: bool = False
+    ) -> Tuple[int, bool]:
+        """
+        Number of matching requests and whether it is exact. Unless exact is
+        requested, counting stops at SEARCH_COUNT_CAP matches.
+        """
+        model = PriorAuthorizationRequest
+        filters = self._search_filters(db, search_request)
+        if search_request.provider_npi:
+            filters.append(
+                or_(
+                    model.requesting_provider_npi == search_request.provider_npi,
+                    model.servicing_provider_npi == search_request.provider_npi
+                )
+            )
+        matches = select(model.id).where(*filters)
+        
+        if exact:
+            return db.scalar(select(func.count()).select_from(matches.subquery())), True
+        
+        capped = db.scalar(select(func.count()).select_from(matches.limit(SEARCH_COUNT_CAP + 1).subquery()))
+        return min(capped, SEARCH_COUNT_CAP), capped <= SEARCH_COUNT_CAP
+
+    def advanced_search(
+        self, 
+        db: Session, 
+        search_request: AuthorizationSearchRequest,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        exact_count: bool = False
+    ) -> Tuple[List[AuthorizationSummary], int]:
+        """Advanced authorization search with count (capped at SEARCH_COUNT_CAP unless exact_count)"""
+        requests, _ = self.search_requests(db, search_request, after_id=after_id, skip=skip, limit=limit)
+        total, _ = self.count_search(db, search_request, exact=exact_count)
         summaries = [AuthorizationSummary.model_validate(r) for r in requests]
         
         return summaries, total
@@ -134,17 +220,14 @@ class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
         return query.order_by(PriorAuthorizationRequest.created_at).offset(skip).limit(limit).all()
 
     def get_requests_requiring_followup(self, db: Session) -> List[PriorAuthorizationRequest]:
-        """Get requests that require follow-up"""
-        query = text("""
-            SELECT par.* 
-            FROM prior_authorization_requests par
-            JOIN prior_authorization_responses pres ON par.request_id = pres.request_id
-            WHERE pres.follow_up_required = true 
-            AND pres.follow_up_date <= CURRENT_DATE
-        """)
-        
-        result = db.execute(query)
-        return [PriorAuthorizationRequest(**row._asdict()) for row in result]
+        """Get requests that require follow-up (served by idx_prior_auth_resp_follow_up_open)"""
+        return db.query(PriorAuthorizationRequest).join(
+            PriorAuthorizationResponse,
+            PriorAuthorizationResponse.request_id == PriorAuthorizationRequest.request_id
+        ).filter(
+            PriorAuthorizationResponse.follow_up_required == True,
+            PriorAuthorizationResponse.follow_up_date <= date.today()
+        ).order_by(PriorAuthorizationResponse.follow_up_date).all()
 
     def get_authorization_statistics(
         self, 
@@ -152,38 +235,41 @@ class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
         date_from: date, 
         date_to: date
     ) -> AuthorizationStatistics:
-        """Get authorization statistics for date range"""
-        
-        # Base query for date range
-        base_query = db.query(PriorAuthorizationRequest).filter(
-            and_(
-                PriorAuthorizationRequest.created_at >= date_from,
-                PriorAuthorizationRequest.created_at <= date_to
+        """Get authorization statistics for date range (whole days, both ends inclusive)"""
+        rows = rollup_dao.summarize(db, date_from, date_to, provider_role=ROLE_REQUESTING)
+        
+        total_requests = approved = denied = pending = responded = 0
+        processing_seconds = 0.0
+        by_priority: Dict[str, int] = {}
+        providers: Dict[str, Dict[str, Any]] = {}
+        
+        for row in rows:
+            count = row.request_count or 0
+            code = normalize_response_code(row.response_code)
+            total_requests += count
+            
+            if code in APPROVED_CODES:
+                approved += count
+            elif code == DENIED_CODE:
+                denied += count
+            elif code in PENDING_CODES:
+                pending += count
+            if code is not None:
+                responded += count
+                processing_seconds += row.processing_seconds or 0
+            
+            priority = row.priority or "unspecified"
+            by_priority[priority] = by_priority.get(priority, 0) + count
+            
+            provider = providers.setdefault(
+                row.provider_npi,
+                {"npi": row.provider_npi, "name": None, "total_requests": 0}
             )
-        )
-        
-        total_requests = base_query.count()
-        
-        # Status counts
-        status_query = base_query.join(PriorAuthorizationResponse, isouter=True)
-        status_counts = status_query.with_entities(
-            PriorAuthorizationResponse.response_code,
-            func.count(PriorAuthorizationRequest.id)
-        ).group_by(PriorAuthorizationResponse.response_code).all()
-        
-        approved = sum(count for code, count in status_counts if code in ['A1', 'A2'])
-        denied = sum(count for code, count in status_counts if code == 'A3')
-        pending = sum(count for code, count in status_counts if code in ['A4', None])
+            provider["name"] = provider["name"] or row.provider_name
+            provider["total_requests"] += count
         
         approval_rate = (approved / total_requests * 100) if total_requests > 0 else 0
-        
-        # Priority distribution
-        priority_query = base_query.with_entities(
-            PriorAuthorizationRequest.priority,
-            func.count(PriorAuthorizationRequest.id)
-        ).group_by(PriorAuthorizationRequest.priority).all()
-        
-        by_priority = {priority: count for priority, count in priority_query}
+        avg_processing_time = (processing_seconds / responded / 3600) if responded else 0
         
         # Status distribution
         by_status = {
@@ -193,37 +279,8 @@ class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
             'pending': pending
         }
         
-        # Processing time calculation
-        processing_time_query = text("""
-            SELECT AVG(EXTRACT(EPOCH FROM (pres.created_at - par.created_at))/3600) as avg_hours
-            FROM prior_authorization_requests par
-            JOIN prior_authorization_responses pres ON par.request_id = pres.request_id
-            WHERE par.created_at BETWEEN :date_from AND :date_to
-        """)
-        
-        avg_processing_time = db.execute(
-            processing_time_query, 
-            {"date_from": date_from, "date_to": date_to}
-        ).scalar() or 0
-        
         # Top providers
-        provider_query = base_query.with_entities(
-            PriorAuthorizationRequest.requesting_provider_npi,
-            PriorAuthorizationRequest.requesting_provider_name,
-            func.count(PriorAuthorizationRequest.id).label('total')
-        ).group_by(
-            PriorAuthorizationRequest.requesting_provider_npi,
-            PriorAuthorizationRequest.requesting_provider_name
-        ).order_by(desc('total')).limit(10).all()
-        
-        by_provider = [
-            {
-                "npi": npi,
-                "name": name,
-                "total_requests": total
-            }
-            for npi, name, total in provider_query
-        ]
+        by_provider = sorted(providers.values(), key=lambda p: (-p["total_requests"], p["npi"]))[:10]
         
         return AuthorizationStatistics(
             total_requests=total_requests,
@@ -248,82 +305,95 @@ class EnhancedAuthorizationDAO(BaseDAO[PriorAuthorizationRequest]):
         date_to: Optional[date] = None
     ) -> Optional[ProviderStatistics]:
         """Get statistics for specific provider"""
-        
-        query = db.query(PriorAuthorizationRequest).filter(
-            or_(
-                PriorAuthorizationRequest.requesting_provider_npi == provider_npi,
-                PriorAuthorizationRequest.servicing_provider_npi == provider_npi
-            )
-        )
-        
-        if date_from:
-            query = query.filter(PriorAuthorizationRequest.created_at >= date_from)
-        if date_to:
-            query = query.filter(PriorAuthorizationRequest.created_at <= date_to)
-        
-        requests = query.all()
-        if not requests:
-            return None
-        
-        total_requests = len(requests)
-        provider_name = requests[0].requesting_provider_name
-        
-        # Get responses for approval calculation
-        response_query = db.query(PriorAuthorizationResponse).filter(
-            PriorAuthorizationResponse.request_id.in_([r.request_id for r in requests])
-        )
-        responses = response_query.all()
-        
-        approved = sum(1 for r in responses if r.response_code in ['A1', 'A2'])
-        denied = sum(1 for r in responses if r.response_code == 'A3')
-        approval_rate = (approved / len(responses) * 100) if responses else 0
-        
-        # Processing time
-        if responses:
-            processing_times = [
-                (r.created_at - next(req.created_at for req in requests if req.request_id == r.request_id)).total_seconds() / 3600
-                for r in responses
-            ]
-            avg_processing_time = sum(processing_times) / len(processing_times)
-        else:
-            avg_processing_time = 0
+        statistics = self.get_providers_statistics(db, [provider_npi], date_from, date_to)
+        return statistics[0] if statistics else None
+
+    def get_providers_statistics(
+        self,
+        db: Session,
+        provider_npis: List[str],
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[ProviderStatistics]:
+        """
+        Statistics for several providers, as requesting or servicing provider.
+        Counts come from one rollup query; procedures and diagnoses from one
+        query over just the code columns. Providers without requests are omitted.
+        """
+        if not provider_npis:
+            return []
+        
+        totals: Dict[str, Dict[str, Any]] = {}
+        for row in rollup_dao.summarize(db, date_from, date_to, provider_npis=provider_npis, provider_role=None):
+            count = row.request_count or 0
+            code = normalize_response_code(row.response_code)
+            entry = totals.setdefault(row.provider_npi, {
+                "name": None, "total": 0, "approved": 0, "denied": 0, "responded": 0, "seconds": 0.0
+            })
+            entry["name"] = entry["name"] or row.provider_name
+            entry["total"] += count
+            if code in APPROVED_CODES:
+                entry["approved"] += count
+            elif code == DENIED_CODE:
+                entry["denied"] += count
+            if code is not None:
+                entry["responded"] += count
+                entry["seconds"] += row.processing_seconds or 0
         
         # Common procedures and diagnoses
-        all_procedures = []
-        all_diagnoses = []
-        
-        for request in requests:
-            if request.procedure_codes:
-                all_procedures.extend([p.get('code') for p in request.procedure_codes if p.get('code')])
-            if request.diagnosis_codes:
-                all_diagnoses.extend([d.get('code') for d in request.diagnosis_codes if d.get('code')])
-        
-        # Count frequencies
         from collections import Counter
-        procedure_counts = Counter(all_procedures)
-        diagnosis_counts = Counter(all_diagnoses)
-        
-        common_procedures = [
-            {"code": code, "count": count}
-            for code, count in procedure_counts.most_common(10)
-        ]
-        
-        common_diagnoses = [
-            {"code": code, "count": count}
-            for code, count in diagnosis_counts.most_common(10)
-        ]
-        
-        return ProviderStatistics(
-            provider_npi=provider_npi,
-            provider_name=provider_name,
-            total_requests=total_requests,
-            approved_requests=approved,
-            denied_requests=denied,
-            approval_rate=approval_rate,
-            average_processing_time_hours=avg_processing_time,
-            common_procedures=common_procedures,
-            common_diagnoses=common_diagnoses
-        )
+        procedure_counts = {npi: Counter() for npi in totals}
+        diagnosis_counts = {npi: Counter() for npi in totals}
+        
+        if totals:
+            npis = list(totals)
+            query = db.query(
+                PriorAuthorizationRequest.requesting_provider_npi,
+                PriorAuthorizationRequest.servicing_provider_npi,
+                PriorAuthorizationRequest.procedure_codes,
+                PriorAuthorizationRequest.diagnosis_codes
+            ).filter(
+                or_(
+                    PriorAuthorizationRequest.requesting_provider_npi.in_(npis),
+                    PriorAuthorizationRequest.servicing_provider_npi.in_(npis)
+                )
+            )
+            if date_from:
+                query = query.filter(PriorAuthorizationRequest.created_at >= date_from)
+            if date_to:
+                query = query.filter(PriorAuthorizationRequest.created_at < date_to + timedelta(days=1))
+            
+            for requesting_npi, servicing_npi, procedure_codes, diagnosis_codes in query:
+                procedures = [p.get('code') for p in procedure_codes or [] if p.get('code')]
+                diagnoses = [d.get('code') for d in diagnosis_codes or [] if d.get('code')]
+                for npi in {requesting_npi, servicing_npi} & procedure_counts.keys():
+                    procedure_counts[npi].update(procedures)
+                    diagnosis_counts[npi].update(diagnoses)
+        
+        statistics = []
+        for npi in provider_npis:
+            entry = totals.get(npi)
+            if not entry or entry["total"] == 0:
+                continue
+            statistics.append(ProviderStatistics(
+                provider_npi=npi,
+                provider_name=entry["name"],
+                total_requests=entry["total"],
+                approved_requests=entry["approved"],
+                denied_requests=entry["denied"],
+                approval_rate=(entry["approved"] / entry["responded"] * 100) if entry["responded"] else 0,
+                average_processing_time_hours=(entry["seconds"] / entry["responded"] / 3600) if entry["responded"] else 0,
+                common_procedures=[
+                    {"code": code, "count": count}
+                    for code, count in procedure_counts[npi].most_common(10)
+                ],
+                common_diagnoses=[
+                    {"code": code, "count": count}
+                    for code, count in diagnosis_counts[npi].most_common(10)
+                ]
+            ))
+        
+        return statistics
 
     def get_expiring_authorizations(
         self, 
@@ -0,0 +1,206 @@
+# File: app/dao/rollup_dao.py
+from typing import Optional, List, Iterable, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, null, select, text, union_all, String, cast, event
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.models import (
+    PriorAuthorizationRequest,
+    PriorAuthorizationResponse,
+    AuthorizationDailyRollup,
+    ResponseCodeEnum
+)
+from app.dao.flush_tracking import affected_request_ids
+from datetime import date
+
+ROLE_REQUESTING = "requesting"
+ROLE_SERVICING = "servicing"
+
+# Columns that decide which rollup bucket a request (and its response) falls in
+REQUEST_ROLLUP_COLUMNS = (
+    "request_id", "created_at", "priority",
+    "requesting_provider_npi", "requesting_provider_name",
+    "servicing_provider_npi", "servicing_provider_name"
+)
+RESPONSE_ROLLUP_COLUMNS = ("request_id", "response_code", "created_at")
+
+_PENDING_REQUEST_IDS = "authorization_rollup_request_ids"
+
+
+def normalize_response_code(code: Any) -> Optional[str]:
+    """EDI code ('A1') for a stored response code, whether stored as the value or the enum name"""
+    if code is None or code == "":
+        return None
+    if isinstance(code, ResponseCodeEnum):
+        return code.value
+    if code in ResponseCodeEnum.__members__:
+        return ResponseCodeEnum[code].value
+    return code
+
+
+class AuthorizationRollupDAO:
+    """
+    Maintains and reads authorization_daily_rollups.
+
+    A request's contribution is computed in SQL from the stored request and its
+    response. Before a flush that touches rollup columns the contributions of the
+    affected requests are subtracted; after it they are added back from the new
+    rows, so creates, updates and deletes through any ORM session stay in step.
+    """
+
+    def _contributions(self, dialect_name: str, sign: int, *criteria):
+        requests = PriorAuthorizationRequest.__table__
+        responses = PriorAuthorizationResponse.__table__
+
+        if dialect_name == "postgresql":
+            elapsed = func.extract("epoch", responses.c.created_at - requests.c.created_at)
+        else:
+            elapsed = (func.julianday(responses.c.created_at) - func.julianday(requests.c.created_at)) * 86400
+
+        joined = requests.outerjoin(responses, responses.c.request_id == requests.c.request_id)
+        common = [
+            func.coalesce(requests.c.priority, ""),
+            func.coalesce(cast(responses.c.response_code, String), ""),
+            literal(sign),
+            func.coalesce(elapsed, 0) * sign
+        ]
+
+        def branch(role, npi_column, name_column, *extra):
+            return (
+                select(
+                    func.date(requests.c.created_at).label("day"),
+                    npi_column.label("provider_npi"),
+                    literal(role).label("provider_role"),
+                    common[0].label("priority"),
+                    common[1].label("response_code"),
+                    # Names only move forward; a subtraction must not restore an old name
+                    (name_column if sign > 0 else null()).label("provider_name"),
+                    common[2].label("request_count"),
+                    common[3].label("processing_seconds")
+                )
+                .select_from(joined)
+                .where(*criteria, *extra)
+            )
+
+        rows = union_all(
+            branch(ROLE_REQUESTING, requests.c.requesting_provider_npi, requests.c.requesting_provider_name),
+            branch(
+                ROLE_SERVICING, requests.c.servicing_provider_npi, requests.c.servicing_provider_name,
+                requests.c.servicing_provider_npi.isnot(None),
+                requests.c.servicing_provider_npi != requests.c.requesting_provider_npi
+            )
+        ).subquery()
+
+        return (
+            select(
+                rows.c.day, rows.c.provider_npi, rows.c.provider_role, rows.c.priority, rows.c.response_code,
+                func.max(rows.c.provider_name), func.sum(rows.c.request_count), func.sum(rows.c.processing_seconds)
+            )
+            .where(rows.c.day.isnot(None))
+            .group_by(rows.c.day, rows.c.provider_npi, rows.c.provider_role, rows.c.priority, rows.c.response_code)
+        )
+
+    def _upsert(self, connection, contributions):
+        table = AuthorizationDailyRollup.__table__
+        dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).from_select(
+            ["day", "provider_npi", "provider_role", "priority", "response_code",
+             "provider_name", "request_count", "processing_seconds"],
+            contributions
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "provider_npi", "provider_role", "priority", "response_code"],
+            set_={
+                "request_count": table.c.request_count + stmt.excluded.request_count,
+                "processing_seconds": table.c.processing_seconds + stmt.excluded.processing_seconds,
+                "provider_name": func.coalesce(stmt.excluded.provider_name, table.c.provider_name)
+            }
+        )
+        connection.execute(stmt)
+
+    def apply(self, connection, request_ids: Iterable[str], sign: int):
+        """Add (sign=1) or remove (sign=-1) the current contributions of the given requests"""
+        request_ids = [request_id for request_id in request_ids if request_id]
+        if not request_ids:
+            return
+        contributions = self._contributions(
+            connection.dialect.name, sign,
+            PriorAuthorizationRequest.__table__.c.request_id.in_(request_ids)
+        )
+        self._upsert(connection, contributions)
+
+    def backfill(self, db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+        """Rebuild the rollups for a day range (all days when unbounded) from the source tables"""
+        connection = db.connection()
+        requests = PriorAuthorizationRequest.__table__
+        rollups = AuthorizationDailyRollup.__table__
+
+        if connection.dialect.name == "postgresql":
+            # Keep writers out until the rebuilt rows are visible to their own upserts
+            connection.execute(text(
+                "LOCK TABLE prior_authorization_requests, prior_authorization_responses IN SHARE MODE"
+            ))
+
+        day = func.date(requests.c.created_at)
+        source_criteria = []
+        rollup_criteria = []
+        if date_from:
+            source_criteria.append(day >= date_from)
+            rollup_criteria.append(rollups.c.day >= date_from)
+        if date_to:
+            source_criteria.append(day <= date_to)
+            rollup_criteria.append(rollups.c.day <= date_to)
+
+        connection.execute(rollups.delete().where(*rollup_criteria))
+        self._upsert(connection, self._contributions(connection.dialect.name, 1, *source_criteria))
+        db.commit()
+
+        return db.query(func.count()).select_from(rollups).filter(*rollup_criteria).scalar()
+
+    def summarize(
+        self,
+        db: Session,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        provider_npis: Optional[List[str]] = None,
+        provider_role: Optional[str] = ROLE_REQUESTING
+    ):
+        """Rollup totals per (provider, priority, response code) for a day range in one query"""
+        rollup = AuthorizationDailyRollup
+        query = db.query(
+            rollup.provider_npi,
+            rollup.priority,
+            rollup.response_code,
+            func.max(rollup.provider_name).label("provider_name"),
+            func.sum(rollup.request_count).label("request_count"),
+            func.sum(rollup.processing_seconds).label("processing_seconds")
+        )
+
+        if date_from:
+            query = query.filter(rollup.day >= date_from)
+        if date_to:
+            query = query.filter(rollup.day <= date_to)
+        if provider_npis is not None:
+            query = query.filter(rollup.provider_npi.in_(provider_npis))
+        if provider_role:
+            query = query.filter(rollup.provider_role == provider_role)
+
+        return query.group_by(rollup.provider_npi, rollup.priority, rollup.response_code).all()
+
+
+@event.listens_for(Session, "before_flush")
+def _subtract_rollups(session, flush_context, instances):
+    affected = affected_request_ids(session, REQUEST_ROLLUP_COLUMNS, RESPONSE_ROLLUP_COLUMNS)
+    if affected:
+        rollup_dao.apply(session.connection(), affected, -1)
+        session.info[_PENDING_REQUEST_IDS] = affected
+
+
+@event.listens_for(Session, "after_flush")
+def _add_rollups(session, flush_context):
+    affected = session.info.pop(_PENDING_REQUEST_IDS, None)
+    if affected:
+        rollup_dao.apply(session.connection(), affected, 1)
+
+
+# Global instance
+rollup_dao = AuthorizationRollupDAO()
@@ -0,0 +1,232 @@
+# File: app/dao/work_queue_dao.py
+from typing import Optional, List, Iterable, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select, update, event
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.config import settings
+from app.models.models import (
+    PriorAuthorizationRequest,
+    PriorAuthorizationResponse,
+    AuthorizationWorkItem,
+    ResponseCodeEnum
+)
+from app.dao.flush_tracking import affected_request_ids
+from datetime import date, datetime, time, timedelta, timezone
+
+KIND_FOLLOW_UP = "follow_up"
+KIND_EXPIRATION = "expiration"
+KIND_URGENT_REVIEW = "urgent_review"
+
+OPEN_REQUEST_STATUSES = ("submitted", "under_review")
+APPROVED_RESPONSE_CODES = (ResponseCodeEnum.APPROVED, ResponseCodeEnum.MODIFIED)
+
+# Columns that decide which work items a request (and its response) has
+REQUEST_WORK_COLUMNS = ("request_id", "created_at", "priority", "status")
+RESPONSE_WORK_COLUMNS = ("request_id", "response_code", "expiration_date", "follow_up_required", "follow_up_date")
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _start_of(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+class AuthorizationWorkQueueDAO:
+    """
+    Time-bucketed queue of due work (follow-ups, expiring approvals, overdue
+    urgent requests) in authorization_work_items.
+
+    schedule() recomputes the pending items of a set of requests from their
+    current rows; the session hooks below call it on every flush that touches
+    the relevant columns, and bulk writers call it directly. Workers claim due
+    items with FOR UPDATE SKIP LOCKED, so concurrent pollers never share an item.
+    """
+
+    def __init__(
+        self,
+        expiration_notice_days: int = settings.EXPIRATION_NOTICE_DAYS,
+        urgent_review_hours: int = settings.URGENT_REVIEW_HOURS
+    ):
+        self.expiration_notice_days = expiration_notice_days
+        self.urgent_review_hours = urgent_review_hours
+
+    def _due_items(self, row) -> List[Dict[str, Any]]:
+        """Work items implied by one request/response row"""
+        items = []
+        if row.follow_up_required and row.follow_up_date:
+            items.append((KIND_FOLLOW_UP, _start_of(row.follow_up_date)))
+        if row.response_code in APPROVED_RESPONSE_CODES and row.expiration_date and row.expiration_date >= date.today():
+            items.append((KIND_EXPIRATION, _start_of(row.expiration_date - timedelta(days=self.expiration_notice_days))))
+        if row.priority == "urgent" and row.status in OPEN_REQUEST_STATUSES and row.created_at:
+            items.append((KIND_URGENT_REVIEW, _utc_naive(row.created_at) + timedelta(hours=self.urgent_review_hours)))
+        return [
+            {"request_id": row.request_id, "kind": kind, "due_day": due_at.date(), "due_at": due_at, "status": "pending", "attempts": 0}
+            for kind, due_at in items
+        ]
+
+    def schedule(self, connection, request_ids: Iterable[str]) -> int:
+        """Replace the pending work items of the given requests; returns the number written"""
+        request_ids = [request_id for request_id in set(request_ids) if request_id]
+        if not request_ids:
+            return 0
+
+        requests = PriorAuthorizationRequest.__table__
+        responses = PriorAuthorizationResponse.__table__
+        rows = connection.execute(
+            select(
+                requests.c.request_id, requests.c.created_at, requests.c.priority, requests.c.status,
+                responses.c.response_code, responses.c.expiration_date,
+                responses.c.follow_up_required, responses.c.follow_up_date
+            )
+            .select_from(requests.outerjoin(responses, responses.c.request_id == requests.c.request_id))
+            .where(requests.c.request_id.in_(request_ids))
+        )
+        items = [item for row in rows for item in self._due_items(row)]
+
+        work_items = AuthorizationWorkItem.__table__
+        connection.execute(
+            delete(work_items).where(work_items.c.request_id.in_(request_ids), work_items.c.status == "pending")
+        )
+        if items:
+            # A claimed or finished item for the same due time is not scheduled again
+            dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+            connection.execute(
+                dialect_insert(work_items).on_conflict_do_nothing(index_elements=["request_id", "kind", "due_at"]),
+                items
+            )
+        return len(items)
+
+    def backfill(self, db: Session, chunk_size: int = 1000) -> int:
+        """Schedule work for every existing request, in keyset chunks"""
+        connection = db.connection()
+        requests = PriorAuthorizationRequest.__table__
+        written = 0
+        last_id = 0
+        while True:
+            chunk = connection.execute(
+                select(requests.c.id, requests.c.request_id)
+                .where(requests.c.id > last_id)
+                .order_by(requests.c.id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+            written += self.schedule(connection, [row.request_id for row in chunk])
+            last_id = chunk[-1].id
+        db.commit()
+        return written
+
+    def claim(
+        self,
+        db: Session,
+        worker_id: str,
+        limit: int = settings.WORK_QUEUE_BATCH_SIZE,
+        kinds: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ):
+        """
+        Claim up to limit due items for worker_id and commit. Rows locked by
+        another worker's claim are skipped rather than waited on.
+        """
+        now = now or datetime.utcnow()
+        item = AuthorizationWorkItem
+        candidates = (
+            select(item.id)
+            .where(
+                item.status == "pending", item.due_day <= now.date(), item.due_at <= now,
+                or_(item.retry_at.is_(None), item.retry_at <= now)
+            )
+            .order_by(item.due_day, item.due_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if kinds:
+            candidates = candidates.where(item.kind.in_(kinds))
+
+        while True:
+            item_ids = list(db.scalars(candidates))
+            if not item_ids:
+                db.commit()
+                return []
+
+            # status = 'pending' again, for databases that ignore FOR UPDATE (SQLite)
+            claimed = db.execute(
+                update(item)
+                .where(item.id.in_(item_ids), item.status == "pending")
+                .values(status="claimed", claimed_by=worker_id, claimed_at=now, attempts=item.attempts + 1)
+                .returning(item.id, item.request_id, item.kind, item.due_at, item.attempts)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+            # Empty only when another worker took every candidate first; look again
+            if claimed:
+                return claimed
+
+    def complete(self, db: Session, item_ids: List[int]):
+        """Mark claimed items done (the caller commits)"""
+        if item_ids:
+            db.execute(
+                update(AuthorizationWorkItem)
+                .where(AuthorizationWorkItem.id.in_(item_ids))
+                .values(status="done", completed_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+
+    def fail(
+        self,
+        db: Session,
+        item_id: int,
+        error: str,
+        attempts: int,
+        retry_in: timedelta = timedelta(minutes=5),
+        max_attempts: int = settings.WORK_QUEUE_MAX_ATTEMPTS
+    ):
+        """Return a claimed item to the queue after retry_in, or park it as failed (the caller commits)"""
+        values: Dict[str, Any] = {"last_error": error[:2000], "claimed_by": None, "claimed_at": None}
+        if attempts >= max_attempts:
+            values["status"] = "failed"
+        else:
+            values.update(status="pending", retry_at=datetime.utcnow() + retry_in)
+        db.execute(
+            update(AuthorizationWorkItem)
+            .where(AuthorizationWorkItem.id == item_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def release_expired(self, db: Session, lease_seconds: int = settings.WORK_QUEUE_LEASE_SECONDS) -> int:
+        """Requeue items whose worker did not finish within the lease"""
+        cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+        result = db.execute(
+            update(AuthorizationWorkItem)
+            .where(AuthorizationWorkItem.status == "claimed", AuthorizationWorkItem.claimed_at < cutoff)
+            .values(status="pending", claimed_by=None, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def due_counts(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Pending items due now, per kind"""
+        now = now or datetime.utcnow()
+        item = AuthorizationWorkItem
+        rows = db.query(item.kind, func.count(item.id)).filter(
+            item.status == "pending", item.due_day <= now.date(), item.due_at <= now
+        ).group_by(item.kind).all()
+        return dict(rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _schedule_work(session, flush_context):
+    # Deleted requests are rescheduled too, which clears their pending items
+    affected = affected_request_ids(session, REQUEST_WORK_COLUMNS, RESPONSE_WORK_COLUMNS)
+    if affected:
+        work_queue_dao.schedule(session.connection(), affected)
+
+
+# Global instance
+work_queue_dao = AuthorizationWorkQueueDAO()
@@ -33,6 +33,13 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.on_event("shutdown")
+def close_patient_client():
+    """Close the pooled Patient service client and its background event loop"""
+    from app.services.patient_client import patient_client
+    patient_client.close()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint"""
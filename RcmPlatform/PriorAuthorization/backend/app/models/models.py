@@ -1,7 +1,8 @@
 # File: app/models/models.py - Database Models for EDI 278/275
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, DateTime, 
-    Date, DECIMAL, ForeignKey, JSON, Enum as SQLEnum
+    Date, DECIMAL, Float, ForeignKey, JSON, Index, PrimaryKeyConstraint, Sequence, UniqueConstraint,
+    Enum as SQLEnum, text
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +11,11 @@ import enum
 from app.core.database import Base
 
 
+def _partial(where: str):
+    """Index kwargs for a partial index on PostgreSQL and SQLite"""
+    return {"postgresql_where": text(where), "sqlite_where": text(where)}
+
+
 class TimestampMixin:
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -41,6 +47,11 @@ class ResponseCodeEnum(enum.Enum):
     CANCELLED = "A6"  # Cancelled
 
 
+
+def _enum_values(enum_class):
+    """Persist EDI codes ('A1'), matching the enum types in database/init.sql"""
+    return [member.value for member in enum_class]
+
 class PriorAuthorizationRequest(Base, TimestampMixin):
     """Model for EDI 278 Prior Authorization Requests"""
     __tablename__ = "prior_authorization_requests"
@@ -49,7 +60,7 @@ class PriorAuthorizationRequest(Base, TimestampMixin):
     request_id = Column(String(50), unique=True, nullable=False, index=True)
     
     # Patient Information
-    patient_id = Column(String(100), nullable=False, index=True)
+    patient_id = Column(String(100), ForeignKey("patient_information.patient_id"), nullable=False, index=True)
     patient_first_name = Column(String(100), nullable=False)
     patient_last_name = Column(String(100), nullable=False)
     patient_dob = Column(Date, nullable=False)
@@ -63,8 +74,8 @@ class PriorAuthorizationRequest(Base, TimestampMixin):
     servicing_provider_name = Column(String(255))
     
     # Authorization Details
-    request_type = Column(SQLEnum(RequestTypeEnum), nullable=False)
-    certification_type = Column(SQLEnum(CertificationTypeEnum), nullable=False)
+    request_type = Column(SQLEnum(RequestTypeEnum, name="request_type_enum", values_callable=_enum_values), nullable=False)
+    certification_type = Column(SQLEnum(CertificationTypeEnum, name="certification_type_enum", values_callable=_enum_values), nullable=False)
     service_type_code = Column(String(10))  # Healthcare service type
     
     # Service Information
@@ -97,6 +108,19 @@ class PriorAuthorizationRequest(Base, TimestampMixin):
     response = relationship("PriorAuthorizationResponse", back_populates="request", uselist=False)
     patient_info = relationship("PatientInformation", back_populates="authorization_requests")
 
+    # One composite per search filter, each ending in the (created_at, id) keyset order;
+    # trigram and phonetic name indexes are PostgreSQL-only, see database/migration_search_indexes.sql
+    __table_args__ = (
+        Index("idx_prior_auth_req_created_id", "created_at", "id"),
+        Index("idx_prior_auth_req_status_created", "status", "created_at", "id"),
+        Index("idx_prior_auth_req_member_created", "member_id", "created_at", "id"),
+        Index("idx_prior_auth_req_requesting_npi_created", "requesting_provider_npi", "created_at", "id"),
+        Index("idx_prior_auth_req_servicing_npi_created", "servicing_provider_npi", "created_at", "id"),
+        # Open urgent requests only; see get_urgent_requests
+        Index("idx_prior_auth_req_urgent_open", "created_at",
+              **_partial("priority = 'urgent' AND status IN ('submitted', 'under_review')")),
+    )
+
 
 class PriorAuthorizationResponse(Base, TimestampMixin):
     """Model for EDI 278 Prior Authorization Responses"""
@@ -106,7 +130,7 @@ class PriorAuthorizationResponse(Base, TimestampMixin):
     request_id = Column(String(50), ForeignKey("prior_authorization_requests.request_id"), nullable=False)
     
     # Response Details
-    response_code = Column(SQLEnum(ResponseCodeEnum), nullable=False)
+    response_code = Column(SQLEnum(ResponseCodeEnum, name="response_code_enum", values_callable=_enum_values), nullable=False)
     authorization_number = Column(String(50), index=True)
     effective_date = Column(Date)
     expiration_date = Column(Date)
@@ -137,6 +161,12 @@ class PriorAuthorizationResponse(Base, TimestampMixin):
     # Relationships
     request = relationship("PriorAuthorizationRequest", back_populates="response")
 
+    # Partial indexes over the open follow-ups and live approvals only
+    __table_args__ = (
+        Index("idx_prior_auth_resp_follow_up_open", "follow_up_date", **_partial("follow_up_required = true")),
+        Index("idx_prior_auth_resp_expiring", "expiration_date", **_partial("response_code IN ('A1', 'A2')")),
+    )
+
 
 class PatientInformation(Base, TimestampMixin):
     """Model for EDI 275 Patient Information"""
@@ -241,282 +271,73 @@ class AuthorizationAudit(Base, TimestampMixin):
     notes = Column(Text)
     previous_status = Column(String(20))
     new_status = Column(String(20))
-    action_metadata = Column(JSON)  # Additional action metadata
-
-# File: app/schemas/prior_authorization.py - Pydantic Schemas
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, field_validator
-from datetime import datetime, date
-from enum import Enum
-
-
-class RequestType(str, Enum):
-    INITIAL = "00"
-    RECONSIDERATION = "01"
-    APPEAL = "02"
-    CANCELLATION = "03"
-    MODIFICATION = "04"
-
-
-class CertificationType(str, Enum):
-    INITIAL = "I"
-    RENEWAL = "R"
-    REVISION = "S"
-    CANCELLATION = "C"
-
-
-class ResponseCode(str, Enum):
-    APPROVED = "A1"
-    MODIFIED = "A2"
-    DENIED = "A3"
-    PENDED = "A4"
-    CANCELLED = "A6"
-
-
-class Gender(str, Enum):
-    MALE = "M"
-    FEMALE = "F"
-    UNKNOWN = "U"
-
-
-class Priority(str, Enum):
-    NORMAL = "normal"
-    URGENT = "urgent"
-    EMERGENCY = "emergency"
-
-
-class ProcedureCodeInfo(BaseModel):
-    code: str
-    description: Optional[str] = None
-    modifier: Optional[str] = None
-    units: Optional[int] = 1
-
-
-class DiagnosisCodeInfo(BaseModel):
-    code: str
-    description: Optional[str] = None
-    is_primary: bool = False
-
-
-class PriorAuthorizationRequestBase(BaseModel):
-    # Patient Information
-    patient_first_name: str
-    patient_last_name: str
-    patient_dob: date
-    patient_gender: Gender
-    member_id: str
-    
-    # Provider Information
-    requesting_provider_npi: str
-    requesting_provider_name: Optional[str] = None
-    servicing_provider_npi: Optional[str] = None
-    servicing_provider_name: Optional[str] = None
-    
-    # Authorization Details
-    request_type: RequestType = RequestType.INITIAL
-    certification_type: CertificationType = CertificationType.INITIAL
-    service_type_code: Optional[str] = None
-    
-    # Service Information
-    procedure_codes: List[ProcedureCodeInfo]
-    diagnosis_codes: List[DiagnosisCodeInfo]
-    service_date_from: date
-    service_date_to: Optional[date] = None
-    units_requested: Optional[int] = 1
-    
-    # Clinical Information
-    clinical_information: Optional[str] = None
-    medical_necessity: str
-    
-    # Priority
-    priority: Priority = Priority.NORMAL
-    
-    @field_validator('requesting_provider_npi')
-    @classmethod
-    def validate_npi(cls, v):
-        if not v.isdigit() or len(v) != 10:
-            raise ValueError('NPI must be exactly 10 digits')
-        return v
-
-
-class PriorAuthorizationRequestCreate(PriorAuthorizationRequestBase):
-    pass
-
-
-class PriorAuthorizationRequest(PriorAuthorizationRequestBase):
-    id: int
-    request_id: str
-    patient_id: str
-    status: str
-    edi_278_content: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-    model_config = {"from_attributes": True}
-
-
-class AuthorizationDecision(BaseModel):
-    response_code: ResponseCode
-    authorization_number: Optional[str] = None
-    effective_date: Optional[date] = None
-    expiration_date: Optional[date] = None
-    units_approved: Optional[int] = None
-    decision_reason: Optional[str] = None
-    additional_information_required: Optional[str] = None
-
-
-class PriorAuthorizationResponse(BaseModel):
-    id: int
-    request_id: str
-    response_code: ResponseCode
-    authorization_number: Optional[str] = None
-    effective_date: Optional[date] = None
-    expiration_date: Optional[date] = None
-    approved_services: Optional[Dict[str, Any]] = None
-    units_approved: Optional[int] = None
-    decision_reason: Optional[str] = None
-    edi_278_response_content: str
-    processing_time_ms: Optional[int] = None
-    created_at: datetime
-
-    model_config = {"from_attributes": True}
-
-
-class PriorAuthorizationInquiryResponse(BaseModel):
-    request_id: str
-    edi_278: str
-    status: str
-    message: str
-
-
-class PriorAuthorizationDecisionResponse(BaseModel):
-    request_id: str
-    edi_278_response: str
-    response_code: ResponseCode
-    authorization_number: Optional[str] = None
-    decision_details: Optional[Dict[str, Any]] = None
-    processed_at: datetime
-
-# File: app/schemas/patient_information.py - EDI 275 Schemas
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, field_validator, EmailStr
-from datetime import datetime, date
-
-
-class InsuranceInfo(BaseModel):
-    carrier_name: str
-    policy_number: str
-    group_number: Optional[str] = None
-    effective_date: Optional[date] = None
-    copay_amount: Optional[float] = None
-    deductible_amount: Optional[float] = None
-
-
-class EmergencyContact(BaseModel):
-    name: str
-    phone: str
-    relationship: str
-
-
-class AllergyInfo(BaseModel):
-    allergen: str
-    reaction: Optional[str] = None
-    severity: Optional[str] = None
-
-
-class MedicalCondition(BaseModel):
-    condition: str
-    icd_code: Optional[str] = None
-    date_diagnosed: Optional[date] = None
-    status: Optional[str] = None  # active, inactive, resolved
-
+    action_metadata = Column("metadata", JSON)  # Additional action metadata ("metadata" is reserved on declarative models)
+
+
+class AuthorizationDailyRollup(Base):
+    """
+    Per-day request counts and processing-time sums, maintained as requests and
+    responses are written (see app/dao/rollup_dao.py). Each request is counted
+    once under its requesting provider and, when different, once under its
+    servicing provider; statistics filter on provider_role to avoid double counting.
+    """
+    __tablename__ = "authorization_daily_rollups"
+
+    day = Column(Date, nullable=False)
+    provider_npi = Column(String(20), nullable=False)
+    provider_role = Column(String(10), nullable=False)  # requesting, servicing
+    priority = Column(String(10), nullable=False)  # '' when the request has none
+    response_code = Column(String(20), nullable=False)  # '' until a response exists
+    provider_name = Column(String(255))
+    request_count = Column(Integer, nullable=False, default=0)
+    processing_seconds = Column(Float, nullable=False, default=0)  # Response minus request time, summed
+
+    __table_args__ = (
+        PrimaryKeyConstraint("day", "provider_npi", "provider_role", "priority", "response_code"),
+        Index("idx_auth_rollups_provider_day", "provider_npi", "day"),
+    )
+
+
+class AuthorizationWorkItem(Base, TimestampMixin):
+    """
+    Due follow-up, expiration and urgent-review work for a request. Items are
+    written together with the request or response they come from (see
+    app/dao/work_queue_dao.py) and claimed in batches by scheduler workers.
+    """
+    __tablename__ = "authorization_work_items"
+
+    id = Column(Integer, primary_key=True)
+    request_id = Column(
+        String(50), ForeignKey("prior_authorization_requests.request_id", ondelete="CASCADE"), nullable=False
+    )
+    kind = Column(String(20), nullable=False)  # follow_up, expiration, urgent_review
+    due_day = Column(Date, nullable=False)  # Day bucket of due_at
+    due_at = Column(DateTime, nullable=False)  # UTC
+    status = Column(String(10), nullable=False, default="pending")  # pending, claimed, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    retry_at = Column(DateTime)  # Set after a failed attempt; not claimable before then
+    claimed_by = Column(String(100))
+    claimed_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    last_error = Column(Text)
+
+    __table_args__ = (
+        UniqueConstraint("request_id", "kind", "due_at", name="uq_auth_work_items_request_kind_due"),
+        Index("idx_auth_work_items_pending_due", "due_day", "due_at", **_partial("status = 'pending'")),
+        Index("idx_auth_work_items_claimed", "claimed_at", **_partial("status = 'claimed'")),
+        Index("idx_auth_work_items_request", "request_id"),
+    )
+
+
+# ISA13 / GS06 / ST02 control numbers for outbound 278s; nine digits, so the sequence cycles
+edi_control_number_seq = Sequence(
+    "edi_control_number_seq", start=1, minvalue=1, maxvalue=999999999, cycle=True, metadata=Base.metadata
+)
 
-class Medication(BaseModel):
-    name: str
-    dosage: Optional[str] = None
-    frequency: Optional[str] = None
-    prescribing_physician: Optional[str] = None
 
+class EDIControlCounter(Base):
+    """Control number counter for databases without sequences (SQLite in development)"""
+    __tablename__ = "edi_control_counters"
 
-class PatientInformationBase(BaseModel):
-    # Demographics
-    first_name: str
-    last_name: str
-    middle_name: Optional[str] = None
-    date_of_birth: date
-    gender: Gender
-    ssn: Optional[str] = None
-    
-    # Contact Information
-    address_line1: Optional[str] = None
-    address_line2: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    zip_code: Optional[str] = None
-    phone_home: Optional[str] = None
-    phone_work: Optional[str] = None
-    phone_mobile: Optional[str] = None
-    email: Optional[EmailStr] = None
-    
-    # Insurance Information
-    primary_insurance: Optional[InsuranceInfo] = None
-    secondary_insurance: Optional[InsuranceInfo] = None
-    member_id_primary: Optional[str] = None
-    member_id_secondary: Optional[str] = None
-    
-    # Emergency Contact
-    emergency_contact: Optional[EmergencyContact] = None
-    
-    # Medical Information
-    primary_care_provider: Optional[str] = None
-    allergies: Optional[List[AllergyInfo]] = None
-    medical_conditions: Optional[List[MedicalCondition]] = None
-    medications: Optional[List[Medication]] = None
-    
-    # Consent
-    hipaa_authorization: bool = False
-    consent_date: Optional[datetime] = None
-
-
-class PatientInformationCreate(PatientInformationBase):
-    pass
-
-
-class PatientInformationUpdate(BaseModel):
-    # All fields optional for updates
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    middle_name: Optional[str] = None
-    address_line1: Optional[str] = None
-    address_line2: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    zip_code: Optional[str] = None
-    phone_home: Optional[str] = None
-    phone_work: Optional[str] = None
-    phone_mobile: Optional[str] = None
-    email: Optional[EmailStr] = None
-    primary_insurance: Optional[InsuranceInfo] = None
-    secondary_insurance: Optional[InsuranceInfo] = None
-    emergency_contact: Optional[EmergencyContact] = None
-    allergies: Optional[List[AllergyInfo]] = None
-    medical_conditions: Optional[List[MedicalCondition]] = None
-    medications: Optional[List[Medication]] = None
-
-
-class PatientInformation(PatientInformationBase):
-    id: int
-    patient_id: str
-    edi_275_content: Optional[str] = None
-    last_edi_update: Optional[datetime] = None
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-    model_config = {"from_attributes": True}
-
-
-class PatientEDI275Response(BaseModel):
-    patient_id: str
-    edi_275: str
-    message: str
-    generated_at: datetime
+    name = Column(String(50), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
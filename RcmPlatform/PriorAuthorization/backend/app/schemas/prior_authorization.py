@@ -181,3 +181,4 @@ class AuthorizationSearchRequest(BaseModel):
     created_from: Optional[datetime] = Field(None, description="Created from date")
     created_to: Optional[datetime] = Field(None, description="Created to date")
     priority: Optional[Priority] = Field(None, description="Priority")
+    phonetic: bool = Field(False, description="Match patient names that sound alike (PostgreSQL only)")
@@ -11,22 +11,26 @@ class AuthorizationStatistics(BaseModel):
     denied_requests: int = Field(..., description="Number of denied requests")
     pending_requests: int = Field(..., description="Number of pending requests")
     approval_rate: float = Field(..., description="Approval rate percentage")
-    average_processing_time: float = Field(..., description="Average processing time in hours")
-    requests_by_status: Dict[str, int] = Field(..., description="Requests grouped by status")
-    requests_by_month: Dict[str, int] = Field(..., description="Requests grouped by month")
+    average_processing_time_hours: float = Field(..., description="Average processing time in hours")
+    by_priority: Dict[str, int] = Field(..., description="Requests grouped by priority")
+    by_status: Dict[str, int] = Field(..., description="Requests grouped by status")
+    by_provider: List[Dict[str, Any]] = Field(..., description="Top requesting providers")
+    period_start: date = Field(..., description="First day of the period")
+    period_end: date = Field(..., description="Last day of the period")
+    generated_at: datetime = Field(..., description="Generation timestamp")
 
 
 class ProviderStatistics(BaseModel):
     """Provider-specific statistics"""
     provider_npi: str = Field(..., description="Provider NPI")
-    provider_name: str = Field(..., description="Provider name")
+    provider_name: Optional[str] = Field(None, description="Provider name")
     total_requests: int = Field(..., description="Total requests from this provider")
     approved_requests: int = Field(..., description="Approved requests from this provider")
     denied_requests: int = Field(..., description="Denied requests from this provider")
     approval_rate: float = Field(..., description="Provider approval rate")
-    average_processing_time: float = Field(..., description="Average processing time for this provider")
-    top_procedures: List[Dict[str, Any]] = Field(..., description="Most common procedures")
-    top_diagnoses: List[Dict[str, Any]] = Field(..., description="Most common diagnoses")
+    average_processing_time_hours: float = Field(..., description="Average processing time for this provider")
+    common_procedures: List[Dict[str, Any]] = Field(..., description="Most common procedures")
+    common_diagnoses: List[Dict[str, Any]] = Field(..., description="Most common diagnoses")
 
 
 class PatientStatistics(BaseModel):
@@ -1,7 +1,9 @@
 # Services for Prior Authorization System
 from .edi_275_service import EDI275Service
 from .edi_278_service import EDI278Service
+from .edi_278_batch_service import EDI278BatchService, edi_278_batch_service
 from .authorization_service import AuthorizationService
+from .authorization_scheduler import AuthorizationScheduler, authorization_scheduler
 from .reporting_service import EnhancedReportingService
 from .patient_service import patient_service
 from .prior_auth_service import prior_auth_service
@@ -11,7 +13,11 @@ from .agentic_integration import create_agentic_prior_authorization
 __all__ = [
     "EDI275Service",
     "EDI278Service", 
+    "EDI278BatchService",
+    "edi_278_batch_service",
     "AuthorizationService",
+    "AuthorizationScheduler",
+    "authorization_scheduler",
     "EnhancedReportingService",
     "patient_service",
     "prior_auth_service",
@@ -0,0 +1,141 @@
+# File: app/services/authorization_scheduler.py - Follow-up and expiration scheduler
+import os
+import socket
+import logging
+import threading
+from typing import Dict, Any, Callable, Optional
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.dao.work_queue_dao import work_queue_dao, KIND_FOLLOW_UP, KIND_EXPIRATION, KIND_URGENT_REVIEW, OPEN_REQUEST_STATUSES
+from app.models.models import PriorAuthorizationRequest, AuthorizationAudit
+
+logger = logging.getLogger(__name__)
+
+# handler(db, request, item) -> None; raising puts the item back for a retry
+WorkHandler = Callable[[Session, Optional[PriorAuthorizationRequest], Any], None]
+
+
+class AuthorizationScheduler:
+    """
+    Polls authorization_work_items for due follow-ups, expiring approvals and
+    overdue urgent requests. Each poll claims one batch (SKIP LOCKED, so any
+    number of workers can run), dispatches the items to per-kind handlers and
+    marks them done in one commit.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: int = settings.WORK_QUEUE_BATCH_SIZE,
+        lease_seconds: int = settings.WORK_QUEUE_LEASE_SECONDS
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, WorkHandler] = {
+            KIND_FOLLOW_UP: self._follow_up_due,
+            KIND_EXPIRATION: self._authorization_expiring,
+            KIND_URGENT_REVIEW: self._urgent_review_overdue
+        }
+
+    def register_handler(self, kind: str, handler: WorkHandler):
+        """Replace the handler for a kind of work item"""
+        self.handlers[kind] = handler
+
+    def run_once(self, db: Session) -> Dict[str, int]:
+        """Claim and process one batch; returns counts of done and failed items"""
+        work_queue_dao.release_expired(db, self.lease_seconds)
+        items = work_queue_dao.claim(db, self.worker_id, self.batch_size, kinds=list(self.handlers))
+        if not items:
+            return {"claimed": 0, "done": 0, "failed": 0}
+
+        requests = {
+            request.request_id: request
+            for request in db.query(PriorAuthorizationRequest).filter(
+                PriorAuthorizationRequest.request_id.in_({item.request_id for item in items})
+            )
+        }
+
+        done, failed = [], 0
+        for item in items:
+            savepoint = db.begin_nested()
+            try:
+                self.handlers[item.kind](db, requests.get(item.request_id), item)
+                savepoint.commit()
+                done.append(item.id)
+            except Exception as e:
+                savepoint.rollback()
+                logger.error(f"Work item {item.id} ({item.kind}, {item.request_id}) failed: {str(e)}")
+                work_queue_dao.fail(db, item.id, str(e), item.attempts)
+                failed += 1
+
+        work_queue_dao.complete(db, done)
+        db.commit()
+        return {"claimed": len(items), "done": len(done), "failed": failed}
+
+    def run_forever(
+        self,
+        session_factory: Callable[[], Session],
+        poll_seconds: float = settings.WORK_QUEUE_POLL_SECONDS,
+        stop_event: Optional[threading.Event] = None
+    ):
+        """Poll until stop_event is set; a full batch is followed at once by the next poll"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            db = session_factory()
+            try:
+                result = self.run_once(db)
+            except Exception as e:
+                logger.error(f"Scheduler poll failed: {str(e)}")
+                db.rollback()
+                result = {"claimed": 0}
+            finally:
+                db.close()
+            if result["claimed"] < self.batch_size:
+                stop_event.wait(poll_seconds)
+
+    @staticmethod
+    def _audit(db: Session, request_id: str, action: str, notes: str, metadata: Dict[str, Any]):
+        db.add(AuthorizationAudit(
+            request_id=request_id,
+            action=action,
+            actor="scheduler",
+            notes=notes,
+            action_metadata=metadata
+        ))
+
+    def _follow_up_due(self, db: Session, request: Optional[PriorAuthorizationRequest], item):
+        if request is None or request.response is None:
+            return
+        follow_up_date = request.response.follow_up_date
+        self._audit(db, request.request_id, "follow_up_due", f"Follow-up due {follow_up_date}", {
+            "follow_up_date": str(follow_up_date),
+            "additional_information_required": request.response.additional_information_required
+        })
+
+    def _authorization_expiring(self, db: Session, request: Optional[PriorAuthorizationRequest], item):
+        if request is None or request.response is None or request.response.expiration_date is None:
+            return
+        response = request.response
+        self._audit(db, request.request_id, "authorization_expiring", f"Authorization expires {response.expiration_date}", {
+            "authorization_number": response.authorization_number,
+            "expiration_date": str(response.expiration_date),
+            "units_remaining": (response.units_approved or 0) - (response.units_used or 0)
+        })
+
+    def _urgent_review_overdue(self, db: Session, request: Optional[PriorAuthorizationRequest], item):
+        # The request may have been decided after the item was claimed
+        if request is None or request.status not in OPEN_REQUEST_STATUSES:
+            return
+        overdue = timedelta(hours=settings.URGENT_REVIEW_HOURS)
+        self._audit(db, request.request_id, "urgent_review_overdue", f"Urgent request open longer than {overdue}", {
+            "status": request.status,
+            "due_at": item.due_at.isoformat()
+        })
+
+
+# Create singleton instance
+authorization_scheduler = AuthorizationScheduler()
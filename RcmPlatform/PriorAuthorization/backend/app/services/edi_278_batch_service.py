@@ -0,0 +1,259 @@
+# File: app/services/edi_278_batch_service.py - Batch EDI 278 generation and response intake
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, IO, Iterator
+
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import delete, insert, select, update
+
+from app.core.config import settings
+from app.core.exceptions import EDIException
+from app.dao.control_number_dao import control_number_dao
+from app.dao.rollup_dao import rollup_dao
+from app.dao.work_queue_dao import work_queue_dao
+from app.models.models import PriorAuthorizationRequest, PriorAuthorizationResponse, ResponseCodeEnum
+from app.services.edi_278_service import EDI278Service, iter_segments
+
+logger = logging.getLogger(__name__)
+
+# Request status after an inbound 278 response with this UM/HCR action code
+RESPONSE_STATUS = {
+    "A1": "approved",
+    "A2": "approved",
+    "A3": "denied",
+    "A4": "pending",
+    "A6": "cancelled"
+}
+
+# Columns read when enveloping stored requests; the stored edi_278_content is never loaded
+_TRANSACTION_COLUMNS = (
+    "id", "request_id", "request_type", "certification_type", "service_type_code",
+    "requesting_provider_name", "requesting_provider_npi", "patient_first_name", "patient_last_name",
+    "member_id", "patient_dob", "patient_gender", "service_date_from", "service_date_to",
+    "diagnosis_codes", "procedure_codes", "clinical_information", "medical_necessity"
+)
+
+
+class EDI278BatchService:
+    """
+    Batch mode for EDI 278.
+
+    Outbound: many stored requests go into one ISA/GS envelope with control
+    numbers allocated from the database sequence. The file is streamed while
+    requests are read in keyset chunks. Inbound: a file of 278 responses is
+    parsed in one pass, and each chunk is applied with set-based statements.
+    """
+
+    def __init__(self, chunk_size: int = 1000):
+        self.edi_service = EDI278Service()
+        self.chunk_size = chunk_size
+
+    def _request_chunks(self, db: Session, request_ids: Optional[List[str]], status: Optional[str]) -> Iterator[List[PriorAuthorizationRequest]]:
+        last_id = 0
+        while True:
+            query = db.query(PriorAuthorizationRequest).options(
+                load_only(*[getattr(PriorAuthorizationRequest, column) for column in _TRANSACTION_COLUMNS])
+            ).filter(PriorAuthorizationRequest.id > last_id)
+            if request_ids is not None:
+                query = query.filter(PriorAuthorizationRequest.request_id.in_(request_ids))
+            if status:
+                query = query.filter(PriorAuthorizationRequest.status == status)
+            chunk = query.order_by(PriorAuthorizationRequest.id).limit(self.chunk_size).all()
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1].id
+
+    def generate_batch(
+        self,
+        db: Session,
+        output_path: str,
+        request_ids: Optional[List[str]] = None,
+        status: Optional[str] = "submitted"
+    ) -> Dict[str, Any]:
+        """
+        Write the selected requests as one 278 interchange to output_path and
+        record each request's control numbers. The file appears only once it is
+        complete; the control numbers are committed after that.
+        """
+        now = datetime.now()
+        current_date, current_time = now.strftime("%Y%m%d"), now.strftime("%H%M")
+        interchange_num, group_num = (control_number_dao.format(n) for n in control_number_dao.allocate(db, 2))
+
+        partial_path = f"{output_path}.partial"
+        assignments = []
+        transaction_count = 0
+
+        try:
+            with open(partial_path, "w", encoding="utf-8", buffering=1 << 20) as out:
+                out.write("\n".join(self.edi_service.interchange_header(interchange_num, group_num, current_date, current_time)))
+                for chunk in self._request_chunks(db, request_ids, status):
+                    numbers = control_number_dao.allocate(db, len(chunk))
+                    lines = []
+                    for request, number in zip(chunk, numbers):
+                        transaction_num = control_number_dao.format(number)
+                        lines.extend(self.edi_service.transaction_segments(
+                            self.edi_service.transaction_fields(request), transaction_num, current_date, current_time
+                        ))
+                        assignments.append({
+                            "id": request.id,
+                            "interchange_control_number": interchange_num,
+                            "group_control_number": group_num,
+                            "transaction_control_number": transaction_num
+                        })
+                    out.write("\n")
+                    out.write("\n".join(lines))
+                    transaction_count += len(chunk)
+                    # Nothing in the chunk is needed again; keep the identity map small
+                    for request in chunk:
+                        db.expunge(request)
+                out.write("\n")
+                out.write("\n".join(self.edi_service.interchange_trailer(transaction_count, interchange_num, group_num)))
+            os.replace(partial_path, output_path)
+        except Exception as e:
+            db.rollback()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            logger.error(f"Error generating EDI 278 batch: {str(e)}")
+            raise EDIException(f"Failed to generate EDI 278 batch: {str(e)}", "278")
+
+        for start in range(0, len(assignments), self.chunk_size):
+            db.execute(update(PriorAuthorizationRequest), assignments[start:start + self.chunk_size])
+        db.commit()
+
+        logger.info(f"EDI 278 batch {interchange_num} written with {transaction_count} transactions")
+        return {
+            "file_name": os.path.basename(output_path),
+            "interchange_control_number": interchange_num,
+            "group_control_number": group_num,
+            "transaction_count": transaction_count
+        }
+
+    def batch_path(self, file_name: str) -> str:
+        """Location of a batch file in EDI_BATCH_DIRECTORY"""
+        return os.path.join(settings.EDI_BATCH_DIRECTORY, os.path.basename(file_name))
+
+    def parse_responses(self, stream: IO) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one dict per ST/SE transaction of an inbound 278 response file.
+        Transactions that cannot be applied carry an "error".
+        """
+        transaction = None
+        for segment in iter_segments(stream):
+            elements = segment.split("*")
+            segment_id = elements[0]
+
+            if segment_id == "ST":
+                transaction = {"segments": [segment], "control_number": elements[2] if len(elements) > 2 else None,
+                               "request_id": None, "response_code": None, "authorization_number": None,
+                               "effective_date": None, "expiration_date": None, "units_approved": None,
+                               "decision_reason": None, "additional_information_required": None,
+                               "_after_pwk": False}
+                continue
+            if transaction is None:
+                continue  # ISA / GS / GE / IEA
+
+            transaction["segments"].append(segment)
+            if segment_id == "SE":
+                declared = elements[1] if len(elements) > 1 else ""
+                if not declared.isdigit() or int(declared) != len(transaction["segments"]):
+                    transaction["error"] = f"SE segment count {declared} does not match {len(transaction['segments'])}"
+                elif not transaction["request_id"]:
+                    transaction["error"] = "No TRN or BHT reference to a request"
+                elif transaction["response_code"] not in RESPONSE_STATUS:
+                    transaction["error"] = f"Unknown response code {transaction['response_code']}"
+                transaction.pop("_after_pwk")
+                yield transaction
+                transaction = None
+            elif segment_id == "BHT" and len(elements) > 3 and not transaction["request_id"]:
+                transaction["request_id"] = elements[3]
+            elif segment_id == "TRN" and len(elements) > 2:
+                transaction["request_id"] = elements[2]
+            elif segment_id in ("UM", "HCR") and len(elements) > 1 and elements[1] in RESPONSE_STATUS:
+                transaction["response_code"] = elements[1]
+                if segment_id == "HCR" and len(elements) > 2 and elements[2]:
+                    transaction["authorization_number"] = elements[2]
+            elif segment_id == "REF" and len(elements) > 2 and elements[1] == "BB":
+                transaction["authorization_number"] = elements[2]
+            elif segment_id == "DTP" and len(elements) > 3 and elements[1] in ("007", "036"):
+                value = datetime.strptime(elements[3][:8], "%Y%m%d").date()
+                transaction["effective_date" if elements[1] == "007" else "expiration_date"] = value
+            elif segment_id == "SV1" and len(elements) > 2 and elements[2].isdigit():
+                transaction["units_approved"] = int(elements[2])
+            elif segment_id == "PWK":
+                transaction["_after_pwk"] = True
+            elif segment_id == "MSG" and len(elements) > 1:
+                field = "additional_information_required" if transaction["_after_pwk"] else "decision_reason"
+                transaction[field] = "*".join(elements[1:])
+
+    def apply_responses(self, db: Session, stream: IO) -> Dict[str, Any]:
+        """
+        Record every response in an inbound 278 file and move its request to the
+        matching status. Each chunk costs one lookup, one delete of superseded
+        responses, one multi-row insert and one UPDATE per resulting status,
+        plus the rollup and work-queue maintenance the session hooks would do.
+        """
+        summary = {"transactions": 0, "applied": 0, "unmatched": [], "errors": [], "by_status": {}}
+        chunk = []
+        for transaction in self.parse_responses(stream):
+            summary["transactions"] += 1
+            if "error" in transaction:
+                summary["errors"].append({"control_number": transaction["control_number"], "error": transaction["error"]})
+                continue
+            chunk.append(transaction)
+            if len(chunk) >= self.chunk_size:
+                self._apply_chunk(db, chunk, summary)
+                chunk = []
+        if chunk:
+            self._apply_chunk(db, chunk, summary)
+        return summary
+
+    def _apply_chunk(self, db: Session, transactions: List[Dict[str, Any]], summary: Dict[str, Any]):
+        # The last response in the file wins for a request that appears twice
+        latest = {transaction["request_id"]: transaction for transaction in transactions}
+        known = set(db.scalars(
+            select(PriorAuthorizationRequest.request_id).where(PriorAuthorizationRequest.request_id.in_(latest))
+        ))
+        summary["unmatched"].extend(request_id for request_id in latest if request_id not in known)
+        if not known:
+            return
+
+        connection = db.connection()
+        rollup_dao.apply(connection, known, -1)
+        db.execute(delete(PriorAuthorizationResponse).where(PriorAuthorizationResponse.request_id.in_(known)))
+        db.execute(insert(PriorAuthorizationResponse), [
+            {
+                "request_id": request_id,
+                "response_code": ResponseCodeEnum(transaction["response_code"]),
+                "authorization_number": transaction["authorization_number"],
+                "effective_date": transaction["effective_date"],
+                "expiration_date": transaction["expiration_date"],
+                "units_approved": transaction["units_approved"],
+                "decision_reason": transaction["decision_reason"],
+                "additional_information_required": transaction["additional_information_required"],
+                "edi_278_response_content": "~\n".join(transaction["segments"]) + "~"
+            }
+            for request_id, transaction in latest.items() if request_id in known
+        ])
+
+        by_status: Dict[str, List[str]] = {}
+        for request_id in known:
+            by_status.setdefault(RESPONSE_STATUS[latest[request_id]["response_code"]], []).append(request_id)
+        for status, request_ids in by_status.items():
+            db.execute(
+                update(PriorAuthorizationRequest)
+                .where(PriorAuthorizationRequest.request_id.in_(request_ids))
+                .values(status=status, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            summary["by_status"][status] = summary["by_status"].get(status, 0) + len(request_ids)
+
+        rollup_dao.apply(connection, known, 1)
+        work_queue_dao.schedule(connection, known)
+        db.commit()
+        summary["applied"] += len(known)
+
+
+# Create singleton instance
+edi_278_batch_service = EDI278BatchService()
@@ -1,11 +1,16 @@
 # File: app/services/edi_278_service.py - EDI 278 Prior Authorization Service
+import codecs
+import io
 import uuid
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional, IO, Iterator
 import logging
 
+from sqlalchemy.orm import Session
+
 from app.core.config import settings
 from app.core.exceptions import EDIException
+from app.dao.control_number_dao import control_number_dao
 from app.schemas.prior_authorization import (
     PriorAuthorizationRequestCreate, 
     AuthorizationDecision,
@@ -14,6 +19,8 @@ from app.schemas.prior_authorization import (
 
 logger = logging.getLogger(__name__)
 
+REQUIRED_278_SEGMENTS = ('ISA', 'GS', 'ST', 'BHT', 'HL', 'NM1', 'UM', 'SE', 'GE', 'IEA')
+
 
 class EDI278Service:
     """Service for handling EDI 278 Prior Authorization transactions."""
@@ -22,115 +29,169 @@ class EDI278Service:
         self.submitter_id = settings.EDI_SUBMITTER_ID
         self.receiver_id = settings.EDI_RECEIVER_ID
     
-    def generate_control_numbers(self) -> Tuple[str, str, str]:
-        """Generate control numbers for EDI transactions."""
+    def generate_control_numbers(self, db: Optional[Session] = None) -> Tuple[str, str, str]:
+        """Generate control numbers for EDI transactions (from the control number sequence when db is given)."""
+        if db is not None:
+            numbers = control_number_dao.allocate(db, 3)
+            return tuple(control_number_dao.format(number) for number in numbers)
+        
         interchange_control_num = str(uuid.uuid4().int)[:9]
         group_control_num = str(uuid.uuid4().int)[:9]
         transaction_control_num = str(uuid.uuid4().int)[:9]
         
         return interchange_control_num, group_control_num, transaction_control_num
     
-    def generate_edi_278_request(self, request_data: PriorAuthorizationRequestCreate) -> Tuple[str, str, Dict[str, str]]:
+    @staticmethod
+    def transaction_fields(request: Any) -> Dict[str, Any]:
+        """Values a 278 transaction needs, from a PriorAuthorizationRequestCreate or a stored request"""
+        def code_value(value):
+            return value.value if hasattr(value, "value") else value
+        
+        def code_items(items, *names):
+            return [
+                {name: (item.get(name) if isinstance(item, dict) else getattr(item, name, None)) for name in names}
+                for item in items or []
+            ]
+        
+        service_date_from = request.service_date_from
+        return {
+            "request_type": code_value(request.request_type),
+            "certification_type": code_value(request.certification_type),
+            "service_type_code": request.service_type_code,
+            "requesting_provider_name": request.requesting_provider_name,
+            "requesting_provider_npi": request.requesting_provider_npi,
+            "patient_first_name": request.patient_first_name,
+            "patient_last_name": request.patient_last_name,
+            "member_id": request.member_id,
+            "patient_dob": request.patient_dob.strftime("%Y%m%d"),
+            "patient_gender": code_value(request.patient_gender),
+            "service_date_from": service_date_from.strftime("%Y%m%d") if service_date_from else None,
+            "service_date_to": (request.service_date_to or service_date_from).strftime("%Y%m%d") if service_date_from else None,
+            "diagnosis_codes": code_items(request.diagnosis_codes, "code"),
+            "procedure_codes": code_items(request.procedure_codes, "code", "units"),
+            "clinical_information": request.clinical_information,
+            "medical_necessity": request.medical_necessity
+        }
+    
+    def transaction_segments(
+        self,
+        fields: Dict[str, Any],
+        transaction_control_num: str,
+        current_date: str,
+        current_time: str
+    ) -> List[str]:
+        """ST through SE of one 278 request transaction."""
+        segments = []
+        
+        # ST - Transaction Set Header
+        segments.append(
+            f"ST*278*{transaction_control_num}*005010X217~"
+        )
+        
+        # BHT - Beginning of Hierarchical Transaction
+        segments.append(
+            f"BHT*0007*{fields['request_type']}*{transaction_control_num}*{current_date}*{current_time}~"
+        )
+        
+        # HL - Hierarchical Level (Utilization Management Organization)
+        segments.append("HL*1**20*1~")
+        
+        # NM1 - Utilization Management Organization Name
+        segments.append(f"NM1*X3*2*{self.receiver_id}*****46*{self.receiver_id}~")
+        
+        # HL - Hierarchical Level (Requester)
+        segments.append("HL*2*1*21*1~")
+        
+        # NM1 - Requester Name
+        segments.append(f"NM1*1P*2*{fields['requesting_provider_name'] or 'PROVIDER'}*****XX*{fields['requesting_provider_npi']}~")
+        
+        # HL - Hierarchical Level (Patient)
+        segments.append("HL*3*2*22*1~")
+        
+        # NM1 - Patient Name
+        segments.append(
+            f"NM1*QC*1*{fields['patient_last_name']}*{fields['patient_first_name']}*****MI*{fields['member_id']}~"
+        )
+        
+        # DMG - Patient Demographics
+        segments.append(f"DMG*D8*{fields['patient_dob']}*{fields['patient_gender']}~")
+        
+        # HL - Hierarchical Level (Service)
+        segments.append("HL*4*3*23*0~")
+        
+        # TRN - Trace Number
+        segments.append(f"TRN*1*{transaction_control_num}*{self.submitter_id}~")
+        
+        # UM - Utilization Management
+        segments.append(f"UM*{fields['certification_type']}*{fields['service_type_code'] or '1'}~")
+        
+        # DTP - Service Date(s)
+        service_date_from, service_date_to = fields['service_date_from'], fields['service_date_to']
+        if service_date_from == service_date_to:
+            segments.append(f"DTP*472*D8*{service_date_from}~")
+        else:
+            segments.append(f"DTP*472*RD8*{service_date_from}-{service_date_to}~")
+        
+        # Add diagnosis codes
+        if fields['diagnosis_codes']:
+            diagnosis_string = "*".join([f"ABK:{diag['code']}" for diag in fields['diagnosis_codes'][:12]])  # Max 12 diagnoses
+            segments.append(f"HI*{diagnosis_string}~")
+        
+        # Add procedure codes
+        for procedure in fields['procedure_codes'][:6]:  # Max 6 procedures
+            segments.append(f"SV1*HC:{procedure['code']}*{procedure['units'] or 1}*UN~")
+        
+        # PWK - Paperwork (if supporting documentation)
+        if fields['clinical_information']:
+            segments.append("PWK*OZ*FT~")
+            segments.append(f"MSG*{(fields['medical_necessity'] or '')[:264]}~")  # Max 264 chars
+        
+        # SE - Transaction Set Trailer
+        segment_count = len(segments) + 1
+        segments.append(f"SE*{segment_count}*{transaction_control_num}~")
+        
+        return segments
+    
+    def interchange_header(self, interchange_control_num: str, group_control_num: str, current_date: str, current_time: str) -> List[str]:
+        """ISA and GS segments of an outbound 278 interchange."""
+        return [
+            # ISA - Interchange Control Header
+            f"ISA*00*          *00*          *ZZ*{self.submitter_id:<15}*ZZ*{self.receiver_id:<15}*{current_date}*{current_time}*^*00501*{interchange_control_num}*0*T*:~",
+            # GS - Functional Group Header
+            f"GS*HI*{self.submitter_id}*{self.receiver_id}*{current_date}*{current_time}*{group_control_num}*X*005010X217~"
+        ]
+    
+    @staticmethod
+    def interchange_trailer(transaction_count: int, interchange_control_num: str, group_control_num: str) -> List[str]:
+        """GE and IEA segments closing a single-group interchange."""
+        return [
+            # GE - Functional Group Trailer
+            f"GE*{transaction_count}*{group_control_num}~",
+            # IEA - Interchange Control Trailer
+            f"IEA*1*{interchange_control_num}~"
+        ]
+    
+    def generate_edi_278_request(
+        self,
+        request_data: PriorAuthorizationRequestCreate,
+        db: Optional[Session] = None
+    ) -> Tuple[str, str, Dict[str, str]]:
         """Generate EDI 278 Prior Authorization Request."""
         try:
             logger.info(f"Generating EDI 278 request for patient: {request_data.patient_first_name} {request_data.patient_last_name}")
             
             # Generate control numbers
-            interchange_control_num, group_control_num, transaction_control_num = self.generate_control_numbers()
+            interchange_control_num, group_control_num, transaction_control_num = self.generate_control_numbers(db)
             
             # Current timestamp
             current_date = datetime.now().strftime("%Y%m%d")
             current_time = datetime.now().strftime("%H%M")
             
-            # Format dates
-            dob_formatted = request_data.patient_dob.strftime("%Y%m%d")
-            service_date_from = request_data.service_date_from.strftime("%Y%m%d")
-            service_date_to = (request_data.service_date_to or request_data.service_date_from).strftime("%Y%m%d")
-            
-            # Build EDI 278 segments
-            segments = []
-            
-            # ISA - Interchange Control Header
-            segments.append(
-                f"ISA*00*          *00*          *ZZ*{self.submitter_id:<15}*ZZ*{self.receiver_id:<15}*{current_date}*{current_time}*^*00501*{interchange_control_num}*0*T*:~"
-            )
-            
-            # GS - Functional Group Header
-            segments.append(
-                f"GS*HI*{self.submitter_id}*{self.receiver_id}*{current_date}*{current_time}*{group_control_num}*X*005010X217~"
-            )
-            
-            # ST - Transaction Set Header
-            segments.append(
-                f"ST*278*{transaction_control_num}*005010X217~"
-            )
-            
-            # BHT - Beginning of Hierarchical Transaction
-            segments.append(
-                f"BHT*0007*{request_data.request_type.value}*{transaction_control_num}*{current_date}*{current_time}~"
-            )
-            
-            # HL - Hierarchical Level (Utilization Management Organization)
-            segments.append("HL*1**20*1~")
-            
-            # NM1 - Utilization Management Organization Name
-            segments.append(f"NM1*X3*2*{self.receiver_id}*****46*{self.receiver_id}~")
-            
-            # HL - Hierarchical Level (Requester)
-            segments.append("HL*2*1*21*1~")
-            
-            # NM1 - Requester Name
-            segments.append(f"NM1*1P*2*{request_data.requesting_provider_name or 'PROVIDER'}*****XX*{request_data.requesting_provider_npi}~")
-            
-            # HL - Hierarchical Level (Patient)
-            segments.append("HL*3*2*22*1~")
-            
-            # NM1 - Patient Name
-            segments.append(
-                f"NM1*QC*1*{request_data.patient_last_name}*{request_data.patient_first_name}*****MI*{request_data.member_id}~"
-            )
-            
-            # DMG - Patient Demographics
-            segments.append(f"DMG*D8*{dob_formatted}*{request_data.patient_gender.value}~")
-            
-            # HL - Hierarchical Level (Service)
-            segments.append("HL*4*3*23*0~")
-            
-            # TRN - Trace Number
-            segments.append(f"TRN*1*{transaction_control_num}*{self.submitter_id}~")
-            
-            # UM - Utilization Management
-            segments.append(f"UM*{request_data.certification_type.value}*{request_data.service_type_code or '1'}~")
-            
-            # DTP - Service Date(s)
-            if service_date_from == service_date_to:
-                segments.append(f"DTP*472*D8*{service_date_from}~")
-            else:
-                segments.append(f"DTP*472*RD8*{service_date_from}-{service_date_to}~")
-            
-            # Add diagnosis codes
-            if request_data.diagnosis_codes:
-                diagnosis_string = "*".join([f"ABK:{diag.code}" for diag in request_data.diagnosis_codes[:12]])  # Max 12 diagnoses
-                segments.append(f"HI*{diagnosis_string}~")
-            
-            # Add procedure codes
-            for i, procedure in enumerate(request_data.procedure_codes[:6], 1):  # Max 6 procedures
-                segments.append(f"SV1*HC:{procedure.code}*{procedure.units or 1}*UN~")
-            
-            # PWK - Paperwork (if supporting documentation)
-            if request_data.clinical_information:
-                segments.append("PWK*OZ*FT~")
-                segments.append(f"MSG*{request_data.medical_necessity[:264]}~")  # Max 264 chars
-            
-            # SE - Transaction Set Trailer
-            segment_count = len(segments) + 1
-            segments.append(f"SE*{segment_count}*{transaction_control_num}~")
-            
-            # GE - Functional Group Trailer
-            segments.append(f"GE*1*{group_control_num}~")
-            
-            # IEA - Interchange Control Trailer
-            segments.append(f"IEA*1*{interchange_control_num}~")
+            segments = self.interchange_header(interchange_control_num, group_control_num, current_date, current_time)
+            segments.extend(self.transaction_segments(
+                self.transaction_fields(request_data), transaction_control_num, current_date, current_time
+            ))
+            segments.extend(self.interchange_trailer(1, interchange_control_num, group_control_num))
             
             edi_278_content = '\n'.join(segments)
             
@@ -223,10 +284,10 @@ class EDI278Service:
                 segments.append("PWK*CT*FT~")
                 segments.append(f"MSG*{decision.additional_information_required[:264]}~")
             
-            # SE - Transaction Set Trailer
-            segment_count = len(segments) + 1
+            # SE - Transaction Set Trailer (counts ST through SE, not ISA/GS)
+            segment_count = len(segments) - 2 + 1
             segments.append(f"SE*{segment_count}*{transaction_control_num}~")
-            
+
             # GE - Functional Group Trailer
             segments.append(f"GE*1*{group_control_num}~")
             
@@ -245,22 +306,36 @@ class EDI278Service:
     def validate_edi_278(self, edi_content: str) -> bool:
         """Validate EDI 278 format and required segments."""
         try:
-            segments = edi_content.split('~')
-            required_segments = ['ISA', 'GS', 'ST', 'BHT', 'HL', 'NM1', 'UM', 'SE', 'GE', 'IEA']
+            missing_segments = set(REQUIRED_278_SEGMENTS)
+            for segment in iter_segments(io.StringIO(edi_content)):
+                missing_segments.discard(segment.partition('*')[0])
+                if not missing_segments:
+                    return True
             
-            found_segments = set()
-            for segment in segments:
-                if segment.strip():
-                    segment_id = segment.split('*')[0]
-                    found_segments.add(segment_id)
-            
-            missing_segments = set(required_segments) - found_segments
-            if missing_segments:
-                logger.warning(f"Missing required segments: {missing_segments}")
-                return False
-            
-            return True
+            logger.warning(f"Missing required segments: {missing_segments}")
+            return False
             
         except Exception as e:
             logger.error(f"Error validating EDI 278: {str(e)}")
             return False
+
+
+def iter_segments(stream: IO, terminator: str = "~", chunk_size: int = 65536) -> Iterator[str]:
+    """Yield stripped segments from a text or binary stream without reading it whole."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        pieces = (pending + chunk).split(terminator)
+        pending = pieces.pop()
+        for piece in pieces:
+            piece = piece.strip()
+            if piece:
+                yield piece
+    pending = (pending + decoder.decode(b"", final=True)).strip()
+    if pending:
+        yield pending
@@ -3,7 +3,9 @@
 
 import httpx
 import asyncio
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from fastapi import HTTPException
 from pydantic import BaseModel
 from datetime import date, datetime
@@ -11,6 +13,12 @@ import os
 
 # Configuration
 PATIENT_SERVICE_URL = os.getenv('PATIENT_SERVICE_URL', 'http://localhost:8000')
+PATIENT_CLIENT_TIMEOUT = float(os.getenv('PATIENT_CLIENT_TIMEOUT', '30'))
+PATIENT_CLIENT_MAX_CONNECTIONS = int(os.getenv('PATIENT_CLIENT_MAX_CONNECTIONS', '20'))
+PATIENT_CACHE_TTL_SECONDS = float(os.getenv('PATIENT_CACHE_TTL_SECONDS', '60'))
+PATIENT_NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv('PATIENT_NEGATIVE_CACHE_TTL_SECONDS', '10'))
+# Identifier lookups arriving within this window share one Patient service scan
+PATIENT_BATCH_WINDOW_SECONDS = float(os.getenv('PATIENT_BATCH_WINDOW_SECONDS', '0.005'))
 
 
 class PatientClientError(Exception):
@@ -91,18 +99,33 @@ class PatientResponse(BaseModel):
     updated_at: datetime
 
 
+def create_http_client(max_connections: int = PATIENT_CLIENT_MAX_CONNECTIONS) -> httpx.AsyncClient:
+    """Pooled HTTP client for the Patient service; idle connections are kept for reuse"""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(PATIENT_CLIENT_TIMEOUT, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0
+        )
+    )
+
+
 class PatientClient:
     """Client for communicating with the Patient microservice"""
     
-    def __init__(self, base_url: str = PATIENT_SERVICE_URL):
+    def __init__(self, base_url: str = PATIENT_SERVICE_URL, client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # A client passed in is a shared pool owned by the caller and is not closed here
+        self._owns_client = client is None
+        self.client = client or create_http_client()
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
     
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request to patient service"""
@@ -194,16 +217,27 @@ class PatientClient:
     
     async def get_patient_by_identifier(self, identifier_value: str, identifier_system: Optional[str] = None) -> Optional[PatientResponse]:
         """Get patient by identifier (e.g., member ID)"""
-        # First get all patients and filter by identifier
+        matches = await self.get_patients_by_identifiers([identifier_value], identifier_system)
+        return matches[identifier_value]
+    
+    async def get_patients_by_identifiers(
+        self,
+        identifier_values: List[str],
+        identifier_system: Optional[str] = None
+    ) -> Dict[str, Optional[PatientResponse]]:
+        """Resolve many identifiers with a single patient listing"""
+        # The Patient service has no identifier search, so one listing is scanned for all of them
         patients = await self.search_patients(limit=1000)
+        wanted = set(identifier_values)
+        matches: Dict[str, Optional[PatientResponse]] = {value: None for value in identifier_values}
         
         for patient in patients:
-            if patient.identifiers:
-                for identifier in patient.identifiers:
-                    if identifier.get('value') == identifier_value:
-                        if identifier_system is None or identifier.get('system') == identifier_system:
-                            return patient
-        return None
+            for identifier in patient.identifiers or []:
+                value = identifier.get('value')
+                if value in wanted and matches[value] is None:
+                    if identifier_system is None or identifier.get('system') == identifier_system:
+                        matches[value] = patient
+        return matches
     
     async def health_check(self) -> bool:
         """Check if patient service is healthy"""
@@ -214,50 +248,267 @@ class PatientClient:
             return False
 
 
+class PatientLookupCache:
+    """
+    Process-local TTL cache of patient lookups keyed by ("id", patient_id) or
+    ("identifier", system, value). A miss (None) is kept for the shorter
+    negative TTL so unknown ids do not hit the Patient service on every call.
+
+    Every discard_patient advances a generation. A fetch records generation()
+    when it starts and passes it to set(), which then drops the result if the
+    patient was discarded meanwhile, so a write is not undone by a read that
+    was already in flight.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PATIENT_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = PATIENT_NEGATIVE_CACHE_TTL_SECONDS,
+        max_entries: int = 10000
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Tuple[float, Optional[PatientResponse]]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        # patient_id -> generation of its last discard; when this is trimmed,
+        # fetches started before _discard_floor are treated as stale
+        self._discarded: Dict[str, int] = {}
+        self._discard_floor = 0
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def _discarded_since(self, key: Tuple, value: Optional[PatientResponse], generation: int) -> bool:
+        if generation < self._discard_floor:
+            return True
+        if value is None:
+            # Every discard drops all cached misses
+            return self._generation > generation
+        patient_ids = {value.id, key[1]} if key[0] == "id" else {value.id}
+        return any(self._discarded.get(patient_id, 0) > generation for patient_id in patient_ids)
+
+    def get(self, key: Tuple) -> Tuple[bool, Optional[PatientResponse]]:
+        """(hit, value); a hit may carry None for a cached miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return False, None
+            return True, value
+
+    def set(self, key: Tuple, value: Optional[PatientResponse], generation: Optional[int] = None):
+        """Cache value; with the generation its fetch started at, skipped if the patient was discarded since"""
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        with self._lock:
+            if generation is not None and self._discarded_since(key, value, generation):
+                return
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop expired entries first, then the oldest insertion
+                now = time.monotonic()
+                for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def discard_patient(self, patient_id: str):
+        """Forget every entry for a patient, and all cached misses, after it is written"""
+        with self._lock:
+            self._generation += 1
+            self._discarded[patient_id] = self._generation
+            if len(self._discarded) > self.max_entries:
+                self._discarded.clear()
+                self._discard_floor = self._generation
+            for key in [
+                k for k, (_, value) in self._entries.items()
+                if value is None or value.id == patient_id or k == ("id", patient_id)
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class _EventLoopThread:
+    """A long-lived event loop on a daemon thread that runs coroutines for sync callers"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def run(self, coro):
+        """Run coro on the loop thread and wait for its result"""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("PatientClientSync cannot be called from its own event loop; await PatientClient instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def stop(self):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+
 # Synchronous wrapper for compatibility with existing code
 class PatientClientSync:
-    """Synchronous wrapper for PatientClient"""
+    """
+    Synchronous facade over PatientClient.
+
+    Calls run on one background event loop and share one pooled HTTP client,
+    so sync callers (including FastAPI threadpool endpoints) reuse keep-alive
+    connections instead of building a client and loop per call. Patient and
+    identifier lookups are cached, concurrent lookups of the same key share one
+    request, and identifier lookups within PATIENT_BATCH_WINDOW_SECONDS share
+    one scan of the Patient service.
+    """
     
-    def __init__(self, base_url: str = PATIENT_SERVICE_URL):
+    def __init__(self, base_url: str = PATIENT_SERVICE_URL, cache: Optional[PatientLookupCache] = None):
         self.base_url = base_url
+        self.cache = cache or PatientLookupCache()
+        self._loop_thread = _EventLoopThread("patient-client")
+        # Owned by the loop thread; only touched from coroutines running on it
+        self._client: Optional[PatientClient] = None
+        self._inflight: Dict[str, Tuple[asyncio.Future, int]] = {}
+        self._pending_identifiers: Dict[Optional[str], Dict[str, asyncio.Future]] = {}
     
     def _run_async(self, coro):
         """Run async function in sync context"""
+        return self._loop_thread.run(coro)
+    
+    def _patient_client(self) -> PatientClient:
+        if self._client is None:
+            self._client = PatientClient(self.base_url, client=create_http_client())
+        return self._client
+    
+    async def _patient_client_call(self, method: str, *args):
+        return await getattr(self._patient_client(), method)(*args)
+    
+    async def _fetch_patient(self, patient_id: str) -> Optional[PatientResponse]:
+        """Fetch one patient; concurrent fetches of the same id share a request"""
+        inflight = self._inflight.get(patient_id)
+        if inflight is None:
+            generation = self.cache.generation()
+            future = asyncio.ensure_future(self._patient_client().get_patient(patient_id))
+            inflight = self._inflight[patient_id] = (future, generation)
+            future.add_done_callback(lambda _: self._inflight.pop(patient_id, None))
+        future, generation = inflight
+        patient = await asyncio.shield(future)
+        self.cache.set(("id", patient_id), patient, generation)
+        return patient
+    
+    async def _fetch_patients(self, patient_ids: List[str]) -> List[Optional[PatientResponse]]:
+        return await asyncio.gather(*(self._fetch_patient(patient_id) for patient_id in patient_ids))
+    
+    async def _lookup_identifiers(self, values: List[str], system: Optional[str]) -> List[Optional[PatientResponse]]:
+        """Queue identifiers for the next batched scan and wait for it"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending_identifiers.get(system)
+        if pending is None:
+            pending = self._pending_identifiers[system] = {}
+            loop.call_later(PATIENT_BATCH_WINDOW_SECONDS, lambda: asyncio.ensure_future(self._flush_identifiers(system)))
+        futures = [pending.setdefault(value, loop.create_future()) for value in values]
+        return await asyncio.gather(*(asyncio.shield(future) for future in futures))
+    
+    async def _flush_identifiers(self, system: Optional[str]):
+        pending = self._pending_identifiers.pop(system, {})
+        if not pending:
+            return
+        generation = self.cache.generation()
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        return loop.run_until_complete(coro)
+            matches = await self._patient_client().get_patients_by_identifiers(list(pending), system)
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for value, future in pending.items():
+            self.cache.set(("identifier", system, value), matches[value], generation)
+            if not future.done():
+                future.set_result(matches[value])
+    
+    async def _aclose(self):
+        if self._client is not None:
+            await self._client.client.aclose()
+            self._client = None
+    
+    def close(self):
+        """Close the pooled HTTP client and stop the background loop (application shutdown)"""
+        if self._loop_thread.running:
+            self._run_async(self._aclose())
+            self._loop_thread.stop()
     
     def create_patient(self, patient_data: PatientCreate) -> PatientResponse:
         """Create a new patient (sync)"""
-        async def _create():
-            async with PatientClient(self.base_url) as client:
-                return await client.create_patient(patient_data)
-        return self._run_async(_create())
+        patient = self._run_async(self._patient_client_call("create_patient", patient_data))
+        self.cache.discard_patient(patient.id)
+        self.cache.set(("id", patient.id), patient)
+        return patient
     
     def get_patient(self, patient_id: str) -> Optional[PatientResponse]:
         """Get patient by ID (sync)"""
-        async def _get():
-            async with PatientClient(self.base_url) as client:
-                return await client.get_patient(patient_id)
-        return self._run_async(_get())
+        hit, patient = self.cache.get(("id", patient_id))
+        if hit:
+            return patient
+        return self._run_async(self._fetch_patient(patient_id))
+    
+    def get_patients(self, patient_ids: Iterable[str]) -> Dict[str, Optional[PatientResponse]]:
+        """Get many patients by ID (sync); uncached ids are fetched concurrently"""
+        patient_ids = list(dict.fromkeys(patient_ids))
+        results: Dict[str, Optional[PatientResponse]] = {}
+        missing = []
+        for patient_id in patient_ids:
+            hit, patient = self.cache.get(("id", patient_id))
+            if hit:
+                results[patient_id] = patient
+            else:
+                missing.append(patient_id)
+        if missing:
+            results.update(zip(missing, self._run_async(self._fetch_patients(missing))))
+        return {patient_id: results[patient_id] for patient_id in patient_ids}
     
     def get_patient_by_fhir_id(self, fhir_id: str) -> Optional[PatientResponse]:
         """Get patient by FHIR ID (sync)"""
-        async def _get():
-            async with PatientClient(self.base_url) as client:
-                return await client.get_patient_by_fhir_id(fhir_id)
-        return self._run_async(_get())
+        return self._run_async(self._patient_client_call("get_patient_by_fhir_id", fhir_id))
     
     def update_patient(self, patient_id: str, patient_update: PatientUpdate) -> Optional[PatientResponse]:
         """Update patient information (sync)"""
-        async def _update():
-            async with PatientClient(self.base_url) as client:
-                return await client.update_patient(patient_id, patient_update)
-        return self._run_async(_update())
+        patient = self._run_async(self._patient_client_call("update_patient", patient_id, patient_update))
+        self.cache.discard_patient(patient_id)
+        if patient:
+            self.cache.set(("id", patient_id), patient)
+        return patient
     
     def search_patients(
         self,
@@ -267,10 +518,7 @@ class PatientClientSync:
         gender: Optional[str] = None
     ) -> List[PatientResponse]:
         """Search patients (sync)"""
-        async def _search():
-            async with PatientClient(self.base_url) as client:
-                return await client.search_patients(skip, limit, active, gender)
-        return self._run_async(_search())
+        return self._run_async(self._patient_client_call("search_patients", skip, limit, active, gender))
     
     def search_patients_by_name(
         self,
@@ -279,25 +527,35 @@ class PatientClientSync:
         limit: int = 100
     ) -> List[PatientResponse]:
         """Search patients by name (sync)"""
-        async def _search():
-            async with PatientClient(self.base_url) as client:
-                return await client.search_patients_by_name(family_name, given_name, limit)
-        return self._run_async(_search())
+        return self._run_async(self._patient_client_call("search_patients_by_name", family_name, given_name, limit))
     
     def get_patient_by_identifier(self, identifier_value: str, identifier_system: Optional[str] = None) -> Optional[PatientResponse]:
         """Get patient by identifier (sync)"""
-        async def _get():
-            async with PatientClient(self.base_url) as client:
-                return await client.get_patient_by_identifier(identifier_value, identifier_system)
-        return self._run_async(_get())
+        return self.get_patients_by_identifiers([identifier_value], identifier_system)[identifier_value]
+    
+    def get_patients_by_identifiers(
+        self,
+        identifier_values: Iterable[str],
+        identifier_system: Optional[str] = None
+    ) -> Dict[str, Optional[PatientResponse]]:
+        """Get patients for many identifiers (sync); uncached ones share one scan"""
+        identifier_values = list(dict.fromkeys(identifier_values))
+        results: Dict[str, Optional[PatientResponse]] = {}
+        missing = []
+        for value in identifier_values:
+            hit, patient = self.cache.get(("identifier", identifier_system, value))
+            if hit:
+                results[value] = patient
+            else:
+                missing.append(value)
+        if missing:
+            results.update(zip(missing, self._run_async(self._lookup_identifiers(missing, identifier_system))))
+        return {value: results[value] for value in identifier_values}
     
     def health_check(self) -> bool:
         """Check if patient service is healthy (sync)"""
-        async def _check():
-            async with PatientClient(self.base_url) as client:
-                return await client.health_check()
-        return self._run_async(_check())
+        return self._run_async(self._patient_client_call("health_check"))
 
 
 # Create singleton instance
-patient_client = PatientClientSync() 
\ No newline at end of file
+patient_client = PatientClientSync()
@@ -1,5 +1,5 @@
 # Prior Authorization Service for Prior Authorization System
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from app.dao.prior_authorization_dao import EnhancedAuthorizationDAO
 from app.schemas.prior_authorization import (
@@ -62,7 +62,42 @@ class PriorAuthService:
         search_request: AuthorizationSearchRequest
     ) -> List[AuthorizationSummary]:
         """Search authorization requests"""
-        return self.dao.search_authorizations(db, search_request)
+        summaries, _ = self.dao.advanced_search(db, search_request)
+        return summaries
+
+    def search_authorization_requests(
+        self,
+        db: Session,
+        patient_name: Optional[str] = None,
+        member_id: Optional[str] = None,
+        provider_npi: Optional[str] = None,
+        status: Optional[str] = None,
+        service_date_from: Optional[str] = None,
+        service_date_to: Optional[str] = None,
+        phonetic: bool = False,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        exact_count: bool = False
+    ) -> Dict[str, Any]:
+        """Keyset-paginated search; the total is capped unless exact_count is set"""
+        search_request = AuthorizationSearchRequest(
+            patient_name=patient_name,
+            member_id=member_id,
+            provider_npi=provider_npi,
+            status=status,
+            service_date_from=service_date_from,
+            service_date_to=service_date_to,
+            phonetic=phonetic
+        )
+        items, next_cursor = self.dao.search_requests(db, search_request, after_id=after_id, skip=skip, limit=limit)
+        total, total_is_exact = self.dao.count_search(db, search_request, exact=exact_count)
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "total": total,
+            "total_is_exact": total_is_exact
+        }
 
     def submit_decision(
         self, 
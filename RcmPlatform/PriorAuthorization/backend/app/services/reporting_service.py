@@ -145,13 +145,9 @@ class EnhancedReportingService:
         patient_stats = self.patient_dao.get_patient_statistics(db)
         
         # Get top providers
-        top_providers = []
-        for provider_info in auth_stats.by_provider[:5]:
-            provider_stats = self.auth_dao.get_provider_statistics(
-                db, provider_info['npi'], start_date, end_date
-            )
-            if provider_stats:
-                top_providers.append(provider_stats)
+        top_providers = self.auth_dao.get_providers_statistics(
+            db, [provider_info['npi'] for provider_info in auth_stats.by_provider[:5]], start_date, end_date
+        )
         
         return SystemStatistics(
             authorization_stats=auth_stats,
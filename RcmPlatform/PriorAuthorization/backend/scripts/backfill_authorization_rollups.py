@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rebuild authorization_daily_rollups from prior_authorization_requests and
+prior_authorization_responses.
+
+Run once after database/migration_statistics_rollups.sql, and again for any
+range whose source rows were changed outside the ORM (raw SQL, restores):
+
+    python scripts/backfill_authorization_rollups.py
+    python scripts/backfill_authorization_rollups.py --from 2024-01-01 --to 2024-01-31
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models.models import AuthorizationDailyRollup  # noqa: E402
+from app.dao.rollup_dao import rollup_dao  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill authorization statistics rollups")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    AuthorizationDailyRollup.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = rollup_dao.backfill(db, args.date_from, args.date_to)
+        elapsed = time.perf_counter() - started
+        scope = f"{args.date_from or 'start'} to {args.date_to or 'end'}"
+        print(f"Rebuilt {rows} rollup rows ({scope}) in {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
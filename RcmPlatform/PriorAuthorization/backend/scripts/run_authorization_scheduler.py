@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Run a follow-up / expiration scheduler worker.
+
+Any number of workers can run against the same database; each poll claims a
+batch of due authorization_work_items with SELECT ... FOR UPDATE SKIP LOCKED.
+After database/migration_work_queue.sql, fill the queue once from existing
+requests with --backfill:
+
+    python scripts/run_authorization_scheduler.py --backfill
+    python scripts/run_authorization_scheduler.py
+    python scripts/run_authorization_scheduler.py --once --batch-size 500
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.dao.work_queue_dao import work_queue_dao  # noqa: E402
+from app.services.authorization_scheduler import AuthorizationScheduler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow-up and expiration scheduler worker")
+    parser.add_argument("--worker-id", help="Name recorded on claimed items (default host:pid)")
+    parser.add_argument("--batch-size", type=int, default=settings.WORK_QUEUE_BATCH_SIZE)
+    parser.add_argument("--poll-seconds", type=float, default=settings.WORK_QUEUE_POLL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Process one batch and exit")
+    parser.add_argument("--backfill", action="store_true", help="Schedule work for all existing requests and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.backfill:
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            written = work_queue_dao.backfill(db)
+            print(f"Scheduled {written} work items in {time.perf_counter() - started:.1f}s")
+        finally:
+            db.close()
+        return
+
+    scheduler = AuthorizationScheduler(worker_id=args.worker_id, batch_size=args.batch_size)
+
+    if args.once:
+        db = SessionLocal()
+        try:
+            print(scheduler.run_once(db))
+        finally:
+            db.close()
+        return
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    print(f"Scheduler worker {scheduler.worker_id} polling every {args.poll_seconds}s")
+    scheduler.run_forever(SessionLocal, args.poll_seconds, stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,17 @@
 -- Create database extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS fuzzystrmatch;
 
 -- Create custom types
 CREATE TYPE request_type_enum AS ENUM ('00', '01', '02', '03', '04');
 CREATE TYPE certification_type_enum AS ENUM ('I', 'R', 'S', 'C');
 CREATE TYPE response_code_enum AS ENUM ('A1', 'A2', 'A3', 'A4', 'A6');
 
+-- ISA13 / GS06 / ST02 control numbers for outbound 278 batches
+CREATE SEQUENCE IF NOT EXISTS edi_control_number_seq MINVALUE 1 MAXVALUE 999999999 CYCLE;
+
 -- Table: service_type_codes
 CREATE TABLE IF NOT EXISTS service_type_codes (
     id SERIAL PRIMARY KEY,
@@ -218,6 +223,44 @@ CREATE TABLE IF NOT EXISTS authorization_audit (
     updated_at TIMESTAMP WITH TIME ZONE
 );
 
+-- Table: authorization_daily_rollups
+-- Per-day counts and processing-time sums behind the statistics endpoints.
+-- Maintained by the application as requests and responses are written;
+-- rebuild with backend/scripts/backfill_authorization_rollups.py
+CREATE TABLE IF NOT EXISTS authorization_daily_rollups (
+    day DATE NOT NULL,
+    provider_npi VARCHAR(20) NOT NULL,
+    provider_role VARCHAR(10) NOT NULL, -- requesting, servicing
+    priority VARCHAR(10) NOT NULL, -- '' when the request has none
+    response_code VARCHAR(20) NOT NULL, -- '' until a response exists
+    provider_name VARCHAR(255),
+    request_count INTEGER NOT NULL DEFAULT 0,
+    processing_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, provider_npi, provider_role, priority, response_code)
+);
+
+-- Table: authorization_work_items
+-- Due follow-ups, expiring approvals and overdue urgent requests. Written by
+-- the application with the request or response they come from; claimed by
+-- backend/scripts/run_authorization_scheduler.py workers with SKIP LOCKED
+CREATE TABLE IF NOT EXISTS authorization_work_items (
+    id SERIAL PRIMARY KEY,
+    request_id VARCHAR(50) NOT NULL REFERENCES prior_authorization_requests(request_id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL, -- follow_up, expiration, urgent_review
+    due_day DATE NOT NULL, -- day bucket of due_at
+    due_at TIMESTAMP NOT NULL, -- UTC
+    status VARCHAR(10) NOT NULL DEFAULT 'pending', -- pending, claimed, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retry_at TIMESTAMP,
+    claimed_by VARCHAR(100),
+    claimed_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_auth_work_items_request_kind_due UNIQUE (request_id, kind, due_at)
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_patient_info_patient_id ON patient_information(patient_id);
 CREATE INDEX IF NOT EXISTS idx_patient_info_member_id ON patient_information(member_id_primary);
@@ -227,10 +270,27 @@ CREATE INDEX IF NOT EXISTS idx_prior_auth_req_request_id ON prior_authorization_
 CREATE INDEX IF NOT EXISTS idx_prior_auth_req_patient_id ON prior_authorization_requests(patient_id);
 CREATE INDEX IF NOT EXISTS idx_prior_auth_req_member_id ON prior_authorization_requests(member_id);
 CREATE INDEX IF NOT EXISTS idx_prior_auth_req_status ON prior_authorization_requests(status);
-CREATE INDEX IF NOT EXISTS idx_prior_auth_req_provider_npi ON prior_authorization_requests(requesting_provider_npi);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_created_id ON prior_authorization_requests(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_status_created ON prior_authorization_requests(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_member_created ON prior_authorization_requests(member_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_requesting_npi_created ON prior_authorization_requests(requesting_provider_npi, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_servicing_npi_created ON prior_authorization_requests(servicing_provider_npi, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_first_name_trgm ON prior_authorization_requests USING gin (patient_first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_last_name_trgm ON prior_authorization_requests USING gin (patient_last_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_first_name_dmetaphone ON prior_authorization_requests (dmetaphone(patient_first_name));
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_last_name_dmetaphone ON prior_authorization_requests (dmetaphone(patient_last_name));
+
+CREATE INDEX IF NOT EXISTS idx_auth_rollups_provider_day ON authorization_daily_rollups(provider_npi, day);
 
 CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_request_id ON prior_authorization_responses(request_id);
 CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_auth_number ON prior_authorization_responses(authorization_number);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_follow_up_open ON prior_authorization_responses(follow_up_date) WHERE follow_up_required = true;
+CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_expiring ON prior_authorization_responses(expiration_date) WHERE response_code IN ('A1', 'A2');
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_urgent_open ON prior_authorization_requests(created_at) WHERE priority = 'urgent' AND status IN ('submitted', 'under_review');
+
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_pending_due ON authorization_work_items(due_day, due_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_claimed ON authorization_work_items(claimed_at) WHERE status = 'claimed';
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_request ON authorization_work_items(request_id);
 
 CREATE INDEX IF NOT EXISTS idx_service_type_codes_code ON service_type_codes(code);
 CREATE INDEX IF NOT EXISTS idx_procedure_codes_code ON procedure_codes(code);
@@ -0,0 +1,8 @@
+-- Migration script for batch EDI 278 processing
+-- Run this script to update existing database schema
+
+-- ISA13 / GS06 / ST02 control numbers for outbound 278 batches. Nine digits,
+-- so the sequence cycles; allocation takes a whole block in one round trip:
+--   SELECT nextval('edi_control_number_seq') FROM generate_series(1, 1000)
+CREATE SEQUENCE IF NOT EXISTS edi_control_number_seq MINVALUE 1 MAXVALUE 999999999 CYCLE;
+
@@ -0,0 +1,36 @@
+-- Migration script to add authorization search indexes
+-- Run this script to update existing database schema (PostgreSQL 11+)
+
+-- Trigram matching for leading-wildcard ILIKE, Double Metaphone for sounds-alike names
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS fuzzystrmatch;
+
+-- Patient name search: ILIKE '%name%' on either column becomes a BitmapOr of two GIN scans
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_first_name_trgm
+    ON prior_authorization_requests USING gin (patient_first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_last_name_trgm
+    ON prior_authorization_requests USING gin (patient_last_name gin_trgm_ops);
+
+-- Phonetic search (phonetic=true)
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_first_name_dmetaphone
+    ON prior_authorization_requests (dmetaphone(patient_first_name));
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_last_name_dmetaphone
+    ON prior_authorization_requests (dmetaphone(patient_last_name));
+
+-- Equality filters followed by the (created_at, id) keyset order, so a filtered
+-- newest-first page is a bounded index range scan
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_created_id
+    ON prior_authorization_requests (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_status_created
+    ON prior_authorization_requests (status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_member_created
+    ON prior_authorization_requests (member_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_requesting_npi_created
+    ON prior_authorization_requests (requesting_provider_npi, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_servicing_npi_created
+    ON prior_authorization_requests (servicing_provider_npi, created_at, id);
+
+-- Superseded by the composites above
+DROP INDEX IF EXISTS idx_prior_auth_req_provider_npi;
+
+ANALYZE prior_authorization_requests;
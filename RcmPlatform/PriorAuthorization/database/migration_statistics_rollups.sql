@@ -0,0 +1,24 @@
+-- Migration script to add the authorization statistics rollup table
+-- Run this script to update existing database schema, then fill it with
+--   python scripts/backfill_authorization_rollups.py
+-- from the backend directory (or container)
+
+-- One row per (day, provider, provider role, priority, response code).
+-- A request counts once under its requesting provider and, when different,
+-- once under its servicing provider. Statistics read the requesting rows for
+-- totals and both roles for per-provider figures.
+CREATE TABLE IF NOT EXISTS authorization_daily_rollups (
+    day DATE NOT NULL,
+    provider_npi VARCHAR(20) NOT NULL,
+    provider_role VARCHAR(10) NOT NULL, -- requesting, servicing
+    priority VARCHAR(10) NOT NULL, -- '' when the request has none
+    response_code VARCHAR(20) NOT NULL, -- '' until a response exists
+    provider_name VARCHAR(255),
+    request_count INTEGER NOT NULL DEFAULT 0,
+    processing_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, provider_npi, provider_role, priority, response_code)
+);
+
+-- Provider statistics filter on NPI first, then the day range
+CREATE INDEX IF NOT EXISTS idx_auth_rollups_provider_day
+    ON authorization_daily_rollups(provider_npi, day);
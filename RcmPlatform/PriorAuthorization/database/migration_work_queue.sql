@@ -0,0 +1,42 @@
+-- Migration script to add the follow-up / expiration work queue
+-- Run this script to update existing database schema, then fill the queue with
+--   python scripts/run_authorization_scheduler.py --backfill
+-- from the backend directory (or container)
+
+-- One row per due item of work for a request. The application writes pending
+-- rows together with the request or response they come from; scheduler
+-- workers claim them with SELECT ... FOR UPDATE SKIP LOCKED.
+CREATE TABLE IF NOT EXISTS authorization_work_items (
+    id SERIAL PRIMARY KEY,
+    request_id VARCHAR(50) NOT NULL REFERENCES prior_authorization_requests(request_id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL, -- follow_up, expiration, urgent_review
+    due_day DATE NOT NULL, -- day bucket of due_at
+    due_at TIMESTAMP NOT NULL, -- UTC
+    status VARCHAR(10) NOT NULL DEFAULT 'pending', -- pending, claimed, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retry_at TIMESTAMP,
+    claimed_by VARCHAR(100),
+    claimed_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_auth_work_items_request_kind_due UNIQUE (request_id, kind, due_at)
+);
+
+-- Pollers only ever scan open items; done and failed rows stay out of these indexes
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_pending_due
+    ON authorization_work_items(due_day, due_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_claimed
+    ON authorization_work_items(claimed_at) WHERE status = 'claimed';
+CREATE INDEX IF NOT EXISTS idx_auth_work_items_request
+    ON authorization_work_items(request_id);
+
+-- Partial indexes behind get_requests_requiring_followup, get_expiring_authorizations
+-- and get_urgent_requests
+CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_follow_up_open
+    ON prior_authorization_responses(follow_up_date) WHERE follow_up_required = true;
+CREATE INDEX IF NOT EXISTS idx_prior_auth_resp_expiring
+    ON prior_authorization_responses(expiration_date) WHERE response_code IN ('A1', 'A2');
+CREATE INDEX IF NOT EXISTS idx_prior_auth_req_urgent_open
+    ON prior_authorization_requests(created_at) WHERE priority = 'urgent' AND status IN ('submitted', 'under_review');
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test PatientClientSync against a local stand-in Patient service.
+
+Checks that sync calls reuse pooled keep-alive connections, work from inside
+a running event loop, are cached (including misses), coalesce concurrent
+identifier lookups into one scan, and see their own writes, even when a read
+of the same patient was already in flight.
+
+    python test_patient_client.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.services.patient_client import PatientClientSync, PatientLookupCache, PatientUpdate  # noqa: E402
+
+
+def _patient(i, family_name="Doe"):
+    return {
+        "id": f"P{i}",
+        "fhir_id": f"fhir-{i}",
+        "family_name": family_name,
+        "given_names": ["Pat"],
+        "identifiers": [{"system": "member-id", "value": f"MEM{i:04d}"}],
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00"
+    }
+
+
+class PatientServiceStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    patients = {f"P{i}": _patient(i) for i in range(300)}
+    stats = {"connections": 0, "requests": [], "lock": threading.Lock()}
+    # GETs of these paths answer with the record as read, once the event is set
+    held = {}
+
+    def setup(self):
+        super().setup()
+        with self.stats["lock"]:
+            self.stats["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _record(self):
+        with self.stats["lock"]:
+            self.stats["requests"].append(f"{self.command} {self.path}")
+
+    def do_GET(self):
+        self._record()
+        path = self.path.split("?")[0]
+        if path == "/patients":
+            self._send(200, list(self.patients.values()))
+        elif path.startswith("/patients/") and path[len("/patients/"):] in self.patients:
+            patient = dict(self.patients[path[len("/patients/"):]])
+            if path in self.held:
+                self.held[path].wait(timeout=5)
+            self._send(200, patient)
+        else:
+            self._send(404, {"detail": "Patient not found"})
+
+    def do_PUT(self):
+        self._record()
+        patient_id = self.path[len("/patients/"):]
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.patients[patient_id] = {**self.patients[patient_id], **body}
+        self._send(200, self.patients[patient_id])
+
+
+def _requests(prefix=""):
+    with PatientServiceStub.stats["lock"]:
+        return [r for r in PatientServiceStub.stats["requests"] if r.startswith(prefix)]
+
+
+def test_patient_client():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PatientServiceStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = PatientClientSync(f"http://127.0.0.1:{server.server_port}")
+
+    try:
+        print("🔍 Sequential lookups reuse pooled connections...")
+        for i in range(200):
+            assert client.get_patient(f"P{i}").fhir_id == f"fhir-{i}"
+        assert len(_requests("GET /patients/P")) == 200
+        assert PatientServiceStub.stats["connections"] <= 2, PatientServiceStub.stats["connections"]
+        print(f"✅ 200 lookups over {PatientServiceStub.stats['connections']} connection(s)")
+
+        print("🔍 Cached hits and misses...")
+        assert client.get_patient("P5").id == "P5"
+        assert client.get_patient("NOPE") is None
+        assert client.get_patient("NOPE") is None
+        assert len(_requests("GET /patients/P")) == 200
+        assert len(_requests("GET /patients/NOPE")) == 1
+        batch = client.get_patients(["P1", "P250", "P251", "NOPE"])
+        assert [p.id if p else None for p in batch.values()] == ["P1", "P250", "P251", None]
+        assert len(_requests("GET /patients/P")) == 202
+        print("✅ Repeat lookups and misses served from cache")
+
+        print("🔍 Calls from inside a running event loop...")
+
+        async def inside_loop():
+            return client.get_patient("P260")
+        assert asyncio.run(inside_loop()).id == "P260"
+        print("✅ Works while another event loop is running")
+
+        print("🔍 Concurrent identifier lookups share one scan...")
+        values = [f"MEM{i:04d}" for i in range(40)] + ["MEM9999"]
+        with ThreadPoolExecutor(max_workers=len(values)) as pool:
+            found = list(pool.map(lambda value: client.get_patient_by_identifier(value, "member-id"), values))
+        assert [p.id if p else None for p in found] == [f"P{i}" for i in range(40)] + [None]
+        scans = len(_requests("GET /patients?"))
+        assert scans <= 3, scans
+        client.get_patient_by_identifier("MEM0003", "member-id")
+        client.get_patient_by_identifier("MEM9999", "member-id")
+        assert len(_requests("GET /patients?")) == scans
+        print(f"✅ {len(values)} concurrent identifier lookups took {scans} scan(s)")
+
+        print("🔍 Writes invalidate cached entries...")
+        updated = client.update_patient("P7", PatientUpdate(family_name="Smith"))
+        assert updated.family_name == "Smith"
+        assert client.get_patient("P7").family_name == "Smith"
+        assert client.get_patient_by_identifier("MEM0007", "member-id").family_name == "Smith"
+        print("✅ Updated patient visible through both caches")
+
+        print("🔍 A read in flight during a write does not re-cache the old record...")
+        release = PatientServiceStub.held["/patients/P280"] = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stale_read = pool.submit(client.get_patient, "P280")
+            while not _requests("GET /patients/P280"):
+                threading.Event().wait(0.01)
+            client.update_patient("P280", PatientUpdate(family_name="Jones"))
+            release.set()
+            assert stale_read.result().family_name == "Doe"
+        assert client.get_patient("P280").family_name == "Jones"
+        assert len(_requests("GET /patients/P280")) == 1
+
+        cache = PatientLookupCache()
+        started = cache.generation()
+        cache.discard_patient("P9")
+        cache.set(("identifier", "member-id", "MEM0009"), client.get_patient("P9"), started)
+        cache.set(("identifier", "member-id", "MEM0010"), client.get_patient("P10"), started)
+        assert cache.get(("identifier", "member-id", "MEM0009")) == (False, None)
+        assert cache.get(("identifier", "member-id", "MEM0010"))[0]
+        print("✅ Results fetched before a discard are not cached")
+
+        client.close()
+        assert client.get_patient("P270").id == "P270"
+        print("✅ Client restarts after close()")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_patient_client()
+    print("🎉 PatientClientSync is pooled, cached and batched")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Equivalence test for the authorization statistics rollups.
+
+Seeds a throwaway SQLite database through the ORM (creates, updates and
+deletes of requests and responses), then checks that the rollup-backed
+get_authorization_statistics / get_provider_statistics match the live
+queries they replaced, before and after a backfill.
+
+    python test_statistics_rollups.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "preauth_rollup_test.db"))
+
+from sqlalchemy import create_engine, or_  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.models import (  # noqa: E402
+    PriorAuthorizationRequest,
+    PriorAuthorizationResponse,
+    AuthorizationDailyRollup,
+    RequestTypeEnum,
+    CertificationTypeEnum,
+    ResponseCodeEnum
+)
+from app.dao.prior_authorization_dao import EnhancedAuthorizationDAO  # noqa: E402
+from app.dao.rollup_dao import rollup_dao, normalize_response_code  # noqa: E402
+
+START = date(2024, 3, 1)
+DAYS = 10
+NPIS = [f"{1000000000 + i}" for i in range(8)]
+PROCEDURES = ["99213", "70551", "27447", "97110"]
+DIAGNOSES = ["M17.11", "G43.909", "E11.9"]
+
+
+def _seed(db, rng):
+    """Requests and responses over DAYS days, written and modified through the ORM"""
+    requests = []
+    for i in range(400):
+        requesting = rng.choice(NPIS)
+        servicing = rng.choice([None, requesting] + NPIS)
+        created_at = datetime.combine(START, datetime.min.time()) + timedelta(
+            days=rng.randrange(DAYS), seconds=rng.randrange(86400)
+        )
+        request = PriorAuthorizationRequest(
+            request_id=f"PA-TEST-{i:04d}",
+            patient_id=f"PAT-{i % 50:03d}",
+            patient_first_name="Test",
+            patient_last_name=f"Patient{i}",
+            patient_dob=date(1980, 1, 1),
+            member_id=f"MEM{i % 50:03d}",
+            requesting_provider_npi=requesting,
+            requesting_provider_name=f"Provider {requesting[-1]}",
+            servicing_provider_npi=servicing,
+            servicing_provider_name=f"Provider {servicing[-1]}" if servicing else None,
+            request_type=RequestTypeEnum.INITIAL,
+            certification_type=CertificationTypeEnum.INITIAL,
+            procedure_codes=[{"code": rng.choice(PROCEDURES)}],
+            diagnosis_codes=[{"code": rng.choice(DIAGNOSES)}],
+            priority=rng.choice(["normal", "urgent", "emergency"]),
+            edi_278_content="ST*278",
+            created_at=created_at
+        )
+        db.add(request)
+        requests.append(request)
+        # Some responses are flushed together with their request, the rest later
+        if rng.random() < 0.3:
+            db.add(_response(request, rng))
+        if i % 50 == 49:
+            db.commit()
+    db.commit()
+
+    for request in requests:
+        if request.response is None and rng.random() < 0.5:
+            db.add(_response(request, rng))
+    db.commit()
+
+    # Updates and deletes that move requests between rollup buckets
+    for request in rng.sample(requests, 40):
+        request.priority = "urgent" if request.priority != "urgent" else "normal"
+    for request in rng.sample(requests, 10):
+        request.requesting_provider_npi = rng.choice(NPIS)
+    responded = [request for request in requests if request.response is not None]
+    for request in rng.sample(responded, 20):
+        request.response.response_code = rng.choice(list(ResponseCodeEnum))
+    db.commit()
+    for request in rng.sample(responded, 10):
+        db.delete(request.response)
+    db.commit()
+    for request in [request for request in requests if request.response is None][:5]:
+        db.delete(request)
+    db.commit()
+
+
+def _response(request, rng):
+    return PriorAuthorizationResponse(
+        request_id=request.request_id,
+        response_code=rng.choice(list(ResponseCodeEnum)),
+        edi_278_response_content="ST*278",
+        created_at=request.created_at + timedelta(hours=rng.uniform(0.5, 96))
+    )
+
+
+def _in_range(query, date_from, date_to):
+    if date_from:
+        query = query.filter(PriorAuthorizationRequest.created_at >= date_from)
+    if date_to:
+        query = query.filter(PriorAuthorizationRequest.created_at < date_to + timedelta(days=1))
+    return query
+
+
+def _hours(request, response):
+    return (response.created_at - request.created_at).total_seconds() / 3600
+
+
+def reference_authorization_statistics(db, date_from, date_to):
+    """The live queries get_authorization_statistics used to run"""
+    requests = _in_range(db.query(PriorAuthorizationRequest), date_from, date_to).all()
+    pairs = [(r, r.response) for r in requests]
+    codes = Counter(normalize_response_code(resp.response_code) if resp else None for _, resp in pairs)
+    processing = [_hours(r, resp) for r, resp in pairs if resp]
+    providers = Counter(r.requesting_provider_npi for r in requests)
+    return {
+        "total_requests": len(requests),
+        "approved_requests": codes["A1"] + codes["A2"],
+        "denied_requests": codes["A3"],
+        "pending_requests": codes["A4"] + codes[None],
+        "average_processing_time_hours": sum(processing) / len(processing) if processing else 0,
+        "by_priority": dict(Counter(r.priority for r in requests)),
+        "by_provider": sorted(providers.items(), key=lambda item: (-item[1], item[0]))[:10]
+    }
+
+
+def reference_provider_statistics(db, npi, date_from, date_to):
+    """The live queries get_provider_statistics used to run"""
+    requests = _in_range(db.query(PriorAuthorizationRequest).filter(
+        or_(
+            PriorAuthorizationRequest.requesting_provider_npi == npi,
+            PriorAuthorizationRequest.servicing_provider_npi == npi
+        )
+    ), date_from, date_to).all()
+    if not requests:
+        return None
+    responses = [(r, r.response) for r in requests if r.response]
+    codes = Counter(normalize_response_code(resp.response_code) for _, resp in responses)
+    approved = codes["A1"] + codes["A2"]
+    processing = [_hours(r, resp) for r, resp in responses]
+    procedures = Counter(p["code"] for r in requests for p in r.procedure_codes or [])
+    return {
+        "total_requests": len(requests),
+        "approved_requests": approved,
+        "denied_requests": codes["A3"],
+        "approval_rate": approved / len(responses) * 100 if responses else 0,
+        "average_processing_time_hours": sum(processing) / len(processing) if processing else 0,
+        "procedure_counts": dict(procedures)
+    }
+
+
+def _close(a, b):
+    return abs(a - b) < 1e-6 * max(1, abs(a), abs(b))
+
+
+def check_equivalence(db, dao):
+    ranges = [
+        (START, START + timedelta(days=DAYS - 1)),
+        (START + timedelta(days=2), START + timedelta(days=4)),
+        (START + timedelta(days=7), START + timedelta(days=7)),
+        (START - timedelta(days=30), START - timedelta(days=1))
+    ]
+    for date_from, date_to in ranges:
+        expected = reference_authorization_statistics(db, date_from, date_to)
+        actual = dao.get_authorization_statistics(db, date_from, date_to)
+        for field in ("total_requests", "approved_requests", "denied_requests", "pending_requests", "by_priority"):
+            assert getattr(actual, field) == expected[field], (date_from, date_to, field, getattr(actual, field), expected[field])
+        assert _close(actual.average_processing_time_hours, expected["average_processing_time_hours"])
+        assert [(p["npi"], p["total_requests"]) for p in actual.by_provider] == expected["by_provider"]
+
+        for npi in NPIS:
+            expected_provider = reference_provider_statistics(db, npi, date_from, date_to)
+            actual_provider = dao.get_provider_statistics(db, npi, date_from, date_to)
+            if expected_provider is None:
+                assert actual_provider is None, (npi, date_from, date_to)
+                continue
+            for field in ("total_requests", "approved_requests", "denied_requests"):
+                assert getattr(actual_provider, field) == expected_provider[field], (npi, field)
+            assert _close(actual_provider.approval_rate, expected_provider["approval_rate"])
+            assert _close(actual_provider.average_processing_time_hours, expected_provider["average_processing_time_hours"])
+            assert {p["code"]: p["count"] for p in actual_provider.common_procedures} == expected_provider["procedure_counts"]
+
+
+def test_statistics_rollups():
+    url = os.environ["DATABASE_URL"]
+    if url.startswith("sqlite:///") and os.path.exists(url[len("sqlite:///"):]):
+        os.remove(url[len("sqlite:///"):])
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    dao = EnhancedAuthorizationDAO()
+
+    try:
+        _seed(db, random.Random(42))
+        print("🔍 Incrementally maintained rollups vs live queries...")
+        check_equivalence(db, dao)
+        print("✅ Incremental rollups match")
+
+        db.query(AuthorizationDailyRollup).delete()
+        db.commit()
+        rows = rollup_dao.backfill(db)
+        print(f"🔍 Full backfill ({rows} rows) vs live queries...")
+        check_equivalence(db, dao)
+        print("✅ Backfilled rollups match")
+
+        middle = START + timedelta(days=3)
+        db.query(AuthorizationDailyRollup).filter(AuthorizationDailyRollup.day == middle).update({"request_count": 999})
+        db.commit()
+        rollup_dao.backfill(db, middle, middle)
+        check_equivalence(db, dao)
+        print("✅ Ranged backfill repairs a day")
+    finally:
+        db.close()
+        engine.dispose()
+        if url.startswith("sqlite:///"):
+            os.remove(url[len("sqlite:///"):])
+
+
+if __name__ == "__main__":
+    test_statistics_rollups()
+    print("🎉 Statistics rollups are equivalent to the live queries")
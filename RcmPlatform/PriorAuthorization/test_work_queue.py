@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test the follow-up / expiration work queue on a throwaway SQLite database.
+
+Checks that work items follow the requests and responses written through the
+ORM and the bulk 278 intake, that concurrent workers claim every due item
+exactly once, that the claim uses the partial index, and that the scheduler
+retries failed items and requeues expired leases.
+
+    python test_work_queue.py
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "preauth_work_queue_test.db"))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.models import (  # noqa: E402
+    PriorAuthorizationRequest,
+    PriorAuthorizationResponse,
+    AuthorizationWorkItem,
+    AuthorizationAudit,
+    RequestTypeEnum,
+    CertificationTypeEnum,
+    ResponseCodeEnum
+)
+from app.dao.prior_authorization_dao import EnhancedAuthorizationDAO  # noqa: E402
+from app.dao.work_queue_dao import (  # noqa: E402
+    work_queue_dao, KIND_FOLLOW_UP, KIND_EXPIRATION, KIND_URGENT_REVIEW
+)
+from app.schemas.prior_authorization import AuthorizationDecision, ResponseCode  # noqa: E402
+from app.services.edi_278_service import EDI278Service  # noqa: E402
+from app.services.edi_278_batch_service import EDI278BatchService  # noqa: E402
+from app.services.authorization_scheduler import AuthorizationScheduler  # noqa: E402
+
+TODAY = date.today()
+
+
+def _request(i, rng, **overrides):
+    values = dict(
+        request_id=f"PA-WQ-{i:04d}",
+        patient_id=f"PAT-{i:04d}",
+        patient_first_name="Test",
+        patient_last_name=f"Patient{i}",
+        patient_dob=date(1980, 1, 1),
+        member_id=f"MEM{i:04d}",
+        requesting_provider_npi="1234567890",
+        request_type=RequestTypeEnum.INITIAL,
+        certification_type=CertificationTypeEnum.INITIAL,
+        priority=rng.choice(["normal", "urgent"]),
+        status="submitted",
+        edi_278_content="ST*278",
+        created_at=datetime.utcnow() - timedelta(hours=rng.randrange(72))
+    )
+    values.update(overrides)
+    return PriorAuthorizationRequest(**values)
+
+
+def _response(request, rng):
+    code = rng.choice(list(ResponseCodeEnum))
+    follow_up = rng.random() < 0.4
+    return PriorAuthorizationResponse(
+        request_id=request.request_id,
+        response_code=code,
+        expiration_date=TODAY + timedelta(days=rng.randrange(-10, 90)),
+        follow_up_required=follow_up,
+        follow_up_date=TODAY + timedelta(days=rng.randrange(-5, 5)) if follow_up else None,
+        edi_278_response_content="ST*278"
+    )
+
+
+def expected_items(db):
+    """Work items recomputed from the rows, independently of the DAO"""
+    expected = set()
+    for request in db.query(PriorAuthorizationRequest):
+        response = request.response
+        if response is not None and response.follow_up_required and response.follow_up_date:
+            expected.add((request.request_id, KIND_FOLLOW_UP, datetime.combine(response.follow_up_date, datetime.min.time())))
+        if (response is not None and response.response_code in (ResponseCodeEnum.APPROVED, ResponseCodeEnum.MODIFIED)
+                and response.expiration_date and response.expiration_date >= TODAY):
+            due = datetime.combine(response.expiration_date - timedelta(days=30), datetime.min.time())
+            expected.add((request.request_id, KIND_EXPIRATION, due))
+        if request.priority == "urgent" and request.status in ("submitted", "under_review"):
+            expected.add((request.request_id, KIND_URGENT_REVIEW, request.created_at + timedelta(hours=24)))
+    return expected
+
+
+def pending_items(db):
+    return {
+        (item.request_id, item.kind, item.due_at)
+        for item in db.query(AuthorizationWorkItem).filter(AuthorizationWorkItem.status == "pending")
+    }
+
+
+def test_work_queue():
+    url = os.environ["DATABASE_URL"]
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else None
+    if path and os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(url, connect_args={"timeout": 30} if path else {})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    rng = random.Random(11)
+
+    try:
+        print("🔍 Work items follow ORM writes...")
+        requests = [_request(i, rng) for i in range(300)]
+        db.add_all(requests)
+        db.commit()
+        for request in requests[:200]:
+            db.add(_response(request, rng))
+        db.commit()
+        assert pending_items(db) == expected_items(db)
+
+        for request in rng.sample(requests[:200], 30):
+            request.response.follow_up_required = True
+            request.response.follow_up_date = TODAY - timedelta(days=rng.randrange(3))
+        for request in rng.sample(requests, 30):
+            request.status = rng.choice(["approved", "under_review"])
+        db.commit()
+        for request in requests[250:255]:
+            db.delete(request)
+        db.commit()
+        assert pending_items(db) == expected_items(db)
+        print(f"✅ {len(pending_items(db))} pending items match the rows after creates, updates and deletes")
+
+        followups = EnhancedAuthorizationDAO().get_requests_requiring_followup(db)
+        assert followups and all(r.response.follow_up_date <= TODAY for r in followups)
+        print(f"✅ get_requests_requiring_followup returns {len(followups)} attached requests")
+
+        print("🔍 Bulk 278 intake schedules expirations...")
+        edi_service = EDI278Service()
+        decision = AuthorizationDecision(
+            response_code=ResponseCode.APPROVED, authorization_number="AUTH1",
+            effective_date=TODAY, expiration_date=TODAY + timedelta(days=10)
+        )
+        content = "\n".join(edi_service.generate_edi_278_response(r.request_id, decision) for r in requests[200:250])
+        summary = EDI278BatchService().apply_responses(db, io.StringIO(content))
+        assert summary["applied"] == 50
+        db.expire_all()
+        assert pending_items(db) == expected_items(db)
+        assert all((r.request_id, KIND_EXPIRATION) in {(i[0], i[1]) for i in pending_items(db)} for r in requests[200:250])
+        print("✅ Bulk-applied responses scheduled their expirations")
+
+        plan = " ".join(str(row) for row in db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM authorization_work_items "
+            "WHERE status = 'pending' AND due_day <= :day AND due_at <= :now ORDER BY due_day, due_at LIMIT 10"
+        ), {"day": TODAY, "now": datetime.utcnow()}))
+        assert "idx_auth_work_items_pending_due" in plan, plan
+        print("✅ Claims scan the partial pending index")
+
+        print("🔍 Concurrent workers claim each due item once...")
+        due = {item.id for item in db.query(AuthorizationWorkItem).filter(
+            AuthorizationWorkItem.status == "pending", AuthorizationWorkItem.due_at <= datetime.utcnow()
+        )}
+        claimed, lock = [], threading.Lock()
+
+        def worker(worker_id):
+            session = Session()
+            try:
+                while True:
+                    batch = work_queue_dao.claim(session, worker_id, limit=7)
+                    if not batch:
+                        return
+                    with lock:
+                        claimed.extend(item.id for item in batch)
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=worker, args=(f"w{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(claimed) == len(set(claimed)), "an item was claimed twice"
+        assert set(claimed) == due
+        print(f"✅ 4 workers claimed {len(claimed)} due items with no duplicates")
+
+        print("🔍 Scheduler processes, retries and requeues...")
+        db.query(AuthorizationWorkItem).filter(AuthorizationWorkItem.id.in_(claimed)).update(
+            {"status": "pending", "claimed_by": None, "claimed_at": None, "attempts": 0}, synchronize_session=False
+        )
+        db.commit()
+        scheduler = AuthorizationScheduler(worker_id="test", batch_size=1000)
+
+        def flaky(session, request, item):
+            raise RuntimeError("payer portal unavailable")
+        scheduler.register_handler(KIND_URGENT_REVIEW, flaky)
+
+        result = scheduler.run_once(db)
+        urgent = db.query(AuthorizationWorkItem).filter(
+            AuthorizationWorkItem.id.in_(claimed), AuthorizationWorkItem.kind == KIND_URGENT_REVIEW
+        ).all()
+        assert result["claimed"] == len(claimed) and result["failed"] == len(urgent)
+        assert all(i.status == "pending" and i.retry_at and i.attempts == 1 and i.last_error for i in urgent)
+        audits = db.query(AuthorizationAudit).filter(AuthorizationAudit.actor == "scheduler").count()
+        assert audits == result["done"] > 0
+        assert scheduler.run_once(db)["claimed"] == 0, "retries must wait for retry_at"
+        print(f"✅ {result['done']} items done with audit entries, {result['failed']} parked for retry")
+
+        db.query(AuthorizationWorkItem).filter(AuthorizationWorkItem.id.in_([i.id for i in urgent])).update(
+            {"status": "claimed", "claimed_at": datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False
+        )
+        db.commit()
+        assert work_queue_dao.release_expired(db, lease_seconds=300) == len(urgent)
+        print("✅ Expired leases return to the queue")
+    finally:
+        db.close()
+        engine.dispose()
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    test_work_queue()
+    print("🎉 Work queue schedules, claims and processes due work")